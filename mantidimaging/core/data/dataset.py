@@ -57,6 +57,13 @@ class BaseDataset:
     def __contains__(self, images_id: uuid.UUID) -> bool:
         return any([image.id == images_id for image in self.all])
 
+    @property
+    def shared_memory_bytes(self) -> int:
+        """
+        :return: The memory held by all the stacks in this dataset in shared memory or mapped files
+        """
+        return sum(image_stack.shared_memory_bytes for image_stack in self.all if image_stack is not None)
+
     @property
     def all_image_ids(self) -> List[uuid.UUID]:
         return [image_stack.id for image_stack in self.all if image_stack is not None]
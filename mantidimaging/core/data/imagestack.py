@@ -11,15 +11,18 @@ from typing import List, Optional, Any, Dict, Union, TextIO, TYPE_CHECKING
 
 import numpy as np
 
+from mantidimaging.core.data.transpose import swap_axes
 from mantidimaging.core.data.utility import mark_cropped
 from mantidimaging.core.operation_history import const
 from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.parallel.memory_budget import memory_budget
 from mantidimaging.core.utility.data_containers import ProjectionAngles, Counts, Indices
 from mantidimaging.core.utility.sensible_roi import SensibleROI
 from mantidimaging.core.utility.leak_tracker import leak_tracker
 
 if TYPE_CHECKING:
     from mantidimaging.core.utility.imat_log_file_parser import IMATLogFile
+    from mantidimaging.core.utility.progress_reporting import Progress
 
 
 class ImageStack:
@@ -48,6 +51,7 @@ class ImageStack:
 
         self.indices = indices
         self._id = uuid.uuid4()
+        self._claim_shared_array()
 
         self._filenames = filenames
 
@@ -143,12 +147,15 @@ class ImageStack:
         """
         return const.OPERATION_HISTORY in self.metadata
 
-    def copy(self, flip_axes=False) -> 'ImageStack':
-        shape = (self.data.shape[1], self.data.shape[0], self.data.shape[2]) if flip_axes else self.data.shape
-        data_copy = pu.create_array(shape, self.data.dtype)
+    def copy(self, flip_axes=False, progress: Optional[Progress] = None) -> 'ImageStack':
+        """
+        :param flip_axes: Swap between projection and sinogram ordering
+        :param progress: Progress reporting for swapping the axes, which can be used to cancel it
+        """
         if flip_axes:
-            data_copy.array[:] = np.swapaxes(self.data, 0, 1)
+            data_copy = swap_axes(self._shared_array, progress)
         else:
+            data_copy = pu.create_array(self.data.shape, self.data.dtype)
             data_copy.array[:] = self.data[:]
 
         images = ImageStack(data_copy,
@@ -262,6 +269,18 @@ class ImageStack:
     @shared_array.setter
     def shared_array(self, shared_array: pu.SharedArray):
         self._shared_array = shared_array
+        self._claim_shared_array()
+
+    def _claim_shared_array(self) -> None:
+        # Account the memory to this stack in the memory budget
+        self._shared_array.claim(self.id)
+
+    @property
+    def shared_memory_bytes(self) -> int:
+        """
+        :return: The memory held by this stack in shared memory or mapped files
+        """
+        return memory_budget.owner_bytes(self.id)
 
     @property
     def uses_shared_memory(self) -> bool:
@@ -273,7 +292,7 @@ class ImageStack:
 
     @staticmethod
     def create_empty_image_stack(shape, dtype, metadata) -> 'ImageStack':
-        arr = pu.create_array(shape, dtype)
+        arr = pu.create_array(shape, dtype, zeroed=True)
         return ImageStack(arr, metadata=metadata)
 
     @property
@@ -0,0 +1,199 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import math
+import threading
+from copy import deepcopy
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING, Union
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from mantidimaging.core.data import ImageStack
+
+
+class StackSnapshot:
+    """
+    The contents of a stack before an operation, so that the operation can be rolled back.
+
+    Nothing is copied up front. An operation that is run through the pipeline with a snapshot calls save_changed just
+    before it writes each slab back to the stack, and only the slices that the operation changes are saved, the first
+    time they are changed. If an operation gives the stack a new array, e.g. a crop, the original array is kept as it
+    is. Operations that can't be run a slab at a time save the whole stack with save_all before they start.
+    """
+    def __init__(self, images: ImageStack):
+        self._images = images
+        self._original = images.shared_array
+        self._metadata = deepcopy(images.metadata)
+        self._saved: Dict[int, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def images(self) -> ImageStack:
+        return self._images
+
+    @property
+    def original_shape(self) -> Tuple[int, ...]:
+        return self._original.array.shape
+
+    @property
+    def original_dtype(self) -> np.dtype:
+        return self._original.array.dtype
+
+    @property
+    def in_place(self) -> bool:
+        """
+        True while the stack still uses its original array, so changes to the stack need to be saved
+        """
+        return self._images.shared_array is self._original
+
+    @property
+    def saved_indices(self) -> List[int]:
+        with self._lock:
+            return sorted(self._saved)
+
+    @property
+    def saved_bytes(self) -> int:
+        with self._lock:
+            return sum(saved.nbytes for saved in self._saved.values())
+
+    def save_changed(self, start: int, new_data: np.ndarray) -> None:
+        """
+        Save the slices of the original array from start that differ from new_data, before new_data is written over
+        them. Slices that have already been saved are skipped, as they no longer hold the original data.
+
+        :param start: Index of the first slice that will be written
+        :param new_data: The slices that will be written
+        """
+        if not self.in_place:
+            return
+        original = self._original.array[start:start + new_data.shape[0]]
+        unchanged = (original == new_data) | (np.isnan(original) & np.isnan(new_data))
+        changed = ~unchanged.reshape(new_data.shape[0], -1).all(axis=1)
+        with self._lock:
+            for offset in np.flatnonzero(changed):
+                self._saved.setdefault(start + int(offset), original[offset].copy())
+
+    def save_all(self) -> None:
+        """
+        Save every slice that hasn't been saved already
+        """
+        if not self.in_place:
+            return
+        with self._lock:
+            for index in range(self._original.array.shape[0]):
+                if index not in self._saved:
+                    self._saved[index] = self._original.array[index].copy()
+
+    def original_slice(self, index: int) -> np.ndarray:
+        """
+        One slice of the original data. This is the saved copy if the slice has been changed, otherwise the slice of
+        the original array, not a copy.
+        """
+        with self._lock:
+            saved = self._saved.get(index)
+        return saved if saved is not None else self._original.array[index]
+
+    def original_view(self) -> SnapshotView:
+        """
+        The original data, for comparing with the result of the operation, without copying it into a new array
+        """
+        return SnapshotView(self)
+
+    def restore(self) -> None:
+        """
+        Put the original data and metadata back into the stack
+        """
+        self._write_back(self._original.array)
+        if not self.in_place:
+            self._images.shared_array = self._original
+        self._images.metadata = deepcopy(self._metadata)
+
+    def _write_back(self, array: np.ndarray) -> None:
+        with self._lock:
+            for index, saved in self._saved.items():
+                array[index] = saved
+
+
+class SnapshotView:
+    """
+    Read only, array like view of the original data in a StackSnapshot, for showing in an image view.
+
+    Reading a slice of the first axis gives the original slice without copying it. Slicing with slices, e.g. to
+    subsample the view, gives another SnapshotView, and the data is only read when it is converted to an array.
+    """
+    def __init__(self, snapshot: StackSnapshot, index: Optional[Tuple[np.ndarray, ...]] = None):
+        """
+        :param snapshot: The snapshot to read the original data from
+        :param index: The indices along each axis of the original data that are in the view
+        """
+        self._snapshot = snapshot
+        if index is None:
+            index = tuple(np.arange(size) for size in snapshot.original_shape)
+        self._index = index
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return tuple(len(axis) for axis in self._index)
+
+    @property
+    def ndim(self) -> int:
+        return len(self._index)
+
+    @property
+    def size(self) -> int:
+        return math.prod(self.shape)
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._snapshot.original_dtype
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key) -> Union[np.ndarray, SnapshotView]:
+        if not isinstance(key, tuple):
+            key = (key, )
+        if len(key) > self.ndim or any(k is Ellipsis or k is None for k in key):
+            raise IndexError(f"Only indexing with up to {self.ndim} integers and slices is supported")
+        key = key + (slice(None), ) * (self.ndim - len(key))
+        index = tuple(axis[k] for axis, k in zip(self._index, key))
+        if all(isinstance(k, slice) for k in key):
+            return SnapshotView(self._snapshot, index)
+        return self._read(index)
+
+    def __array__(self, dtype=None) -> np.ndarray:
+        array = self._read(self._index)
+        return array if dtype is None else array.astype(dtype)
+
+    def transpose(self, axes: Sequence[int]) -> Union[np.ndarray, SnapshotView]:
+        if list(axes) == list(range(self.ndim)):
+            return self
+        return np.asarray(self).transpose(axes)
+
+    def min(self, *args, **kwargs):
+        return np.asarray(self).min(*args, **kwargs)
+
+    def max(self, *args, **kwargs):
+        return np.asarray(self).max(*args, **kwargs)
+
+    def mean(self, *args, **kwargs):
+        return np.asarray(self).mean(*args, **kwargs)
+
+    def _read(self, index: Tuple[Union[int, np.ndarray], ...]) -> np.ndarray:
+        """
+        Read the data at the given indices, one slice of the first axis at a time. Integer indices drop their axis.
+        """
+        full_slices = all(
+            np.ndim(axis) == 1 and np.array_equal(axis, np.arange(size))
+            for axis, size in zip(index[1:], self._snapshot.original_shape[1:]))
+        if np.ndim(index[0]) == 0 and full_slices:
+            return self._snapshot.original_slice(int(index[0]))
+
+        slices = []
+        for image in np.atleast_1d(index[0]):
+            original = self._snapshot.original_slice(int(image))
+            slices.append(original if full_slices else original[np.ix_(*(np.atleast_1d(axis) for axis in index[1:]))])
+        data = np.stack(slices) if slices else np.empty((0, ) + tuple(np.size(axis) for axis in index[1:]), self.dtype)
+        return data.reshape(tuple(np.size(axis) for axis in index if np.ndim(axis) == 1))
@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import io
+import tempfile
 from mantidimaging.core.utility.data_containers import ProjectionAngles
 import unittest
+from unittest import mock
 
 import numpy as np
 
 from mantidimaging.core.data import ImageStack
 from mantidimaging.core.data.test.fake_logfile import generate_csv_logfile, generate_txt_logfile
 from mantidimaging.core.operations.crop_coords import CropCoordinatesFilter
+from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.operation_history import const
 from mantidimaging.core.utility.sensible_roi import SensibleROI
 from mantidimaging.test_helpers.unit_test_helper import generate_images
@@ -82,6 +85,27 @@ class ImageStackTest(unittest.TestCase):
         self.assertEqual(images.metadata, copy.metadata)
         self.assertNotEqual(copy, images.sinograms)
 
+    def test_copy_flip_axes_of_sinograms(self):
+        sinograms = generate_images().copy(flip_axes=True)
+
+        projections = sinograms.copy(flip_axes=True)
+
+        self.assertFalse(projections.is_sinograms)
+        self.assertEqual(projections, sinograms.projections)
+
+    @mock.patch('mantidimaging.core.parallel.utility.enough_memory', return_value=False)
+    def test_copy_uses_mapped_file_when_not_enough_memory(self, _mock_enough_memory):
+        images = generate_images()
+        pu.clear_segment_pool()
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            with mock.patch('mantidimaging.core.parallel.manager.MAPPED_FILE_DIR', scratch_dir):
+                copy = images.copy()
+
+            self.assertTrue(copy.uses_shared_memory)
+            self.assertIsNotNone(copy.shared_array.mapped_file)
+            self.assertEqual(images, copy)
+            del copy
+
     def test_copy_roi(self):
         images = generate_images()
         images.record_operation("Test", "Display", 123)
@@ -0,0 +1,130 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+from parameterized import parameterized
+
+from mantidimaging.core.data import ImageStack
+from mantidimaging.core.data.snapshot import StackSnapshot
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.test_helpers.unit_test_helper import gen_img_numpy_rand
+
+
+class StackSnapshotTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.images = ImageStack(pu.copy_into_shared_memory(gen_img_numpy_rand((5, 4, 3)).astype(np.float32)))
+        self.images.metadata = {"name": "before"}
+        self.original = self.images.data.copy()
+        self.snapshot = StackSnapshot(self.images)
+
+    def _write(self, start: int, new_data: np.ndarray):
+        self.snapshot.save_changed(start, new_data)
+        self.images.data[start:start + new_data.shape[0]] = new_data
+
+    def test_nothing_saved_up_front(self):
+        self.assertEqual([], self.snapshot.saved_indices)
+        self.assertEqual(0, self.snapshot.saved_bytes)
+
+    def test_only_changed_slices_saved(self):
+        new_data = self.images.data[1:4].copy()
+        new_data[1] += 1
+        self._write(1, new_data)
+
+        self.assertEqual([2], self.snapshot.saved_indices)
+        self.assertEqual(self.images.data[0].nbytes, self.snapshot.saved_bytes)
+
+    def test_nan_slices_not_changed(self):
+        self.images.data[0, 0, 0] = np.nan
+        snapshot = StackSnapshot(self.images)
+
+        snapshot.save_changed(0, self.images.data[:2].copy())
+
+        self.assertEqual([], snapshot.saved_indices)
+
+    def test_slice_saved_once(self):
+        self._write(0, self.images.data[:1] + 1)
+        self._write(0, self.images.data[:1] + 1)
+
+        self.snapshot.restore()
+        npt.assert_equal(self.original, self.images.data)
+
+    def test_restore(self):
+        self._write(1, self.images.data[1:3] * 2)
+        self.images.metadata = {"name": "after"}
+
+        self.snapshot.restore()
+
+        npt.assert_equal(self.original, self.images.data)
+        self.assertEqual({"name": "before"}, self.images.metadata)
+
+    def test_restore_after_array_replaced(self):
+        original_array = self.images.shared_array
+        self._write(0, self.images.data[:1] * 2)
+        self.images.shared_array = pu.create_array((5, 2, 3), np.float32)
+
+        self.assertFalse(self.snapshot.in_place)
+        # Writes to the new array don't need saving
+        self.snapshot.save_changed(0, np.ones((5, 2, 3), np.float32))
+        self.assertEqual([0], self.snapshot.saved_indices)
+
+        self.snapshot.restore()
+        self.assertIs(original_array, self.images.shared_array)
+        npt.assert_equal(self.original, self.images.data)
+
+    def test_save_all(self):
+        self._write(0, self.images.data[:1] * 2)
+        self.snapshot.save_all()
+        self.images.data[:] = 0
+
+        self.assertEqual([0, 1, 2, 3, 4], self.snapshot.saved_indices)
+        self.snapshot.restore()
+        npt.assert_equal(self.original, self.images.data)
+
+    def test_original_slice_without_changes_shares_data(self):
+        self.assertTrue(np.shares_memory(self.images.data, self.snapshot.original_slice(2)))
+
+    def test_original_view_with_changes(self):
+        self._write(2, self.images.data[2:3] * 2)
+        changed = self.images.data.copy()
+
+        view = self.snapshot.original_view()
+
+        self.assertEqual(self.original.shape, view.shape)
+        self.assertEqual(self.original.dtype, view.dtype)
+        npt.assert_equal(self.original, np.asarray(view))
+        npt.assert_equal(changed, self.images.data)
+
+    def test_original_view_after_array_replaced(self):
+        self._write(0, self.images.data[:1] * 2)
+        self.images.shared_array = pu.create_array((5, 2, 3), np.float32)
+
+        npt.assert_equal(self.original, np.asarray(self.snapshot.original_view()))
+
+    @parameterized.expand([
+        ("slice", (2, )),
+        ("pixel", (2, 1, 0)),
+        ("column", (slice(None), slice(1, 3), 2)),
+        ("subsampled", (slice(None, None, 2), slice(None, None, 3))),
+        ("negative", (-1, slice(None, None, -1))),
+    ])
+    def test_original_view_indexing(self, _, key):
+        self._write(1, self.images.data[1:3] * 2)
+
+        npt.assert_equal(self.original[key], np.asarray(self.snapshot.original_view()[key]))
+
+    def test_original_view_sliced_twice(self):
+        self._write(0, self.images.data[:2] * 2)
+
+        view = self.snapshot.original_view()[::2][:, 1:]
+
+        self.assertEqual((3, 3, 3), view.shape)
+        npt.assert_equal(self.original[::2][:, 1:], np.asarray(view))
+        self.assertEqual(self.original[::2][:, 1:].max(), view.max())
+
+
+if __name__ == "__main__":
+    unittest.main()
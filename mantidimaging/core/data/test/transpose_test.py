@@ -0,0 +1,49 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+from parameterized import parameterized
+
+from mantidimaging.core.data.transpose import swap_axes
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.progress_reporting import Progress
+from mantidimaging.test_helpers.unit_test_helper import gen_img_numpy_rand
+
+
+class SwapAxesTest(unittest.TestCase):
+    @parameterized.expand([
+        ("single_tile", 1024 * 1024, 1024 * 1024),
+        ("tile_per_row", 10 * 4, 10 * 4),
+        ("uneven_tiles", 3 * 10 * 4, 7 * 3 * 10 * 4),
+    ])
+    def test_same_as_numpy(self, _, block_read_bytes, tile_bytes):
+        data = pu.copy_into_shared_memory(gen_img_numpy_rand((13, 11, 10)).astype(np.float32))
+
+        with mock.patch('mantidimaging.core.data.transpose.BLOCK_READ_BYTES', block_read_bytes), \
+                mock.patch('mantidimaging.core.data.transpose.TILE_BYTES', tile_bytes):
+            swapped = swap_axes(data)
+
+        self.assertTrue(swapped.has_shared_memory)
+        npt.assert_equal(np.swapaxes(data.array, 0, 1), swapped.array)
+
+    def test_array_not_in_shared_memory(self):
+        data = pu.SharedArray(gen_img_numpy_rand((4, 6, 5)), None)
+
+        npt.assert_equal(np.swapaxes(data.array, 0, 1), swap_axes(data).array)
+
+    def test_cancel(self):
+        data = pu.copy_into_shared_memory(gen_img_numpy_rand((4, 6, 5)))
+        progress = Progress()
+        progress.cancel()
+
+        with self.assertRaisesRegex(RuntimeError, "cancelled"):
+            swap_axes(data, progress)
+
+
+if __name__ == "__main__":
+    unittest.main()
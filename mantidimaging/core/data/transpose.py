@@ -0,0 +1,57 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from mantidimaging.core.parallel import manager as pm
+from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
+
+if TYPE_CHECKING:
+    from mantidimaging.core.utility.progress_reporting import Progress
+
+# Target size of the contiguous runs read from the source by each copy, long enough for the hardware prefetchers. Blocks
+# are made smaller than this when there are too few rows to give every thread SLABS_PER_CORE blocks.
+BLOCK_READ_BYTES = 64 * 1024
+# Size of the tiles copied with their axes swapped, small enough that a tile stays in the L2 cache while it is written
+TILE_BYTES = 512 * 1024
+
+
+def swap_axes(source: pu.SharedArray, progress: Optional[Progress] = None) -> pu.SharedArray:
+    """
+    Copy a stack into a new shared array with its first two axes swapped, e.g. to turn projections into sinograms.
+
+    The rows of the output are split into blocks that are filled in parallel. Each block is copied a tile at a time,
+    reading contiguous runs of rows from every image in the tile, instead of with one strided copy of the whole stack.
+
+    :param source: The stack to copy
+    :param progress: Progress reporting object. If it is cancelled the copy stops with a RuntimeError.
+    :return: The copy, with shape (rows, images, columns)
+    """
+    data = source.array
+    num_images, num_rows = data.shape[:2]
+    output = pu.create_array((num_rows, num_images) + data.shape[2:], data.dtype)
+
+    row_bytes = max(1, data[0, 0].nbytes)
+    rows_per_block = max(1, min(BLOCK_READ_BYTES // row_bytes, num_rows // (pm.threads * pu.SLABS_PER_CORE)))
+    params = {
+        'rows_per_block': rows_per_block,
+        'images_per_tile': max(1, TILE_BYTES // (rows_per_block * row_bytes)),
+    }
+    num_blocks = -(-num_rows // rows_per_block)
+    # Copying releases the GIL, so threads avoid the cost of attaching each process to the arrays
+    ps.run_compute_func(_swap_block, num_blocks, [source, output], params, progress, backend=pu.ExecutionBackend.THREAD)
+    return output
+
+
+def _swap_block(index: int, arrays: List[np.ndarray], params: Dict[str, Any]) -> None:
+    source, output = arrays
+    start = index * params['rows_per_block']
+    stop = start + params['rows_per_block']
+    images_per_tile = params['images_per_tile']
+    for first_image in range(0, source.shape[0], images_per_tile):
+        last_image = first_image + images_per_tile
+        output[start:stop, first_image:last_image] = np.swapaxes(source[first_image:last_image, start:stop], 0, 1)
@@ -14,3 +14,9 @@ def mark_cropped(images: ImageStack, roi: SensibleROI):
     from mantidimaging.core.operations.crop_coords import CropCoordinatesFilter
     # not ideal.. but it will allow to replicate the result accurately
     images.record_operation(CropCoordinatesFilter.__name__, CropCoordinatesFilter.filter_name, region_of_interest=roi)
+
+
+def mark_binned(images: ImageStack, factor: int):
+    # avoids circular import error
+    from mantidimaging.core.operations.rebin import RebinFilter
+    images.record_operation(RebinFilter.__name__, RebinFilter.filter_name, rebin_param=1 / factor, mode="reflect")
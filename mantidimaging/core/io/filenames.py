@@ -2,15 +2,24 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import fnmatch
+import os
+import threading
+import time
+from collections import defaultdict
 from pathlib import Path
 import re
-from typing import List, Iterator, Optional, Union
+from typing import Collection, Dict, List, Iterator, Optional, Set, Tuple, Union
 from logging import getLogger
 
 from mantidimaging.core.utility.data_containers import FILE_TYPES
 
 LOG = getLogger(__name__)
 
+# Directory modification times can be as coarse as 2 seconds, e.g. on FAT and some network file systems. A directory
+# that changed this soon before it was indexed could change again without its time changing, so the index isn't reused.
+MTIME_RESOLUTION_NS = 2_000_000_000
+
 
 class FilenamePattern:
     """
@@ -73,6 +82,9 @@ class FilenamePattern:
     def match_metadata(self, filename: str) -> bool:
         return self.re_pattern_metadata.match(filename) is not None
 
+    def metadata_name(self) -> str:
+        return self.prefix.rstrip("_ ") + ".json"
+
 
 class FilenamePatternGolden(FilenamePattern):
     """
@@ -120,6 +132,91 @@ class FilenamePatternGolden(FilenamePattern):
         return self.name_store[index]
 
 
+class DirectoryIndex:
+    """
+    The names of the entries in a directory, read with a single os.scandir.
+
+    Numbered names are grouped by the prefix and suffix of their FilenamePattern, so the files of a group are found
+    without matching the pattern against every name in the directory.
+    """
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.mtime_ns = os.stat(directory).st_mtime_ns
+        self.scan_time_ns = time.time_ns()
+        with os.scandir(directory) as entries:
+            self.names: Set[str] = {entry.name for entry in entries}
+        self._by_pattern: Optional[Dict[Tuple[str, str], List[str]]] = None
+        self._indexes: Dict[Tuple[str, int, str], List[int]] = {}
+
+    def is_current(self, mtime_ns: int) -> bool:
+        return mtime_ns == self.mtime_ns and self.scan_time_ns - mtime_ns > MTIME_RESOLUTION_NS
+
+    def candidates(self, pattern: FilenamePattern) -> Collection[str]:
+        """
+        The names that could match the pattern. Patterns that don't have a numbered prefix and suffix, e.g. golden
+        ratio scans, get every name.
+        """
+        key = self._pattern_key(pattern.generate(0)) if type(pattern) is FilenamePattern else None
+        if key != (pattern.prefix, pattern.suffix):
+            return self.names
+        if self._by_pattern is None:
+            self._by_pattern = defaultdict(list)
+            for name in self.names:
+                if (name_key := self._pattern_key(name)) is not None:
+                    self._by_pattern[name_key].append(name)
+        return self._by_pattern.get(key, [])
+
+    def indexes(self, pattern: FilenamePattern) -> List[int]:
+        """
+        The sorted indexes of the names that match the pattern. They are kept for plain numbered patterns, so finding
+        the same group again doesn't match any names.
+        """
+        if type(pattern) is not FilenamePattern:
+            return sorted(pattern.get_index(name) for name in self.candidates(pattern) if pattern.match(name))
+        key = (pattern.prefix, pattern.digit_count, pattern.suffix)
+        if key not in self._indexes:
+            self._indexes[key] = sorted(
+                pattern.get_index(name) for name in self.candidates(pattern) if pattern.match(name))
+        return list(self._indexes[key])
+
+    @staticmethod
+    def _pattern_key(name: str) -> Optional[Tuple[str, str]]:
+        result = FilenamePattern.PATTERN.search(name)
+        return None if result is None else (result.group(1), result.group(3))
+
+
+_directory_indexes: Dict[Path, DirectoryIndex] = {}
+_directory_indexes_lock = threading.Lock()
+
+
+def get_directory_index(directory: Path) -> DirectoryIndex:
+    """
+    Get the index of a directory. Indexes are cached, and the directory is scanned again if its modification time
+    has changed since it was indexed.
+    """
+    directory = Path(os.path.abspath(directory))
+    mtime_ns = os.stat(directory).st_mtime_ns
+    with _directory_indexes_lock:
+        index = _directory_indexes.get(directory)
+    if index is None or not index.is_current(mtime_ns):
+        index = DirectoryIndex(directory)
+        with _directory_indexes_lock:
+            _directory_indexes[directory] = index
+    return index
+
+
+def clear_directory_indexes() -> None:
+    with _directory_indexes_lock:
+        _directory_indexes.clear()
+
+
+def _index_contains(directory: Path, name: str) -> bool:
+    try:
+        return name in get_directory_index(directory).names
+    except OSError:
+        return False
+
+
 class FilenameGroup:
     def __init__(self, directory: Path, pattern: FilenamePattern, all_indexes: List[int]):
         self.directory = directory
@@ -160,26 +257,22 @@ class FilenameGroup:
         return next(self.all_files())
 
     def find_all_files(self) -> None:
-        self.all_indexes = []
-        for filename in self.directory.iterdir():
-            if self.pattern.match(filename.name):
-                self.all_indexes.append(self.pattern.get_index(filename.name))
+        index = get_directory_index(self.directory)
+        self.all_indexes = index.indexes(self.pattern)
 
-            if self.pattern.match_metadata(filename.name):
-                if self.metadata_path is not None:
-                    LOG.warning(f"Multiple metadata files found: {filename}")
-                self.metadata_path = filename
-        self.all_indexes.sort()
+        metadata_name = self.pattern.metadata_name()
+        if metadata_name in index.names:
+            self.metadata_path = self.directory / metadata_name
 
     def find_log_file(self) -> None:
         parent_directory = self.directory.parent
         log_pattern = self.directory.name + "*" + ".txt"
-        log_paths = list(parent_directory.glob(log_pattern))
+        log_names = fnmatch.filter(get_directory_index(parent_directory).names, log_pattern)
 
-        if log_paths:
+        if log_names:
             # choose shortest match
-            shortest = min(log_paths, key=lambda p: len(p.name))
-            self.log_path = self.directory / shortest
+            shortest = min(log_names, key=len)
+            self.log_path = parent_directory / shortest
 
     def find_related(self, file_type: FILE_TYPES) -> Optional[FilenameGroup]:
         if file_type == FILE_TYPES.PROJ_180:
@@ -194,9 +287,9 @@ class FilenameGroup:
         if self.directory.name in ["Tomo", "tomo"]:
             for test_name in test_names:
                 new_dir = self.directory.parent / test_name
-                if new_dir.exists():
+                if _index_contains(self.directory.parent, test_name):
                     new_path = new_dir / sample_first_name.replace("Tomo", test_name).replace("tomo", test_name)
-                    if new_path.exists():
+                    if _index_contains(new_dir, new_path.name):
                         return self.from_file(new_path)
 
         return None
@@ -207,7 +300,7 @@ class FilenameGroup:
         test_name = "180deg"
         if self.directory.name in ["Tomo", "tomo"]:
             new_dir = self.directory.parent / test_name
-            if new_dir.exists():
+            if _index_contains(self.directory.parent, test_name):
                 for trim_numbers in [True, False]:
                     if trim_numbers:
                         new_name = re.sub(r'_([0-9]+)', "", sample_first_name)
@@ -215,7 +308,7 @@ class FilenameGroup:
                         new_name = sample_first_name
                     new_name = new_name.replace("Tomo", test_name).replace("tomo", test_name)
                     new_path = new_dir / new_name
-                    if new_path.exists():
+                    if _index_contains(new_dir, new_name):
                         return self.from_file(new_path)
 
         return None
@@ -4,24 +4,57 @@ from __future__ import annotations
 """
 This module handles the loading of FIT, FITS, TIF, TIFF
 """
-from typing import Tuple, Optional, List, Callable, Union, TYPE_CHECKING
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from logging import getLogger
+from typing import Tuple, Optional, List, Callable, Sequence, Union, TYPE_CHECKING
+
+import numpy as np
 
 from mantidimaging.core.data import ImageStack
+from mantidimaging.core.io.loader.probe import probe_image
 from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.parallel.memory_budget import memory_budget
+from mantidimaging.core.utility.binning import bin_blocks
 from mantidimaging.core.utility.progress_reporting import Progress
+from mantidimaging.core.utility.sensible_roi import SensibleROI
 
 if TYPE_CHECKING:
-    import numpy as np
     import numpy.typing as npt
     from ...utility.data_containers import Indices
 
+LOG = getLogger(__name__)
+
+# Number of threads used to decode files when loading. File reading and decompression release the GIL, so threads
+# scale well on local disks. On network storage a lower value can avoid saturating the connection.
+DEFAULT_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+
+# What the load function of an ImageLoader reads an image from: a file name, or the index of a page in a file that
+# holds a stack of images
+ImageSource = Union[str, int]
+
+# Ways of combining the images of a stack into a single image as they are loaded, used for flat and dark images
+COMBINE_MEAN = "Mean"
+COMBINE_MEDIAN = "Median"
+COMBINE_SIGMA_CLIPPED_MEAN = "Sigma clipped mean"
+COMBINE_METHODS = [COMBINE_MEAN, COMBINE_MEDIAN, COMBINE_SIGMA_CLIPPED_MEAN]
+# Pixels further than this many standard deviations from the mean of their pixel are left out of a sigma clipped mean
+SIGMA_CLIP = 3.0
+# Memory used to hold a band of rows from every image while the median is found
+MEDIAN_BUFFER_BYTES = 256 * 1024 * 1024
+
 
 def execute(load_func: Callable[[str], np.ndarray],
             sample_path: List[str],
             img_format: str,
             dtype: 'npt.DTypeLike',
             indices: Union[List[int], Indices, None],
-            progress: Optional[Progress] = None) -> ImageStack:
+            progress: Optional[Progress] = None,
+            workers: int = DEFAULT_LOAD_WORKERS,
+            img_shape: Optional[Tuple[int, ...]] = None,
+            binning: int = 1) -> ImageStack:
     """
     Reads a stack of images into memory, assuming dark and flat images
     are in separate directories.
@@ -31,6 +64,10 @@ def execute(load_func: Callable[[str], np.ndarray],
         '>f2' - float16
         '>f4' - float32
 
+    :param workers: Number of threads used to decode the files. A value of 1 loads the files sequentially.
+    :param img_shape: The shape of the images returned by load_func. If not given it is read from the header of the
+                      first file.
+    :param binning: Average blocks of binning x binning pixels of each image as it is loaded
     :returns: ImageStack object
     """
     if not sample_path:
@@ -38,36 +75,78 @@ def execute(load_func: Callable[[str], np.ndarray],
 
     # The following codes assume that all images have the same size and properties as the first.
     # This is always true in the case of raw data
-    first_sample_img = load_func(sample_path[0])
+    if img_shape is None:
+        img_shape = probe_image(sample_path[0]).data_shape
 
     # select the files loaded based on the indices, if any are provided
     chosen_input_filenames = sample_path[indices[0]:indices[1]:indices[2]] if indices else sample_path
 
-    # get the shape of all images
-    img_shape = first_sample_img.shape
-
     # forward all arguments to internal class for easy re-usage
-    il = ImageLoader(load_func, img_format, img_shape, dtype, indices, progress)
+    il = ImageLoader(load_func, img_format, img_shape, dtype, indices, progress, workers, binning)
 
     sample_data = il.load_sample_data(chosen_input_filenames)
 
     return ImageStack(sample_data, chosen_input_filenames, indices)
 
 
+def execute_combined(load_func: Callable[..., np.ndarray],
+                     sample_path: List[str],
+                     method: str,
+                     dtype: 'npt.DTypeLike',
+                     indices: Union[List[int], Indices, None],
+                     progress: Optional[Progress] = None,
+                     workers: int = DEFAULT_LOAD_WORKERS,
+                     roi: Optional[SensibleROI] = None,
+                     binning: int = 1) -> ImageStack:
+    """
+    Reads a stack of images and combines them into a single image while they are loaded. Only the running totals, or
+    a band of rows of each image for the median, are held in memory rather than the whole stack.
+
+    :param load_func: Reads an image file. It must take a roi keyword argument, to read a region of the image.
+    :param method: How the images are combined, one of COMBINE_METHODS
+    :param roi: Only load this region of the images. The whole image is used if not given.
+    :param binning: Average blocks of binning x binning pixels of each image as it is loaded
+    :returns: ImageStack object holding the combined image
+    """
+    if method not in COMBINE_METHODS:
+        raise ValueError(f"Unknown combine method: {method}. Expected one of {COMBINE_METHODS}")
+    if not sample_path:
+        raise RuntimeError("No filenames were provided.")
+
+    info = probe_image(sample_path[0])
+    if roi is None:
+        img_shape = info.data_shape
+        if len(img_shape) != 2:
+            raise ValueError("Data loaded has invalid shape: {0}".format(img_shape))
+        roi = SensibleROI(0, 0, img_shape[1], img_shape[0])
+
+    chosen_input_filenames = sample_path[indices[0]:indices[1]:indices[2]] if indices else sample_path
+
+    il = ImageLoader(load_func, "", (roi.height, roi.width), dtype, indices, progress, workers, binning)
+    # Regions of compressed images can't be read without decoding the whole image
+    combined = il.combine_files(chosen_input_filenames, method, roi, decodes_whole_images=info.compression is not None)
+
+    return ImageStack(combined[np.newaxis], chosen_input_filenames[:1], indices)
+
+
 class ImageLoader(object):
     def __init__(self,
-                 load_func: Callable[[str], np.ndarray],
+                 load_func: Callable[..., np.ndarray],
                  img_format: str,
                  img_shape: Tuple[int, ...],
                  data_dtype: 'npt.DTypeLike',
                  indices: Union[List[int], Indices, None],
-                 progress: Optional[Progress] = None):
+                 progress: Optional[Progress] = None,
+                 workers: int = DEFAULT_LOAD_WORKERS,
+                 binning: int = 1):
         self.load_func = load_func
         self.img_format = img_format
         self.img_shape = img_shape
         self.data_dtype = data_dtype
         self.indices = indices
         self.progress = progress
+        self.workers = workers
+        self.binning = binning
 
     def load_sample_data(self, input_file_names: List[str]) -> pu.SharedArray:
         # determine what the loaded data was
@@ -77,28 +156,226 @@ class ImageLoader(object):
         else:
             raise ValueError("Data loaded has invalid shape: {0}", self.img_shape)
 
-    def _do_files_load_seq(self, data: pu.SharedArray, files: List[str]) -> pu.SharedArray:
+    def _load_image(self,
+                    in_file: ImageSource,
+                    load_func: Optional[Callable[..., np.ndarray]] = None,
+                    img_shape: Optional[Tuple[int, ...]] = None) -> np.ndarray:
+        """
+        Load and bin one image, checking that it has the expected shape
+
+        :param load_func: Used instead of self.load_func, e.g. to read a region of the image
+        :param img_shape: The shape of the image returned by load_func, if it is not self.img_shape
+        """
+        img_shape = img_shape or self.img_shape
+        try:
+            image = (load_func or self.load_func)(in_file)
+            if image.shape[-2:] != tuple(img_shape):
+                raise ValueError(f"{in_file} has dimensions {image.shape}")
+            image = image.reshape(img_shape)
+        except ValueError as exc:
+            raise ValueError("An image has different width and/or height "
+                             "dimensions! All images must have the same "
+                             "dimensions. Expected dimensions: {0} Error "
+                             "message: {1}".format(img_shape, exc))
+        except IOError as exc:
+            raise RuntimeError("Could not load file {0}. Error details: " "{1}".format(in_file, exc))
+        return _bin_image(image, self.binning) if self.binning > 1 else image
+
+    def _load_file_into(self, data: np.ndarray, idx: int, in_file: ImageSource) -> None:
+        data[idx, :] = self._load_image(in_file)
+
+    def _for_each_file_seq(self, task: Callable[[int, ImageSource], None], files: Sequence[ImageSource],
+                           progress: Progress) -> None:
+        for idx, in_file in enumerate(files):
+            task(idx, in_file)
+            progress.update(msg='Image')
+
+    def _for_each_file_par(self, task: Callable[[int, ImageSource], None], files: Sequence[ImageSource],
+                           progress: Progress) -> None:
+        """
+        Run the task for each file on a thread pool.
+
+        Progress is reported from the calling thread as tasks finish, so progress handlers and cancellation behave
+        the same as for the sequential load.
+        """
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(task, idx, in_file) for idx, in_file in enumerate(files)]
+            try:
+                for future in as_completed(futures):
+                    future.result()
+                    progress.update(msg='Image')
+            except BaseException:
+                # Don't start decoding any more files after an error or a cancellation
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _for_each_file(self, task: Callable[[int, ImageSource], None], files: Sequence[ImageSource],
+                       progress: Progress) -> None:
+        if self.workers > 1 and len(files) > 1:
+            self._for_each_file_par(task, files, progress)
+        else:
+            self._for_each_file_seq(task, files, progress)
+
+    def _do_files_load_seq(self, data: pu.SharedArray, files: Sequence[ImageSource]) -> pu.SharedArray:
         progress = Progress.ensure_instance(self.progress, num_steps=len(files), task_name='Loading')
 
         with progress:
-            for idx, in_file in enumerate(files):
-                try:
-                    data.array[idx, :] = self.load_func(in_file)
-                    progress.update(msg='Image')
-                except ValueError as exc:
-                    raise ValueError("An image has different width and/or height "
-                                     "dimensions! All images must have the same "
-                                     "dimensions. Expected dimensions: {0} Error "
-                                     "message: {1}".format(self.img_shape, exc))
-                except IOError as exc:
-                    raise RuntimeError("Could not load file {0}. Error details: " "{1}".format(in_file, exc))
+            self._for_each_file_seq(partial(self._load_file_into, data.array), files, progress)
 
         return data
 
-    def load_files(self, files: List[str]) -> pu.SharedArray:
+    def _do_files_load_par(self, data: pu.SharedArray, files: Sequence[ImageSource]) -> pu.SharedArray:
+        """
+        Decode the files on a thread pool, with each task writing directly into its own slot of the shared array.
+        """
+        progress = Progress.ensure_instance(self.progress, num_steps=len(files), task_name='Loading')
+
+        with progress:
+            self._for_each_file_par(partial(self._load_file_into, data.array), files, progress)
+
+        return data
+
+    def load_files(self, files: Sequence[ImageSource]) -> pu.SharedArray:
+        """
+        Load the images into a new shared array, decoding them on a thread pool if self.workers > 1.
+
+        :param files: The file names, or the page indices if self.load_func reads the pages of one file
+        """
         # Zeroing here to make sure that we can allocate the memory.
         # If it's not possible better crash here than later.
         num_images = len(files)
-        shape = (num_images, self.img_shape[0], self.img_shape[1])
+        shape = (num_images, self.img_shape[0] // self.binning, self.img_shape[1] // self.binning)
         data = pu.create_array(shape, self.data_dtype)
+        if self.workers > 1 and num_images > 1:
+            return self._do_files_load_par(data, files)
         return self._do_files_load_seq(data, files)
+
+    def combine_files(self,
+                      files: List[str],
+                      method: str,
+                      roi: SensibleROI,
+                      decodes_whole_images: bool = False) -> np.ndarray:
+        """
+        Combine the files into one image, loading them on the thread pool.
+
+        :param files: The files to combine
+        :param method: One of COMBINE_METHODS
+        :param roi: The region of the images to load. self.load_func is called with it as the roi keyword argument.
+        :param decodes_whole_images: Whether self.load_func decodes the whole image to read any region of it, e.g. for
+                                     compressed TIFF files
+        :return: The combined image, with the data type of the loader
+        """
+        num_passes = 2 if method == COMBINE_SIGMA_CLIPPED_MEAN else 1
+        progress = Progress.ensure_instance(self.progress, num_steps=len(files) * num_passes, task_name='Loading')
+
+        with progress:
+            if method == COMBINE_MEDIAN:
+                combined = self._median_files(files, roi, progress, decodes_whole_images)
+            else:
+                load_func = partial(self.load_func, roi=roi)
+                sums = self._sum_files(files, load_func, progress)
+                combined = sums[0] / len(files)
+                if method == COMBINE_SIGMA_CLIPPED_MEAN:
+                    deviation = np.sqrt(np.maximum(sums[1] / len(files) - combined**2, 0))
+                    sums = self._sum_files(files, load_func, progress, combined, deviation * SIGMA_CLIP)
+                    np.divide(sums[0], sums[1], out=combined, where=sums[1] > 0)
+
+        return combined.astype(self.data_dtype, copy=False)
+
+    def _sum_files(self,
+                   files: List[str],
+                   load_func: Callable[[str], np.ndarray],
+                   progress: Progress,
+                   mean: Optional[np.ndarray] = None,
+                   limit: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Sum the images, and the squares of the images. Given a mean and a limit, instead sum the pixels within the
+        limit of the mean, and count them.
+
+        Each thread adds into its own totals, which are summed at the end.
+        """
+        shape = (2, self.img_shape[0] // self.binning, self.img_shape[1] // self.binning)
+        totals = _ThreadTotals(shape)
+
+        def add_file(_: int, in_file: ImageSource) -> None:
+            image = self._load_image(in_file, load_func)
+            sums = totals.get()
+            if mean is None:
+                sums[0] += image
+                sums[1] += np.square(image, dtype=np.float64)
+            else:
+                keep = np.abs(image - mean) <= limit
+                sums[0] += np.where(keep, image, 0)
+                sums[1] += keep
+
+        self._for_each_file(add_file, files, progress)
+        return totals.sum()
+
+    def _median_files(self, files: List[str], roi: SensibleROI, progress: Progress,
+                      decodes_whole_images: bool) -> np.ndarray:
+        """
+        Find the median a band of rows at a time, so that only MEDIAN_BUFFER_BYTES of every image are held in memory.
+        Each band is read from the files with a region, so each file is opened once per band.
+
+        Reading a region of a compressed file decodes the whole image, so the bands would decode every file once per
+        band. For those files the whole stack is held instead, if it fits in the free memory, so that each file is
+        decoded once. Otherwise the bands are used, at the cost of the repeated decoding.
+        """
+        rows, columns = roi.height // self.binning, roi.width // self.binning
+        itemsize = np.dtype(np.float32).itemsize
+        band_rows = max(1, MEDIAN_BUFFER_BYTES // (len(files) * columns * itemsize))
+        if decodes_whole_images and band_rows < rows:
+            if memory_budget.fits(len(files) * rows * columns * itemsize, shared=False):
+                band_rows = rows
+            else:
+                LOG.warning(f"Not enough memory to hold the images while finding their median. Each image will be "
+                            f"decoded {-(-rows // band_rows)} times.")
+        num_bands = -(-rows // band_rows)
+        progress.set_estimated_steps(len(files) * num_bands)
+
+        buffer = np.empty((len(files), min(band_rows, rows), columns), dtype=np.float32)
+        median = np.empty((rows, columns), dtype=np.float32)
+        for start in range(0, rows, band_rows):
+            stop = min(start + band_rows, rows)
+            band = buffer[:, :stop - start]
+            band_roi = SensibleROI(roi.left, roi.top + start * self.binning, roi.right, roi.top + stop * self.binning)
+            load_func = partial(self.load_func, roi=band_roi)
+            band_shape = (band_roi.height, band_roi.width)
+
+            def load_band(idx: int, in_file: ImageSource) -> None:
+                band[idx] = self._load_image(in_file, load_func, band_shape)
+
+            self._for_each_file(load_band, files, progress)
+            np.median(band, axis=0, out=median[start:stop])
+        return median
+
+
+def _bin_image(image: np.ndarray, factor: int) -> np.ndarray:
+    """
+    Average blocks of factor x factor pixels. Pixels left over at the bottom and right edges are dropped.
+    """
+    return bin_blocks(image, (factor, factor))
+
+
+class _ThreadTotals:
+    """
+    Running totals for each thread, so that threads loading files don't have to take turns adding to one array
+    """
+    def __init__(self, shape: Tuple[int, ...]):
+        self.shape = shape
+        self._local = threading.local()
+        self._all: List[np.ndarray] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> np.ndarray:
+        totals = getattr(self._local, "totals", None)
+        if totals is None:
+            totals = self._local.totals = np.zeros(self.shape, dtype=np.float64)
+            with self._lock:
+                self._all.append(totals)
+        return totals
+
+    def sum(self) -> np.ndarray:
+        with self._lock:
+            return np.sum(self._all, axis=0) if self._all else np.zeros(self.shape, dtype=np.float64)
@@ -3,6 +3,7 @@
 from __future__ import annotations
 import os
 from dataclasses import dataclass, field
+from functools import partial
 from logging import getLogger
 from pathlib import Path
 from typing import Tuple, List, Optional, Union, TYPE_CHECKING, Callable
@@ -11,15 +12,18 @@ import numpy as np
 import astropy.io.fits as fits
 from tifffile import tifffile
 
-from mantidimaging.core.io.loader import img_loader
+from mantidimaging.core.data import ImageStack
+from mantidimaging.core.data.utility import mark_binned, mark_cropped
+from mantidimaging.core.io.loader import img_loader, volume_loader
+from mantidimaging.core.io.loader.probe import probe_image
 from mantidimaging.core.io.utility import find_first_file_that_is_possibly_a_sample
 from mantidimaging.core.utility.data_containers import Indices, FILE_TYPES, ProjectionAngles
 from mantidimaging.core.utility.imat_log_file_parser import IMATLogFile
 from mantidimaging.core.io.filenames import FilenameGroup
+from mantidimaging.core.utility.sensible_roi import SensibleROI
 
 if TYPE_CHECKING:
     import numpy.typing as npt
-    from mantidimaging.core.data import ImageStack
     from mantidimaging.core.utility.progress_reporting import Progress
 
 LOG = getLogger(__name__)
@@ -51,45 +55,64 @@ class LoadingParameters:
     name: str = ""
     dtype: str = DEFAULT_PIXEL_DEPTH
     sinograms: bool = DEFAULT_IS_SINOGRAM
+    load_workers: int = img_loader.DEFAULT_LOAD_WORKERS
+    # Crop and bin every stack while it is loaded, instead of loading the full images
+    roi: Optional[SensibleROI] = None
+    binning: int = 1
+    # Combine each flat and dark stack into one image while it is loaded, with one of img_loader.COMBINE_METHODS.
+    # Flat-fielding only uses the combined images, so the full stacks don't have to be held in memory.
+    flat_dark_combine: Optional[str] = None
 
 
-def _fitsread(filename: Union[Path, str]) -> np.ndarray:
+def _fitsread(filename: Union[Path, str], roi: Optional[SensibleROI] = None) -> np.ndarray:
     """
     Read one image and return it as a 2d numpy array
 
     :param filename :: name of the image file, can be relative or absolute path
-    :param img_format: format of the image ('fits')
+    :param roi: Only read this region of the image
     """
     image = fits.open(filename)
     if len(image) < 1:
         raise RuntimeError("Could not load at least one FITS image/table file from: {0}".format(filename))
 
+    if roi is not None:
+        # A section reads only the rows of the region from the file
+        return image[0].section[roi.top:roi.bottom, roi.left:roi.right]
+
     # get the image data
     return image[0].data
 
 
-def _imread(filename: Union[Path, str]) -> np.ndarray:
-    return tifffile.imread(filename)
+def _imread(filename: Union[Path, str], roi: Optional[SensibleROI] = None) -> np.ndarray:
+    if roi is None:
+        return tifffile.imread(filename)
+
+    with tifffile.TiffFile(filename) as tif:
+        page = tif.pages[0]
+        if not page.is_memmappable:
+            # Compressed images have to be decoded in full
+            return page.asarray()[roi.top:roi.bottom, roi.left:roi.right]
+    # Uncompressed images are mapped, so only the rows of the region are read from the file
+    return np.array(tifffile.memmap(filename, page=0, mode='r')[roi.top:roi.bottom, roi.left:roi.right])
 
 
 def supported_formats() -> List[str]:
     return ['fits', 'fit', 'tif', 'tiff']
 
 
-def get_loader(in_format: str) -> Callable[[Union[Path, str]], np.ndarray]:
+def get_loader(in_format: str, roi: Optional[SensibleROI] = None) -> Callable[[Union[Path, str]], np.ndarray]:
+    load_func: Callable[..., np.ndarray]
     if in_format in ['fits', 'fit']:
         load_func = _fitsread
     elif in_format in ['tiff', 'tif']:
         load_func = _imread
     else:
         raise NotImplementedError("Loading not implemented for:", in_format)
-    return load_func
+    return load_func if roi is None else partial(load_func, roi=roi)
 
 
-def read_image_dimensions(file_path: Path) -> Tuple[int, int]:
-    load_func = get_loader(file_path.suffix.replace(".", ""))
-    img = load_func(file_path)
-    return img.shape
+def read_image_dimensions(file_path: Path) -> Tuple[int, ...]:
+    return probe_image(file_path).data_shape
 
 
 def load_log(log_file: Path) -> IMATLogFile:
@@ -103,19 +126,38 @@ def load_stack_from_group(group: FilenameGroup, progress: Optional[Progress] = N
 
 def load_stack_from_image_params(image_params: ImageParameters,
                                  progress: Optional[Progress] = None,
-                                 dtype: npt.DTypeLike = np.float32):
+                                 dtype: npt.DTypeLike = np.float32,
+                                 workers: int = img_loader.DEFAULT_LOAD_WORKERS,
+                                 roi: Optional[SensibleROI] = None,
+                                 binning: int = 1,
+                                 combine: Optional[str] = None):
+    if combine is not None:
+        return load_combined(filename_group=image_params.file_group,
+                             method=combine,
+                             progress=progress,
+                             dtype=dtype,
+                             indices=image_params.indices,
+                             workers=workers,
+                             roi=roi,
+                             binning=binning)
     return load(filename_group=image_params.file_group,
                 progress=progress,
                 dtype=dtype,
                 indices=image_params.indices,
-                log_file=image_params.log_file)
+                log_file=image_params.log_file,
+                workers=workers,
+                roi=roi,
+                binning=binning)
 
 
 def load(filename_group: FilenameGroup,
          dtype: 'npt.DTypeLike' = np.float32,
          indices: Optional[Union[List[int], Indices]] = None,
          progress: Optional[Progress] = None,
-         log_file: Optional[Path] = None) -> ImageStack:
+         log_file: Optional[Path] = None,
+         workers: int = img_loader.DEFAULT_LOAD_WORKERS,
+         roi: Optional[SensibleROI] = None,
+         binning: int = 1) -> ImageStack:
     """
 
     Loads a stack, including sample, white and dark images.
@@ -127,27 +169,95 @@ def load(filename_group: FilenameGroup,
                     filename, but removes all indices from the filenames list
                     that are not selected
     :param progress: The progress reporting instance
+    :param workers: Number of threads used to decode the image files
+    :param roi: Only load this region of the images. Recorded in the history as a Crop Coordinates operation.
+    :param binning: Average blocks of binning x binning pixels as the images are loaded. Recorded in the history as
+                    a Rebin operation, after the crop.
     :return: an ImageStack
     """
     if indices and len(indices) < 3:
         raise ValueError("Indices at this point MUST have 3 elements: [start, stop, step]!")
+    if binning < 1:
+        raise ValueError(f"Binning must be at least 1, got {binning}")
 
     file_names = [str(p) for p in filename_group.all_files()]
     in_format = filename_group.first_file().suffix.lstrip('.')
-    load_func = get_loader(in_format)
+    info = probe_image(filename_group.first_file())
+    img_shape = info.shape if roi is None else _region_shape(info.shape, roi)
 
     if log_file is not None:
         log_data = load_log(log_file)
         angles = log_data.projection_angles().value
         angle_order = np.argsort(angles)
-        file_names = [file_names[i] for i in angle_order]
 
-    image_stack = img_loader.execute(load_func, file_names, in_format, dtype, indices, progress)
+    if info.pages > 1:
+        # Each image is a page of one file
+        if len(file_names) > 1:
+            raise ValueError(f"Only one file can be loaded when the files hold several images, found {len(file_names)}")
+        pages = list(range(info.pages))
+        if log_file is not None:
+            pages = [pages[i] for i in angle_order]
+        if indices:
+            pages = pages[indices[0]:indices[1]:indices[2]]
+        data = volume_loader.read_volume(file_names[0], pages, dtype, roi, binning, progress, workers)
+        # One name for each image, so that the names still match the images, e.g. after binning projections
+        image_stack = ImageStack(data, [f"{file_names[0]}:{page}" for page in pages], indices)
+    else:
+        if log_file is not None:
+            file_names = [file_names[i] for i in angle_order]
+        image_stack = img_loader.execute(get_loader(in_format, roi), file_names, in_format, dtype, indices, progress,
+                                         workers, img_shape, binning)
+    # The metadata file replaces the metadata of the stack, so it is loaded before the crop and binning are recorded
+    _load_metadata(image_stack, filename_group)
+    if roi is not None:
+        mark_cropped(image_stack, roi)
+    if binning > 1:
+        mark_binned(image_stack, binning)
 
     if log_file is not None:
         image_stack.log_file = log_data
         image_stack.set_projection_angles(ProjectionAngles(angles[angle_order]))
 
+    return image_stack
+
+
+def load_combined(filename_group: FilenameGroup,
+                  method: str,
+                  dtype: 'npt.DTypeLike' = np.float32,
+                  indices: Optional[Union[List[int], Indices]] = None,
+                  progress: Optional[Progress] = None,
+                  workers: int = img_loader.DEFAULT_LOAD_WORKERS,
+                  roi: Optional[SensibleROI] = None,
+                  binning: int = 1) -> ImageStack:
+    """
+    Loads a stack of flat or dark images, combining them into a single image as they are read. Memory use is around
+    the size of one image, rather than the whole stack.
+
+    :param method: How the images are combined, one of img_loader.COMBINE_METHODS
+    :return: an ImageStack holding the combined image
+    """
+    if indices and len(indices) < 3:
+        raise ValueError("Indices at this point MUST have 3 elements: [start, stop, step]!")
+    if binning < 1:
+        raise ValueError(f"Binning must be at least 1, got {binning}")
+
+    file_names = [str(p) for p in filename_group.all_files()]
+    load_func = get_loader(filename_group.first_file().suffix.lstrip('.'))
+    if roi is not None:
+        _region_shape(probe_image(filename_group.first_file()).data_shape, roi)
+
+    image_stack = img_loader.execute_combined(load_func, file_names, method, dtype, indices, progress, workers, roi,
+                                              binning)
+    _load_metadata(image_stack, filename_group)
+    if roi is not None:
+        mark_cropped(image_stack, roi)
+    if binning > 1:
+        mark_binned(image_stack, binning)
+
+    return image_stack
+
+
+def _load_metadata(image_stack: ImageStack, filename_group: FilenameGroup) -> None:
     # Search for and load metadata file
     metadata_filename = filename_group.metadata_path
     if metadata_filename:
@@ -157,7 +267,12 @@ def load(filename_group: FilenameGroup,
     else:
         LOG.debug('No metadata file found')
 
-    return image_stack
+
+def _region_shape(img_shape: Tuple[int, ...], roi: SensibleROI) -> Tuple[int, int]:
+    if len(img_shape) != 2 or not (0 <= roi.left < roi.right <= img_shape[1]
+                                   and 0 <= roi.top < roi.bottom <= img_shape[0]):
+        raise ValueError(f"The region of interest ({roi}) is outside of the image dimensions {img_shape}")
+    return roi.height, roi.width
 
 
 def create_loading_parameters_for_file_path(file_path: Path) -> Optional[LoadingParameters]:
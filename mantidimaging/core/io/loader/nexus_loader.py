@@ -0,0 +1,191 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+"""
+This module reads the images of NXtomo entries from NeXus files
+"""
+import enum
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import h5py
+import numpy as np
+
+from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.progress_reporting import Progress
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+    from mantidimaging.core.utility.data_containers import Indices
+
+# Approximate size of each read from the file. Large enough that the per-read overhead of HDF5 is small, small enough
+# that the buffers used to convert the data type stay small.
+READ_BYTES = 64 * 1024 * 1024
+
+DEFINITION = "definition"
+NXTOMOPROC = "NXtomoproc"
+RECON_DATA_PATH = "data/data"
+
+# A read of count images, starting at source_start in the file and stepping by stride, into the output from dest_start
+Read = Tuple[int, int, int, int]
+
+
+class ImageKeys(enum.Enum):
+    Projections = 0
+    FlatField = 1
+    DarkField = 2
+
+
+@dataclass
+class ReconEntry:
+    """
+    A reconstruction saved in a NeXus file, found without reading its data
+    """
+    name: str
+    path: str
+    shape: Tuple[int, ...]
+    dtype: np.dtype
+
+
+def find_recon_entries(nexus_file: h5py.File) -> List[ReconEntry]:
+    """
+    Find the NXtomoproc entries in a NeXus file. Only the metadata of the entries is read.
+
+    :param nexus_file: The open NeXus file
+    :return: The reconstructions in the file
+    """
+    entries = []
+    for key, entry in nexus_file.items():
+        if isinstance(entry, h5py.Group) and DEFINITION in entry:
+            if np.array(entry[DEFINITION]).tobytes().decode("utf-8") == NXTOMOPROC:
+                data = entry[RECON_DATA_PATH]
+                entries.append(ReconEntry(key, data.name, data.shape, data.dtype))
+    return entries
+
+
+def read_recon(nexus_file: h5py.File, entry: ReconEntry, progress: Optional[Progress] = None) -> pu.SharedArray:
+    """
+    Read the volume of a reconstruction in chunks, keeping the data type it was saved with.
+
+    :param nexus_file: The open NeXus file
+    :param entry: The reconstruction to read, from find_recon_entries
+    :param progress: Progress reporting object
+    :return: The reconstructed volume
+    """
+    return read_images(nexus_file[entry.path], np.arange(entry.shape[0]), entry.dtype, progress)
+
+
+def image_key_indices(image_key: np.ndarray, key: ImageKeys, before: Optional[bool] = None) -> np.ndarray:
+    """
+    Find the images with an image key.
+
+    :param image_key: The image key of every image in the file
+    :param key: The image key to look for
+    :param before: For flat and dark images, True to look in the first half of the file and False to look in the
+                   second half. Ignored for projections.
+    :return: The indices of the images
+    """
+    matches = np.asarray(image_key) == key.value
+    if key is not ImageKeys.Projections:
+        half = matches.size // 2
+        if before:
+            matches[half:] = False
+        else:
+            matches[:half] = False
+    return np.flatnonzero(matches)
+
+
+def read_images(dataset: h5py.Dataset,
+                indices: np.ndarray,
+                dtype: 'npt.DTypeLike' = np.float32,
+                progress: Optional[Progress] = None,
+                parallel: bool = False) -> pu.SharedArray:
+    """
+    Read images from a NeXus dataset straight into a new shared array.
+
+    The indices are split into runs with a constant step, and each run is read as HDF5 hyperslabs of around
+    READ_BYTES, lined up with the chunks of the dataset if it has any. Only the selected images are read, and the data
+    is converted to dtype as it is read, so no full size temporary array is needed.
+
+    :param dataset: The images dataset, with shape (images, rows, columns)
+    :param indices: The indices of the images to read, in increasing order
+    :param dtype: The data type of the result
+    :param progress: Progress reporting object. It is updated after each read.
+    :param parallel: Read on the process pool, with each process opening the file. Only used when the file is on disk.
+    :return: The images
+    """
+    if len(indices) == 0:
+        raise ValueError("No images were selected to read")
+    output = pu.create_array((len(indices), ) + dataset.shape[1:], dtype)
+    reads = _plan_reads(np.asarray(indices), _images_per_read(dataset, output.array.dtype))
+
+    if parallel and dataset.file.driver != 'core':
+        params = {'filename': dataset.file.filename, 'path': dataset.name, 'reads': reads}
+        ps.run_compute_func(_read_in_process, len(reads), output, params, progress)
+        return output
+
+    progress = Progress.ensure_instance(progress, num_steps=len(reads), task_name='Loading')
+    with progress:
+        for read in reads:
+            _read(dataset, output.array, read)
+            progress.update(msg='Images')
+    return output
+
+
+def read_image_key_images(dataset: h5py.Dataset,
+                          image_key: np.ndarray,
+                          key: ImageKeys,
+                          before: Optional[bool] = None,
+                          indices: Optional[Indices] = None,
+                          dtype: 'npt.DTypeLike' = np.float32,
+                          progress: Optional[Progress] = None,
+                          parallel: bool = False) -> pu.SharedArray:
+    """
+    Read the images with an image key from a NeXus dataset.
+
+    :param indices: Start, stop and step applied to the images with the image key, e.g. to load every other projection
+    :return: The images
+    """
+    selected = image_key_indices(image_key, key, before)
+    if indices is not None:
+        selected = selected[indices[0]:indices[1]:indices[2]]
+    return read_images(dataset, selected, dtype, progress, parallel)
+
+
+def _images_per_read(dataset: h5py.Dataset, dtype: np.dtype) -> int:
+    image_bytes = max(1, int(np.prod(dataset.shape[1:])) * max(dataset.dtype.itemsize, dtype.itemsize))
+    count = max(1, READ_BYTES // image_bytes)
+    if dataset.chunks is not None and count > dataset.chunks[0]:
+        # Whole chunks, so that compressed chunks are not decompressed by two reads
+        count -= count % dataset.chunks[0]
+    return count
+
+
+def _plan_reads(indices: np.ndarray, images_per_read: int) -> List[Read]:
+    """
+    Split the indices into runs that have a constant step, and the runs into reads of at most images_per_read images
+    """
+    reads: List[Read] = []
+    run_start = 0
+    while run_start < len(indices):
+        stride = int(indices[run_start + 1] - indices[run_start]) if run_start + 1 < len(indices) else 1
+        run_end = run_start + 1
+        while run_end < len(indices) and indices[run_end] - indices[run_end - 1] == stride:
+            run_end += 1
+        for dest_start in range(run_start, run_end, images_per_read):
+            count = min(images_per_read, run_end - dest_start)
+            reads.append((dest_start, int(indices[dest_start]), count, stride))
+        run_start = run_end
+    return reads
+
+
+def _read(dataset: h5py.Dataset, output: np.ndarray, read: Read) -> None:
+    dest_start, source_start, count, stride = read
+    source_stop = source_start + (count - 1) * stride + 1
+    dataset.read_direct(output, np.s_[source_start:source_stop:stride], np.s_[dest_start:dest_start + count])
+
+
+def _read_in_process(index: int, output: np.ndarray, params: Dict[str, Any]) -> None:
+    with h5py.File(params['filename'], 'r') as nexus_file:
+        _read(nexus_file[params['path']], output, params['reads'][index])
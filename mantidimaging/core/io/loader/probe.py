@@ -0,0 +1,84 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+"""
+This module finds the shape and type of the images in TIFF and FITS files by reading only their headers
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import astropy.io.fits as fits
+from astropy.io.fits.hdu.base import BITPIX2DTYPE
+from tifffile import tifffile
+
+
+@dataclass
+class ImageInfo:
+    """
+    The images in a file, as described by its header
+    """
+    # Shape of one image
+    shape: Tuple[int, int]
+    dtype: np.dtype
+    pages: int = 1
+    compression: Optional[str] = None
+
+    @property
+    def data_shape(self) -> Tuple[int, ...]:
+        """
+        Shape of the array that the loader reads from the file
+        """
+        return self.shape if self.pages == 1 else (self.pages, ) + self.shape
+
+
+def probe_image(file_path: Union[Path, str]) -> ImageInfo:
+    """
+    Read the header of a TIFF or FITS file, without decoding any image data.
+
+    :param file_path: The image file
+    :return: The shape, data type, number of pages and compression of the images in the file
+    """
+    in_format = Path(file_path).suffix.lstrip(".").lower()
+    if in_format in ['fits', 'fit']:
+        return _probe_fits(file_path)
+    elif in_format in ['tiff', 'tif']:
+        return _probe_tiff(file_path)
+    else:
+        raise NotImplementedError("Probing not implemented for:", in_format)
+
+
+def _probe_tiff(file_path: Union[Path, str]) -> ImageInfo:
+    with tifffile.TiffFile(file_path) as tif:
+        series = tif.series[0]
+        compression = tifffile.COMPRESSION(tif.pages[0].compression)
+        return ImageInfo((series.shape[-2], series.shape[-1]), np.dtype(series.dtype), int(np.prod(series.shape[:-2])),
+                         None if compression == tifffile.COMPRESSION.NONE else compression.name.lower())
+
+
+def _probe_fits(file_path: Union[Path, str]) -> ImageInfo:
+    # The loader reads the primary HDU
+    header = fits.getheader(file_path, 0)
+    if header["NAXIS"] < 1:
+        raise RuntimeError("Could not find a FITS image in: {0}".format(file_path))
+    shape = [header[f"NAXIS{axis}"] for axis in range(header["NAXIS"], 0, -1)]
+    pages = shape[0] if len(shape) > 2 else 1
+    return ImageInfo((shape[-2], shape[-1]), _fits_dtype(header), pages)
+
+
+def _fits_dtype(header: fits.Header) -> np.dtype:
+    """
+    The type that astropy gives the data, including the scaling with BZERO and BSCALE
+    """
+    dtype = np.dtype(BITPIX2DTYPE[header["BITPIX"]])
+    bscale, bzero = header.get("BSCALE", 1), header.get("BZERO", 0)
+    if bscale == 1 and bzero == 0:
+        # FITS data is big-endian, and astropy only converts it when it is scaled
+        return dtype.newbyteorder(">")
+    if bscale == 1 and dtype.kind == "i" and bzero == 1 << (dtype.itemsize * 8 - 1):
+        # Unsigned integers are stored as signed integers with an offset
+        return np.dtype(f"uint{dtype.itemsize * 8}")
+    if bscale == 1 and dtype == np.uint8 and bzero == -128:
+        return np.dtype(np.int8)
+    return np.dtype(np.float32) if dtype.itemsize <= 2 else np.dtype(np.float64)
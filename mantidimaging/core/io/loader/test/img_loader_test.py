@@ -0,0 +1,188 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+import unittest
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+from parameterized import parameterized
+
+from mantidimaging.core.io.loader import img_loader
+from mantidimaging.core.io.loader.probe import ImageInfo
+from mantidimaging.core.utility.sensible_roi import SensibleROI
+
+IMG_SHAPE = (4, 6)
+
+
+def _fake_load_func(filename: str) -> np.ndarray:
+    index = int(filename.split("_")[1])
+    return np.full(IMG_SHAPE, index, dtype=np.float32)
+
+
+def _fake_region_load_func(filename: str, roi: SensibleROI) -> np.ndarray:
+    index = int(filename.split("_")[1])
+    image = np.arange(24, dtype=np.float32).reshape(IMG_SHAPE) + index
+    return image[roi.top:roi.bottom, roi.left:roi.right]
+
+
+class ImageLoaderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.files = [f"file_{i}" for i in range(12)]
+
+    @parameterized.expand([("sequential", 1), ("parallel", 4)])
+    def test_load_files_fills_each_slot(self, _, workers):
+        il = img_loader.ImageLoader(_fake_load_func, "tif", IMG_SHAPE, np.float32, None, workers=workers)
+
+        data = il.load_files(self.files)
+
+        for idx in range(len(self.files)):
+            npt.assert_equal(data.array[idx], idx)
+
+    @parameterized.expand([("sequential", 1), ("parallel", 4)])
+    def test_load_files_reports_progress_per_image(self, _, workers):
+        progress = mock.MagicMock()
+        il = img_loader.ImageLoader(_fake_load_func, "tif", IMG_SHAPE, np.float32, None, progress, workers)
+
+        il.load_files(self.files)
+
+        self.assertEqual(len(self.files), progress.update.call_count)
+
+    @parameterized.expand([("sequential", 1), ("parallel", 4)])
+    def test_load_files_wrong_shape(self, _, workers):
+        def load_func(filename):
+            return np.zeros((3, 3)) if filename == "file_5" else _fake_load_func(filename)
+
+        il = img_loader.ImageLoader(load_func, "tif", IMG_SHAPE, np.float32, None, workers=workers)
+
+        with self.assertRaisesRegex(ValueError, "different width and/or height"):
+            il.load_files(self.files)
+
+    @parameterized.expand([("sequential", 1), ("parallel", 4)])
+    def test_load_files_io_error(self, _, workers):
+        def load_func(filename):
+            if filename == "file_7":
+                raise IOError("Disk error")
+            return _fake_load_func(filename)
+
+        il = img_loader.ImageLoader(load_func, "tif", IMG_SHAPE, np.float32, None, workers=workers)
+
+        with self.assertRaisesRegex(RuntimeError, "Could not load file file_7"):
+            il.load_files(self.files)
+
+    def test_load_files_with_binning(self):
+        load_func = mock.Mock(return_value=np.arange(24, dtype=np.float32).reshape(IMG_SHAPE))
+        il = img_loader.ImageLoader(load_func, "tif", IMG_SHAPE, np.float32, None, workers=1, binning=3)
+
+        data = il.load_files(self.files[:2])
+
+        self.assertEqual((2, 1, 2), data.array.shape)
+        npt.assert_equal([[7, 10]], data.array[1])
+
+    @parameterized.expand([
+        ("mean_sequential", img_loader.COMBINE_MEAN, 1, lambda images: images.mean(axis=0)),
+        ("mean_parallel", img_loader.COMBINE_MEAN, 4, lambda images: images.mean(axis=0)),
+        ("median_sequential", img_loader.COMBINE_MEDIAN, 1, lambda images: np.median(images, axis=0)),
+        ("median_parallel", img_loader.COMBINE_MEDIAN, 4, lambda images: np.median(images, axis=0)),
+    ])
+    def test_combine_files(self, _, method, workers, combine):
+        roi = SensibleROI(1, 0, 6, 3)
+        expected = combine(np.array([_fake_region_load_func(f, roi) for f in self.files]))
+        il = img_loader.ImageLoader(_fake_region_load_func, "tif", (3, 5), np.float32, None, workers=workers)
+
+        # Small enough that the median is found a row at a time
+        with mock.patch("mantidimaging.core.io.loader.img_loader.MEDIAN_BUFFER_BYTES", len(self.files) * 5 * 4):
+            combined = il.combine_files(self.files, method, roi)
+
+        self.assertEqual(np.float32, combined.dtype)
+        npt.assert_allclose(expected, combined)
+
+    def test_combine_files_median_reads_bands(self):
+        load_func = mock.Mock(side_effect=_fake_region_load_func)
+        progress = mock.MagicMock()
+        il = img_loader.ImageLoader(load_func, "tif", IMG_SHAPE, np.float32, None, progress, workers=1)
+
+        with mock.patch("mantidimaging.core.io.loader.img_loader.MEDIAN_BUFFER_BYTES", len(self.files) * 6 * 4 * 2):
+            il.combine_files(self.files, img_loader.COMBINE_MEDIAN, SensibleROI(0, 0, 6, 4))
+
+        self.assertEqual({(0, 0, 6, 2), (0, 2, 6, 4)}, {tuple(c.kwargs["roi"]) for c in load_func.call_args_list})
+        self.assertEqual(2 * len(self.files), progress.update.call_count)
+
+    @parameterized.expand([("fits_in_memory", True, {(0, 0, 6, 4)}), ("too_big", False, {(0, 0, 6, 2), (0, 2, 6, 4)})])
+    def test_combine_files_median_decodes_compressed_files_once(self, _, fits, expected_regions):
+        load_func = mock.Mock(side_effect=_fake_region_load_func)
+        il = img_loader.ImageLoader(load_func, "tif", IMG_SHAPE, np.float32, None, workers=1)
+
+        with mock.patch("mantidimaging.core.io.loader.img_loader.MEDIAN_BUFFER_BYTES", len(self.files) * 6 * 4 * 2), \
+                mock.patch("mantidimaging.core.io.loader.img_loader.memory_budget.fits", return_value=fits):
+            combined = il.combine_files(self.files,
+                                        img_loader.COMBINE_MEDIAN,
+                                        SensibleROI(0, 0, 6, 4),
+                                        decodes_whole_images=True)
+
+        self.assertEqual(expected_regions, {tuple(c.kwargs["roi"]) for c in load_func.call_args_list})
+        npt.assert_allclose(np.median([_fake_region_load_func(f, SensibleROI(0, 0, 6, 4)) for f in self.files], axis=0),
+                            combined)
+
+    def test_combine_files_sigma_clipped_mean_rejects_outliers(self):
+        def load_func(filename, roi):
+            image = np.full(IMG_SHAPE, int(filename.split("_")[1]) % 2, dtype=np.float32)
+            if filename == "file_7":
+                image[1, 2] = 1000
+            return image
+
+        il = img_loader.ImageLoader(load_func, "tif", IMG_SHAPE, np.float32, None, workers=4)
+
+        combined = il.combine_files(self.files, img_loader.COMBINE_SIGMA_CLIPPED_MEAN, SensibleROI(0, 0, 6, 4))
+
+        expected = np.full(IMG_SHAPE, 0.5)
+        expected[1, 2] = 5 / 11
+        npt.assert_allclose(expected, combined, rtol=1e-6)
+
+    def test_combine_files_wrong_shape(self):
+        def load_func(filename, roi):
+            return np.zeros((3, 3)) if filename == "file_5" else _fake_region_load_func(filename, roi)
+
+        il = img_loader.ImageLoader(load_func, "tif", IMG_SHAPE, np.float32, None, workers=1)
+
+        with self.assertRaisesRegex(ValueError, "different width and/or height"):
+            il.combine_files(self.files, img_loader.COMBINE_MEAN, SensibleROI(0, 0, 6, 4))
+
+    @mock.patch("mantidimaging.core.io.loader.img_loader.probe_image")
+    def test_execute_combined(self, probe_image):
+        probe_image.return_value = ImageInfo(IMG_SHAPE, np.dtype(np.float32))
+
+        images = img_loader.execute_combined(_fake_region_load_func, self.files, img_loader.COMBINE_MEAN, np.float32,
+                                             None)
+
+        self.assertEqual((1, ) + IMG_SHAPE, images.data.shape)
+        npt.assert_allclose(np.arange(24).reshape(IMG_SHAPE) + 5.5, images.data[0])
+        self.assertEqual(["file_0"], images.filenames)
+
+    def test_execute_combined_unknown_method(self):
+        with self.assertRaises(ValueError):
+            img_loader.execute_combined(_fake_region_load_func, self.files, "Maximum", np.float32, None)
+
+    def test_execute_passes_workers(self):
+        with mock.patch.object(img_loader.ImageLoader, "_do_files_load_par") as load_par:
+            img_loader.execute(_fake_load_func, self.files, "tif", np.float32, None, workers=3, img_shape=IMG_SHAPE)
+        load_par.assert_called_once()
+
+        with mock.patch.object(img_loader.ImageLoader, "_do_files_load_seq") as load_seq:
+            img_loader.execute(_fake_load_func, self.files, "tif", np.float32, None, workers=1, img_shape=IMG_SHAPE)
+        load_seq.assert_called_once()
+
+    @mock.patch("mantidimaging.core.io.loader.img_loader.probe_image")
+    def test_execute_reads_first_file_once(self, probe_image):
+        probe_image.return_value = ImageInfo(IMG_SHAPE, np.dtype(np.float32))
+        load_func = mock.Mock(side_effect=_fake_load_func)
+
+        images = img_loader.execute(load_func, self.files, "tif", np.float32, None, workers=1)
+
+        probe_image.assert_called_once_with(self.files[0])
+        self.assertEqual(len(self.files), load_func.call_count)
+        self.assertEqual((12, ) + IMG_SHAPE, images.data.shape)
+
+
+if __name__ == "__main__":
+    unittest.main()
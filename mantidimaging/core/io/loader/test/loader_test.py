@@ -10,6 +10,7 @@ from mantidimaging.core.io.filenames import FilenameGroup
 from mantidimaging.core.io.loader.loader import (DEFAULT_PIXEL_DEPTH, DEFAULT_PIXEL_SIZE, DEFAULT_IS_SINOGRAM,
                                                  create_loading_parameters_for_file_path, get_loader, load)
 
+from mantidimaging.core.io.loader.probe import ImageInfo
 from mantidimaging.core.utility.data_containers import FILE_TYPES, ProjectionAngles
 from mantidimaging.core.utility.imat_log_file_parser import IMATLogFile
 from mantidimaging.test_helpers.unit_test_helper import FakeFSTestCase
@@ -64,9 +65,12 @@ class LoaderTest(FakeFSTestCase):
         self._file_in_sequence(Path("/b/180deg/180deg_0000.tif"), sample.file_group.all_files())
         self.assertEqual(1, len(list(sample.file_group.all_files())))
 
+    @mock.patch('mantidimaging.core.io.loader.loader.probe_image')
     @mock.patch('mantidimaging.core.io.loader.loader.load_log')
     @mock.patch('mantidimaging.core.io.loader.loader.img_loader.execute')
-    def test_load_with_golden_angles(self, mock_execute: mock.Mock, mock_load_log: mock.Mock):
+    def test_load_with_golden_angles(self, mock_execute: mock.Mock, mock_load_log: mock.Mock,
+                                     mock_probe_image: mock.Mock):
+        mock_probe_image.return_value = ImageInfo((10, 10), np.dtype(np.float32))
         filenames = [Path(f"foo_{n}.tif") for n in range(20)]
         angles = np.array([(n * 137.507764) % 360 for n in range(20)])
 
@@ -88,3 +92,33 @@ class LoaderTest(FakeFSTestCase):
         self._file_list_count_equal(filenames, reordered_filenames)
         self.assertListEqual(['foo_0.tif', 'foo_8.tif', 'foo_16.tif', 'foo_3.tif', 'foo_11.tif'],
                              reordered_filenames[:5])
+
+    @mock.patch('mantidimaging.core.io.loader.loader.probe_image')
+    @mock.patch('mantidimaging.core.io.loader.loader.load_log')
+    @mock.patch('mantidimaging.core.io.loader.loader.volume_loader.read_volume')
+    def test_load_volume_with_golden_angles(self, mock_read_volume: mock.Mock, mock_load_log: mock.Mock,
+                                            mock_probe_image: mock.Mock):
+        mock_probe_image.return_value = ImageInfo((10, 10), np.dtype(np.float32), pages=20)
+        mock_read_volume.return_value = np.zeros((20, 10, 10))
+        angles = np.array([(n * 137.507764) % 360 for n in range(20)])
+        mock_filename_group = mock.create_autospec(FilenameGroup, metadata_path=None)
+        mock_filename_group.all_files.return_value = [Path("volume.tif")]
+        mock_filename_group.first_file.return_value = Path("volume.tif")
+        mock_load_log.return_value.projection_angles.return_value = ProjectionAngles(np.deg2rad(angles))
+
+        images = load(mock_filename_group, log_file=Path())
+
+        pages = mock_read_volume.call_args[0][1]
+        self.assertListEqual([0, 8, 16, 3, 11], pages[:5])
+        self.assertEqual(20, images.count())
+        self.assertEqual(["volume.tif:0", "volume.tif:8"], (images.filenames or [])[:2])
+
+    @mock.patch('mantidimaging.core.io.loader.loader.probe_image')
+    def test_load_volume_from_several_files(self, mock_probe_image: mock.Mock):
+        mock_probe_image.return_value = ImageInfo((10, 10), np.dtype(np.float32), pages=20)
+        mock_filename_group = mock.create_autospec(FilenameGroup, metadata_path=None)
+        mock_filename_group.all_files.return_value = [Path("volume_0.tif"), Path("volume_1.tif")]
+        mock_filename_group.first_file.return_value = Path("volume_0.tif")
+
+        with self.assertRaisesRegex(ValueError, "Only one file"):
+            load(mock_filename_group)
@@ -0,0 +1,114 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import h5py
+import numpy as np
+import numpy.testing as npt
+from parameterized import parameterized
+
+from mantidimaging.core.io.loader import nexus_loader
+from mantidimaging.core.io.loader.nexus_loader import (ImageKeys, find_recon_entries, image_key_indices,
+                                                       read_image_key_images, read_images, read_recon)
+from mantidimaging.core.utility.data_containers import Indices
+
+IMAGE_KEY = np.array([1, 1, 2, 0, 0, 0, 0, 0, 2, 1])
+
+
+class NexusLoaderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.nexus = h5py.File("data", "w", driver="core", backing_store=False)
+        self.data_array = np.random.random((10, 4, 5))
+        self.data = self.nexus.create_dataset("data", data=self.data_array, chunks=(2, 4, 5))
+
+    def tearDown(self) -> None:
+        self.nexus.close()
+
+    @parameterized.expand([
+        ("projections", ImageKeys.Projections, None, [3, 4, 5, 6, 7]),
+        ("flat_before", ImageKeys.FlatField, True, [0, 1]),
+        ("flat_after", ImageKeys.FlatField, False, [9]),
+        ("dark_before", ImageKeys.DarkField, True, [2]),
+        ("dark_after", ImageKeys.DarkField, False, [8]),
+    ])
+    def test_image_key_indices(self, _, key, before, expected):
+        npt.assert_equal(expected, image_key_indices(IMAGE_KEY, key, before))
+
+    @parameterized.expand([
+        ("contiguous", [2, 3, 4, 5, 6, 7], 4, [(0, 2, 4, 1), (4, 6, 2, 1)]),
+        ("strided", [1, 3, 5, 6, 7], 10, [(0, 1, 3, 2), (3, 6, 2, 1)]),
+        ("single", [4], 10, [(0, 4, 1, 1)]),
+    ])
+    def test_plan_reads(self, _, indices, images_per_read, expected):
+        self.assertEqual(expected, nexus_loader._plan_reads(np.array(indices), images_per_read))
+
+    def test_reads_are_whole_chunks(self):
+        with mock.patch('mantidimaging.core.io.loader.nexus_loader.READ_BYTES', 3 * 4 * 5 * 8):
+            self.assertEqual(2, nexus_loader._images_per_read(self.data, np.dtype(np.float32)))
+
+    @parameterized.expand([
+        ("all", list(range(10))),
+        ("some", [0, 2, 4, 5, 6, 9]),
+    ])
+    def test_read_images(self, _, indices):
+        with mock.patch('mantidimaging.core.io.loader.nexus_loader.READ_BYTES', 2 * 4 * 5 * 8):
+            images = read_images(self.data, np.array(indices), np.float32)
+
+        self.assertEqual(np.float32, images.array.dtype)
+        npt.assert_allclose(self.data_array[indices], images.array, rtol=1e-6)
+
+    def test_read_images_reports_progress(self):
+        progress = mock.MagicMock()
+        with mock.patch('mantidimaging.core.io.loader.nexus_loader.READ_BYTES', 2 * 4 * 5 * 8):
+            read_images(self.data, np.arange(6), progress=progress)
+
+        self.assertEqual(3, progress.update.call_count)
+
+    def test_read_no_images(self):
+        with self.assertRaises(ValueError):
+            read_images(self.data, np.array([], dtype=int))
+
+    def test_read_image_key_images_with_indices(self):
+        images = read_image_key_images(self.data,
+                                       IMAGE_KEY,
+                                       ImageKeys.Projections,
+                                       indices=Indices(1, 5, 2),
+                                       dtype=np.float64)
+
+        npt.assert_equal(self.data_array[[4, 6]], images.array)
+
+    def test_find_and_read_recon_entries(self):
+        recon_array = np.random.random((3, 4, 4)).astype(np.float16)
+        recon_entry = self.nexus.create_group("Recon")
+        recon_entry.create_dataset("definition", data=np.string_("NXtomoproc"))
+        recon_entry.create_dataset("data/data", data=recon_array)
+        self.nexus.create_group("other").create_dataset("definition", data=np.string_("NXtomo"))
+
+        with mock.patch('mantidimaging.core.io.loader.nexus_loader.read_images') as read_images_mock:
+            entries = find_recon_entries(self.nexus)
+        read_images_mock.assert_not_called()
+
+        self.assertEqual(1, len(entries))
+        self.assertEqual(("Recon", "/Recon/data/data", (3, 4, 4), np.float16),
+                         (entries[0].name, entries[0].path, entries[0].shape, entries[0].dtype))
+        npt.assert_equal(recon_array, read_recon(self.nexus, entries[0]).array)
+
+    def test_parallel_read_from_file(self):
+        with TemporaryDirectory() as tmpdir:
+            file_path = Path(tmpdir) / "data.nxs"
+            with h5py.File(file_path, "w") as nexus_file:
+                nexus_file.create_dataset("entry/data", data=self.data_array)
+
+            with h5py.File(file_path, "r") as nexus_file:
+                images = read_images(nexus_file["entry/data"], np.array([1, 2, 3, 7]), np.float64, parallel=True)
+
+        npt.assert_equal(self.data_array[[1, 2, 3, 7]], images.array)
+
+
+if __name__ == "__main__":
+    unittest.main()
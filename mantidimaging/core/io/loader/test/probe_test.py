@@ -0,0 +1,72 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import astropy.io.fits as fits
+import numpy as np
+from parameterized import parameterized
+from tifffile import tifffile
+
+from mantidimaging.core.io.loader.probe import ImageInfo, probe_image
+
+
+class ProbeImageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = TemporaryDirectory()
+        self.path = Path(self.tmpdir.name)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    @parameterized.expand([
+        ("uncompressed", (5, 7), np.uint16, None, ImageInfo((5, 7), np.dtype(np.uint16))),
+        ("compressed", (5, 7), np.float32, "zlib", ImageInfo((5, 7), np.dtype(np.float32), 1, "adobe_deflate")),
+        ("pages", (4, 5, 7), np.uint16, None, ImageInfo((5, 7), np.dtype(np.uint16), 4)),
+    ])
+    def test_tiff(self, _, shape, dtype, compression, expected):
+        file_path = self.path / "image.tif"
+        tifffile.imwrite(file_path, np.ones(shape, dtype), compression=compression)
+
+        with mock.patch("mantidimaging.core.io.loader.probe.tifffile.imread") as imread:
+            info = probe_image(file_path)
+        imread.assert_not_called()
+
+        self.assertEqual(expected, info)
+        self.assertEqual(shape, info.data_shape)
+
+    @parameterized.expand([
+        ("float", (5, 7), np.float32, ImageInfo((5, 7), np.dtype(">f4"))),
+        ("unsigned", (5, 7), np.uint16, ImageInfo((5, 7), np.dtype(np.uint16))),
+        ("cube", (3, 5, 7), np.int16, ImageInfo((5, 7), np.dtype(">i2"), 3)),
+    ])
+    def test_fits(self, _, shape, dtype, expected):
+        file_path = self.path / "image.fits"
+        data = np.ones(shape, dtype)
+        fits.PrimaryHDU(data).writeto(file_path)
+
+        info = probe_image(file_path)
+
+        self.assertEqual(expected, info)
+        self.assertEqual(fits.getdata(file_path).dtype, info.dtype)
+        self.assertEqual(shape, info.data_shape)
+
+    def test_scaled_fits(self):
+        file_path = self.path / "image.fits"
+        hdu = fits.PrimaryHDU(np.ones((5, 7), np.int16))
+        hdu.header["BSCALE"] = 2.0
+        hdu.writeto(file_path)
+
+        self.assertEqual(fits.getdata(file_path).dtype, probe_image(file_path).dtype)
+
+    def test_unsupported_format(self):
+        with self.assertRaises(NotImplementedError):
+            probe_image(self.path / "image.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()
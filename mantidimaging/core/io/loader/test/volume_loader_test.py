@@ -0,0 +1,94 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import astropy.io.fits as fits
+import numpy as np
+import numpy.testing as npt
+import tifffile
+from parameterized import parameterized
+
+from mantidimaging.core.io.loader.volume_loader import read_volume
+from mantidimaging.core.utility.sensible_roi import SensibleROI
+
+PAGES = [5, 1, 2, 7]
+
+
+class VolumeLoaderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmpdir = TemporaryDirectory()
+        self.data = np.random.randint(0, 60000, (8, 6, 10)).astype(np.uint16)
+
+    def tearDown(self) -> None:
+        self.tmpdir.cleanup()
+
+    def _write_tiff(self, **kwargs) -> Path:
+        file_path = Path(self.tmpdir.name) / "volume.tif"
+        tifffile.imwrite(file_path, self.data, **kwargs)
+        return file_path
+
+    @parameterized.expand([
+        ("tiff", {}, True),
+        ("bigtiff", dict(bigtiff=True), True),
+        ("compressed", dict(compression="zlib"), False),
+    ])
+    def test_read_tiff_pages(self, _, kwargs, memory_mapped):
+        file_path = self._write_tiff(**kwargs)
+
+        with mock.patch("mantidimaging.core.io.loader.volume_loader.tifffile.memmap",
+                        side_effect=tifffile.memmap) as memmap:
+            images = read_volume(file_path, PAGES, workers=4)
+
+        self.assertEqual(memory_mapped, memmap.called)
+        self.assertEqual(np.float32, images.array.dtype)
+        npt.assert_equal(self.data[PAGES], images.array)
+
+    @parameterized.expand([("tiff", {}), ("compressed", dict(compression="zlib"))])
+    def test_read_tiff_pages_with_roi_and_binning(self, _, kwargs):
+        file_path = self._write_tiff(**kwargs)
+
+        images = read_volume(file_path, PAGES, roi=SensibleROI(1, 2, 9, 6), binning=2)
+
+        expected = self.data[PAGES, 2:6, 1:9].reshape(4, 2, 2, 4, 2).mean(axis=(2, 4))
+        npt.assert_allclose(expected, images.array)
+
+    def test_compressed_tiff_only_decodes_selected_pages(self):
+        file_path = self._write_tiff(compression="zlib")
+
+        with mock.patch("tifffile.TiffPage.asarray", autospec=True, side_effect=tifffile.TiffPage.asarray) as asarray:
+            read_volume(file_path, PAGES, workers=1)
+
+        self.assertEqual(sorted(PAGES), sorted(call.args[0].index for call in asarray.call_args_list))
+
+    @parameterized.expand([
+        ("unscaled", np.float32, {}),
+        # Unsigned integers are saved as signed integers with BZERO
+        ("scaled", np.uint16, dict(uint=True)),
+    ])
+    def test_read_fits_pages(self, _, file_dtype, kwargs):
+        file_path = Path(self.tmpdir.name) / "volume.fits"
+        fits.PrimaryHDU(self.data.astype(file_dtype), **kwargs).writeto(file_path)
+
+        images = read_volume(file_path, PAGES, dtype=np.uint16, roi=SensibleROI(1, 2, 9, 6), workers=4)
+
+        npt.assert_equal(self.data[PAGES, 2:6, 1:9], images.array)
+
+    def test_read_no_pages(self):
+        with self.assertRaises(ValueError):
+            read_volume(self._write_tiff(), [])
+
+    def test_progress_per_page(self):
+        progress = mock.MagicMock()
+
+        read_volume(self._write_tiff(), PAGES, progress=progress, workers=1)
+
+        self.assertEqual(len(PAGES), progress.update.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
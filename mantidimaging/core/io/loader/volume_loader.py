@@ -0,0 +1,117 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+"""
+This module reads files that hold a stack of images: multi-page TIFF and BigTIFF files, and 3D FITS files
+"""
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence, Union, TYPE_CHECKING
+
+import numpy as np
+import astropy.io.fits as fits
+from tifffile import tifffile
+
+from mantidimaging.core.io.loader import img_loader
+from mantidimaging.core.io.loader.probe import probe_image
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.sensible_roi import SensibleROI
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+    from mantidimaging.core.utility.progress_reporting import Progress
+
+# Reads one page of a file. It can be called from several threads at once.
+PageReader = Callable[[int], np.ndarray]
+
+
+def read_volume(file_path: Union[Path, str],
+                pages: Sequence[int],
+                dtype: 'npt.DTypeLike' = np.float32,
+                roi: Optional[SensibleROI] = None,
+                binning: int = 1,
+                progress: Optional[Progress] = None,
+                workers: int = img_loader.DEFAULT_LOAD_WORKERS) -> pu.SharedArray:
+    """
+    Read pages of a multi-page file straight into a new shared array.
+
+    Uncompressed data that is stored contiguously is memory mapped, so only the selected pages, and only the rows of
+    the region of each page, are read from the file. The pages are copied and converted to dtype on a thread pool.
+    Compressed TIFF pages are decoded on the thread pool. Pages that are not selected are never read.
+
+    :param file_path: The TIFF or FITS file
+    :param pages: The indices of the pages to read, in the order they are put in the stack
+    :param dtype: The data type of the result
+    :param roi: Only read this region of each page
+    :param binning: Average blocks of binning x binning pixels of each page as it is read
+    :param progress: Progress reporting object. It is updated after each page.
+    :param workers: Number of threads used to read the pages
+    :return: The images
+    """
+    if len(pages) == 0:
+        raise ValueError("No images were selected to read")
+    info = probe_image(file_path)
+    if roi is None:
+        roi = SensibleROI(0, 0, info.shape[1], info.shape[0])
+
+    with _open_pages(file_path, pages) as read_page:
+
+        def read_region(page: int) -> np.ndarray:
+            return read_page(page)[roi.top:roi.bottom, roi.left:roi.right]
+
+        il = img_loader.ImageLoader(read_region,
+                                    Path(file_path).suffix.lstrip("."), (roi.height, roi.width), dtype, None, progress,
+                                    workers, binning)
+        return il.load_files(pages)
+
+
+@contextmanager
+def _open_pages(file_path: Union[Path, str], pages: Sequence[int]) -> Iterator[PageReader]:
+    in_format = Path(file_path).suffix.lstrip(".").lower()
+    if in_format in ['fits', 'fit']:
+        with _open_fits_pages(file_path) as reader:
+            yield reader
+    elif in_format in ['tiff', 'tif']:
+        with _open_tiff_pages(file_path, pages) as reader:
+            yield reader
+    else:
+        raise NotImplementedError("Loading not implemented for:", in_format)
+
+
+@contextmanager
+def _open_tiff_pages(file_path: Union[Path, str], pages: Sequence[int]) -> Iterator[PageReader]:
+    with tifffile.TiffFile(file_path) as tif:
+        series = tif.series[0]
+        if series.dataoffset is not None:
+            # Uncompressed and contiguous, e.g. BigTIFF volumes and ImageJ hyperstacks
+            data = tifffile.memmap(file_path, mode='r')
+            yield data.reshape((-1, ) + data.shape[-2:]).__getitem__
+            return
+
+        # The headers of the selected pages are read up front, so the threads only read and decode image data, with
+        # the file reads synchronised by the lock of the file handle
+        tif.filehandle.set_lock(True)
+        tiff_pages = {page: tif.pages[page] for page in pages}
+
+        def read_page(page: int) -> np.ndarray:
+            return tiff_pages[page].asarray()  # type: ignore[union-attr]
+
+        yield read_page
+
+
+@contextmanager
+def _open_fits_pages(file_path: Union[Path, str]) -> Iterator[PageReader]:
+    # The loader reads the primary HDU. The raw data is memory mapped and scaled a page at a time, so that astropy
+    # doesn't scale the whole volume when the data is accessed.
+    with fits.open(file_path, memmap=True, do_not_scale_image_data=True) as hdul:
+        hdu = hdul[0]
+        data = hdu.data.reshape((-1, ) + hdu.data.shape[-2:])
+        bscale, bzero = hdu.header.get("BSCALE", 1), hdu.header.get("BZERO", 0)
+        if bscale == 1 and bzero == 0:
+            yield data.__getitem__
+            return
+
+        def read_page(page: int) -> np.ndarray:
+            return data[page] * np.float64(bscale) + np.float64(bzero)
+
+        yield read_page
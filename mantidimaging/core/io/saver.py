@@ -2,7 +2,11 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 import datetime
+import itertools
 import os
+import threading
+import zlib
+from dataclasses import dataclass
 from logging import getLogger
 from typing import List, Union, Optional, Dict, Callable, Tuple, TYPE_CHECKING
 
@@ -15,10 +19,12 @@ import astropy.io.fits as fits
 
 from .utility import DEFAULT_IO_FILE_FORMAT, NEXUS_PROCESSED_DATA_PATH
 from ..operations.rescale import RescaleFilter
+from ..parallel import manager as pm
 from ..utility.progress_reporting import Progress
 from ..utility.version_check import CheckVersion
 
 if TYPE_CHECKING:
+    import numpy.typing as npt
     from ..data.dataset import StrictDataset
     from ..data.imagestack import ImageStack
     from ..utility.data_containers import Indices
@@ -30,9 +36,28 @@ DEFAULT_NAME_PREFIX = 'image'
 DEFAULT_NAME_POSTFIX = ''
 INT16_SIZE = 65536
 
+# Size of the slabs of images written to NeXus files. Only one slab at a time is converted to the saved data type and
+# compressed, so this bounds the memory used for saving.
+NEXUS_SLAB_BYTES = 64 * 1024 * 1024
+NEXUS_DTYPE = np.float32
+
 package_version = CheckVersion().get_version()
 
 
+@dataclass
+class NexusSaveOptions:
+    """
+    Storage options for the image and reconstruction datasets in NeXus files
+    """
+    # Shape of the HDF5 chunks, limited to the shape of each dataset. None gives one image per chunk.
+    chunks: Optional[Tuple[int, int, int]] = None
+    # Lossless compression: "gzip", "lzf" or None. gzip chunks are compressed in parallel.
+    compression: Optional[str] = None
+    compression_level: int = 4
+    # Shuffle the bytes of each chunk before compressing it, which usually compresses floating point data better
+    shuffle: bool = True
+
+
 def write_fits(data: np.ndarray, filename: str, overwrite: bool = False, description: Optional[str] = ""):
     hdu = fits.PrimaryHDU(data)
     hdulist = fits.HDUList([hdu])
@@ -112,8 +137,7 @@ def image_save(images: ImageStack,
     make_dirs_if_needed(output_dir, overwrite_all)
 
     # Define current parameters
-    min_value: float = np.nanmin(images.data)
-    max_value: float = np.nanmax(images.data)
+    min_value, max_value = _nan_min_max(images.data)
     int_16_slope = max_value / INT16_SIZE
 
     # Do rescale if needed.
@@ -157,52 +181,99 @@ def image_save(images: ImageStack,
         for i in range(len(names)):
             names[i] = os.path.join(output_dir, names[i])
 
+        buffers = threading.local()
+
+        def save_image(idx: int) -> None:
+            if progress.should_cancel:
+                return
+            if pixel_depth == "int16":
+                # Each thread rescales into its own buffers, which are reused for all the images it saves
+                if not hasattr(buffers, "rescaled"):
+                    buffers.rescaled = np.empty(data.shape[1:], data.dtype)
+                    buffers.output = np.empty(data.shape[1:], np.uint16)
+                buffers.rescaled[:] = data[idx]
+                RescaleFilter.filter_array(buffers.rescaled,
+                                           min_input=min_value,
+                                           max_input=max_value,
+                                           max_output=INT16_SIZE - 1)
+                np.copyto(buffers.output, buffers.rescaled, casting="unsafe")
+                write_func(buffers.output, names[idx], overwrite_all, rescale_info)
+            else:
+                write_func(data[idx, :, :], names[idx], overwrite_all, rescale_info)
+
+        # Images are converted and written on the thread pool, so that encoding overlaps with writing to disk
         with progress:
-            for idx in range(num_images):
-                # Overwrite images with the copy that has been rescaled.
-                if pixel_depth == "int16":
-                    output_data = RescaleFilter.filter_array(np.copy(images.data[idx]),
-                                                             min_input=min_value,
-                                                             max_input=max_value,
-                                                             max_output=INT16_SIZE - 1).astype(np.uint16)
-                    write_func(output_data, names[idx], overwrite_all, rescale_info)
-                else:
-                    write_func(data[idx, :, :], names[idx], overwrite_all, rescale_info)
-
+            for _ in pm.get_thread_pool().imap_unordered(save_image, range(num_images)):
                 progress.update(msg='Image')
 
         return names
 
 
-def nexus_save(dataset: StrictDataset, path: str, sample_name: str):
+def _nan_min_max(data: np.ndarray) -> Tuple[float, float]:
     """
-    Uses information from a StrictDataset to create a NeXus file.
+    Find the minimum and maximum of the data, ignoring NaNs, with one pass over each image on the thread pool.
+    """
+    def image_min_max(idx: int) -> Tuple[float, float]:
+        # fmin and fmax ignore NaNs without warning about images that are all NaN
+        return np.fmin.reduce(data[idx], axis=None), np.fmax.reduce(data[idx], axis=None)
+
+    minima, maxima = zip(*pm.get_thread_pool().map(image_min_max, range(data.shape[0])))
+    return np.fmin.reduce(minima), np.fmax.reduce(maxima)
+
+
+def nexus_save(dataset: StrictDataset,
+               path: str,
+               sample_name: str,
+               options: Optional[NexusSaveOptions] = None,
+               progress: Optional[Progress] = None):
+    """
+    Uses information from a StrictDataset to create a NeXus file. The images are written to the file a slab at a
+    time, so the memory used doesn't grow with the size of the dataset.
     :param dataset: The dataset to save as a NeXus file.
     :param path: The NeXus file path.
     :param sample_name: The sample name.
+    :param options: The chunking and compression of the image datasets.
+    :param progress: The progress reporting instance.
     """
     try:
-        nexus_file = h5py.File(path, "w", driver="core")
+        nexus_file = h5py.File(path, "w")
     except OSError as e:
         raise RuntimeError("Unable to save NeXus file. " + str(e))
 
+    saved = False
     try:
-        _nexus_save(nexus_file, dataset, sample_name)
+        _nexus_save(nexus_file, dataset, sample_name, options, progress)
+        saved = True
     except OSError as e:
-        nexus_file.close()
-        os.remove(path)
         raise RuntimeError("Unable to save NeXus file. " + str(e))
-
-    nexus_file.close()
+    finally:
+        nexus_file.close()
+        if not saved:
+            # Don't leave a partial file behind, whether the save failed or was cancelled
+            os.remove(path)
 
 
-def _nexus_save(nexus_file: h5py.File, dataset: StrictDataset, sample_name: str):
+def _nexus_save(nexus_file: h5py.File,
+                dataset: StrictDataset,
+                sample_name: str,
+                options: Optional[NexusSaveOptions] = None,
+                progress: Optional[Progress] = None):
     """
     Takes a NeXus file and writes the StrictDataset information to it.
     :param nexus_file: The NeXus file.
     :param dataset: The StrictDataset.
     :param sample_name: The sample name.
+    :param options: The chunking and compression of the image datasets.
+    :param progress: The progress reporting instance.
     """
+    options = options if options is not None else NexusSaveOptions()
+    progress = Progress.ensure_instance(progress, task_name='Save NeXus')
+    with progress:
+        _write_nexus_entries(nexus_file, dataset, sample_name, options, progress)
+
+
+def _write_nexus_entries(nexus_file: h5py.File, dataset: StrictDataset, sample_name: str, options: NexusSaveOptions,
+                         progress: Progress):
     # Top-level group
     entry = nexus_file.create_group("entry1")
     _set_nx_class(entry, "NXentry")
@@ -233,9 +304,9 @@ def _nexus_save(nexus_file: h5py.File, dataset: StrictDataset, sample_name: str)
     rotation_angle.attrs["units"] = "rad"
 
     if dataset.is_processed:
-        _save_processed_data_to_nexus(nexus_file, dataset, rotation_angle, detector["image_key"])
+        _save_processed_data_to_nexus(nexus_file, dataset, rotation_angle, detector["image_key"], options, progress)
     else:
-        _save_image_stacks_to_nexus(dataset, detector)
+        _save_image_stacks_to_nexus(dataset, detector, options, progress)
 
     # data field
     data = tomo_entry.create_group("data")
@@ -245,16 +316,20 @@ def _nexus_save(nexus_file: h5py.File, dataset: StrictDataset, sample_name: str)
 
     for recon in dataset.recons:
         assert dataset.sample.filenames is not None
-        _save_recon_to_nexus(nexus_file, recon, dataset.sample.filenames[0])
+        _save_recon_to_nexus(nexus_file, recon, dataset.sample.filenames[0], options, progress)
 
 
-def _save_processed_data_to_nexus(nexus_file: h5py.File, dataset: StrictDataset, rotation_angle: h5py.Dataset,
-                                  image_key: h5py.Dataset):
+def _save_processed_data_to_nexus(nexus_file: h5py.File,
+                                  dataset: StrictDataset,
+                                  rotation_angle: h5py.Dataset,
+                                  image_key: h5py.Dataset,
+                                  options: Optional[NexusSaveOptions] = None,
+                                  progress: Optional[Progress] = None):
     data = nexus_file.create_group(NEXUS_PROCESSED_DATA_PATH)
     data["rotation_angle"] = rotation_angle
     data["image_key"] = image_key
     _set_nx_class(data, "NXdata")
-    _save_image_stacks_to_nexus(dataset, data)
+    _save_image_stacks_to_nexus(dataset, data, options, progress)
 
     process = data.create_group("process")
     _set_nx_class(process, "NXprocess")
@@ -263,20 +338,103 @@ def _save_processed_data_to_nexus(nexus_file: h5py.File, dataset: StrictDataset,
     process.create_dataset("version", data=np.string_(package_version))
 
 
-def _save_image_stacks_to_nexus(dataset: StrictDataset, data_group: h5py.Group):
-    combined_data_shape = (sum([len(arr) for arr in dataset.nexus_arrays]), ) + dataset.nexus_arrays[0].shape[1:]
-    data_group.create_dataset("data", shape=combined_data_shape, dtype="float32")
-    index = 0
-    for arr in dataset.nexus_arrays:
-        data_group["data"][index:index + arr.shape[0]] = arr
-        index += arr.shape[0]
+def _save_image_stacks_to_nexus(dataset: StrictDataset,
+                                data_group: h5py.Group,
+                                options: Optional[NexusSaveOptions] = None,
+                                progress: Optional[Progress] = None):
+    _write_images_dataset(data_group, "data", dataset.nexus_arrays, options, progress)
 
 
-def _save_recon_to_nexus(nexus_file: h5py.File, recon: ImageStack, sample_path: str):
+def _write_images_dataset(group: h5py.Group,
+                          name: str,
+                          arrays: List[np.ndarray],
+                          options: Optional[NexusSaveOptions] = None,
+                          progress: Optional[Progress] = None,
+                          dtype: 'npt.DTypeLike' = NEXUS_DTYPE) -> h5py.Dataset:
+    """
+    Create a chunked dataset for a stack of images and write the arrays into it one after the other, a slab of whole
+    chunks at a time. With gzip compression the chunks of each slab are compressed in parallel and written directly to
+    the file. Other compression is done by HDF5 as each slab is written.
+    :param group: The group to create the dataset in.
+    :param name: The name of the dataset.
+    :param arrays: The images to write, joined along the first axis.
+    :param options: The chunking and compression of the dataset.
+    :param progress: The progress reporting instance. It is updated after each slab.
+    :param dtype: The data type of the dataset.
+    :return: The dataset.
+    """
+    options = options if options is not None else NexusSaveOptions()
+    progress = Progress.ensure_instance(progress, task_name='Save NeXus')
+    shape = (sum(len(arr) for arr in arrays), ) + arrays[0].shape[1:]
+    chunks = tuple(max(1, min(chunk, extent)) for chunk, extent in zip(options.chunks or (1, ) + shape[1:], shape))
+    compressed = options.compression is not None
+    dataset = group.create_dataset(
+        name,
+        shape=shape,
+        dtype=dtype,
+        chunks=chunks,
+        compression=options.compression,
+        compression_opts=options.compression_level if options.compression == "gzip" else None,
+        shuffle=options.shuffle and compressed)
+
+    # Each slab is a whole number of layers of chunks, so gzip chunks never straddle two slabs
+    chunks_per_layer = int(np.prod([-(-extent // chunk) for extent, chunk in zip(shape[1:], chunks[1:])]))
+    layer_bytes = chunks_per_layer * int(np.prod(chunks)) * np.dtype(dtype).itemsize
+    slab_images = max(1, NEXUS_SLAB_BYTES // layer_bytes) * chunks[0]
+    slab_starts = range(0, shape[0], slab_images)
+    progress.add_estimated_steps(len(slab_starts))
+    offsets = np.cumsum([0] + [len(arr) for arr in arrays])
+    for start in slab_starts:
+        stop = min(start + slab_images, shape[0])
+        slab = np.empty((stop - start, ) + shape[1:], dtype)
+        for arr, arr_start in zip(arrays, offsets):
+            first, last = max(start, arr_start), min(stop, arr_start + len(arr))
+            if first < last:
+                slab[first - start:last - start] = arr[first - arr_start:last - arr_start]
+
+        if options.compression == "gzip":
+            _write_deflated_chunks(dataset, slab, start, options)
+        else:
+            dataset[start:stop] = slab
+        progress.update(msg=f"Saving {group.name}/{name}")
+    return dataset
+
+
+def _write_deflated_chunks(dataset: h5py.Dataset, slab: np.ndarray, start: int, options: NexusSaveOptions):
+    """
+    Compress the chunks of a slab on the thread pool, and write them straight into the file, bypassing the HDF5
+    filter pipeline. zlib releases the GIL while it compresses, so the chunks are compressed in parallel.
+    """
+    chunks = dataset.chunks
+    origins = list(itertools.product(*(range(0, extent, chunk) for extent, chunk in zip(slab.shape, chunks))))
+
+    def deflate(origin: Tuple[int, ...]) -> bytes:
+        block = slab[tuple(slice(o, o + chunk) for o, chunk in zip(origin, chunks))]
+        if block.shape != chunks:
+            # Edge chunks are stored at full size
+            padded = np.zeros(chunks, slab.dtype)
+            padded[tuple(slice(0, extent) for extent in block.shape)] = block
+            block = padded
+        block = np.ascontiguousarray(block)
+        if options.shuffle:
+            block = np.ascontiguousarray(block.view(np.uint8).reshape(-1, block.itemsize).T)
+        return zlib.compress(block.data, options.compression_level)
+
+    for origin, data in zip(origins, pm.get_thread_pool().imap(deflate, origins)):
+        dataset.id.write_direct_chunk((start + origin[0], ) + origin[1:], data)
+
+
+def _save_recon_to_nexus(nexus_file: h5py.File,
+                         recon: ImageStack,
+                         sample_path: str,
+                         options: Optional[NexusSaveOptions] = None,
+                         progress: Optional[Progress] = None):
     """
     Saves a recon to a NeXus file.
     :param nexus_file: The NeXus file.
     :param recon: The recon data.
+    :param options: The chunking and compression of the recon dataset.
+    :param progress: The progress reporting instance.
     """
     recon_entry = nexus_file.create_group(recon.name)
     _set_nx_class(recon_entry, "NXentry")
@@ -314,8 +472,7 @@ def _save_recon_to_nexus(nexus_file: h5py.File, recon: ImageStack, sample_path:
     data = recon_entry.create_group("data")
     _set_nx_class(data, "NXdata")
 
-    data.create_dataset("data", shape=recon.data.shape, dtype="float32")
-    data["data"][:] = recon.data
+    _write_images_dataset(data, "data", [recon.data], options, progress)
 
     x_arr, y_arr, z_arr = _create_pixel_size_arrays(recon)
     data.create_dataset("x", shape=x_arr.shape, dtype="float16", data=x_arr)
@@ -0,0 +1,261 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+"""
+This module saves the datasets open in Mantid Imaging to a session file, and reopens them.
+
+A session is an HDF5 file. Each dataset is a group under /datasets, and each of its stacks is a group holding the
+images, the filenames, the projection angles and the metadata, including the operation history. The images are stored
+in their own data type, either uncompressed and contiguous, so that they can be memory mapped when the session is
+reopened, or as gzip compressed chunks of one image each, which are compressed and decompressed in parallel.
+"""
+import itertools
+import json
+import os
+import zlib
+from logging import getLogger
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import h5py
+import numpy as np
+
+from mantidimaging.core.data import ImageStack
+from mantidimaging.core.data.dataset import MixedDataset, StrictDataset
+from mantidimaging.core.io import saver
+from mantidimaging.core.parallel import manager as pm
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.data_containers import Indices, ProjectionAngles
+from mantidimaging.core.utility.progress_reporting import Progress
+
+LOG = getLogger(__name__)
+
+SESSION_EXT = ".mis"
+SESSION_FORMAT = "mantidimaging-session"
+SESSION_VERSION = 1
+
+# Fast gzip compression. The bytes of the images are shuffled first, which does most of the work for floating point
+# data.
+SESSION_COMPRESSION_LEVEL = 1
+
+# The roles of the stacks of a dataset
+SAMPLE = "sample"
+PROJ_180 = "proj180deg"
+STRICT_STACKS = [SAMPLE, "flat_before", "flat_after", "dark_before", "dark_after"]
+SINOGRAMS = "sinograms"
+RECON = "recon"
+STACK = "stack"
+
+Dataset = Union[StrictDataset, MixedDataset]
+
+
+def save_session(datasets: List[Dataset],
+                 path: Union[Path, str],
+                 compress: bool = False,
+                 progress: Optional[Progress] = None):
+    """
+    Save datasets to a session file.
+
+    The file is written next to the destination and renamed over it when it is complete, so a failed save leaves the
+    old file as it was. Stacks that are memory mapped from the file being overwritten are copied into memory first, as
+    on Windows a file can't be replaced while it is mapped.
+
+    :param datasets: The datasets to save.
+    :param path: The session file.
+    :param compress: Compress the images. Compressed sessions are read into memory when they are reopened, while
+                     uncompressed sessions are memory mapped.
+    :param progress: The progress reporting instance.
+    """
+    progress = Progress.ensure_instance(progress, task_name="Save session")
+    path = Path(path)
+    temp_path = path.with_name(path.name + ".part")
+    with progress:
+        for dataset in datasets:
+            for _, stack in _dataset_stacks(dataset):
+                if _is_mapped_from(stack.data, path):
+                    stack.shared_array = pu.copy_into_shared_memory(stack.data)
+        try:
+            with h5py.File(temp_path, "w") as session_file:
+                session_file.attrs["format"] = SESSION_FORMAT
+                session_file.attrs["version"] = SESSION_VERSION
+                session_file.attrs["program_version"] = saver.package_version
+                datasets_group = session_file.create_group("datasets")
+                for i, dataset in enumerate(datasets):
+                    _write_dataset(datasets_group.create_group(str(i)), dataset, compress, progress)
+            try:
+                os.replace(temp_path, path)
+            except PermissionError as e:
+                raise RuntimeError(f"Could not replace {path}, it is open in another program") from e
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+
+def _is_mapped_from(array: np.ndarray, path: Path) -> bool:
+    filename = getattr(array, "filename", None)
+    return filename is not None and path.exists() and os.path.samefile(filename, path)
+
+
+def load_session(path: Union[Path, str], progress: Optional[Progress] = None) -> List[Dataset]:
+    """
+    Reopen the datasets saved in a session file.
+
+    The images of uncompressed sessions are memory mapped copy-on-write, so they are read from the file as they are
+    used, and changing them never changes the file. Compressed images are decompressed in parallel into shared memory.
+
+    :param path: The session file.
+    :param progress: The progress reporting instance. It is updated after each stack.
+    :return: The datasets, in the order they were saved.
+    """
+    progress = Progress.ensure_instance(progress, task_name="Open session")
+    with progress, h5py.File(path, "r") as session_file:
+        if session_file.attrs.get("format") != SESSION_FORMAT:
+            raise RuntimeError(f"{path} is not a Mantid Imaging session file")
+        if session_file.attrs["version"] > SESSION_VERSION:
+            raise RuntimeError(f"{path} was saved by a newer version of Mantid Imaging "
+                               f"({session_file.attrs.get('program_version')})")
+
+        datasets_group = session_file["datasets"]
+        dataset_groups = [datasets_group[key] for key in sorted(datasets_group, key=int)]
+        progress.set_estimated_steps(sum(len(group) for group in dataset_groups))
+        return [_read_dataset(group, Path(path), progress) for group in dataset_groups]
+
+
+def _dataset_stacks(dataset: Dataset) -> List[Tuple[str, ImageStack]]:
+    if isinstance(dataset, StrictDataset):
+        stacks = [(role, getattr(dataset, role)) for role in STRICT_STACKS + [PROJ_180]]
+    else:
+        other_ids = set(dataset.recons.ids)
+        if dataset.sinograms is not None:
+            other_ids.add(dataset.sinograms.id)
+        stacks = [(STACK, stack) for stack in dataset.all if stack.id not in other_ids]
+    stacks.append((SINOGRAMS, dataset.sinograms))
+    stacks += [(RECON, recon) for recon in dataset.recons]
+    return [(role, stack) for role, stack in stacks if stack is not None]
+
+
+def _write_dataset(group: h5py.Group, dataset: Dataset, compress: bool, progress: Progress):
+    group.attrs["kind"] = "strict" if isinstance(dataset, StrictDataset) else "mixed"
+    group.attrs["name"] = dataset.name
+    for i, (role, stack) in enumerate(_dataset_stacks(dataset)):
+        _write_stack(group.create_group(str(i)), role, stack, compress, progress)
+
+
+def _write_stack(group: h5py.Group, role: str, stack: ImageStack, compress: bool, progress: Progress):
+    group.attrs["role"] = role
+    group.attrs["name"] = stack.name
+    group.attrs["sinograms"] = stack.is_sinograms
+    group.attrs["metadata"] = json.dumps(stack.metadata)
+    if isinstance(stack.indices, tuple):
+        group.attrs["index_range"] = list(stack.indices)
+    elif stack.indices is not None:
+        group.create_dataset("indices", data=np.asarray(stack.indices, dtype=np.int64))
+    if stack.filenames is not None:
+        group.create_dataset("filenames", data=stack.filenames, dtype=h5py.string_dtype())
+    angles = stack.real_projection_angles()
+    if angles is not None:
+        group.create_dataset("projection_angles", data=angles.value)
+
+    if compress:
+        options = saver.NexusSaveOptions(compression="gzip", compression_level=SESSION_COMPRESSION_LEVEL, shuffle=True)
+        saver._write_images_dataset(group, "data", [stack.data], options, progress, stack.data.dtype)
+    else:
+        _write_contiguous_images(group, "data", stack.data, progress)
+
+
+def _write_contiguous_images(group: h5py.Group, name: str, data: np.ndarray, progress: Progress):
+    """
+    Write images into a contiguous dataset, so that it can be memory mapped. The images are written a slab at a time,
+    which keeps stacks that are themselves memory mapped from being read into memory all at once.
+    """
+    dataset = group.create_dataset(name, shape=data.shape, dtype=data.dtype)
+    image_bytes = max(1, int(np.prod(data.shape[1:])) * data.dtype.itemsize)
+    slab_images = max(1, saver.NEXUS_SLAB_BYTES // image_bytes)
+    slab_starts = range(0, data.shape[0], slab_images)
+    progress.add_estimated_steps(len(slab_starts))
+    for start in slab_starts:
+        dataset[start:start + slab_images] = data[start:start + slab_images]
+        progress.update(msg=f"Saving {dataset.name}")
+
+
+def _read_dataset(group: h5py.Group, path: Path, progress: Progress) -> Dataset:
+    stacks = [_read_stack(group[key], path, progress) for key in sorted(group, key=int)]
+    roles = [group[key].attrs["role"] for key in sorted(group, key=int)]
+    dataset: Dataset
+    if group.attrs["kind"] == "strict":
+        strict_stacks = {role: stack for role, stack in zip(roles, stacks) if role in STRICT_STACKS}
+        dataset = StrictDataset(**strict_stacks, name=group.attrs["name"])
+        if PROJ_180 in roles:
+            dataset.proj180deg = stacks[roles.index(PROJ_180)]
+    else:
+        dataset = MixedDataset([stack for role, stack in zip(roles, stacks) if role == STACK], group.attrs["name"])
+
+    if SINOGRAMS in roles:
+        dataset.sinograms = stacks[roles.index(SINOGRAMS)]
+    for role, stack in zip(roles, stacks):
+        if role == RECON:
+            dataset.add_recon(stack)
+    return dataset
+
+
+def _read_stack(group: h5py.Group, path: Path, progress: Progress) -> ImageStack:
+    if "index_range" in group.attrs:
+        indices: Union[List[int], Indices, None] = Indices(*(int(i) for i in group.attrs["index_range"]))
+    elif "indices" in group:
+        indices = group["indices"][()].tolist()
+    else:
+        indices = None
+    filenames = [name.decode() for name in group["filenames"][()]] if "filenames" in group else None
+
+    stack = ImageStack(_read_images(group["data"], path),
+                       filenames,
+                       indices,
+                       json.loads(group.attrs["metadata"]),
+                       sinograms=bool(group.attrs["sinograms"]),
+                       name=group.attrs["name"])
+    if "projection_angles" in group:
+        stack.set_projection_angles(ProjectionAngles(group["projection_angles"][()]))
+    progress.update(msg=f"Opening {stack.name}")
+    return stack
+
+
+def _read_images(dataset: h5py.Dataset, path: Path) -> pu.SharedArray:
+    offset = dataset.id.get_offset()
+    if dataset.chunks is None and offset is not None:
+        # Copy-on-write, so processing the stack in place never changes the session file. Other processes can't see
+        # the changes to a private mapping, so the stack is copied into shared memory when it is processed by them.
+        array = np.memmap(path, dtype=dataset.dtype, mode="c", offset=offset, shape=dataset.shape)
+        return pu.SharedArray(array, None, copy_to_share=True)
+
+    images = pu.create_array(dataset.shape, dataset.dtype)
+    if dataset.compression == "gzip" and not dataset.fletcher32 and dataset.scaleoffset is None:
+        _read_deflated_chunks(dataset, images.array)
+    elif images.array.size > 0:
+        dataset.read_direct(images.array)
+    return images
+
+
+def _read_deflated_chunks(dataset: h5py.Dataset, out: np.ndarray):
+    """
+    Read the chunks of a gzip compressed dataset straight from the file, and decompress and unshuffle them on the
+    thread pool. This mirrors the parallel compression in the saver. zlib releases the GIL while it decompresses, so
+    the chunks are decompressed in parallel.
+    """
+    chunks = dataset.chunks
+    origins = list(itertools.product(*(range(0, extent, chunk) for extent, chunk in zip(dataset.shape, chunks))))
+
+    def inflate(origin: Tuple[int, ...]):
+        region = tuple(slice(o, min(o + chunk, extent)) for o, chunk, extent in zip(origin, chunks, dataset.shape))
+        filter_mask, raw = dataset.id.read_direct_chunk(origin)
+        if filter_mask != 0:
+            # A filter was skipped when the chunk was written, so let HDF5 decode it
+            out[region] = dataset[region]
+            return
+        block = np.frombuffer(zlib.decompress(raw), np.uint8)
+        if dataset.shuffle:
+            block = np.ascontiguousarray(block.reshape(out.itemsize, -1).T)
+        block = block.view(out.dtype).reshape(chunks)
+        out[region] = block[tuple(slice(0, r.stop - r.start) for r in region)]
+
+    for _ in pm.get_thread_pool().imap(inflate, origins):
+        pass
@@ -2,13 +2,15 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import os
 from pathlib import Path
 import unittest
+from unittest import mock
 
 from parameterized import parameterized
 
 from mantidimaging.test_helpers.unit_test_helper import FakeFSTestCase
-from ..filenames import FilenameGroup, FilenamePattern, FilenamePatternGolden
+from ..filenames import (DirectoryIndex, FilenameGroup, FilenamePattern, FilenamePatternGolden, get_directory_index)
 from ...utility.data_containers import FILE_TYPES
 
 
@@ -234,3 +236,63 @@ class GoldenFilenameGroupTest(FakeFSTestCase):
         group.find_all_files()
 
         self._file_list_count_equal(filenames, group.all_files())
+
+
+class DirectoryIndexTest(FakeFSTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = Path("/a", "Tomo")
+        for i in range(5):
+            self.fs.create_file(self.directory / f"IMAT_Tomo_{i:04d}.tif")
+        self.fs.create_file(self.directory / "IMAT_Tomo.json")
+        self.fs.create_file(self.directory / "IMAT_Flat_0000.tif")
+        self.fs.create_file(self.directory / "notes")
+
+    def _age_directory(self) -> None:
+        os.utime(self.directory, ns=(0, 0))
+
+    def test_candidates_are_grouped_by_pattern(self):
+        index = DirectoryIndex(self.directory)
+
+        self.assertEqual(8, len(index.names))
+        self.assertCountEqual([f"IMAT_Tomo_{i:04d}.tif" for i in range(5)],
+                              index.candidates(FilenamePattern.from_name("IMAT_Tomo_0000.tif")))
+        self.assertEqual([], index.candidates(FilenamePattern.from_name("other_0000.tif")))
+        # Golden ratio patterns aren't grouped
+        self.assertEqual(index.names,
+                         index.candidates(FilenamePatternGolden.from_name("IMAT_Tomo_GRtomo_1.0_0000.tif")))
+
+    def test_indexes_kept_for_pattern(self):
+        index = DirectoryIndex(self.directory)
+        pattern = FilenamePattern.from_name("IMAT_Tomo_0000.tif")
+        self.assertEqual(list(range(5)), index.indexes(pattern))
+
+        with mock.patch.object(pattern, "match") as match:
+            self.assertEqual(list(range(5)), index.indexes(FilenamePattern.from_name("IMAT_Tomo_0003.tif")))
+        match.assert_not_called()
+
+    def test_index_reused_when_directory_unchanged(self):
+        self._age_directory()
+        index = get_directory_index(self.directory)
+
+        with mock.patch("mantidimaging.core.io.filenames.os.scandir") as scandir:
+            self.assertIs(index, get_directory_index(self.directory))
+        scandir.assert_not_called()
+
+    def test_index_rebuilt_when_directory_changes(self):
+        self._age_directory()
+        get_directory_index(self.directory)
+
+        self.fs.create_file(self.directory / "IMAT_Tomo_0005.tif")
+        # The fake file system doesn't update the time of the directory
+        os.utime(self.directory)
+        fg = FilenameGroup.from_file(self.directory / "IMAT_Tomo_0000.tif")
+        fg.find_all_files()
+
+        self.assertEqual(list(range(6)), fg.all_indexes)
+        self._files_equal(self.directory / "IMAT_Tomo.json", fg.metadata_path)
+
+    def test_recently_changed_directory_not_reused(self):
+        index = get_directory_index(self.directory)
+
+        self.assertIsNot(index, get_directory_index(self.directory))
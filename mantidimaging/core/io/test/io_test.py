@@ -2,25 +2,34 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 import datetime
+import json
 import os
 import unittest
 from pathlib import Path
 from unittest import mock
 
+import astropy.io.fits as fits
 import h5py
 import numpy as np
 import numpy.testing as npt
+import tifffile
+from parameterized import parameterized
 
 from mantidimaging.core.io.filenames import FilenameGroup
 from mantidimaging.core.io.utility import NEXUS_PROCESSED_DATA_PATH
-from mantidimaging.core.operation_history.const import TIMESTAMP
+from mantidimaging.core.operation_history.const import (OPERATION_HISTORY, OPERATION_KEYWORD_ARGS, OPERATION_NAME,
+                                                        RESCALED, TIMESTAMP)
+from mantidimaging.core.operations.rescale import RescaleFilter
 
 import mantidimaging.test_helpers.unit_test_helper as th
 from mantidimaging.core.data import ImageStack
 from mantidimaging.core.data.dataset import StrictDataset
 from mantidimaging.core.io import loader
 from mantidimaging.core.io import saver
-from mantidimaging.core.io.saver import _rescale_recon_data, _save_recon_to_nexus, _save_processed_data_to_nexus
+from mantidimaging.core.io.saver import (NexusSaveOptions, _rescale_recon_data, _save_recon_to_nexus,
+                                         _save_processed_data_to_nexus, _write_images_dataset)
+from mantidimaging.core.utility.progress_reporting import Progress
+from mantidimaging.core.utility.sensible_roi import SensibleROI
 from mantidimaging.core.utility.version_check import CheckVersion
 from mantidimaging.helper import initialise_logging
 from mantidimaging.test_helpers import FileOutputtingTestCase
@@ -184,6 +193,72 @@ class IOTest(FileOutputtingTestCase):
 
         npt.assert_equal(loaded_images.data, images.data)
 
+    @parameterized.expand([
+        ("tiff", "tiff", None),
+        ("compressed_tiff", "tiff", "zlib"),
+        ("fits", "fits", None),
+    ])
+    def test_load_with_roi_and_binning(self, _, img_format, compression):
+        data = np.random.randint(0, 1000, (3, 12, 14)).astype(np.uint16)
+        for idx, image in enumerate(data):
+            filename = os.path.join(self.output_directory, f"image_{idx:06d}.{img_format}")
+            if img_format == "fits":
+                fits.PrimaryHDU(image).writeto(filename)
+            else:
+                tifffile.imwrite(filename, image, compression=compression)
+        group = FilenameGroup.from_file(Path(self.output_directory) / f"image_000000.{img_format}")
+        group.find_all_files()
+        roi = SensibleROI(2, 1, 13, 10)
+
+        loaded_images = loader.load(group, roi=roi, binning=2)
+
+        expected = data[:, 1:9, 2:12].reshape(3, 4, 2, 5, 2).mean(axis=(2, 4))
+        npt.assert_allclose(expected, loaded_images.data)
+        history = loaded_images.metadata[OPERATION_HISTORY]
+        self.assertEqual(["CropCoordinatesFilter", "RebinFilter"], [op[OPERATION_NAME] for op in history])
+        self.assertEqual(list(roi), history[0][OPERATION_KEYWORD_ARGS]["region_of_interest"])
+        self.assertEqual(0.5, history[1][OPERATION_KEYWORD_ARGS]["rebin_param"])
+
+    @parameterized.expand([
+        ("mean", "Mean", lambda images: images.mean(axis=0)),
+        ("median", "Median", lambda images: np.median(images, axis=0)),
+    ])
+    def test_load_combined_with_roi_and_binning(self, _, method, combine):
+        data = np.random.randint(0, 1000, (5, 12, 14)).astype(np.uint16)
+        for idx, image in enumerate(data):
+            tifffile.imwrite(os.path.join(self.output_directory, f"image_{idx:06d}.tif"), image)
+        group = FilenameGroup.from_file(Path(self.output_directory) / "image_000000.tif")
+        group.find_all_files()
+        roi = SensibleROI(2, 1, 13, 10)
+
+        with mock.patch("mantidimaging.core.io.loader.img_loader.MEDIAN_BUFFER_BYTES", 5 * 5 * 4 * 3):
+            combined = loader.load_combined(group, method, roi=roi, binning=2)
+
+        expected = combine(data[:, 1:9, 2:12].reshape(5, 4, 2, 5, 2).mean(axis=(2, 4)))
+        self.assertEqual((1, 4, 5), combined.data.shape)
+        npt.assert_allclose(expected, combined.data[0], rtol=1e-6)
+        history = combined.metadata[OPERATION_HISTORY]
+        self.assertEqual(["CropCoordinatesFilter", "RebinFilter"], [op[OPERATION_NAME] for op in history])
+
+    def test_load_multi_page_tiff_with_indices(self):
+        data = np.random.random((10, 6, 8)).astype(np.float32)
+        tifffile.imwrite(os.path.join(self.output_directory, "volume.tif"), data)
+        group = FilenameGroup.from_file(Path(self.output_directory) / "volume.tif")
+        group.find_all_files()
+
+        loaded_images = loader.load(group, indices=[1, 8, 3])
+
+        npt.assert_equal(data[1:8:3], loaded_images.data)
+        self.assertEqual([1, 8, 3], loaded_images.indices)
+
+    def test_load_with_roi_outside_image(self):
+        saver.image_save(th.generate_images((2, 8, 10)), self.output_directory)
+        group = FilenameGroup.from_file(Path(self.output_directory) / f"{saver.DEFAULT_NAME_PREFIX}_000000.tif")
+        group.find_all_files()
+
+        with self.assertRaisesRegex(ValueError, "outside of the image"):
+            loader.load(group, roi=SensibleROI(0, 0, 11, 8))
+
     def test_metadata_round_trip(self):
         # Create dummy image stack
         sample = th.gen_img_numpy_rand()
@@ -202,6 +277,60 @@ class IOTest(FileOutputtingTestCase):
         # Ensure properties have been preserved
         self.assertEqual(loaded_images.metadata, images.metadata)
 
+    @parameterized.expand([("load", lambda group, **kwargs: loader.load(group, **kwargs)),
+                           ("load_combined", lambda group, **kwargs: loader.load_combined(group, "Mean", **kwargs))])
+    def test_metadata_file_keeps_roi_and_binning_history(self, _, load):
+        images = th.generate_images((2, 8, 10))
+        images.metadata['message'] = 'hello, world!'
+        images.record_operation("MedianFilter", "Median", size=3)
+        saver.image_save(images, self.output_directory)
+        group = FilenameGroup.from_file(Path(self.output_directory) / f"{saver.DEFAULT_NAME_PREFIX}_000000.tif")
+        group.find_all_files()
+        self.assertIsNotNone(group.metadata_path)
+
+        loaded_images = load(group, roi=SensibleROI(0, 0, 8, 6), binning=2)
+
+        self.assertEqual('hello, world!', loaded_images.metadata['message'])
+        history = loaded_images.metadata[OPERATION_HISTORY]
+        self.assertEqual(["MedianFilter", "CropCoordinatesFilter", "RebinFilter"],
+                         [op[OPERATION_NAME] for op in history])
+
+    def test_int16_save_rescales_every_image(self):
+        images = th.generate_images()
+        images.data[1, 2, 3] = np.nan
+        min_value, max_value = np.nanmin(images.data), np.nanmax(images.data)
+
+        names = saver.image_save(images, self.output_directory, pixel_depth="int16")
+
+        for idx, name in enumerate(names):
+            expected = RescaleFilter.filter_array(np.copy(images.data[idx]), min_value, max_value,
+                                                  saver.INT16_SIZE - 1).astype(np.uint16)
+            npt.assert_equal(expected, tifffile.imread(name))
+        with open(os.path.join(self.output_directory, saver.DEFAULT_NAME_PREFIX + ".json")) as f:
+            self.assertEqual(str(min_value), json.load(f)[RESCALED]["offset"])
+
+    def test_swap_axes_save(self):
+        images = th.generate_images((4, 6, 5))
+
+        names = saver.image_save(images, self.output_directory, swap_axes=True, pixel_depth="int16")
+
+        self.assertEqual(6, len(names))
+        self.assertEqual((4, 5), tifffile.imread(names[0]).shape)
+
+    def test_image_save_cancel(self):
+        progress = Progress()
+        progress.cancel()
+
+        with self.assertRaisesRegex(RuntimeError, "cancelled"):
+            saver.image_save(th.generate_images(), self.output_directory, progress=progress)
+
+    def test_nan_min_max(self):
+        data = th.generate_images((4, 3, 3)).data
+        data[0] = np.nan
+        data[2, 1, 1] = np.nan
+
+        self.assertEqual((np.nanmin(data), np.nanmax(data)), saver._nan_min_max(data))
+
     def test_nexus_simple_dataset_save(self):
         sample = th.generate_images()
         sample.data *= 12
@@ -322,6 +451,41 @@ class IOTest(FileOutputtingTestCase):
                     [sd.dark_before.data, sd.flat_before.data, sd.sample.data, sd.flat_after.data,
                      sd.dark_after.data]).astype("float32"))
 
+    @parameterized.expand([
+        ("uncompressed", NexusSaveOptions()),
+        ("chunks", NexusSaveOptions(chunks=(3, 4, 100))),
+        ("gzip", NexusSaveOptions(chunks=(2, 5, 3), compression="gzip")),
+        ("gzip_no_shuffle", NexusSaveOptions(chunks=(2, 5, 3), compression="gzip", shuffle=False)),
+        ("lzf", NexusSaveOptions(chunks=(2, 5, 3), compression="lzf")),
+    ])
+    def test_write_images_dataset_in_slabs(self, _, options):
+        arrays = [th.generate_images((3, 8, 7)).data, th.generate_images((4, 8, 7)).data]
+        progress = mock.Mock()
+
+        with mock.patch("mantidimaging.core.io.saver.NEXUS_SLAB_BYTES", 2 * 8 * 7 * 4), \
+                h5py.File("path", "w", driver="core", backing_store=False) as nexus_file:
+            dataset = _write_images_dataset(nexus_file, "data", arrays, options, progress)
+
+            self.assertEqual(options.compression, dataset.compression)
+            npt.assert_array_equal(np.concatenate(arrays).astype(np.float32), dataset[()])
+        self.assertGreater(progress.update.call_count, 1)
+
+    def test_write_images_dataset_default_chunks_are_images(self):
+        with h5py.File("path", "w", driver="core", backing_store=False) as nexus_file:
+            dataset = _write_images_dataset(nexus_file, "data", [th.generate_images((3, 8, 7)).data])
+            self.assertEqual((1, 8, 7), dataset.chunks)
+
+    def test_nexus_save_writes_to_disk(self):
+        sd = StrictDataset(th.generate_images())
+        path = os.path.join(self.output_directory, "file.nxs")
+
+        saver.nexus_save(sd, path, "sample-name", NexusSaveOptions(compression="gzip"))
+
+        with h5py.File(path, "r") as nexus_file:
+            self.assertNotEqual("core", nexus_file.driver)
+            npt.assert_array_equal(sd.sample.data.astype(np.float32),
+                                   np.array(nexus_file["entry1"]["tomo_entry"]["instrument"]["detector"]["data"]))
+
     @mock.patch("mantidimaging.core.io.saver.h5py.File")
     @mock.patch("mantidimaging.core.io.saver._nexus_save")
     def test_h5py_os_error_returns(self, nexus_save_mock: mock.Mock, file_mock: mock.Mock):
@@ -341,6 +505,18 @@ class IOTest(FileOutputtingTestCase):
         file_mock.return_value.close.assert_called_once()
         os_mock.remove.assert_called_once_with(save_path)
 
+    @mock.patch("mantidimaging.core.io.saver.h5py.File")
+    @mock.patch("mantidimaging.core.io.saver._nexus_save")
+    @mock.patch("mantidimaging.core.io.saver.os")
+    def test_cancelled_nexus_save_deletes_file(self, os_mock: mock.Mock, nexus_save_mock: mock.Mock,
+                                               file_mock: mock.Mock):
+        nexus_save_mock.side_effect = RuntimeError("Task has been cancelled")
+        save_path = "cancelled/save/path"
+        with self.assertRaisesRegex(RuntimeError, "Task has been cancelled"):
+            saver.nexus_save(StrictDataset(th.generate_images()), save_path, "sample-name")
+        file_mock.return_value.close.assert_called_once()
+        os_mock.remove.assert_called_once_with(save_path)
+
     @mock.patch("mantidimaging.core.io.saver.h5py.File")
     @mock.patch("mantidimaging.core.io.saver._nexus_save")
     def test_successful_nexus_save_closes_file(self, nexus_save_mock: mock.Mock, file_mock: mock.Mock):
@@ -0,0 +1,172 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+import os
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import h5py
+import numpy as np
+import numpy.testing as npt
+from parameterized import parameterized
+
+import mantidimaging.test_helpers.unit_test_helper as th
+from mantidimaging.core.data.dataset import MixedDataset, StrictDataset
+from mantidimaging.core.io.session import load_session, save_session
+from mantidimaging.core.operation_history.const import OPERATION_HISTORY
+from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.utility.data_containers import Indices, ProjectionAngles
+from mantidimaging.test_helpers import FileOutputtingTestCase
+
+
+def _named_images(name: str, shape=(4, 5, 6), dtype=np.float32):
+    images = th.generate_images(shape, dtype)
+    images.name = name
+    images.filenames = [f"{name}_{i}.tif" for i in range(shape[0])]
+    return images
+
+
+class SessionTest(FileOutputtingTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.path = Path(self.output_directory) / "session.mis"
+
+        sample = _named_images("sample")
+        sample.indices = Indices(2, 10, 2)
+        sample.pixel_size = 12
+        sample.metadata[OPERATION_HISTORY] = [{"name": "median", "kwargs": {"size": 3}}]
+        sample.set_projection_angles(ProjectionAngles(np.linspace(0, np.pi, 4)))
+        sample.proj180deg = _named_images("180", (1, 5, 6))
+        self.strict = StrictDataset(sample, flat_before=_named_images("flat"), name="strict")
+        self.strict.add_recon(_named_images("recon", (3, 6, 6)))
+
+        stack = _named_images("stack", dtype=np.uint16)
+        stack.indices = [0, 3, 5, 6]
+        self.mixed = MixedDataset([stack], "mixed")
+        self.mixed.sinograms = _named_images("sinograms", (5, 4, 6))
+
+    def _assert_stack_restored(self, expected, actual):
+        self.assertEqual(expected.name, actual.name)
+        self.assertEqual(expected.metadata, actual.metadata)
+        self.assertEqual(expected.indices, actual.indices)
+        self.assertEqual(expected.filenames, actual.filenames)
+        self.assertEqual(expected.is_sinograms, actual.is_sinograms)
+        self.assertEqual(expected.data.dtype, actual.data.dtype)
+        npt.assert_equal(expected.data, actual.data)
+
+    @parameterized.expand([("uncompressed", False), ("compressed", True)])
+    def test_round_trip(self, _, compress):
+        save_session([self.strict, self.mixed], self.path, compress)
+
+        strict, mixed = load_session(self.path)
+
+        self.assertIsInstance(strict, StrictDataset)
+        self.assertEqual("strict", strict.name)
+        for expected, actual in zip(self.strict.all, strict.all):
+            self._assert_stack_restored(expected, actual)
+        self.assertEqual(len(self.strict.all), len(strict.all))
+        self.assertIsNone(strict.flat_after)
+        self._assert_stack_restored(self.strict.proj180deg, strict.proj180deg)
+        npt.assert_equal(self.strict.sample.real_projection_angles().value,
+                         strict.sample.real_projection_angles().value)
+        self.assertIsNone(strict.flat_before.real_projection_angles())
+
+        self.assertIsInstance(mixed, MixedDataset)
+        self.assertEqual("mixed", mixed.name)
+        self.assertEqual(len(self.mixed.all), len(mixed.all))
+        for expected, actual in zip(self.mixed.all, mixed.all):
+            self._assert_stack_restored(expected, actual)
+        self._assert_stack_restored(self.mixed.sinograms, mixed.sinograms)
+
+    def test_uncompressed_session_is_memory_mapped_copy_on_write(self):
+        save_session([self.strict], self.path, compress=False)
+        saved_sample = self.strict.sample.data.copy()
+
+        strict, = load_session(self.path)
+        self.assertIsInstance(strict.sample.data, np.memmap)
+        strict.sample.data[:] = 0
+
+        reopened, = load_session(self.path)
+        npt.assert_equal(saved_sample, reopened.sample.data)
+
+    def test_memory_mapped_stack_copied_into_shared_memory_for_processes(self):
+        save_session([self.strict], self.path, compress=False)
+        strict, = load_session(self.path)
+        shared_array = strict.sample.shared_array
+        self.assertFalse(shared_array.has_shared_memory)
+
+        all_in_shared_memory, data = ps._check_shared_mem_and_get_data([shared_array])
+
+        self.assertTrue(all_in_shared_memory)
+        self.assertTrue(shared_array.has_shared_memory)
+        self.assertNotIsInstance(strict.sample.data, np.memmap)
+        npt.assert_equal(self.strict.sample.data, data[0].array)
+        self.assertEqual(strict.sample.data.nbytes, strict.sample.shared_memory_bytes)
+
+    def test_compressed_session_is_chunked_per_image(self):
+        save_session([self.strict], self.path, compress=True)
+
+        with h5py.File(self.path, "r") as session_file:
+            data = session_file["datasets/0/0/data"]
+            self.assertEqual("gzip", data.compression)
+            self.assertEqual((1, ) + self.strict.sample.data.shape[1:], data.chunks)
+
+    def test_overwrite_memory_mapped_session(self):
+        save_session([self.strict], self.path, compress=False)
+        strict, = load_session(self.path)
+        strict.sample.data[0] = 7
+
+        save_session([strict], self.path, compress=False)
+
+        reopened, = load_session(self.path)
+        npt.assert_equal(strict.sample.data, reopened.sample.data)
+        self.assertEqual(["session.mis"], os.listdir(self.output_directory))
+
+    def test_stacks_mapped_from_overwritten_session_copied_into_memory(self):
+        other_path = Path(self.output_directory) / "other.mis"
+        save_session([self.strict], self.path, compress=False)
+        save_session([self.mixed], other_path, compress=False)
+        strict, = load_session(self.path)
+        mixed, = load_session(other_path)
+        self.assertIsInstance(strict.sample.data, np.memmap)
+
+        save_session([strict, mixed], self.path, compress=False)
+
+        self.assertNotIsInstance(strict.sample.data, np.memmap)
+        self.assertTrue(strict.sample.shared_array.has_shared_memory)
+        npt.assert_equal(self.strict.sample.data, strict.sample.data)
+        self.assertIsInstance(mixed.sinograms.data, np.memmap)
+
+    def test_session_that_cannot_be_replaced(self):
+        with mock.patch("mantidimaging.core.io.session.os.replace", side_effect=PermissionError):
+            with self.assertRaisesRegex(RuntimeError, "Could not replace"):
+                save_session([self.strict], self.path)
+
+        self.assertEqual([], os.listdir(self.output_directory))
+
+    def test_failed_save_removes_partial_file(self):
+        with mock.patch("mantidimaging.core.io.session._write_dataset", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                save_session([self.strict], self.path)
+
+        self.assertEqual([], os.listdir(self.output_directory))
+
+    def test_load_rejects_other_hdf5_files(self):
+        with h5py.File(self.path, "w") as f:
+            f.create_dataset("data", data=np.zeros(3))
+
+        with self.assertRaises(RuntimeError):
+            load_session(self.path)
+
+    def test_progress_per_stack(self):
+        save_session([self.strict, self.mixed], self.path)
+        progress = mock.MagicMock()
+
+        load_session(self.path, progress)
+
+        self.assertEqual(len(self.strict.all) + len(self.mixed.all), progress.update.call_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -55,11 +55,15 @@ def deserialize_metadata(metadata: Dict[str, Any]) -> List[ImageOperation]:
         if const.OPERATION_HISTORY in metadata else []
 
 
+def filters_by_name() -> Dict[str, Any]:
+    """
+    :return: The available filter classes, keyed by the class name used in the operation history
+    """
+    return {f.__name__: f for f in load_filter_packages(ignored_packages=['mantidimaging.core.operations.wip'])}
+
+
 def ops_to_partials(filter_ops: Iterable[ImageOperation]) -> Iterable[partial]:
-    filter_funcs: Dict[str, Callable] = {
-        f.__name__: f.filter_func
-        for f in load_filter_packages(ignored_packages=['mantidimaging.core.operations.wip'])
-    }
+    filter_funcs: Dict[str, Callable] = {name: f.filter_func for name, f in filters_by_name().items()}
     fixed_funcs = {
         const.OPERATION_NAME_AXES_SWAP: lambda img, **_: np.swapaxes(img, 0, 1),
         # const.OPERATION_NAME_TOMOPY_RECON: lambda img, **kwargs: TomopyReconWindowModel.do_recon(img, **kwargs),
@@ -0,0 +1,174 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+from logging import getLogger
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from mantidimaging.core.data import ImageStack
+from mantidimaging.core.parallel import manager as pm
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.progress_reporting import Progress
+from .operations import ImageOperation, filters_by_name
+
+if TYPE_CHECKING:
+    from mantidimaging.core.data.snapshot import StackSnapshot
+    from mantidimaging.core.operations.base_filter import BaseFilter
+
+LOG = getLogger(__name__)
+
+# Size of the slab of projections each worker takes through a whole segment of the pipeline. Small enough that the
+# slab stays in the CPU caches between operations.
+SLAB_BYTES = 8 * 1024 * 1024
+
+Stage = Tuple['BaseFilter', Dict[str, Any]]
+
+
+def run_pipeline(images: ImageStack,
+                 operations: List[ImageOperation],
+                 progress: Optional[Progress] = None,
+                 slab_bytes: int = SLAB_BYTES) -> ImageStack:
+    """
+    Apply a chain of operations to a stack, taking each slab of projections through as many operations as possible
+    before moving on to the next slab, instead of making a full pass over the stack for each operation.
+
+    The chain is split into segments. A new segment starts at each operation that needs a value computed from the
+    whole stack (see BaseFilter.needs_reduction), and operations that do not process projections independently are
+    run on their own on the whole stack. The result is the same as applying each operation in turn.
+
+    :param images: The stack to process. Modified in place, or given a new array if the operations change the shape
+                   or dtype of the images.
+    :param operations: The operations to apply, in order
+    :param progress: Progress reporting object
+    :param slab_bytes: Approximate size in bytes of each slab of projections
+    :return: The processed stack
+    """
+    filters = filters_by_name()
+    stages: List[Stage] = []
+    for op in operations:
+        if op.filter_name not in filters:
+            raise KeyError(f"Could not find filter with name '{op.filter_name}'")
+        stages.append((filters[op.filter_name], op.filter_kwargs))
+
+    run_stages(images, stages, progress, slab_bytes)
+
+    for op in operations:
+        images.record_operation(op.filter_name, op.display_name, **op.filter_kwargs)
+    return images
+
+
+def run_stages(images: ImageStack,
+               stages: List[Stage],
+               progress: Optional[Progress] = None,
+               slab_bytes: int = SLAB_BYTES,
+               snapshot: Optional[StackSnapshot] = None) -> None:
+    """
+    Apply filters to a stack as run_pipeline does, without recording them in the operation history.
+
+    :param images: The stack to process
+    :param stages: The filter classes to apply, with the keyword arguments for each
+    :param progress: Progress reporting object
+    :param slab_bytes: Approximate size in bytes of each slab of projections
+    :param snapshot: If given, the original contents of the slices of the stack are saved in it before they are
+                     changed, so that the filters can be rolled back
+    """
+    progress = Progress.ensure_instance(progress, task_name='Pipeline')
+    with progress:
+        for segment in _split_into_segments(stages):
+            filter_class, kwargs = segment[0]
+            if len(segment) == 1 and not _runs_on_slabs(filter_class, kwargs):
+                if snapshot is not None:
+                    snapshot.save_all()
+                progress.add_estimated_steps(1)
+                filter_class.filter_func(images, **kwargs)
+                progress.update(1, msg=filter_class.filter_name)
+            else:
+                _run_segment(images, segment, progress, slab_bytes, snapshot)
+
+
+def _runs_on_slabs(filter_class: BaseFilter, kwargs: Dict[str, Any]) -> bool:
+    return filter_class.projections_independent(**kwargs) and not filter_class.operate_on_sinograms
+
+
+def _split_into_segments(stages: List[Stage]) -> List[List[Stage]]:
+    segments: List[List[Stage]] = []
+    for filter_class, kwargs in stages:
+        starts_segment = not segments or not _runs_on_slabs(
+            filter_class, kwargs) or not _runs_on_slabs(*segments[-1][-1]) or filter_class.needs_reduction(**kwargs)
+        if starts_segment:
+            segments.append([])
+        segments[-1].append((filter_class, kwargs))
+    return segments
+
+
+def _run_segment(images: ImageStack, segment: List[Stage], progress: Progress, slab_bytes: int,
+                 snapshot: Optional[StackSnapshot]) -> None:
+    # The reductions for every operation in the segment are made on the stack as it is at the start of the segment,
+    # which is only correct for the first one. _split_into_segments makes sure that only it can need a reduction.
+    stages = [(filter_class, filter_class.reduce(images, **kwargs)) for filter_class, kwargs in segment]
+    names = ", ".join(filter_class.filter_name for filter_class, _ in segment)
+
+    num_images = images.data.shape[0]
+    slab_size = max(1, min(num_images, slab_bytes // max(1, images.data[0].nbytes)))
+    starts = list(range(0, num_images, slab_size))
+    progress.add_estimated_steps(len(starts))
+    LOG.info(f"Running {names} on {len(starts)} slabs of {slab_size} images")
+
+    runner = _SlabRunner(images.data, stages, slab_size)
+
+    # The first slab gives the shape and dtype of the output
+    first = runner.process(starts[0])
+    progress.update(1, msg=names)
+    output_shape = (num_images, ) + first.data.shape[1:]
+    if output_shape == images.data.shape and first.dtype == images.dtype:
+        output = images.shared_array
+        # Writing over the stack, so the slices need saving before they are changed
+        runner.snapshot = snapshot
+    else:
+        output = pu.create_array(output_shape, first.dtype)
+    runner.output = output.array
+    runner.write(starts[0], first.data)
+    del first
+
+    if len(starts) > 1:
+        for _ in pm.get_thread_pool().imap(runner, starts[1:]):
+            progress.update(1, msg=names)
+
+    if output is not images.shared_array:
+        images.shared_array = output
+
+
+class _SlabRunner:
+    """
+    Takes a copy of a slab of the input through all the stages of a segment, and writes the result to the output.
+    """
+    def __init__(self, source: np.ndarray, stages: List[Stage], slab_size: int):
+        self.source = source
+        self.stages = stages
+        self.slab_size = slab_size
+        self.output: Optional[np.ndarray] = None
+        self.snapshot: Optional[StackSnapshot] = None
+
+    def process(self, start: int) -> ImageStack:
+        slab = ImageStack(np.array(self.source[start:start + self.slab_size]))
+        # Many slabs are processed at once already, so the filters should not try to run in parallel themselves
+        with pu.run_synchronously():
+            for filter_class, kwargs in self.stages:
+                filter_class.filter_func(slab, **kwargs)
+        if slab.data.shape[0] != min(self.slab_size, self.source.shape[0] - start):
+            raise RuntimeError("Operations that change the number of images can not be run as part of a pipeline")
+        return slab
+
+    def write(self, start: int, data: np.ndarray) -> None:
+        assert self.output is not None
+        if self.snapshot is not None:
+            self.snapshot.save_changed(start, data)
+        self.output[start:start + data.shape[0]] = data
+
+    def __call__(self, start: int) -> None:
+        # The slab must be kept alive while it is copied, as the filters may have replaced its array with one in
+        # shared memory that is freed along with it
+        slab = self.process(start)
+        self.write(start, slab.data)
@@ -0,0 +1,143 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import unittest
+
+import numpy.testing as npt
+
+import mantidimaging.test_helpers.unit_test_helper as th
+from mantidimaging.core.data.snapshot import StackSnapshot
+from mantidimaging.core.operation_history import const
+from mantidimaging.core.operation_history.operations import ImageOperation, ops_to_partials
+from mantidimaging.core.operation_history.pipeline import run_pipeline, run_stages, _split_into_segments
+from mantidimaging.core.operations.clip_values import ClipValuesFilter
+from mantidimaging.core.operations.crop_coords import CropCoordinatesFilter
+from mantidimaging.core.operations.median_filter import MedianFilter
+from mantidimaging.core.operations.monitor_normalisation import MonitorNormalisation
+from mantidimaging.core.operations.roi_normalisation import RoiNormalisationFilter
+from mantidimaging.core.parallel.volume import DIM_2D, DIM_3D
+
+# Small enough that the test stacks are split into several slabs
+SLAB_BYTES = 3 * 10 * 8 * 4
+
+OPERATIONS = [
+    ImageOperation("ClipValuesFilter", {
+        "clip_min": 0.1,
+        "clip_max": 0.9
+    }, "Clip Values"),
+    ImageOperation("RoiNormalisationFilter", {
+        "region_of_interest": [1, 1, 5, 4],
+        "normalisation_mode": "Stack Average"
+    }, "ROI Normalisation"),
+    ImageOperation("CropCoordinatesFilter", {"region_of_interest": [2, 1, 8, 7]}, "Crop Coordinates"),
+    ImageOperation("MedianFilter", {"size": 3}, "Median"),
+]
+
+
+class PipelineTest(unittest.TestCase):
+    def test_same_result_as_running_each_operation(self):
+        images = th.generate_images_for_parallel(seed=2023)
+        expected = images.copy()
+        for op in ops_to_partials(OPERATIONS):
+            op(expected)
+
+        result = run_pipeline(images, OPERATIONS, slab_bytes=SLAB_BYTES)
+
+        self.assertIs(result, images)
+        self.assertEqual(expected.data.shape, images.data.shape)
+        npt.assert_allclose(expected.data, images.data, rtol=1e-6)
+
+    def test_records_operations_in_history(self):
+        images = th.generate_images_for_parallel(seed=2023)
+
+        run_pipeline(images, OPERATIONS, slab_bytes=SLAB_BYTES)
+
+        history = images.metadata[const.OPERATION_HISTORY]
+        self.assertEqual([op.filter_name for op in OPERATIONS], [entry[const.OPERATION_NAME] for entry in history])
+        self.assertEqual(OPERATIONS[1].filter_kwargs, history[1][const.OPERATION_KEYWORD_ARGS])
+
+    def test_snapshot_saves_only_changed_slices(self):
+        images = th.generate_images_for_parallel(seed=2023)
+        images.data[:] = 0.5
+        images.data[3, 0, 0] = 2
+        original = images.data.copy()
+        snapshot = StackSnapshot(images)
+
+        run_stages(images, [(ClipValuesFilter, {
+            "clip_min": 0.1,
+            "clip_max": 0.9
+        })],
+                   slab_bytes=SLAB_BYTES,
+                   snapshot=snapshot)
+
+        self.assertEqual([3], snapshot.saved_indices)
+        snapshot.restore()
+        npt.assert_equal(original, images.data)
+
+    def test_snapshot_rolls_back_operations_that_replace_the_array(self):
+        images = th.generate_images_for_parallel(seed=2023)
+        original = images.data.copy()
+        snapshot = StackSnapshot(images)
+
+        run_stages(images, [(ClipValuesFilter, {
+            "clip_min": 0.1,
+            "clip_max": 0.9
+        }), (CropCoordinatesFilter, {
+            "region_of_interest": [2, 1, 8, 7]
+        })],
+                   slab_bytes=SLAB_BYTES,
+                   snapshot=snapshot)
+
+        self.assertFalse(snapshot.in_place)
+        snapshot.restore()
+        npt.assert_equal(original, images.data)
+
+    def test_unknown_filter(self):
+        images = th.generate_images_for_parallel()
+
+        with self.assertRaisesRegex(KeyError, "NonExistingFilter12"):
+            run_pipeline(images, [ImageOperation("NonExistingFilter12", {}, "unknown")])
+
+    def test_split_into_segments(self):
+        roi_kwargs = {"region_of_interest": [0, 0, 2, 2], "normalisation_mode": "Stack Average"}
+        stages = [
+            (ClipValuesFilter, {}),
+            (ClipValuesFilter, {}),
+            (RoiNormalisationFilter, roi_kwargs),
+            (ClipValuesFilter, {}),
+            (MonitorNormalisation, {}),
+            (ClipValuesFilter, {}),
+        ]
+
+        segments = _split_into_segments(stages)
+
+        self.assertEqual([2, 2, 1, 1], [len(segment) for segment in segments])
+        self.assertIs(RoiNormalisationFilter, segments[1][0][0])
+        self.assertIs(MonitorNormalisation, segments[2][0][0])
+
+    def test_3d_filter_runs_on_whole_stack(self):
+        stages = [
+            (ClipValuesFilter, {}),
+            (MedianFilter, {
+                "size": 3,
+                "dimensions": DIM_3D
+            }),
+            (MedianFilter, {
+                "size": 3,
+                "dimensions": DIM_2D
+            }),
+            (ClipValuesFilter, {}),
+        ]
+
+        segments = _split_into_segments(stages)
+
+        self.assertEqual([1, 1, 2], [len(segment) for segment in segments])
+
+    def test_flat_field_roi_normalisation_does_not_need_reduction(self):
+        self.assertFalse(RoiNormalisationFilter.needs_reduction(normalisation_mode="Flat Field"))
+        self.assertTrue(RoiNormalisationFilter.needs_reduction(normalisation_mode="Stack Average"))
+
+
+if __name__ == "__main__":
+    unittest.main()
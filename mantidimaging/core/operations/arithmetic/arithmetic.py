@@ -7,6 +7,7 @@ from typing import Callable, Dict, TYPE_CHECKING
 from mantidimaging.gui.utility.qt_helpers import add_property_to_form, MAX_SPIN_BOX, Type
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel.utility import ExecutionBackend
 
 if TYPE_CHECKING:
     import numpy as np
@@ -24,6 +25,7 @@ class ArithmeticFilter(BaseFilter):
 
     """
     filter_name = "Arithmetic"
+    parallel_backend = ExecutionBackend.THREAD
 
     @classmethod
     def filter_func(cls,
@@ -47,7 +49,12 @@ class ArithmeticFilter(BaseFilter):
             raise ValueError("Unable to proceed with operation because division/multiplication value is zero.")
 
         params = {'div': div_val, 'mult': mult_val, 'add': add_val, 'sub': sub_val}
-        ps.run_compute_func(cls.compute_function, images.data.shape[0], images.shared_array, params, progress)
+        ps.run_compute_func(cls.compute_function,
+                            images.data.shape[0],
+                            images.shared_array,
+                            params,
+                            progress,
+                            backend=cls.parallel_backend)
 
         return images
 
@@ -9,6 +9,7 @@ from enum import Enum, auto
 import numpy as np
 
 from mantidimaging.core.data import ImageStack
+from mantidimaging.core.parallel.utility import ExecutionBackend
 
 if TYPE_CHECKING:
     from PyQt5.QtWidgets import QFormLayout, QWidget  # noqa: F401   # pragma: no cover
@@ -27,6 +28,12 @@ class BaseFilter:
     link_histograms = False
     show_negative_overlay = True
     operate_on_sinograms = False
+    # Filters that spend their time in numpy/scipy code which releases the GIL can use ExecutionBackend.THREAD. This
+    # runs in parallel without needing the data to be in shared memory, e.g. for previews.
+    parallel_backend = ExecutionBackend.PROCESS
+    # Whether each projection is processed independently of the others. If so the pipeline executor can run the filter
+    # on a slab of projections at a time. Filters that operate on sinograms always need the whole stack.
+    independent_projections = True
 
     SINOGRAM_FILTER_INFO = "This filter will work on a\nsinogram view of the data."
 
@@ -84,6 +91,50 @@ class BaseFilter:
         """
         return {}
 
+    @classmethod
+    def projections_independent(cls, **kwargs) -> bool:
+        """
+        Whether each projection is processed independently of the others with these arguments, e.g. not when a filter
+        is run with a 3D kernel. By default this is the independent_projections attribute.
+
+        :param kwargs: the keyword arguments that filter_func will be called with
+        """
+        return cls.independent_projections
+
+    @staticmethod
+    def needs_reduction(**kwargs) -> bool:
+        """
+        Whether the filter needs a value computed from the whole stack (e.g. a stack average) before it can be run on
+        a slab of projections. If so the pipeline executor calls reduce on the whole stack first.
+
+        :param kwargs: the keyword arguments that filter_func will be called with
+        """
+        return False
+
+    @staticmethod
+    def reduce(images: ImageStack, **kwargs) -> Dict[str, Any]:
+        """
+        Compute any whole stack values needed by the filter, once, before it is run slab by slab.
+
+        :param images: the whole stack, as it is before this filter is applied
+        :param kwargs: the keyword arguments that filter_func will be called with
+        :return: the keyword arguments to call filter_func with for each slab
+        """
+        return kwargs
+
+    @staticmethod
+    def preview_kwargs(images: ImageStack, index: int, **kwargs) -> Dict[str, Any]:
+        """
+        The keyword arguments to preview the filter on one slice taken from a stack. Filters whose result for a slice
+        depends on where the slice is in the stack add what they need from the whole stack here.
+
+        :param images: the whole stack that the slice is taken from
+        :param index: the index of the slice in images
+        :param kwargs: the keyword arguments that filter_func will be called with
+        :return: the keyword arguments to call filter_func with for the preview
+        """
+        return kwargs
+
     @staticmethod
     def validate_execute_kwargs(kwargs: Dict[str, Any]) -> bool:
         return True
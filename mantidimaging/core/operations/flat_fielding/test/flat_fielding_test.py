@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from parameterized import parameterized
 import unittest
+from pathlib import Path
 from typing import Tuple, TYPE_CHECKING
 from unittest import mock
 
@@ -11,8 +12,12 @@ import numpy as np
 import numpy.testing as npt
 
 import mantidimaging.test_helpers.unit_test_helper as th
-from mantidimaging.core.operations.flat_fielding.flat_fielding import enable_correct_fields_only
+from mantidimaging.core.data.test.fake_logfile import generate_csv_logfile
+from mantidimaging.core.operations.flat_fielding import flat_fielding
+from mantidimaging.core.operations.flat_fielding.flat_fielding import enable_correct_fields_only, MINIMUM_PIXEL_VALUE
 from mantidimaging.core.operations.flat_fielding import FlatFieldFilter
+from mantidimaging.core.utility.data_containers import ProjectionAngles
+from mantidimaging.core.utility.imat_log_file_parser import CSVLogParser, IMATLogFile
 
 if TYPE_CHECKING:
     from mantidimaging.core.data import ImageStack
@@ -98,6 +103,106 @@ class FlatFieldingTest(unittest.TestCase):
 
         npt.assert_almost_equal(result.data, expected, 7)
 
+    def _interpolated_stacks(self, num_images: int):
+        images, flat_before, dark_before, flat_after, dark_after = self._make_images()
+        images = th.generate_images(shape=(num_images, 8, 10))
+        images.data[:] = 26.
+        flat_before.data[:] = 8.
+        flat_after.data[:] = 16.
+        dark_before.data[:] = 6.
+        dark_after.data[:] = 4.
+        return images, flat_before, dark_before, flat_after, dark_after
+
+    def test_real_result_both_interpolated(self):
+        images, flat_before, dark_before, flat_after, dark_after = self._interpolated_stacks(5)
+        weights = np.linspace(0, 1, 5)[:, np.newaxis, np.newaxis]
+        dark = 6. - 2. * weights
+        flat = 8. + 8. * weights
+        expected = np.broadcast_to((26. - dark) / (flat - dark), images.data.shape)
+
+        result = FlatFieldFilter.filter_func(images,
+                                             flat_before=flat_before,
+                                             flat_after=flat_after,
+                                             dark_before=dark_before,
+                                             dark_after=dark_after,
+                                             selected_flat_fielding="Both, interpolated")
+
+        npt.assert_almost_equal(result.data, expected, 6)
+
+    def test_interpolated_uses_log_timestamps(self):
+        images, flat_before, dark_before, flat_after, dark_after = self._interpolated_stacks(10)
+        images.log_file = generate_csv_logfile()
+        timestamps = images.log_file.timestamps()
+        weights = (timestamps / timestamps[-1])[:, np.newaxis, np.newaxis]
+        dark = 6. - 2. * weights
+        flat = 8. + 8. * weights
+        expected = np.broadcast_to((26. - dark) / (flat - dark), images.data.shape)
+
+        result = FlatFieldFilter.filter_func(images,
+                                             flat_before=flat_before,
+                                             flat_after=flat_after,
+                                             dark_before=dark_before,
+                                             dark_after=dark_after,
+                                             selected_flat_fielding="Both, interpolated")
+
+        npt.assert_almost_equal(result.data, expected, 6)
+
+    def test_interpolated_log_timestamps_follow_angle_order(self):
+        images, flat_before, dark_before, flat_after, dark_after = self._interpolated_stacks(10)
+        # Projections taken out of angle order, e.g. a golden ratio scan
+        log_file = IMATLogFile([CSVLogParser.EXPECTED_HEADER_FOR_IMAT_CSV_LOG_FILE] + [
+            f"Sun Feb 10 00:{22 + i}:04 2019,Projection,{i},angle: {angle},Monitor 3 before: 0,Monitor 3 after: 1"
+            for i, angle in enumerate([0, 5, 2, 7, 4, 9, 6, 1, 8, 3])
+        ], Path("/tmp/fake"))
+        # As the loader does, the projections are sorted by angle
+        log_angles = log_file.projection_angles().value
+        angle_order = np.argsort(log_angles)
+        images.log_file = log_file
+        images.set_projection_angles(ProjectionAngles(log_angles[angle_order]))
+        timestamps = log_file.timestamps()
+        assert timestamps is not None
+        weights = (timestamps[angle_order] / timestamps[-1])[:, np.newaxis, np.newaxis]
+        dark = 6. - 2. * weights
+        flat = 8. + 8. * weights
+        expected = np.broadcast_to((26. - dark) / (flat - dark), images.data.shape)
+
+        result = FlatFieldFilter.filter_func(images,
+                                             flat_before=flat_before,
+                                             flat_after=flat_after,
+                                             dark_before=dark_before,
+                                             dark_after=dark_after,
+                                             selected_flat_fielding="Both, interpolated")
+
+        npt.assert_almost_equal(result.data, expected, 6)
+
+    def test_interpolated_single_image_uses_midpoint(self):
+        images, flat_before, dark_before, flat_after, dark_after = self._interpolated_stacks(1)
+        concatenated = images.copy()
+        kwargs = dict(flat_before=flat_before, flat_after=flat_after, dark_before=dark_before, dark_after=dark_after)
+
+        FlatFieldFilter.filter_func(images, selected_flat_fielding="Both, interpolated", **kwargs)
+        FlatFieldFilter.filter_func(concatenated, selected_flat_fielding="Both, concatenated", **kwargs)
+
+        npt.assert_almost_equal(images.data, concatenated.data, 6)
+
+    def test_interpolated_preview_matches_apply(self):
+        images, flat_before, dark_before, flat_after, dark_after = self._interpolated_stacks(5)
+        kwargs = dict(flat_before=flat_before,
+                      flat_after=flat_after,
+                      dark_before=dark_before,
+                      dark_after=dark_after,
+                      selected_flat_fielding="Both, interpolated")
+        preview = images.slice_as_image_stack(3)
+
+        FlatFieldFilter.filter_func(preview, **FlatFieldFilter.preview_kwargs(images, 3, **kwargs))
+        FlatFieldFilter.filter_func(images, **kwargs)
+
+        npt.assert_almost_equal(preview.data[0], images.data[3], 6)
+
+    def test_interpolated_not_run_on_slabs(self):
+        self.assertTrue(FlatFieldFilter.projections_independent(selected_flat_fielding="Both, concatenated"))
+        self.assertFalse(FlatFieldFilter.projections_independent(selected_flat_fielding="Both, interpolated"))
+
     def test_execute_wrapper_return_is_runnable(self):
         """
         Test that the partial returned by execute_wrapper can be executed (kwargs are named correctly)
@@ -114,16 +219,56 @@ class FlatFieldingTest(unittest.TestCase):
         selected_flat_fielding_widget = mock.Mock()
         selected_flat_fielding_widget.currentText = mock.Mock(return_value="Only Before")
         use_dark_widget = mock.Mock()
+        minus_log_widget = mock.Mock()
+        minus_log_widget.isChecked = mock.Mock(return_value=False)
 
         execute_func = FlatFieldFilter.execute_wrapper(flat_before_widget=flat_before_widget,
                                                        flat_after_widget=flat_before_widget,
                                                        dark_before_widget=dark_before_widget,
                                                        dark_after_widget=dark_after_widget,
                                                        selected_flat_fielding_widget=selected_flat_fielding_widget,
-                                                       use_dark_widget=use_dark_widget)
+                                                       use_dark_widget=use_dark_widget,
+                                                       minus_log_widget=minus_log_widget)
         images = th.generate_images()
         execute_func(images)
 
+        self.assertEqual(minus_log_widget.isChecked.call_count, 1)
+
+    @parameterized.expand([("one_block", 1024 * 1024), ("block_per_row", 1), ("uneven_blocks", 3 * 8 * 4)])
+    def test_single_pass_matches_separate_passes(self, _, block_bytes):
+        images = th.generate_images(shape=(6, 17, 8), seed=2023)
+        flat = th.generate_images(shape=(6, 17, 8), seed=1).data.mean(axis=0) + 1
+        dark = th.generate_images(shape=(6, 17, 8), seed=2).data.mean(axis=0)
+        flat[2, 3] = dark[2, 3]
+        norm_divide = flat - dark
+        norm_divide[norm_divide == 0] = MINIMUM_PIXEL_VALUE
+        # How the correction was done before the single pass kernel
+        expected = np.true_divide(np.subtract(images.data, dark), norm_divide)
+
+        with mock.patch("mantidimaging.core.operations.flat_fielding.flat_fielding.BLOCK_BYTES", block_bytes):
+            flat_fielding._execute(images, flat, dark)
+
+        npt.assert_array_equal(expected, images.data)
+
+    def test_minus_log(self):
+        images, flat_before, dark_before, _, _ = self._make_images()
+        images.data[:] = 26.
+        images.data[0, 0, 0] = 5.
+        flat_before.data[:] = 7.
+        dark_before.data[:] = 6.
+
+        expected = np.full(images.data.shape, -np.log(20.), dtype=np.float32)
+        # Negative transmission is clipped before the log
+        expected[0, 0, 0] = -np.log(MINIMUM_PIXEL_VALUE)
+
+        result = FlatFieldFilter.filter_func(images,
+                                             flat_before=flat_before,
+                                             dark_before=dark_before,
+                                             selected_flat_fielding="Only Before",
+                                             minus_log=True)
+
+        npt.assert_almost_equal(result.data, expected, 5)
+
     def test_enable_correct_fields_only_before(self):
         text = "Only Before"
         flat_before_widget = mock.MagicMock()
@@ -156,8 +301,8 @@ class FlatFieldingTest(unittest.TestCase):
         dark_before_widget.setEnabled.assert_called_once_with(False)
         dark_after_widget.setEnabled.assert_called_once_with(True)
 
-    def test_enable_correct_fields_both(self):
-        text = "Both, concatenated"
+    @parameterized.expand([("concatenated", "Both, concatenated"), ("interpolated", "Both, interpolated")])
+    def test_enable_correct_fields_both(self, _, text):
         flat_before_widget = mock.MagicMock()
         flat_after_widget = mock.MagicMock()
         dark_before_widget = mock.MagicMock()
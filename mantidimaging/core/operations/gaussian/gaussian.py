@@ -11,6 +11,9 @@ import scipy.ndimage as scipy_ndimage
 from mantidimaging import helper as h
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import volume
+from mantidimaging.core.parallel.utility import ExecutionBackend
+from mantidimaging.core.parallel.volume import DIM_2D, DIM_3D
 from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.gui.utility import add_property_to_form
 from mantidimaging.gui.utility.qt_helpers import Type
@@ -18,6 +21,8 @@ from mantidimaging.gui.utility.qt_helpers import Type
 if TYPE_CHECKING:
     from mantidimaging.core.data import ImageStack
 
+GAUSSIAN_TRUNCATE = 4.0
+
 
 class GaussianFilter(BaseFilter):
     """Applies Gaussian filter to the data.
@@ -25,12 +30,15 @@ class GaussianFilter(BaseFilter):
     Intended to be used on: Projections or reconstructed slices
 
     When: As a pre-processing or post-reconstruction step to reduce noise.
+
+    In 3D the whole stack is filtered as a volume, so the kernel also spans neighbouring images.
     """
     filter_name = "Gaussian"
+    parallel_backend = ExecutionBackend.THREAD
     link_histograms = True
 
     @staticmethod
-    def filter_func(data: ImageStack, size=None, mode=None, order=None, progress=None):
+    def filter_func(data: ImageStack, size=None, mode=None, order=None, progress=None, dimensions=DIM_2D):
         """
         :param data: Input data as a 3D numpy.ndarray
         :param size: Size of the kernel
@@ -45,6 +53,7 @@ class GaussianFilter(BaseFilter):
                       An order of 1, 2, or 3 corresponds to convolution
                       with the first, second or third derivatives of a Gaussian.
                       Higher order derivatives are not implemented
+        :param dimensions: Whether to filter each image on its own (DIM_2D), or the whole stack as a volume (DIM_3D).
 
         :return: The processed 3D numpy.ndarray
         """
@@ -52,8 +61,13 @@ class GaussianFilter(BaseFilter):
 
         if not size or not size > 1:
             raise ValueError(f'Size parameter must be greater than 1, but value provided was {size}')
+        if dimensions not in volume.DIMENSIONS:
+            raise ValueError(f'Dimensions must be one of {volume.DIMENSIONS}, but value provided was {dimensions}')
 
-        _execute(data, size, mode, order, progress)
+        if dimensions == DIM_3D:
+            _execute_3d(data, size, mode, order, progress)
+        else:
+            _execute(data, size, mode, order, progress)
         h.check_data_stack(data)
         return data
 
@@ -80,14 +94,31 @@ class GaussianFilter(BaseFilter):
                                              on_change=on_change,
                                              tooltip="Mode to handle the edges of the image")
 
-        return {'size_field': size_field, 'order_field': order_field, 'mode_field': mode_field}
+        _, dimensions_field = add_property_to_form('Dimensions',
+                                                   Type.CHOICE,
+                                                   valid_values=volume.DIMENSIONS,
+                                                   form=form,
+                                                   on_change=on_change,
+                                                   tooltip="Filter each image, or the stack as a volume")
+
+        return {
+            'size_field': size_field,
+            'order_field': order_field,
+            'mode_field': mode_field,
+            'dimensions_field': dimensions_field
+        }
 
     @staticmethod
-    def execute_wrapper(size_field=None, order_field=None, mode_field=None):
+    def execute_wrapper(size_field=None, order_field=None, mode_field=None, dimensions_field=None):
         return partial(GaussianFilter.filter_func,
                        size=size_field.value(),
                        mode=mode_field.currentText(),
-                       order=order_field.value())
+                       order=order_field.value(),
+                       dimensions=dimensions_field.currentText())
+
+    @staticmethod
+    def projections_independent(**kwargs) -> bool:
+        return kwargs.get('dimensions', DIM_2D) == DIM_2D
 
 
 def modes():
@@ -104,8 +135,32 @@ def _execute(images: ImageStack, size, mode, order, progress=None):
              "filter size/width: {1}.".format(images.dtype, size))
 
     progress.update()
-    ps.execute(f, [images.shared_array], images.data.shape[0], progress, msg="Gaussian filter")
+    ps.execute(f, [images.shared_array],
+               images.data.shape[0],
+               progress,
+               msg="Gaussian filter",
+               backend=GaussianFilter.parallel_backend)
 
     progress.mark_complete()
     log.info("Finished  gaussian filter, with pixel data type: {0}, "
              "filter size/width: {1}.".format(images.dtype, size))
+
+
+def _execute_3d(images: ImageStack, size, mode, order, progress=None):
+    log = getLogger(__name__)
+    progress = Progress.ensure_instance(progress, task_name='Gaussian filter 3D')
+
+    log.info("Starting PARALLEL 3D gaussian filter, with pixel data type: {0}, "
+             "filter size/width: {1}.".format(images.dtype, size))
+    # The kernel is cut off this many standard deviations from its centre
+    halo = int(GAUSSIAN_TRUNCATE * size + 0.5)
+    volume.filter_volume(partial(scipy_ndimage.gaussian_filter,
+                                 sigma=size,
+                                 mode=mode,
+                                 order=order,
+                                 truncate=GAUSSIAN_TRUNCATE),
+                         images.shared_array,
+                         halo,
+                         wrap=mode == 'wrap',
+                         progress=progress,
+                         backend=GaussianFilter.parallel_backend)
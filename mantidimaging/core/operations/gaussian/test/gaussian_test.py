@@ -7,9 +7,12 @@ import unittest
 from unittest import mock
 
 import numpy as np
+import numpy.testing as npt
+import scipy.ndimage as scipy_ndimage
 
 import mantidimaging.test_helpers.unit_test_helper as th
 from mantidimaging.core.operations.gaussian import GaussianFilter
+from mantidimaging.core.parallel.volume import DIM_2D, DIM_3D
 
 
 class GaussianTest(unittest.TestCase):
@@ -55,7 +58,9 @@ class GaussianTest(unittest.TestCase):
         mode_field.currentText = mock.Mock(return_value='reflect')
         order_field = mock.Mock()
         order_field.value = mock.Mock(return_value=0)
-        execute_func = GaussianFilter.execute_wrapper(size_field, order_field, mode_field)
+        dimensions_field = mock.Mock()
+        dimensions_field.currentText = mock.Mock(return_value=DIM_2D)
+        execute_func = GaussianFilter.execute_wrapper(size_field, order_field, mode_field, dimensions_field)
 
         images = th.generate_images()
         execute_func(images)
@@ -63,6 +68,21 @@ class GaussianTest(unittest.TestCase):
         self.assertEqual(size_field.value.call_count, 1)
         self.assertEqual(mode_field.currentText.call_count, 1)
         self.assertEqual(order_field.value.call_count, 1)
+        self.assertEqual(dimensions_field.currentText.call_count, 1)
+
+    @parameterized.expand([("nearest", 0), ("wrap", 1)])
+    def test_executed_3d(self, mode, order):
+        images = th.generate_images(shape=(40, 12, 10))
+        expected = scipy_ndimage.gaussian_filter(images.data, 2, mode=mode, order=order)
+
+        result = GaussianFilter.filter_func(images, 2, mode, order, dimensions=DIM_3D)
+
+        npt.assert_array_equal(expected, result.data)
+
+    def test_exception_raised_for_invalid_dimensions(self):
+        images = th.generate_images()
+
+        self.assertRaises(ValueError, GaussianFilter.filter_func, images, 3, 'reflect', 0, dimensions="4D")
 
 
 if __name__ == '__main__':
@@ -7,7 +7,6 @@ from logging import getLogger
 from typing import Callable, Dict, Any, TYPE_CHECKING, Tuple
 
 import numpy as np
-import scipy.ndimage as scipy_ndimage
 from PyQt5.QtGui import QValidator
 from PyQt5.QtWidgets import QSpinBox, QLabel, QSizePolicy
 
@@ -15,6 +14,10 @@ from mantidimaging import helper as h
 from mantidimaging.core.gpu import utility as gpu
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import volume
+from mantidimaging.core.parallel.utility import ExecutionBackend
+from mantidimaging.core.parallel.volume import DIM_2D, DIM_3D
+from mantidimaging.core.utility import median
 from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.gui.utility import add_property_to_form
 from mantidimaging.gui.utility.qt_helpers import Type, on_change_and_disable
@@ -63,12 +66,16 @@ class MedianFilter(BaseFilter):
 
     Note: NaN values are preserved through the filter. They are treated as negative infinity while calculating
     neighbouring pixels.
+
+    In 3D the kernel is a cube, which also takes the median over neighbouring images, e.g. to denoise a reconstructed
+    volume. 3D filtering runs on the CPU.
     """
     filter_name = "Median"
+    parallel_backend = ExecutionBackend.THREAD
     link_histograms = True
 
     @staticmethod
-    def filter_func(data: ImageStack, size=None, mode="reflect", progress=None, force_cpu=True):
+    def filter_func(data: ImageStack, size=None, mode="reflect", progress=None, force_cpu=True, dimensions=DIM_2D):
         """
         :param data: Input data as an ImageStack object.
         :param size: Size of the kernel
@@ -78,6 +85,7 @@ class MedianFilter(BaseFilter):
                      <https://docs.scipy.org/doc/scipy/reference/generated/scipy.ndimage.median_filter.html>`_.
         :param progress: The object for displaying the progress.
         :param force_cpu: Whether or not to use the CPU.
+        :param dimensions: Whether to filter each image on its own (DIM_2D), or the whole stack as a volume (DIM_3D).
 
         :return: Returns the processed data
 
@@ -86,8 +94,14 @@ class MedianFilter(BaseFilter):
 
         if not size or not size > 1:
             raise ValueError(f'Size parameter must be greater than 1, but value provided was {size}')
-
-        if not force_cpu:
+        if dimensions not in volume.DIMENSIONS:
+            raise ValueError(f'Dimensions must be one of {volume.DIMENSIONS}, but value provided was {dimensions}')
+
+        if dimensions == DIM_3D:
+            if not force_cpu:
+                raise ValueError('The GPU median filter only filters in 2D')
+            _execute_3d(data, size, mode, progress)
+        elif not force_cpu:
             _execute_gpu(data.data, size, mode, progress)
         else:
             _execute(data, size, mode, progress)
@@ -118,14 +132,31 @@ class MedianFilter(BaseFilter):
                                             form=form,
                                             on_change=on_change)
 
-        return {'size_field': size_field, 'mode_field': mode_field, 'use_gpu_field': gpu_field}
+        _, dimensions_field = add_property_to_form('Dimensions',
+                                                   Type.CHOICE,
+                                                   valid_values=volume.DIMENSIONS,
+                                                   form=form,
+                                                   on_change=on_change,
+                                                   tooltip="Filter each image, or the stack as a volume")
+
+        return {
+            'size_field': size_field,
+            'mode_field': mode_field,
+            'use_gpu_field': gpu_field,
+            'dimensions_field': dimensions_field
+        }
 
     @staticmethod
-    def execute_wrapper(size_field=None, mode_field=None, use_gpu_field=None):
+    def execute_wrapper(size_field=None, mode_field=None, use_gpu_field=None, dimensions_field=None):
         return partial(MedianFilter.filter_func,
                        size=size_field.value(),
                        mode=mode_field.currentText(),
-                       force_cpu=not use_gpu_field.isChecked())
+                       force_cpu=not use_gpu_field.isChecked(),
+                       dimensions=dimensions_field.currentText())
+
+    @staticmethod
+    def projections_independent(**kwargs) -> bool:
+        return kwargs.get('dimensions', DIM_2D) == DIM_2D
 
 
 def modes():
@@ -133,14 +164,12 @@ def modes():
 
 
 def _median_filter(data: np.ndarray, size: int, mode: str):
-    # Replaces NaNs with negative infinity before median filter
-    # so they do not effect neighbouring pixels
-    nans = np.isnan(data)
-    data = np.where(nans, -np.inf, data)
-    data = scipy_ndimage.median_filter(data, size=size, mode=mode)
+    # NaNs are ordered as negative infinity by the median, so they do not effect neighbouring pixels
+    result = median.median_filter(data, size, mode)
     # Put the original NaNs back
-    data = np.where(nans, np.nan, data)
-    return data
+    if result.dtype.kind == 'f':
+        np.copyto(result, np.nan, where=np.isnan(data))
+    return result
 
 
 def _execute(images: ImageStack, size, mode, progress=None):
@@ -154,7 +183,25 @@ def _execute(images: ImageStack, size, mode, progress=None):
         log.info("PARALLEL median filter, with pixel data type: {0}, filter "
                  "size/width: {1}.".format(images.dtype, size))
 
-        ps.execute(f, [images.shared_array], images.data.shape[0], progress, msg="Median filter")
+        ps.execute(f, [images.shared_array],
+                   images.data.shape[0],
+                   progress,
+                   msg="Median filter",
+                   backend=MedianFilter.parallel_backend)
+
+
+def _execute_3d(images: ImageStack, size, mode, progress=None):
+    log = getLogger(__name__)
+    progress = Progress.ensure_instance(progress, task_name='Median filter 3D')
+
+    log.info("PARALLEL 3D median filter, with pixel data type: {0}, filter "
+             "size/width: {1}.".format(images.dtype, size))
+    volume.filter_volume(partial(_median_filter, size=size, mode=mode),
+                         images.shared_array,
+                         size // 2,
+                         wrap=mode == 'wrap',
+                         progress=progress,
+                         backend=MedianFilter.parallel_backend)
 
 
 def _execute_gpu(data, size, mode, progress=None):
@@ -9,10 +9,12 @@ from typing import TYPE_CHECKING
 
 import numpy as np
 import numpy.testing as npt
+import scipy.ndimage as scipy_ndimage
 
 import mantidimaging.test_helpers.unit_test_helper as th
 from mantidimaging.core.gpu import utility as gpu
 from mantidimaging.core.operations.median_filter import MedianFilter
+from mantidimaging.core.parallel.volume import DIM_2D, DIM_3D
 from mantidimaging.test_helpers.start_qapplication import start_multiprocessing_pool
 
 if TYPE_CHECKING:
@@ -83,7 +85,9 @@ class MedianTest(unittest.TestCase):
         mode_field.currentText = mock.Mock(return_value='reflect')
         use_gpu_field = mock.Mock()
         use_gpu_field.isChecked = mock.Mock(return_value=False)
-        execute_func = MedianFilter.execute_wrapper(size_field, mode_field, use_gpu_field)
+        dimensions_field = mock.Mock()
+        dimensions_field.currentText = mock.Mock(return_value=DIM_2D)
+        execute_func = MedianFilter.execute_wrapper(size_field, mode_field, use_gpu_field, dimensions_field)
 
         images = th.generate_images()
         execute_func(images)
@@ -91,6 +95,27 @@ class MedianTest(unittest.TestCase):
         self.assertEqual(size_field.value.call_count, 1)
         self.assertEqual(mode_field.currentText.call_count, 1)
         self.assertEqual(use_gpu_field.isChecked.call_count, 1)
+        self.assertEqual(dimensions_field.currentText.call_count, 1)
+
+    @parameterized.expand([("reflect", ), ("wrap", )])
+    def test_executed_3d(self, mode):
+        images = th.generate_images(shape=(30, 12, 10), seed=2021)
+        images.data[4, 5, 5] = np.nan
+        expected = scipy_ndimage.median_filter(np.where(np.isnan(images.data), -np.inf, images.data), 3, mode=mode)
+        expected[4, 5, 5] = np.nan
+
+        result = MedianFilter.filter_func(images, 3, mode, dimensions=DIM_3D)
+
+        npt.assert_equal(expected, result.data)
+
+    def test_3d_on_gpu_raises(self):
+        images = th.generate_images()
+
+        npt.assert_raises(ValueError, MedianFilter.filter_func, images, 3, force_cpu=False, dimensions=DIM_3D)
+
+    def test_3d_projections_not_independent(self):
+        self.assertTrue(MedianFilter.projections_independent(size=3))
+        self.assertFalse(MedianFilter.projections_independent(size=3, dimensions=DIM_3D))
 
     @parameterized.expand([("CPU", True), ("GPU", False)])
     def test_executed_with_nan(self, _, use_cpu):
@@ -30,6 +30,7 @@ class MonitorNormalisation(BaseFilter):
     When: As a pre-processing step to normalise the grey value ranges of the data.
     """
     filter_name = "Monitor Normalisation"
+    independent_projections = False
     link_histograms = True
 
     @staticmethod
@@ -7,10 +7,10 @@ from logging import getLogger
 from typing import Dict, TYPE_CHECKING
 
 import numpy as np
-import scipy.ndimage as scipy_ndimage
 
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.utility import median
 from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.gui.utility.qt_helpers import Type
 
@@ -97,13 +97,11 @@ class NaNRemovalFilter(BaseFilter):
 def _nan_to_median(data: np.ndarray, size: int, edgemode: str):
     nans = np.isnan(data)
     if np.any(nans):
-        median_data = np.where(nans, -np.inf, data)
-        median_data = scipy_ndimage.median_filter(median_data, size=size, mode=edgemode)
-        data = np.where(nans, median_data, data)
-
-        if np.any(data == -np.inf):
-            # Convert any left over -infs back to NaNs
-            data = np.where(np.logical_and(nans, data == -np.inf), np.NaN, data)
+        # NaNs are ordered as negative infinity by the median
+        median_data = median.median_filter(data, size, edgemode)
+        # Any NaNs surrounded by NaNs get a median of -inf, and are left as NaNs
+        median_data[np.isneginf(median_data)] = np.nan
+        data[nans] = median_data[nans]
 
     return data
 
@@ -6,10 +6,12 @@ from functools import partial
 from typing import TYPE_CHECKING
 
 import numpy as np
-import scipy.ndimage as scipy_ndimage
 
 from mantidimaging.core.operations.base_filter import BaseFilter, FilterGroup
 from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import volume
+from mantidimaging.core.parallel.volume import DIM_2D, DIM_3D
+from mantidimaging.core.utility import median
 from mantidimaging.gui.utility import add_property_to_form
 from mantidimaging.gui.utility.qt_helpers import Type
 
@@ -21,7 +23,6 @@ OUTLIERS_DARK = 'dark'
 OUTLIERS_BRIGHT = 'bright'
 _default_radius = 3
 _default_mode = OUTLIERS_BRIGHT
-DIM_2D = "2D"
 DIM_1D = "1D"
 
 
@@ -34,6 +35,9 @@ class OutliersFilter(BaseFilter):
 
     Caution: This should usually be one of the first steps applied to the data, flat and dark
     images, to remove pixels with very large values that will cause issues for flat-fielding.
+
+    In 3D the median is taken over a cube, so it also spans neighbouring images, e.g. to remove outliers from a
+    reconstructed volume.
     """
     filter_name = "Remove Outliers"
     link_histograms = True
@@ -41,24 +45,26 @@ class OutliersFilter(BaseFilter):
     @staticmethod
     def _execute(data, diff, radius, mode):
         # Adapted from tomopy source
-        median = scipy_ndimage.median_filter(data, radius)
+        median_data = median.median_filter(data, radius)
         if mode == OUTLIERS_BRIGHT:
-            return np.where((data - median) > diff, median, data)
+            return np.where((data - median_data) > diff, median_data, data)
         else:
-            return np.where((median - data) > diff, median, data)
+            return np.where((median_data - data) > diff, median_data, data)
 
     @staticmethod
     def filter_func(images: ImageStack,
                     diff=None,
                     radius=_default_radius,
                     mode=_default_mode,
-                    progress: Progress = None):
+                    progress: Progress = None,
+                    dimensions=DIM_2D):
         """
         :param images: Input data
         :param diff: Pixel value difference above which to crop bright pixels
         :param radius: Size of the median filter to apply
         :param mode: Whether to remove bright or dark outliers
                     One of [OUTLIERS_BRIGHT, OUTLIERS_DARK]
+        :param dimensions: Whether to filter each image on its own (DIM_2D), or the whole stack as a volume (DIM_3D).
 
         :return: The processed 3D numpy.ndarray
         """
@@ -68,6 +74,17 @@ class OutliersFilter(BaseFilter):
         if not radius or not radius > 0:
             raise ValueError(f'radius parameter must be greater than 0. Value provided was {radius}')
 
+        if dimensions not in volume.DIMENSIONS:
+            raise ValueError(f'dimensions must be one of {volume.DIMENSIONS}. Value provided was {dimensions}')
+
+        if dimensions == DIM_3D:
+            volume.filter_volume(partial(OutliersFilter._execute, diff=diff, radius=radius, mode=mode),
+                                 images.shared_array,
+                                 radius // 2,
+                                 progress=progress,
+                                 backend=OutliersFilter.parallel_backend)
+            return images
+
         func = ps.create_partial(OutliersFilter._execute, ps.return_to_self, diff=diff, radius=radius, mode=mode)
         ps.execute(func, [images.shared_array],
                    images.data.shape[0],
@@ -102,15 +119,32 @@ class OutliersFilter(BaseFilter):
                                              on_change=on_change,
                                              tooltip="Whether to remove bright or dark outliers")
 
-        return {'diff_field': diff_field, 'size_field': size_field, 'mode_field': mode_field}
+        _, dimensions_field = add_property_to_form('Dimensions',
+                                                   Type.CHOICE,
+                                                   valid_values=volume.DIMENSIONS,
+                                                   form=form,
+                                                   on_change=on_change,
+                                                   tooltip="Find outliers in each image, or in the stack as a volume")
+
+        return {
+            'diff_field': diff_field,
+            'size_field': size_field,
+            'mode_field': mode_field,
+            'dimensions_field': dimensions_field
+        }
 
     @staticmethod
-    def execute_wrapper(diff_field=None, size_field=None, mode_field=None):
+    def execute_wrapper(diff_field=None, size_field=None, mode_field=None, dimensions_field=None):
 
         return partial(OutliersFilter.filter_func,
                        diff=diff_field.value(),
                        radius=size_field.value(),
-                       mode=mode_field.currentText())
+                       mode=mode_field.currentText(),
+                       dimensions=dimensions_field.currentText())
+
+    @staticmethod
+    def projections_independent(**kwargs) -> bool:
+        return kwargs.get('dimensions', DIM_2D) == DIM_2D
 
     @staticmethod
     def group_name() -> FilterGroup:
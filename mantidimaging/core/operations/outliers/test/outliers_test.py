@@ -7,12 +7,15 @@ import unittest
 from unittest import mock
 
 import numpy as np
+import numpy.testing as npt
+import scipy.ndimage as scipy_ndimage
 from PyQt5.QtWidgets import QSpinBox, QComboBox, QDoubleSpinBox
 from mantidimaging.test_helpers import start_qapplication
 
 import mantidimaging.test_helpers.unit_test_helper as th
 from mantidimaging.core.operations.outliers import OutliersFilter
-from mantidimaging.core.operations.outliers.outliers import OUTLIERS_BRIGHT
+from mantidimaging.core.operations.outliers.outliers import OUTLIERS_BRIGHT, OUTLIERS_DARK
+from mantidimaging.core.parallel.volume import DIM_2D, DIM_3D
 
 
 @start_qapplication
@@ -65,7 +68,9 @@ class OutliersTest(unittest.TestCase):
         size_field.value = mock.Mock(return_value=1)
         mode_field = mock.Mock()
         mode_field.currentText = mock.Mock(return_value=OUTLIERS_BRIGHT)
-        execute_func = OutliersFilter.execute_wrapper(diff_field, size_field, mode_field)
+        dimensions_field = mock.Mock()
+        dimensions_field.currentText = mock.Mock(return_value=DIM_2D)
+        execute_func = OutliersFilter.execute_wrapper(diff_field, size_field, mode_field, dimensions_field)
 
         images = th.generate_images()
         execute_func(images)
@@ -73,6 +78,20 @@ class OutliersTest(unittest.TestCase):
         self.assertEqual(diff_field.value.call_count, 1)
         self.assertEqual(size_field.value.call_count, 1)
         self.assertEqual(mode_field.currentText.call_count, 1)
+        self.assertEqual(dimensions_field.currentText.call_count, 1)
+
+    @parameterized.expand([(OUTLIERS_BRIGHT, ), (OUTLIERS_DARK, )])
+    def test_executed_3d(self, mode):
+        images = th.generate_images(shape=(30, 12, 10))
+        images.data[5, 6, 6] = 100
+        images.data[20, 3, 3] = -100
+        median_data = scipy_ndimage.median_filter(images.data, 3)
+        outliers = images.data - median_data > 0.5 if mode == OUTLIERS_BRIGHT else median_data - images.data > 0.5
+        expected = np.where(outliers, median_data, images.data)
+
+        result = OutliersFilter.filter_func(images, 0.5, 3, mode, dimensions=DIM_3D)
+
+        npt.assert_array_equal(expected, result.data)
 
     def test_register_gui_returns_correct_types(self):
         gui_dict = OutliersFilter.register_gui(mock.MagicMock(), mock.MagicMock(), mock.MagicMock())
@@ -80,8 +99,9 @@ class OutliersTest(unittest.TestCase):
         assert (isinstance(gui_dict["diff_field"], QDoubleSpinBox))
         assert (isinstance(gui_dict["size_field"], QSpinBox))
         assert (isinstance(gui_dict["mode_field"], QComboBox))
+        assert (isinstance(gui_dict["dimensions_field"], QComboBox))
         # use sets because dictionary order isn't guaranteed in Python 3
-        self.assertEqual({'diff_field', 'size_field', 'mode_field'}, set(gui_dict.keys()))
+        self.assertEqual({'diff_field', 'size_field', 'mode_field', 'dimensions_field'}, set(gui_dict.keys()))
 
     def test_gui_diff_spin_box_min_is_correct(self):
         gui_dict = OutliersFilter.register_gui(mock.MagicMock(), mock.MagicMock(), mock.MagicMock())
@@ -3,14 +3,18 @@
 from __future__ import annotations
 
 from functools import partial
-from typing import TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING, Tuple
 
+import numpy as np
 import skimage.transform
 
 from mantidimaging import helper as h
 from mantidimaging.core.operations.base_filter import BaseFilter
 from mantidimaging.core.parallel import shared as ps
 from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility import binning
+from mantidimaging.core.utility.binning import BIN_MEAN
+from mantidimaging.core.utility.data_containers import ProjectionAngles
 from mantidimaging.gui.utility import add_property_to_form
 from mantidimaging.gui.utility.qt_helpers import Type
 
@@ -24,6 +28,10 @@ class RebinFilter(BaseFilter):
     This filter temporarily increases memory usage, while the image is being rebinned.
     The memory usage will be lowered after the filter has finished executing.
 
+    Integer factors, e.g. a factor of 0.5 or dimensions that divide the size of the images, bin blocks of pixels
+    exactly, by averaging or summing them. Other factors resize the images with interpolation. Projections can also be
+    binned together, with an integer factor.
+
     Intended to be used on: Any data
 
     When: If you want to reduce the data size and to smoothen the image.
@@ -32,7 +40,12 @@ class RebinFilter(BaseFilter):
     link_histograms = True
 
     @staticmethod
-    def filter_func(images: ImageStack, rebin_param=0.5, mode=None, progress=None) -> ImageStack:
+    def filter_func(images: ImageStack,
+                    rebin_param=0.5,
+                    mode=None,
+                    progress=None,
+                    bin_method=BIN_MEAN,
+                    projection_factor=1) -> ImageStack:
         """
         :param images: Sample data which is to be processed. Expects radiograms
         :param rebin_param: int, float or tuple
@@ -41,6 +54,11 @@ class RebinFilter(BaseFilter):
                             tuple - Size of the output image (x, y).
         :param mode: Interpolation to use for re-sizing
                      ('nearest', 'lanczos', 'bilinear', 'bicubic' or 'cubic').
+                     Not used when binning by an integer factor.
+        :param bin_method: How blocks of pixels are binned by integer factors, BIN_MEAN or BIN_SUM. Sums are stored in
+                           the data type of the images.
+        :param projection_factor: The number of consecutive projections to bin together. Projections left over at
+                                  the end are dropped.
 
         :return: The processed 3D numpy.ndarray
         """
@@ -53,9 +71,29 @@ class RebinFilter(BaseFilter):
 
         if not param_valid:
             raise ValueError('Rebin parameter must be greater than 0')
+        if bin_method not in binning.BIN_METHODS:
+            raise ValueError(f'Binning method must be one of {binning.BIN_METHODS}')
+        if projection_factor < 1 or projection_factor > images.data.shape[0]:
+            raise ValueError('Projection factor must be between 1 and the number of images')
+
+        binned_shape = _binned_shape(images.data.shape, rebin_param)
+        factors = _integer_factors(images.data.shape[1:], binned_shape, rebin_param)
+
+        if factors is not None:
+            # Found before the stack is changed, so that a mismatch leaves the stack as it was
+            filenames, angles = _binned_projection_metadata(images, projection_factor)
+            binned_data = _bin_stack(images, factors, projection_factor, bin_method, binned_shape, progress)
+            images.shared_array = binned_data
+            if filenames is not None:
+                images.filenames = filenames
+            if angles is not None:
+                images.set_projection_angles(angles)
+            return images
+
+        if projection_factor > 1 or bin_method != BIN_MEAN:
+            raise ValueError('Binning projections, and summing, need an integer rebin factor')
 
         empty_resized_data = _create_reshaped_array(images, rebin_param)
-
         f = ps.create_partial(skimage.transform.resize,
                               ps.return_to_second_at_i,
                               mode=mode,
@@ -69,6 +107,10 @@ class RebinFilter(BaseFilter):
 
         return images
 
+    @staticmethod
+    def projections_independent(**kwargs) -> bool:
+        return kwargs.get('projection_factor', 1) == 1
+
     @staticmethod
     def register_gui(form, on_change, view):
         # Rebin by uniform factor options
@@ -113,10 +155,24 @@ class RebinFilter(BaseFilter):
         label_mode = QLabel("Mode")
         mode_field = QComboBox()
         mode_field.addItems(modes())
+        mode_field.setToolTip("Mode to handle the edges when resizing by a factor that is not an integer")
+
+        label_method = QLabel("Bin Method")
+        method_field = QComboBox()
+        method_field.addItems(binning.BIN_METHODS)
+        method_field.setToolTip("Whether to average or sum blocks of pixels, when binning by an integer factor")
 
         form.addRow(rebin_to_dimensions_radio, shape_fields)
         form.addRow(rebin_by_factor_radio, factor)
         form.addRow(label_mode, mode_field)
+        form.addRow(label_method, method_field)
+
+        _, projection_factor_field = add_property_to_form('Bin Projections',
+                                                          Type.INT,
+                                                          1, (1, 1000),
+                                                          form=form,
+                                                          on_change=on_change,
+                                                          tooltip="Number of consecutive projections to bin together")
 
         # Ensure good default UI state
         rebin_to_dimensions_radio.setChecked(True)
@@ -129,6 +185,8 @@ class RebinFilter(BaseFilter):
             "rebin_by_factor_radio": rebin_by_factor_radio,
             "factor": factor,
             "mode_field": mode_field,
+            "method_field": method_field,
+            "projection_factor_field": projection_factor_field,
         }
 
     @staticmethod
@@ -137,7 +195,9 @@ class RebinFilter(BaseFilter):
                         shape_y=None,
                         rebin_by_factor_radio=None,
                         factor=None,
-                        mode_field=None):
+                        mode_field=None,
+                        method_field=None,
+                        projection_factor_field=None):
         if rebin_to_dimensions_radio.isChecked():
             params = (shape_x.value(), shape_y.value())
         elif rebin_by_factor_radio.isChecked():
@@ -145,26 +205,83 @@ class RebinFilter(BaseFilter):
         else:
             raise ValueError('Unknown bin dimension mode')
 
-        return partial(RebinFilter.filter_func, mode=mode_field.currentText(), rebin_param=params)
+        return partial(RebinFilter.filter_func,
+                       mode=mode_field.currentText(),
+                       rebin_param=params,
+                       bin_method=method_field.currentText(),
+                       projection_factor=projection_factor_field.value())
 
 
 def modes():
     return ["constant", "edge", "wrap", "reflect", "symmetric"]
 
 
-def _create_reshaped_array(images, rebin_param):
-    old_shape = images.data.shape
-    num_images = old_shape[0]
-
+def _binned_shape(shape: Tuple[int, ...], rebin_param) -> Tuple[int, int]:
+    """
+    The shape of each image after rebinning
+    """
     # use SciPy's calculation to find the expected dimensions
     # int to avoid visible deprecation warning
     if isinstance(rebin_param, tuple):
-        expected_dimy = int(rebin_param[0])
-        expected_dimx = int(rebin_param[1])
-    else:
-        expected_dimy = int(rebin_param * old_shape[1])
-        expected_dimx = int(rebin_param * old_shape[2])
+        return int(rebin_param[0]), int(rebin_param[1])
+    return int(rebin_param * shape[1]), int(rebin_param * shape[2])
+
+
+def _create_reshaped_array(images, rebin_param, projection_factor=1):
+    num_images = images.data.shape[0] // projection_factor
 
     # allocate memory for images with new dimensions
-    shape = (num_images, expected_dimy, expected_dimx)
+    shape = (num_images, ) + _binned_shape(images.data.shape, rebin_param)
     return pu.create_array(shape, images.dtype)
+
+
+def _integer_factors(shape: Tuple[int, ...], binned_shape: Tuple[int, ...], rebin_param) -> Optional[Tuple[int, int]]:
+    """
+    The integer factors that give the binned shape, or None if the images need resizing with interpolation
+    """
+    if isinstance(rebin_param, tuple):
+        return binning.integer_factors_for_shape((shape[0], shape[1]), (binned_shape[0], binned_shape[1]))
+    factor = binning.integer_factor(rebin_param)
+    if factor is None or tuple(binned_shape) != (shape[0] // factor, shape[1] // factor):
+        return None
+    return factor, factor
+
+
+def _bin_stack(images: ImageStack, factors: Tuple[int, int], projection_factor: int, bin_method: str,
+               binned_shape: Tuple[int, int], progress) -> pu.SharedArray:
+    binned_images = _create_reshaped_array(images, binned_shape, projection_factor)
+    params = {"factors": (projection_factor, ) + factors, "method": bin_method}
+    # Block binning is numpy reductions, which release the GIL, and the threads write straight into the binned array
+    ps.run_compute_func(_bin_images,
+                        binned_images.array.shape[0], [images.shared_array, binned_images],
+                        params,
+                        progress,
+                        backend=pu.ExecutionBackend.THREAD)
+    return binned_images
+
+
+def _bin_images(index: int, arrays: List[np.ndarray], params: Dict[str, Any]):
+    data, binned = arrays
+    factors = params["factors"]
+    projections = slice(index * factors[0], (index + 1) * factors[0])
+    binning.bin_blocks(data[projections], factors, params["method"], out=binned[index:index + 1])
+
+
+def _binned_projection_metadata(images: ImageStack,
+                                projection_factor: int) -> Tuple[Optional[List[str]], Optional[ProjectionAngles]]:
+    """
+    The filename of the first projection of each bin, and the mean angle of each bin
+    """
+    if projection_factor == 1:
+        return None, None
+    num_binned = images.data.shape[0] // projection_factor
+    num_used = num_binned * projection_factor
+    filenames = images.filenames
+    if filenames is not None:
+        if len(filenames) != images.data.shape[0]:
+            raise ValueError(f"The stack has {len(filenames)} filenames for {images.data.shape[0]} images")
+        filenames = filenames[:num_used:projection_factor]
+    angles = images.real_projection_angles()
+    if angles is not None:
+        angles = ProjectionAngles(binning.bin_blocks(angles.value[:num_used], (projection_factor, )))
+    return filenames, angles
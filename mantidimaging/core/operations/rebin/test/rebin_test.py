@@ -11,6 +11,9 @@ import numpy.testing as npt
 
 import mantidimaging.test_helpers.unit_test_helper as th
 from mantidimaging.core.operations.rebin import RebinFilter
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.binning import BIN_MEAN, BIN_SUM
+from mantidimaging.core.utility.data_containers import ProjectionAngles
 from mantidimaging.test_helpers.start_qapplication import start_multiprocessing_pool
 
 
@@ -99,6 +102,76 @@ class RebinTest(unittest.TestCase):
         rebin_param = (100000, 100000)
         self.assertRaises(RuntimeError, RebinFilter.filter_func, images, rebin_param=rebin_param, mode=mode)
 
+    @parameterized.expand([("factor", 0.5, (2, 2)), ("fifth", 0.2, (5, 5)), ("shape", (5, 2), (2, 5))])
+    @mock.patch("mantidimaging.core.operations.rebin.rebin.skimage.transform.resize")
+    def test_integer_factor_bins_blocks(self, _, rebin_param, factors, resize):
+        images = th.generate_images((4, 10, 10))
+        data = images.data.copy()
+        expected = data.reshape(4, 10 // factors[0], factors[0], 10 // factors[1], factors[1]).mean(axis=(2, 4))
+
+        result = RebinFilter.filter_func(images, rebin_param=rebin_param)
+
+        resize.assert_not_called()
+        npt.assert_allclose(expected, result.data, rtol=1e-6)
+
+    def test_integer_factor_sum(self):
+        images = th.generate_images((4, 8, 8), dtype=np.int32)
+        data = images.data.copy()
+
+        result = RebinFilter.filter_func(images, rebin_param=0.25, bin_method=BIN_SUM)
+
+        self.assertEqual(np.int32, result.data.dtype)
+        npt.assert_array_equal(data.reshape(4, 2, 4, 2, 4).sum(axis=(2, 4)), result.data)
+
+    def test_bin_projections(self):
+        images = th.generate_images((7, 8, 8))
+        images.set_projection_angles(ProjectionAngles(np.linspace(0, np.pi, 7)))
+        images.filenames = [f"image_{i}.tif" for i in range(7)]
+        data = images.data.copy()
+
+        result = RebinFilter.filter_func(images, rebin_param=0.5, bin_method=BIN_MEAN, projection_factor=3)
+
+        self.assertEqual((2, 4, 4), result.data.shape)
+        npt.assert_allclose(data[:6].reshape(2, 3, 4, 2, 4, 2).mean(axis=(1, 3, 5)), result.data, rtol=1e-6)
+        npt.assert_allclose(
+            np.linspace(0, np.pi, 7)[:6].reshape(2, 3).mean(axis=1),
+            result.real_projection_angles().value)
+        self.assertEqual(["image_0.tif", "image_3.tif"], result.filenames)
+
+    def test_bin_projections_allocates_only_binned_array(self):
+        images = th.generate_images((6, 8, 8))
+
+        with mock.patch("mantidimaging.core.operations.rebin.rebin.pu.create_array",
+                        wraps=pu.create_array) as create_array:
+            RebinFilter.filter_func(images, rebin_param=0.5, projection_factor=3)
+
+        create_array.assert_called_once_with((2, 4, 4), images.dtype)
+
+    def test_bin_projections_filename_mismatch_leaves_stack_unchanged(self):
+        images = th.generate_images((6, 8, 8))
+        images._filenames = ["volume.tif"]
+        data = images.data.copy()
+
+        self.assertRaises(ValueError, RebinFilter.filter_func, images, rebin_param=0.5, projection_factor=3)
+
+        npt.assert_equal(data, images.data)
+        self.assertEqual(["volume.tif"], images.filenames)
+
+    @parameterized.expand([("sum", BIN_SUM, 1), ("projections", BIN_MEAN, 2)])
+    def test_fractional_factor_cannot_bin(self, _, bin_method, projection_factor):
+        images = th.generate_images((4, 10, 10))
+
+        self.assertRaises(ValueError,
+                          RebinFilter.filter_func,
+                          images,
+                          rebin_param=0.3,
+                          bin_method=bin_method,
+                          projection_factor=projection_factor)
+
+    def test_projections_independent(self):
+        self.assertTrue(RebinFilter.projections_independent(rebin_param=0.5))
+        self.assertFalse(RebinFilter.projections_independent(rebin_param=0.5, projection_factor=2))
+
     def test_execute_wrapper_return_is_runnable(self):
         """
         Test that the partial returned by execute_wrapper can be executed (kwargs are named correctly)
@@ -111,10 +184,16 @@ class RebinTest(unittest.TestCase):
         factor.value = mock.Mock(return_value=0.5)
         mode_field = mock.Mock()
         mode_field.currentText = mock.Mock(return_value='reflect')
+        method_field = mock.Mock()
+        method_field.currentText = mock.Mock(return_value=BIN_MEAN)
+        projection_factor_field = mock.Mock()
+        projection_factor_field.value = mock.Mock(return_value=1)
         execute_func = RebinFilter.execute_wrapper(rebin_to_dimensions_radio=rebin_to_dimensions_radio,
                                                    rebin_by_factor_radio=rebin_by_factor_radio,
                                                    factor=factor,
-                                                   mode_field=mode_field)
+                                                   mode_field=mode_field,
+                                                   method_field=method_field,
+                                                   projection_factor_field=projection_factor_field)
 
         images = th.generate_images()
         execute_func(images)
@@ -123,6 +202,8 @@ class RebinTest(unittest.TestCase):
         self.assertEqual(rebin_by_factor_radio.isChecked.call_count, 1)
         self.assertEqual(factor.value.call_count, 1)
         self.assertEqual(mode_field.currentText.call_count, 1)
+        self.assertEqual(method_field.currentText.call_count, 1)
+        self.assertEqual(projection_factor_field.value.call_count, 1)
 
 
 if __name__ == '__main__':
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from functools import partial
 from logging import getLogger
-from typing import List, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 import numpy as np
 
@@ -49,6 +49,7 @@ class RoiNormalisationFilter(BaseFilter):
                     region_of_interest: SensibleROI = None,
                     normalisation_mode: str = DEFAULT_NORMALISATION_MODE,
                     flat_field: Optional[ImageStack] = None,
+                    air_reference: Optional[float] = None,
                     progress=None):
         """Normalise by beam intensity.
 
@@ -69,6 +70,9 @@ class RoiNormalisationFilter(BaseFilter):
 
         :param flat_field: Flat field to use if 'Flat Field' mode is enabled.
 
+        :param air_reference: Precomputed value to normalise the air region means to, used instead of the value
+                              given by normalisation_mode when the filter is run on part of a stack.
+
         :param progress: Reference to a progress bar object
 
         :returns: Filtered data (stack of images)
@@ -76,7 +80,7 @@ class RoiNormalisationFilter(BaseFilter):
         if normalisation_mode not in modes():
             raise ValueError(f"Unknown normalisation_mode: {normalisation_mode}, should be one of {modes()}")
 
-        if normalisation_mode == "Flat Field" and flat_field is None:
+        if normalisation_mode == "Flat Field" and flat_field is None and air_reference is None:
             raise ValueError('flat_field must provided if using normalisation_mode of "Flat Field"')
 
         h.check_data_stack(images)
@@ -85,10 +89,35 @@ class RoiNormalisationFilter(BaseFilter):
             raise ValueError('region_of_interest must be provided')
 
         progress = Progress.ensure_instance(progress, task_name='ROI Normalisation')
-        _execute(images, region_of_interest, normalisation_mode, flat_field, progress)
+        _execute(images, region_of_interest, normalisation_mode, flat_field, progress, air_reference)
         h.check_data_stack(images)
         return images
 
+    @staticmethod
+    def needs_reduction(normalisation_mode: str = DEFAULT_NORMALISATION_MODE, **kwargs) -> bool:
+        return normalisation_mode == 'Stack Average'
+
+    @staticmethod
+    def reduce(images: ImageStack, **kwargs) -> Dict[str, Any]:
+        air_region = kwargs.get('region_of_interest')
+        if not air_region:
+            raise ValueError('region_of_interest must be provided')
+        if isinstance(air_region, list):
+            air_region = SensibleROI.from_list(air_region)
+
+        reference: Optional[ImageStack] = images
+        if kwargs.get('normalisation_mode', DEFAULT_NORMALISATION_MODE) == 'Flat Field':
+            reference = kwargs.get('flat_field')
+        if reference is None:
+            raise ValueError('flat_field must provided if using normalisation_mode of "Flat Field"')
+
+        means = [
+            _calc_mean(image, air_region.left, air_region.top, air_region.right, air_region.bottom)
+            for image in reference.data
+        ]
+        air_means = np.array(means, dtype=reference.dtype)
+        return dict(kwargs, air_reference=air_means.mean())
+
     @staticmethod
     def register_gui(form, on_change, view):
         label, roi_field = add_property_to_form("Air Region",
@@ -155,7 +184,8 @@ def _execute(images: ImageStack,
              air_region: SensibleROI,
              normalisation_mode: str,
              flat_field: Optional[ImageStack],
-             progress=None):
+             progress=None,
+             air_reference: Optional[float] = None):
     log = getLogger(__name__)
 
     with progress:
@@ -177,7 +207,10 @@ def _execute(images: ImageStack,
         arrays = [images.shared_array, air_means]
         ps.execute(do_calculate_air_means, arrays, images.data.shape[0], progress)
 
-        if normalisation_mode == 'Stack Average':
+        if air_reference is not None:
+            air_means.array /= air_reference
+
+        elif normalisation_mode == 'Stack Average':
             air_means.array /= air_means.array.mean()
 
         elif normalisation_mode == 'Flat Field' and flat_field is not None:
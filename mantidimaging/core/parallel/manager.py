@@ -2,7 +2,9 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 from multiprocessing import get_context
+from multiprocessing.pool import ThreadPool
 import os
+import tempfile
 import uuid
 from logging import getLogger
 from typing import List, Optional, TYPE_CHECKING
@@ -15,12 +17,16 @@ if TYPE_CHECKING:
 
 MEM_PREFIX = 'MI'
 MEM_DIR_LINUX = '/dev/shm'
+# Directory for the files backing arrays that are too large to fit in memory. Should be on a fast local disk.
+MAPPED_FILE_DIR = os.environ.get('MANTIDIMAGING_SCRATCH_DIR', os.path.join(tempfile.gettempdir(), 'mantidimaging'))
 CURRENT_PID = psutil.Process().pid
 
 LOG = getLogger(__name__)
 
 cores: int = 1
 pool: Optional['Pool'] = None
+threads: int = os.cpu_count() or 1
+thread_pool: Optional[ThreadPool] = None
 
 
 def create_and_start_pool():
@@ -40,10 +46,29 @@ def _do_nothing(i):
     pass
 
 
+def get_thread_pool() -> ThreadPool:
+    """
+    Get the pool used for the thread execution backend, creating it on first use.
+
+    Unlike the process pool, this doesn't need to be started in advance as threads are cheap to create.
+    """
+    global thread_pool
+    if thread_pool is None:
+        LOG.info('Creating thread pool')
+        thread_pool = ThreadPool(threads)
+    return thread_pool
+
+
 def end_pool():
+    global pool, thread_pool
     if pool:
         pool.close()
         pool.terminate()
+        pool = None
+    if thread_pool:
+        thread_pool.close()
+        thread_pool.terminate()
+        thread_pool = None
 
 
 def generate_mi_shared_mem_name() -> str:
@@ -56,6 +81,14 @@ def clear_memory_from_current_process_linux() -> None:
             free_shared_memory_linux([mem_name])
 
 
+def clear_mapped_files_from_current_process() -> None:
+    if not os.path.isdir(MAPPED_FILE_DIR):
+        return
+    for file_name in os.listdir(MAPPED_FILE_DIR):
+        if _is_mi_memory_from_current_process(file_name):
+            os.remove(os.path.join(MAPPED_FILE_DIR, file_name))
+
+
 def find_memory_from_previous_process_linux() -> List[str]:
     old_memory = []
     for mem_name in _get_shared_mem_names_linux():
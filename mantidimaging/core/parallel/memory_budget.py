@@ -0,0 +1,188 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Callable, Dict, Iterator, List, Optional
+
+from mantidimaging.core.utility.memory_usage import system_free_memory
+
+LOG = getLogger(__name__)
+
+# Environment variable that sets a limit, in MB, on the shared memory held by Mantid Imaging
+BUDGET_ENV_VAR = 'MANTIDIMAGING_SHARED_MEMORY_BUDGET_MB'
+
+PressureListener = Callable[[int], None]
+
+
+@dataclass
+class _Allocation:
+    size: int
+    mapped: bool
+    owner: Optional[uuid.UUID] = None
+
+
+@dataclass
+class OperationUsage:
+    """
+    Shared memory held at the start of an operation, and the most held at any point while it was running
+    """
+    name: str
+    start_bytes: int
+    peak_bytes: int
+
+    @property
+    def peak_increase_bytes(self) -> int:
+        return self.peak_bytes - self.start_bytes
+
+
+class MemoryBudget:
+    """
+    Registry of the shared arrays allocated by this process.
+
+    Every SharedArray that owns its memory registers here, so the total held across stacks, previews, copies and
+    reconstructions is known in one place. Stacks claim their arrays with set_owner, which gives the totals per stack
+    and per dataset.
+
+    An optional limit caps the total held in shared memory. When an allocation would not fit, either in the limit or
+    in the free physical memory, the pressure listeners are called with the number of bytes that need freeing, so
+    that caches can evict before the allocation fails or the OS runs out of memory. Arrays backed by mapped files are
+    tracked separately and do not count against the limit.
+    """
+    def __init__(self, limit_bytes: Optional[int] = None):
+        self.limit_bytes = limit_bytes
+        self._lock = threading.Lock()
+        self._allocations: Dict[str, _Allocation] = {}
+        self._pressure_listeners: List[PressureListener] = []
+        self._active_operations: List[OperationUsage] = []
+        self.operation_usage: Dict[str, OperationUsage] = {}
+
+    def register(self, name: str, size: int, mapped: bool = False) -> None:
+        with self._lock:
+            self._allocations[name] = _Allocation(size, mapped)
+            total = self._total(mapped=False)
+            for usage in self._active_operations:
+                usage.peak_bytes = max(usage.peak_bytes, total)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._allocations.pop(name, None)
+
+    def set_owner(self, name: str, owner: uuid.UUID) -> None:
+        with self._lock:
+            if name in self._allocations:
+                self._allocations[name].owner = owner
+
+    @property
+    def total_bytes(self) -> int:
+        """
+        Total held in shared memory
+        """
+        with self._lock:
+            return self._total(mapped=False)
+
+    @property
+    def mapped_bytes(self) -> int:
+        """
+        Total held in memory-mapped files
+        """
+        with self._lock:
+            return self._total(mapped=True)
+
+    def owner_bytes(self, owner: uuid.UUID) -> int:
+        """
+        Total held by a stack, in shared memory and in mapped files
+        """
+        with self._lock:
+            return sum(allocation.size for allocation in self._allocations.values() if allocation.owner == owner)
+
+    def usage_by_owner(self) -> Dict[Optional[uuid.UUID], int]:
+        """
+        Totals for each stack. Arrays that don't belong to any stack are under None.
+        """
+        usage: Dict[Optional[uuid.UUID], int] = {}
+        with self._lock:
+            for allocation in self._allocations.values():
+                usage[allocation.owner] = usage.get(allocation.owner, 0) + allocation.size
+        return usage
+
+    def add_pressure_listener(self, listener: PressureListener) -> None:
+        self._pressure_listeners.append(listener)
+
+    def remove_pressure_listener(self, listener: PressureListener) -> None:
+        self._pressure_listeners.remove(listener)
+
+    def enough_memory(self, size: int, shared: bool = True) -> bool:
+        """
+        Check if size bytes can be allocated. If not, the pressure listeners are asked to free the shortfall, and the
+        check is repeated.
+
+        :param size: Number of bytes to allocate
+        :param shared: Whether the allocation will be in shared memory, and so count against the limit
+        :return: True if the allocation fits
+        """
+        shortfall = self._shortfall(size, shared)
+        if shortfall <= 0:
+            return True
+
+        LOG.info(f"Memory pressure, {shortfall} bytes needed to allocate {size} bytes")
+        for listener in list(self._pressure_listeners):
+            listener(shortfall)
+        return self._shortfall(size, shared) <= 0
+
+    def fits(self, size: int, shared: bool = True) -> bool:
+        """
+        Check if size bytes could be allocated now, without asking the pressure listeners to free anything. Used for
+        estimates shown before the allocation is made.
+
+        :param size: Number of bytes to allocate
+        :param shared: Whether the allocation will be in shared memory, and so count against the limit
+        :return: True if the allocation fits
+        """
+        return self._shortfall(size, shared) <= 0
+
+    @contextmanager
+    def track_operation(self, name: str) -> Iterator[OperationUsage]:
+        """
+        Record the peak shared memory held while an operation runs. The result is kept in operation_usage.
+        """
+        with self._lock:
+            start = self._total(mapped=False)
+            usage = OperationUsage(name, start, start)
+            self._active_operations.append(usage)
+        try:
+            yield usage
+        finally:
+            with self._lock:
+                self._active_operations.remove(usage)
+            self.operation_usage[name] = usage
+            LOG.info(f"{name}: peak shared memory {usage.peak_bytes} bytes, "
+                     f"{usage.peak_increase_bytes} bytes more than at the start")
+
+    def _total(self, mapped: bool) -> int:
+        return sum(allocation.size for allocation in self._allocations.values() if allocation.mapped == mapped)
+
+    def _shortfall(self, size: int, shared: bool) -> int:
+        shortfall = size - int(system_free_memory().kb() * 1024)
+        if shared and self.limit_bytes is not None:
+            shortfall = max(shortfall, self.total_bytes + size - self.limit_bytes)
+        return shortfall
+
+
+def _limit_from_environment() -> Optional[int]:
+    value = os.environ.get(BUDGET_ENV_VAR)
+    if not value:
+        return None
+    try:
+        return int(float(value) * 1024 * 1024)
+    except ValueError:
+        LOG.warning(f"Ignoring invalid {BUDGET_ENV_VAR}: {value}")
+        return None
+
+
+memory_budget = MemoryBudget(_limit_from_environment())
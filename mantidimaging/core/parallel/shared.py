@@ -54,13 +54,15 @@ def execute(partial_func: partial,
             arrays: List[pu.SharedArray],
             num_operations: int,
             progress=None,
-            msg: str = '') -> None:
+            msg: str = '',
+            backend: pu.ExecutionBackend = pu.ExecutionBackend.PROCESS) -> None:
     """
     Executes a function a given number of times using the provided list of SharedArray objects.
 
-    If all the arrays in the list use shared memory then the execution is done in parallel, with each process
-    accessing the data in shared memory.
+    With the PROCESS backend, if all the arrays in the list use shared memory then the execution is done in parallel,
+    with each process accessing the data in shared memory.
     If any arrays in the list do not use shared memory then the execution will be performed synchronously.
+    With the THREAD backend the execution is done in parallel by threads, whether or not the arrays use shared memory.
 
     :param partial_func: A function constructed using create_partial
     :param arrays: The list of SharedArray objects that the operations should be performed on
@@ -68,12 +70,13 @@ def execute(partial_func: partial,
                            Also used to set the number of progress steps
     :param progress: Progress instance to use for progress reporting (optional)
     :param msg: Message to be shown on the progress bar
+    :param backend: The ExecutionBackend used to run the operations in parallel
     :return:
     """
 
-    all_data_in_shared_memory, data = _check_shared_mem_and_get_data(arrays)
+    all_data_in_shared_memory, data = _get_data_for_backend(arrays, backend)
     partial_func = partial(partial_func, data)
-    pu.execute_impl(num_operations, partial_func, all_data_in_shared_memory, progress, msg)
+    pu.execute_impl(num_operations, partial_func, all_data_in_shared_memory, progress, msg, backend)
 
 
 ComputeFuncType = Union[Callable[[int, List['ndarray'], Dict[str, Any]], None],
@@ -98,26 +101,37 @@ def run_compute_func(func: ComputeFuncType,
                      num_operations: int,
                      arrays: Union[List[pu.SharedArray], pu.SharedArray],
                      params: Dict[str, Any],
-                     progress=None):
+                     progress=None,
+                     backend: pu.ExecutionBackend = pu.ExecutionBackend.PROCESS):
     if isinstance(arrays, pu.SharedArray):
         arrays = [arrays]
-    all_data_in_shared_memory, data = _check_shared_mem_and_get_data(arrays)
+    all_data_in_shared_memory, data = _get_data_for_backend(arrays, backend)
     worker_func = _Worker(func, data, params)
-    pu.run_compute_func_impl(worker_func, num_operations, all_data_in_shared_memory, progress)
+    pu.run_compute_func_impl(worker_func, num_operations, all_data_in_shared_memory, progress, backend=backend)
+
+
+def _get_data_for_backend(
+        arrays: List[pu.SharedArray],
+        backend: pu.ExecutionBackend) -> Tuple[bool, Union[List[pu.SharedArray], List[pu.SharedArrayProxy]]]:
+    if backend is pu.ExecutionBackend.THREAD:
+        # Threads share the memory of this process, so the arrays can be used directly
+        return all(shared_array.has_shared_memory for shared_array in arrays), arrays
+    return _check_shared_mem_and_get_data(arrays)
 
 
 def _check_shared_mem_and_get_data(
         arrays: List[pu.SharedArray]) -> Tuple[bool, Union[List[pu.SharedArray], List[pu.SharedArrayProxy]]]:
     """
     Checks if all shared arrays in shared_list are using shared memory and returns this result in the first element
-    of the tuple. The second element of the tuple gives the data to use in the processing.
+    of the tuple. The second element of the tuple gives the data to use in the processing. Arrays that can only be
+    used by other processes once they are copied into shared memory are copied first.
     """
+    if not all(shared_array.can_share for shared_array in arrays):
+        return False, arrays
     data = []
     for shared_array in arrays:
-        if shared_array.has_shared_memory:
-            # If we're using shared memory then we must use the SharedArrayProxy for the data. This allows us to
-            # look up the SharedArray from within a subprocess without needing to pass it in directly
-            data.append(shared_array.array_proxy)
-        else:
-            return False, arrays
+        shared_array.share()
+        # If we're using shared memory then we must use the SharedArrayProxy for the data. This allows us to
+        # look up the SharedArray from within a subprocess without needing to pass it in directly
+        data.append(shared_array.array_proxy)
     return True, data
@@ -1,6 +1,8 @@
 # Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -59,3 +61,15 @@ class ParallelManagerTest(unittest.TestCase):
         _mock_getmtime.return_value = psutil.Process().create_time() - 3600
 
         self.assertEqual(files_to_remove, pm.find_memory_from_previous_process_linux())
+
+    def test_clear_mapped_files_from_current_process(self):
+        files = [f'MI_{CURRENT_PID}_123', f'MI_{OLD_PID}_123', 'other_file']
+        with tempfile.TemporaryDirectory() as scratch_dir:
+            for file_name in files:
+                open(os.path.join(scratch_dir, file_name), 'w').close()
+
+            with patch('mantidimaging.core.parallel.manager.CURRENT_PID', CURRENT_PID), \
+                    patch('mantidimaging.core.parallel.manager.MAPPED_FILE_DIR', scratch_dir):
+                pm.clear_mapped_files_from_current_process()
+
+            self.assertEqual(sorted(files[1:]), sorted(os.listdir(scratch_dir)))
@@ -0,0 +1,124 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import unittest
+import uuid
+from unittest import mock
+
+import numpy as np
+
+from mantidimaging.core.data import ImageStack
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.parallel.memory_budget import MemoryBudget, memory_budget
+
+MB = 1024 * 1024
+
+
+class MemoryBudgetTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.budget = MemoryBudget()
+        free_memory_patcher = mock.patch('mantidimaging.core.parallel.memory_budget.system_free_memory')
+        self.mock_free_memory = free_memory_patcher.start()
+        self.mock_free_memory.return_value.kb.return_value = 1024
+        self.addCleanup(free_memory_patcher.stop)
+
+    def test_totals(self):
+        self.budget.register("a", 10)
+        self.budget.register("b", 20)
+        self.budget.register("c", 40, mapped=True)
+        self.assertEqual(30, self.budget.total_bytes)
+        self.assertEqual(40, self.budget.mapped_bytes)
+
+        self.budget.unregister("a")
+        self.assertEqual(20, self.budget.total_bytes)
+
+    def test_usage_by_owner(self):
+        stack_id = uuid.uuid4()
+        self.budget.register("a", 10)
+        self.budget.register("b", 20)
+        self.budget.set_owner("b", stack_id)
+
+        self.assertEqual(20, self.budget.owner_bytes(stack_id))
+        self.assertEqual({None: 10, stack_id: 20}, self.budget.usage_by_owner())
+
+    def test_enough_memory_within_limit(self):
+        self.budget.limit_bytes = 100
+        self.budget.register("a", 60)
+        self.assertTrue(self.budget.enough_memory(40))
+        self.assertFalse(self.budget.enough_memory(41))
+        # Allocations outside of shared memory only need to fit in the free physical memory
+        self.assertTrue(self.budget.enough_memory(41, shared=False))
+
+    def test_enough_memory_checks_system_free_memory(self):
+        self.assertTrue(self.budget.enough_memory(MB))
+        self.assertFalse(self.budget.enough_memory(MB + 1))
+
+    def test_fits_does_not_ask_listeners_to_free_memory(self):
+        listener = mock.Mock()
+        self.budget.add_pressure_listener(listener)
+        self.budget.limit_bytes = 100
+        self.budget.register("a", 60)
+
+        self.assertTrue(self.budget.fits(40))
+        self.assertFalse(self.budget.fits(41))
+        self.assertTrue(self.budget.fits(41, shared=False))
+        listener.assert_not_called()
+
+    def test_pressure_listeners_asked_to_free_shortfall(self):
+        self.budget.limit_bytes = 100
+        self.budget.register("a", 60)
+
+        def free_cache(shortfall):
+            self.assertEqual(10, shortfall)
+            self.budget.unregister("a")
+
+        listener = mock.Mock(side_effect=free_cache)
+        self.budget.add_pressure_listener(listener)
+
+        self.assertTrue(self.budget.enough_memory(50))
+        listener.assert_called_once_with(10)
+
+    def test_pressure_listeners_not_called_when_allocation_fits(self):
+        listener = mock.Mock()
+        self.budget.add_pressure_listener(listener)
+        self.assertTrue(self.budget.enough_memory(10))
+        listener.assert_not_called()
+
+    def test_track_operation_records_peak(self):
+        self.budget.register("a", 10)
+        with self.budget.track_operation("Test op"):
+            self.budget.register("b", 30)
+            self.budget.unregister("b")
+            self.budget.register("c", 5)
+
+        usage = self.budget.operation_usage["Test op"]
+        self.assertEqual(10, usage.start_bytes)
+        self.assertEqual(40, usage.peak_bytes)
+        self.assertEqual(30, usage.peak_increase_bytes)
+
+
+class SharedArrayBudgetTest(unittest.TestCase):
+    def test_shared_array_registered_until_freed(self):
+        pu.clear_segment_pool()
+        total = memory_budget.total_bytes
+        shared_array = pu.create_array((4, 5), np.float32)
+        self.assertEqual(total + 4 * 5 * 4, memory_budget.total_bytes)
+
+        # The segment is still held while it is kept for re-use
+        del shared_array
+        self.assertEqual(total + 4 * 5 * 4, memory_budget.total_bytes)
+
+        pu.clear_segment_pool()
+        self.assertEqual(total, memory_budget.total_bytes)
+
+    def test_image_stack_owns_its_array(self):
+        images = ImageStack(pu.create_array((2, 4, 5), np.float32))
+        self.assertEqual(2 * 4 * 5 * 4, images.shared_memory_bytes)
+
+        images.shared_array = pu.create_array((1, 4, 5), np.float32)
+        self.assertEqual(4 * 5 * 4, images.shared_memory_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
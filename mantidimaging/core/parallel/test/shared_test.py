@@ -5,7 +5,7 @@ import unittest
 from unittest import mock
 
 from mantidimaging.core.parallel import shared as ps
-from mantidimaging.core.parallel.utility import SharedArrayProxy
+from mantidimaging.core.parallel.utility import SharedArrayProxy, ExecutionBackend
 
 
 class SharedTest(unittest.TestCase):
@@ -30,11 +30,23 @@ class SharedTest(unittest.TestCase):
         self.assertTrue(len(data) == 5)
         self.assertTrue(isinstance(data[0], mock.Mock))
 
+    def test_get_data_for_thread_backend_uses_arrays_directly(self):
+        arrays = self._create_array_list(3, True)
+        _, data = ps._get_data_for_backend(arrays, ExecutionBackend.THREAD)
+        self.assertIs(arrays, data)
+
+    def test_get_data_for_process_backend_uses_proxies(self):
+        arrays = self._create_array_list(3, True)
+        all_in_shared_memory, data = ps._get_data_for_backend(arrays, ExecutionBackend.PROCESS)
+        self.assertTrue(all_in_shared_memory)
+        self.assertTrue(isinstance(data[0], SharedArrayProxy))
+
     def _create_array_list(self, num_arrays, has_shared_mem):
         array_list = []
         for _ in range(num_arrays):
             mock_array = mock.Mock()
             mock_array.has_shared_memory = has_shared_mem
+            mock_array.can_share = has_shared_mem
             mock_array.array_proxy = SharedArrayProxy(None, (2, 2), 'float32') if has_shared_mem else mock.Mock()
             array_list.append(mock_array)
         return array_list
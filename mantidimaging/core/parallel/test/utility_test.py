@@ -2,6 +2,8 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import os
+
 import numpy as np
 from unittest import mock
 
@@ -10,7 +12,9 @@ import numpy.testing as npt
 
 from mantidimaging.test_helpers import unit_test_helper as th
 from mantidimaging.core.parallel.utility import _create_shared_array, execute_impl, multiprocessing_necessary,\
-    copy_into_shared_memory
+    copy_into_shared_memory, run_compute_func_impl, calculate_slab_size, SLABS_PER_CORE, SharedArrayProxy, \
+    ExecutionBackend, run_synchronously
+from mantidimaging.core.parallel import utility as pu
 
 
 @pytest.mark.parametrize(
@@ -33,16 +37,68 @@ def test_execute_impl_seq():
     mock_progress.update.assert_called_once_with(1, "Test")
 
 
+@mock.patch('mantidimaging.core.parallel.utility.pm.cores', 2)
 @mock.patch('mantidimaging.core.parallel.utility.pm.pool')
 def test_execute_impl_par(mock_pool):
     mock_partial = mock.Mock()
     mock_progress = mock.Mock()
-    mock_pool.imap.return_value = range(15)
+    mock_pool.imap.side_effect = lambda func, iterable: map(func, iterable)
     execute_impl(15, mock_partial, True, mock_progress, "Test")
-    mock_pool.imap.assert_called_once()
+    # One pass to measure the cost of a slice, then one pass for the remaining slabs
+    assert mock_pool.imap.call_count == 2
+    assert sorted(c.args[0] for c in mock_partial.call_args_list) == list(range(15))
+    assert mock_progress.update.call_count == 15
+
+
+@mock.patch('mantidimaging.core.parallel.utility.pm.cores', 2)
+@mock.patch('mantidimaging.core.parallel.utility.pm.pool')
+def test_run_compute_func_impl_par_sends_slabs(mock_pool):
+    mock_worker = mock.Mock()
+    mock_progress = mock.Mock()
+    mock_pool.imap.side_effect = lambda func, iterable: map(func, iterable)
+    run_compute_func_impl(mock_worker, 100, True, mock_progress, "Test")
+
+    probe_slabs = list(mock_pool.imap.call_args_list[0].args[1])
+    assert probe_slabs == [(0, 1), (1, 2)]
+    slabs = list(mock_pool.imap.call_args_list[1].args[1])
+    # Cheap operations should be batched, up to the limit that keeps all cores busy
+    assert len(slabs) == 2 * SLABS_PER_CORE + 1
+    assert slabs[0][0] == 2 and slabs[-1][1] == 100
+    assert mock_worker.call_count == 100
+    assert mock_progress.update.call_count == 100
+
+
+@mock.patch('mantidimaging.core.parallel.utility.pm.pool')
+def test_execute_impl_thread_backend_does_not_need_shared_data(mock_pool):
+    indices = []
+    mock_progress = mock.Mock()
+    execute_impl(15, indices.append, False, mock_progress, "Test", ExecutionBackend.THREAD)
+    mock_pool.imap.assert_not_called()
+    assert sorted(indices) == list(range(15))
     assert mock_progress.update.call_count == 15
 
 
+@mock.patch('mantidimaging.core.parallel.utility.pm.get_thread_pool')
+def test_run_synchronously_disables_parallel_execution(mock_get_thread_pool):
+    indices = []
+    with run_synchronously():
+        execute_impl(15, indices.append, False, mock.Mock(), "Test", ExecutionBackend.THREAD)
+    mock_get_thread_pool.assert_not_called()
+    assert indices == list(range(15))
+
+
+@pytest.mark.parametrize(
+    'seconds_per_slice,num_slices,cores,expected',
+    (
+        [0.0, 100, 2, 100 // (2 * SLABS_PER_CORE)],  # unmeasurably fast uses the largest slab allowed
+        [0.001, 10000, 2, 50],  # slab sized to take the target time
+        [1.0, 10000, 2, 1],  # slow operations are sent one slice at a time
+        [0.001, 5, 8, 1],  # fewer slices than cores
+    ))
+def test_calculate_slab_size(seconds_per_slice, num_slices, cores, expected):
+    assert calculate_slab_size(seconds_per_slice, num_slices, cores) == expected
+
+
 @pytest.mark.parametrize('dtype,expected_dtype', [
     [np.uint8, np.uint8],
     ['uint8', np.uint8],
@@ -71,13 +127,22 @@ def test_copy_into_shared_memory():
     npt.assert_equal(shared_array.array, array)
 
 
+def _create_shared_array_owned_elsewhere(shape, dtype) -> pu.SharedArray:
+    """
+    Create a shared array that proxies attach to in the same way as they would in a worker process
+    """
+    shared_array = _create_shared_array(shape, dtype)
+    del pu._owned_segments[shared_array.name]
+    return shared_array
+
+
 def test_looking_up_shared_array_from_proxy():
     shape = (5, 5, 5)
     dtype = np.float32
     array = th.gen_img_numpy_rand(shape)
 
     # Create an array in shared memory to look up
-    shared_array = _create_shared_array(shape, dtype)
+    shared_array = _create_shared_array_owned_elsewhere(shape, dtype)
     shared_array.array[:] = array[:]
 
     # Create the proxy
@@ -91,6 +156,207 @@ def test_looking_up_shared_array_from_proxy():
     assert shared_array._shared_memory.name == proxy._shared_array._shared_memory.name
 
 
+def test_proxies_reuse_attached_segment():
+    shared_array = _create_shared_array_owned_elsewhere((5, 5, 5), np.float32)
+    proxy_1 = shared_array.array_proxy
+    proxy_2 = shared_array.array_proxy
+
+    with mock.patch('mantidimaging.core.parallel.utility.shared_memory.SharedMemory',
+                    wraps=pu.shared_memory.SharedMemory) as mock_shared_memory:
+        proxy_1.array
+        proxy_2.array
+    mock_shared_memory.assert_called_once()
+    assert proxy_1._shared_array is proxy_2._shared_array
+
+
+def test_attach_cache_is_bounded():
+    shared_arrays = [_create_shared_array_owned_elsewhere((2, 2), np.float32) for _ in range(pu.ATTACH_CACHE_SIZE + 2)]
+    for shared_array in shared_arrays:
+        shared_array.array_proxy.array
+
+    assert len(pu._attached_arrays) == pu.ATTACH_CACHE_SIZE
+    assert shared_arrays[0]._shared_memory.name not in pu._attached_arrays
+    assert shared_arrays[-1]._shared_memory.name in pu._attached_arrays
+
+
+def test_attached_segment_dropped_when_owner_deleted():
+    shared_array = _create_shared_array_owned_elsewhere((2, 2), np.float32)
+    mem_name = shared_array._shared_memory.name
+    SharedArrayProxy(mem_name, (2, 2), np.float32).array
+    assert mem_name in pu._attached_arrays
+
+    del shared_array
+    assert mem_name not in pu._attached_arrays
+
+
+@mock.patch('mantidimaging.core.parallel.utility.enough_memory', return_value=False)
+def test_create_array_uses_mapped_file_when_not_enough_memory(_mock_enough_memory, tmp_path):
+    pu.clear_segment_pool()
+    with mock.patch('mantidimaging.core.parallel.utility.pm.MAPPED_FILE_DIR', str(tmp_path)):
+        shared_array = pu.create_array((5, 4, 3), np.uint16)
+
+    assert shared_array.has_shared_memory
+    assert shared_array.mapped_file is not None
+    assert os.path.dirname(shared_array.mapped_file) == str(tmp_path)
+    assert shared_array.array.shape == (5, 4, 3)
+    assert shared_array.array.dtype == np.uint16
+
+
+@mock.patch('mantidimaging.core.parallel.utility.enough_disk_space', return_value=False)
+@mock.patch('mantidimaging.core.parallel.utility.enough_memory', return_value=False)
+def test_create_array_not_enough_memory_or_disk_space(_mock_enough_memory, _mock_enough_disk_space):
+    pu.clear_segment_pool()
+    with pytest.raises(RuntimeError):
+        pu.create_array((5, 4, 3))
+
+
+def test_looking_up_mapped_array_from_proxy(tmp_path):
+    with mock.patch('mantidimaging.core.parallel.utility.pm.MAPPED_FILE_DIR', str(tmp_path)):
+        shared_array = pu._create_mapped_array((5, 4, 3), np.float32)
+    proxy = shared_array.array_proxy
+
+    proxy.array[2] = 7
+    npt.assert_equal(shared_array.array[2], 7)
+    assert not proxy._shared_array._free_mem_on_del
+    assert proxy._shared_array.mapped_file == shared_array.mapped_file
+
+
+def test_proxy_in_owning_process_uses_owner():
+    shared_array = pu.create_array((4, 5, 6), np.float32)
+    mem_name = shared_array.name
+    proxy = shared_array.array_proxy
+    assert proxy.array is shared_array.array
+    assert mem_name not in pu._attached_arrays
+
+    view = proxy.array[1:]
+    del shared_array, proxy
+    assert mem_name not in pu._segment_pool
+    del view
+
+
+def test_mapped_file_removed_when_deleted(tmp_path):
+    with mock.patch('mantidimaging.core.parallel.utility.pm.MAPPED_FILE_DIR', str(tmp_path)):
+        shared_array = pu._create_mapped_array((5, 4, 3), np.float32)
+    mapped_file = shared_array.mapped_file
+    shared_array.array_proxy.array
+    assert os.path.exists(mapped_file)
+    assert mapped_file in pu._attached_arrays
+
+    del shared_array
+    assert not os.path.exists(mapped_file)
+    assert mapped_file not in pu._attached_arrays
+
+
+def test_freed_segment_recycled_for_same_size():
+    shared_array = pu.create_array((4, 5, 6), np.float32)
+    mem_name = shared_array.name
+    shared_array.array[:] = 3
+
+    del shared_array
+    assert mem_name in pu._segment_pool
+    recycled = pu.create_array((6, 20), np.int32)
+
+    assert recycled.name == mem_name
+    assert mem_name not in pu._segment_pool
+    assert recycled.array.shape == (6, 20)
+    assert recycled.array.dtype == np.int32
+
+
+def test_segment_with_live_views_not_recycled():
+    shared_array = pu.create_array((10, 10, 10), np.float32)
+    mem_name = shared_array.name
+    shared_array.array[:] = 1
+    view = shared_array.array
+
+    del shared_array
+    assert mem_name not in pu._segment_pool
+    other = pu.create_array((10, 10, 10), np.float32)
+    other.array[:] = 5
+
+    npt.assert_equal(view, 1)
+
+
+@mock.patch('mantidimaging.core.parallel.utility._pool_closed', False)
+def test_pool_drained_at_exit():
+    shared_array = pu.create_array((4, 5, 6), np.float32)
+    mem_name = shared_array.name
+    del shared_array
+    assert mem_name in pu._segment_pool
+
+    pu._clear_segment_pool_at_exit()
+    assert not pu._segment_pool
+
+    freed_after_exit = pu.create_array((4, 5, 6), np.float32)
+    del freed_after_exit
+    assert not pu._segment_pool
+
+
+def test_zeroed_array_not_recycled():
+    shared_array = pu.create_array((4, 5, 6), np.float32)
+    mem_name = shared_array.name
+    shared_array.array[:] = 3
+
+    del shared_array
+    zeroed = pu.create_array((4, 5, 6), np.float32, zeroed=True)
+
+    assert zeroed.name != mem_name
+    assert mem_name in pu._segment_pool
+    npt.assert_equal(zeroed.array, 0)
+
+
+def test_pooled_segment_kept_open():
+    shared_array = pu.create_array((4, 5, 6), np.float32)
+    mem_name = shared_array.name
+    del shared_array
+    assert pu._segment_pool[mem_name].buf is not None
+
+    recycled = pu.create_array((4, 5, 6), np.float32)
+    recycled.array[:] = 2
+    npt.assert_equal(SharedArrayProxy(mem_name, (4, 5, 6), np.float32).array, 2)
+
+
+def test_segment_closed_when_views_are_gone():
+    shared_array = pu.create_array((10, 10, 10), np.float32)
+    mem = shared_array._shared_memory
+    view = shared_array.array[2:5][::2]
+
+    del shared_array
+    assert mem.buf is not None
+    assert mem.name not in pu._segment_pool
+
+    del view
+    assert mem.buf is None
+    assert mem.name not in pu._segment_pool
+
+
+def test_segment_pool_is_bounded():
+    pu.clear_segment_pool()
+    with mock.patch('mantidimaging.core.parallel.utility.SEGMENT_POOL_BYTES', 2 * 100 * 4):
+        shared_arrays = [pu.create_array((100, ), np.float32) for _ in range(3)]
+        mem_names = [shared_array.name for shared_array in shared_arrays]
+        while shared_arrays:
+            del shared_arrays[0]
+
+        assert list(pu._segment_pool) == mem_names[1:]
+
+        too_large = pu.create_array((201, ), np.float32)
+        too_large_name = too_large.name
+        del too_large
+        assert too_large_name not in pu._segment_pool
+
+
+def test_pooled_segments_freed_under_memory_pressure():
+    pu.clear_segment_pool()
+    shared_arrays = [pu.create_array((100, ), np.float32) for _ in range(3)]
+    mem_names = [shared_array.name for shared_array in shared_arrays]
+    while shared_arrays:
+        del shared_arrays[0]
+
+    pu._free_pooled_segments(2 * 100 * 4)
+
+    assert list(pu._segment_pool) == mem_names[2:]
+
+
 if __name__ == "__main__":
     import pytest
 
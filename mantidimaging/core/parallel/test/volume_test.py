@@ -0,0 +1,63 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import unittest
+from functools import partial
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+import scipy.ndimage as scipy_ndimage
+from parameterized import parameterized
+
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.parallel import volume
+from mantidimaging.core.parallel.volume import filter_volume
+
+
+def _volume(num_planes: int) -> pu.SharedArray:
+    shared_array = pu.create_array((num_planes, 9, 11), np.float32)
+    shared_array.array[:] = np.random.default_rng(7).random(shared_array.array.shape)
+    return shared_array
+
+
+class VolumeTest(unittest.TestCase):
+    @parameterized.expand([
+        ("median", partial(scipy_ndimage.median_filter, size=3, mode='reflect'), 1, False),
+        ("median_5_wrap", partial(scipy_ndimage.median_filter, size=5, mode='wrap'), 2, True),
+        ("gaussian", partial(scipy_ndimage.gaussian_filter, sigma=0.5, mode='nearest'), 2, False),
+        ("gaussian_wrap", partial(scipy_ndimage.gaussian_filter, sigma=0.5, mode='wrap'), 2, True),
+    ])
+    def test_matches_filtering_whole_volume(self, _, func, halo, wrap):
+        shared_array = _volume(23)
+        expected = func(shared_array.array.copy())
+
+        # Small slabs so the volume is split into many
+        filter_volume(func, shared_array, halo, wrap, slab_bytes=9 * 11 * 4 * 2)
+
+        npt.assert_array_equal(expected, shared_array.array)
+
+    @mock.patch("mantidimaging.core.parallel.volume.ps.run_compute_func")
+    def test_one_slab_filtered_directly(self, run_compute_func):
+        shared_array = _volume(3)
+        expected = scipy_ndimage.median_filter(shared_array.array, size=3)
+
+        filter_volume(partial(scipy_ndimage.median_filter, size=3), shared_array, 2)
+
+        run_compute_func.assert_not_called()
+        npt.assert_array_equal(expected, shared_array.array)
+
+    @parameterized.expand([(23, 1, 2), (23, 3, 2), (10, 4, 1), (7, 1, 100)])
+    def test_slab_bounds(self, num_planes, halo, slab_planes):
+        bounds = volume._slab_bounds(num_planes, 100, halo, slab_planes * 100)
+
+        self.assertEqual(0, bounds[0])
+        self.assertEqual(num_planes, bounds[-1])
+        slab_sizes = np.diff(bounds)
+        self.assertTrue(np.all(slab_sizes >= halo))
+        self.assertTrue(np.all(slab_sizes[:-1] <= max(slab_planes, 2 * halo)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,43 +2,98 @@
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
 
+import atexit
 import os
+import shutil
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from enum import Enum, auto
 from logging import getLogger
 from multiprocessing import shared_memory
-from typing import Tuple, TYPE_CHECKING, Optional, Callable
+from typing import Any, Iterator, List, Tuple, TYPE_CHECKING, Optional, Callable
 
 import numpy as np
 
-from mantidimaging.core.utility.memory_usage import system_free_memory
 from mantidimaging.core.utility.progress_reporting import Progress
-from mantidimaging.core.utility.size_calculator import full_size_KB, full_size_bytes
+from mantidimaging.core.utility.size_calculator import full_size_bytes
 from mantidimaging.core.parallel import manager as pm
+from mantidimaging.core.parallel.memory_budget import memory_budget
 
 if TYPE_CHECKING:
+    import uuid
     from functools import partial
     import numpy.typing as npt
+    from multiprocessing.pool import Pool
     from multiprocessing.shared_memory import SharedMemory
 
 LOG = getLogger(__name__)
 
+# Wall time that each task sent to the pool should take. Long enough to amortise the pickling and IPC cost of a task,
+# short enough that the work stays balanced across processes.
+TARGET_TASK_SECONDS = 0.05
+# Minimum number of slabs each core should receive, so a slow slab near the end doesn't leave the other cores idle
+SLABS_PER_CORE = 4
+# Maximum number of shared memory segments that each process keeps attached for re-use by SharedArrayProxy objects
+ATTACH_CACHE_SIZE = 16
+# Maximum total size of the freed shared memory segments that are kept for re-use by arrays of the same size
+SEGMENT_POOL_BYTES = 1024 * 1024 * 1024
+
+
+class ExecutionBackend(Enum):
+    """
+    How work is spread across cores by ps.execute and ps.run_compute_func.
+
+    PROCESS uses the multiprocessing pool, so all the data must be in shared memory for it to run in parallel.
+    THREAD uses a pool of threads in this process and works on any ndarray. It is only faster for operations that
+    spend their time in numpy or scipy code that releases the GIL.
+    """
+    PROCESS = auto()
+    THREAD = auto()
+
 
 def enough_memory(shape, dtype):
-    return full_size_KB(shape=shape, dtype=dtype) < system_free_memory().kb()
+    return memory_budget.enough_memory(full_size_bytes(shape, dtype))
+
 
+def enough_disk_space(shape, dtype):
+    directory = pm.MAPPED_FILE_DIR if os.path.isdir(pm.MAPPED_FILE_DIR) else os.path.dirname(pm.MAPPED_FILE_DIR)
+    return full_size_bytes(shape, dtype) < shutil.disk_usage(directory).free
 
-def create_array(shape: Tuple[int, ...], dtype: 'npt.DTypeLike' = np.float32) -> 'SharedArray':
+
+def create_array(shape: Tuple[int, ...], dtype: 'npt.DTypeLike' = np.float32, zeroed: bool = False) -> 'SharedArray':
     """
-    Create an array in shared memory
+    Create an array in shared memory.
+
+    A recently freed segment of the same size is re-used if there is one, which avoids the cost of the OS allocating and
+    zero filling new pages. The array then holds whatever the previous array left in it, so callers that do not write
+    to every element must ask for a zeroed array.
+
+    If there is not enough physical memory available, the array is backed by a memory-mapped file in
+    pm.MAPPED_FILE_DIR instead. The OS then pages the data in and out as it is used, so processing it a slice at a time
+    keeps the resident memory bounded.
 
     :param shape: Shape of the array
     :param dtype: Dtype of the array
+    :param zeroed: Whether the array must be filled with zeros. If True a recycled segment is never used.
     :return: The created SharedArray
     """
-    if not enough_memory(shape, dtype):
-        raise RuntimeError(
-            "The machine does not have enough physical memory available to allocate space for this data.")
+    if not zeroed:
+        recycled = _take_pooled_segment(shape, dtype)
+        if recycled is not None:
+            return recycled
 
-    return _create_shared_array(shape, dtype)
+    if enough_memory(shape, dtype):
+        return _create_shared_array(shape, dtype)
+
+    if enough_disk_space(shape, dtype):
+        return _create_mapped_array(shape, dtype)
+
+    raise RuntimeError("The machine does not have enough physical memory or scratch disk space available to allocate "
+                       "space for this data.")
 
 
 def _create_shared_array(shape: Tuple[int, ...], dtype: 'npt.DTypeLike' = np.float32) -> 'SharedArray':
@@ -48,13 +103,43 @@ def _create_shared_array(shape: Tuple[int, ...], dtype: 'npt.DTypeLike' = np.flo
 
     name = pm.generate_mi_shared_mem_name()
     mem = shared_memory.SharedMemory(name=name, create=True, size=size)
+    memory_budget.register(name, size)
+    return _read_array_from_shared_memory(shape, dtype, mem, True)
+
+
+def _take_pooled_segment(shape: Tuple[int, ...], dtype: 'npt.DTypeLike') -> Optional['SharedArray']:
+    size = full_size_bytes(shape, dtype)
+    with _segment_pool_lock:
+        # Take the most recently freed segment, as its pages are the most likely to still be in the CPU caches
+        for name in reversed(_segment_pool):
+            if _segment_pool[name].size == size:
+                mem = _segment_pool.pop(name)
+                break
+        else:
+            return None
+
+    LOG.info(f'Recycled shared array with shape={shape}, size={size}, dtype={dtype}')
     return _read_array_from_shared_memory(shape, dtype, mem, True)
 
 
+def _create_mapped_array(shape: Tuple[int, ...], dtype: 'npt.DTypeLike' = np.float32) -> 'SharedArray':
+    os.makedirs(pm.MAPPED_FILE_DIR, exist_ok=True)
+    file_name = os.path.join(pm.MAPPED_FILE_DIR, pm.generate_mi_shared_mem_name())
+
+    LOG.info(f'Not enough memory for shared array with shape={shape}, dtype={dtype}, using file {file_name}')
+
+    array = np.memmap(file_name, dtype=dtype, mode='w+', shape=shape)
+    memory_budget.register(file_name, array.nbytes, mapped=True)
+    return SharedArray(array, None, mapped_file=file_name)
+
+
 def _read_array_from_shared_memory(shape: Tuple[int, ...], dtype: 'npt.DTypeLike', mem: SharedMemory,
                                    free_mem_on_delete: bool) -> 'SharedArray':
     array = np.ndarray(shape, dtype=dtype, buffer=mem.buf)
-    return SharedArray(array, mem, free_mem_on_del=free_mem_on_delete)
+    shared_array = SharedArray(array, mem, free_mem_on_del=free_mem_on_delete)
+    if free_mem_on_delete:
+        _owned_segments[mem.name] = shared_array
+    return shared_array
 
 
 def copy_into_shared_memory(array: np.ndarray) -> 'SharedArray':
@@ -63,24 +148,37 @@ def copy_into_shared_memory(array: np.ndarray) -> 'SharedArray':
     return shared_array
 
 
-def calculate_chunksize(cores):
+def calculate_slab_size(seconds_per_slice: float, num_slices: int, cores: int) -> int:
+    """
+    Calculate how many contiguous slices should be handed to a worker in a single task.
+
+    Cheap per-slice operations (arithmetic, clipping) get large slabs, so that the cost of pickling and sending the
+    task is small compared to the compute. Expensive operations get small slabs. The slab size is capped so that each
+    core still receives at least SLABS_PER_CORE slabs.
+
+    :param seconds_per_slice: Measured time to process a single slice
+    :param num_slices: Number of slices left to dispatch
+    :param cores: Number of processes in the pool
+    :return: The number of slices per task
     """
-    TODO possible proper calculation of chunksize, although best performance has been with 1
-    From performance tests, the chunksize doesn't seem to make much of a
-    difference, but having larger chunks usually led to slower performance:
+    max_slab_size = max(1, num_slices // (cores * SLABS_PER_CORE))
+    if seconds_per_slice <= 0:
+        return max_slab_size
+    return max(1, min(int(TARGET_TASK_SECONDS / seconds_per_slice), max_slab_size))
+
 
-    Shape: (50,512,512)
-    1 chunk 3.06s
-    2 chunks 3.05s
-    3 chunks 3.07s
-    4 chunks 3.06s
-    5 chunks 3.16s
-    6 chunks 3.06s
-    7 chunks 3.058s
-    8 chunks 3.25s
-    9 chunks 3.45s
+class _SlabTask:
+    """
+    Runs a function for each index in a contiguous range of indices and returns the time taken.
     """
-    return 1
+    def __init__(self, func: Callable[[int], Any]):
+        self.func = func
+
+    def __call__(self, slab: Tuple[int, int]) -> float:
+        start_time = time.perf_counter()
+        for index in range(*slab):
+            self.func(index)
+        return time.perf_counter() - start_time
 
 
 def multiprocessing_necessary(shape: int, is_shared_data: bool) -> bool:
@@ -102,24 +200,15 @@ def multiprocessing_necessary(shape: int, is_shared_data: bool) -> bool:
     return True
 
 
-def execute_impl(img_num: int, partial_func: partial, is_shared_data: bool, progress: Progress, msg: str):
+def execute_impl(img_num: int,
+                 partial_func: partial,
+                 is_shared_data: bool,
+                 progress: Progress,
+                 msg: str,
+                 backend: ExecutionBackend = ExecutionBackend.PROCESS):
     task_name = f"{msg}"
     progress = Progress.ensure_instance(progress, num_steps=img_num, task_name=task_name)
-    indices_list = range(img_num)
-    if multiprocessing_necessary(img_num, is_shared_data) and pm.pool:
-        LOG.info(f"Running async on {pm.cores} cores")
-        # Using _ in the for _ enumerate is slightly faster, because the tuple from enumerate isn't unpacked,
-        # and thus some time is saved
-        # Using imap here seems to be the best choice:
-        # - imap_unordered gives the images back in random order
-        # - map and map_async do not improve speed performance
-        for _ in pm.pool.imap(partial_func, indices_list, chunksize=calculate_chunksize(pm.cores)):
-            progress.update(1, msg)
-    else:
-        LOG.info("Running synchronously on 1 core")
-        for ind in indices_list:
-            partial_func(ind)
-            progress.update(1, msg)
+    _run_operations(partial_func, img_num, is_shared_data, progress, msg, backend)
     progress.mark_complete()
 
 
@@ -127,58 +216,402 @@ def run_compute_func_impl(worker_func: Callable[[int], None],
                           num_operations: int,
                           is_shared_data: bool,
                           progress=None,
-                          msg: str = ""):
+                          msg: str = "",
+                          backend: ExecutionBackend = ExecutionBackend.PROCESS):
     task_name = f"{msg}"
     progress = Progress.ensure_instance(progress, num_steps=num_operations, task_name=task_name)
-    indices_list = range(num_operations)
-    if multiprocessing_necessary(num_operations, is_shared_data) and pm.pool:
+    _run_operations(worker_func, num_operations, is_shared_data, progress, msg, backend)
+    progress.mark_complete()
+
+
+# Per thread state, used to disable nested parallel execution
+_thread_state = threading.local()
+
+
+@contextmanager
+def run_synchronously() -> Iterator[None]:
+    """
+    Run any operations started by this thread on a single core.
+
+    Used when the calling thread is already one of several doing work in parallel. Nesting the parallel execution
+    would oversubscribe the cores, and waiting on the thread pool from one of its own threads can deadlock.
+    """
+    previous = getattr(_thread_state, 'synchronous', False)
+    _thread_state.synchronous = True
+    try:
+        yield
+    finally:
+        _thread_state.synchronous = previous
+
+
+def _run_operations(func: Callable[[int], Any], num_operations: int, is_shared_data: bool, progress: Progress, msg: str,
+                    backend: ExecutionBackend):
+    synchronous = getattr(_thread_state, 'synchronous', False)
+    if not synchronous and backend is ExecutionBackend.THREAD and num_operations > 1:
+        LOG.info(f"Running on {pm.threads} threads")
+        _run_slabs_in_pool(func, num_operations, progress, msg, pm.get_thread_pool(), pm.threads)
+    elif not synchronous and backend is ExecutionBackend.PROCESS and multiprocessing_necessary(
+            num_operations, is_shared_data) and pm.pool:
         LOG.info(f"Running async on {pm.cores} cores")
-        for _ in pm.pool.imap(worker_func, indices_list, chunksize=calculate_chunksize(pm.cores)):
-            progress.update(1, msg)
+        _run_slabs_in_pool(func, num_operations, progress, msg, pm.pool, pm.cores)
     else:
         LOG.info("Running synchronously on 1 core")
-        for ind in indices_list:
-            worker_func(ind)
+        for ind in range(num_operations):
+            func(ind)
+            progress.update(1, msg)
+
+
+def _run_slabs_in_pool(func: Callable[[int], Any], num_operations: int, progress: Progress, msg: str, pool: Pool,
+                       cores: int):
+    """
+    Run func for every index in range(num_operations) using a process or thread pool.
+
+    The first task for each core processes a single index, which is used to measure the per-slice cost of func. The
+    remaining indices are then sent as contiguous slabs sized by calculate_slab_size. Progress is advanced once for
+    every slice.
+    """
+    slab_task = _SlabTask(func)
+
+    num_probes = min(cores, num_operations)
+    probe_times: List[float] = []
+    # Using imap here seems to be the best choice:
+    # - imap_unordered gives the images back in random order
+    # - map and map_async do not improve speed performance
+    for elapsed in pool.imap(slab_task, [(ind, ind + 1) for ind in range(num_probes)]):
+        probe_times.append(elapsed)
+        progress.update(1, msg)
+
+    if num_probes == num_operations:
+        return
+
+    slab_size = calculate_slab_size(float(np.median(probe_times)), num_operations - num_probes, cores)
+    LOG.info(f"Dispatching remaining {num_operations - num_probes} slices in slabs of {slab_size}")
+    slabs = [(start, min(start + slab_size, num_operations)) for start in range(num_probes, num_operations, slab_size)]
+    for (start, stop), _ in zip(slabs, pool.imap(slab_task, slabs)):
+        for _ in range(stop - start):
             progress.update(1, msg)
-    progress.mark_complete()
 
 
 class SharedArray:
-    def __init__(self, array: np.ndarray, shared_memory: Optional[SharedMemory], free_mem_on_del: bool = True):
+    def __init__(self,
+                 array: np.ndarray,
+                 shared_memory: Optional[SharedMemory],
+                 free_mem_on_del: bool = True,
+                 mapped_file: Optional[str] = None,
+                 copy_to_share: bool = False):
+        """
+        :param array: The array, using the buffer of shared_memory or mapped from mapped_file if either is given
+        :param shared_memory: The shared memory segment holding the array
+        :param free_mem_on_del: Whether to free the shared memory or remove the mapped file when deleted
+        :param mapped_file: The file that the array is memory-mapped from
+        :param copy_to_share: Whether an array that other processes can't attach to should be copied into shared memory
+                              when it is processed by them, see share
+        """
         self.array = array
         self._shared_memory = shared_memory
         self._free_mem_on_del = free_mem_on_del
+        self._mapped_file = mapped_file
+        self._copy_to_share = copy_to_share
+        self._owner: Optional[uuid.UUID] = None
 
     def __del__(self):
-        if self.has_shared_memory:
-            self._shared_memory.close()
+        if self._mapped_file is not None:
+            self._remove_mapped_file()
+        elif self._shared_memory is not None:
+            mem = self._shared_memory
+            if self._free_mem_on_del and _owned_segments is not None:
+                _owned_segments.pop(mem.name, None)
+            # Views of the array hold it as their base, so the array outlives this object if any of them are alive
+            array = weakref.ref(self.array)
+            del self.array
+            viewed_array = array()
+            in_use = viewed_array is not None
+            if self._free_mem_on_del and _attached_arrays is not None:
+                # Stop this process re-using a mapping to memory that is about to be unlinked
+                _attached_arrays.pop(mem.name, None)
+                if not in_use and _release_to_pool(mem):
+                    return
+                memory_budget.unregister(mem.name)
+            if in_use:
+                # Closing the segment would unmap the memory under the views, so it is closed once they are gone
+                weakref.finalize(viewed_array, _close_segment, mem)
+            else:
+                _close_segment(mem)
             if self._free_mem_on_del:
                 try:
-                    self._shared_memory.unlink()
+                    mem.unlink()
                 except FileNotFoundError:
                     # Do nothing, memory has already been freed
                     pass
 
+    def _remove_mapped_file(self):
+        if not self._free_mem_on_del:
+            return
+        if _attached_arrays is not None:
+            _attached_arrays.pop(self._mapped_file, None)
+            memory_budget.unregister(self._mapped_file)
+        try:
+            os.remove(self._mapped_file)
+        except FileNotFoundError:
+            # Do nothing, file has already been removed
+            pass
+        except PermissionError:
+            # On Windows the file can't be removed while it is still mapped by a view of the array or by another
+            # process. It is removed when the application exits instead.
+            LOG.warning(f"Could not remove mapped file {self._mapped_file}")
+
+    def claim(self, owner: uuid.UUID) -> None:
+        """
+        Account the memory of the array to owner in the memory budget, including any it is later copied into by share
+        """
+        self._owner = owner
+        if self.name is not None:
+            memory_budget.set_owner(self.name, owner)
+
+    def share(self) -> None:
+        """
+        Copy the array into shared memory, if other processes can't attach to it and it was created with copy_to_share.
+        This is used for copy-on-write mappings of a file, e.g. a stack opened from a session, whose changes are
+        private to this process. The copy is only made when the array is first processed in parallel, so stacks that
+        are only viewed are never copied.
+        """
+        if self.has_shared_memory or not self._copy_to_share:
+            return
+        LOG.info(f'Copying array with shape={self.array.shape} into shared memory to process it in parallel')
+        copy = copy_into_shared_memory(self.array)
+        # Take over the memory of the copy, so it is freed when this array is deleted rather than the copy
+        self.array = copy.array
+        self._shared_memory, self._free_mem_on_del, self._mapped_file = (copy._shared_memory, copy._free_mem_on_del,
+                                                                         copy._mapped_file)
+        copy._shared_memory, copy._mapped_file = None, None
+        if self._shared_memory is not None:
+            _owned_segments[self._shared_memory.name] = self
+        self._copy_to_share = False
+        if self._owner is not None:
+            self.claim(self._owner)
+
+    @property
+    def can_share(self) -> bool:
+        """
+        True if other processes can attach to the array, either now or once share has copied it into shared memory
+        """
+        return self.has_shared_memory or self._copy_to_share
+
     @property
     def has_shared_memory(self) -> bool:
-        return self._shared_memory is not None
+        """
+        True if other processes can attach to the array, because it is either in shared memory or mapped from a file
+        """
+        return self._shared_memory is not None or self._mapped_file is not None
+
+    @property
+    def mapped_file(self) -> Optional[str]:
+        return self._mapped_file
+
+    @property
+    def name(self) -> Optional[str]:
+        """
+        The name of the shared memory segment or the path of the mapped file, if the array uses either
+        """
+        if self._shared_memory is not None:
+            return self._shared_memory.name
+        return self._mapped_file
 
     @property
     def array_proxy(self) -> 'SharedArrayProxy':
         mem_name = self._shared_memory.name if self._shared_memory else None
-        return SharedArrayProxy(mem_name=mem_name, shape=self.array.shape, dtype=self.array.dtype)
+        return SharedArrayProxy(mem_name=mem_name,
+                                shape=self.array.shape,
+                                dtype=self.array.dtype,
+                                mapped_file=self._mapped_file)
 
 
 class SharedArrayProxy:
-    def __init__(self, mem_name: Optional[str], shape: Tuple[int, ...], dtype: 'npt.DTypeLike'):
+    def __init__(self,
+                 mem_name: Optional[str],
+                 shape: Tuple[int, ...],
+                 dtype: 'npt.DTypeLike',
+                 mapped_file: Optional[str] = None):
         self._mem_name = mem_name
         self._shape = shape
         self._dtype = dtype
+        self._mapped_file = mapped_file
         self._shared_array: Optional['SharedArray'] = None
 
     @property
     def array(self) -> np.ndarray:
         if self._shared_array is None:
-            mem = shared_memory.SharedMemory(name=self._mem_name)
-            self._shared_array = _read_array_from_shared_memory(self._shape, self._dtype, mem, False)
+            if self._mapped_file is not None:
+                self._shared_array = _attach_mapped_array(self._mapped_file, self._shape, self._dtype)
+            else:
+                assert self._mem_name is not None
+                self._shared_array = _attach_shared_array(self._mem_name, self._shape, self._dtype)
         return self._shared_array.array
+
+
+# Segments created by this process, keyed by name, see _attach_shared_array
+_owned_segments: weakref.WeakValueDictionary[str, SharedArray] = weakref.WeakValueDictionary()
+if hasattr(os, 'register_at_fork'):
+    # Processes forked from this one own none of them, and must attach to the segments like any other process
+    os.register_at_fork(after_in_child=_owned_segments.clear)
+
+# Segments and mapped files attached to by SharedArrayProxy objects in this process, in least recently used order.
+# Keyed by the segment name, or the path of the mapped file.
+_attached_arrays: OrderedDict[str, SharedArray] = OrderedDict()
+
+
+def _attach_shared_array(mem_name: str, shape: Tuple[int, ...], dtype: 'npt.DTypeLike') -> SharedArray:
+    """
+    Get a SharedArray for an existing shared memory segment.
+
+    Every task sent to the pool unpickles new SharedArrayProxy objects, so the mapping is cached per process to avoid
+    re-opening and re-mapping the segment for each task. Only a reference to the SharedArray is dropped on eviction,
+    so a proxy that is still in use keeps its mapping open.
+
+    A segment created by this process is used through the SharedArray that owns it, so that every array on the
+    segment is a view of the owner's array, and the owner can tell when they are all gone.
+    """
+    owner = _owned_segments.get(mem_name)
+    if owner is not None and owner.array.shape == tuple(shape) and owner.array.dtype == dtype:
+        return owner
+
+    shared_array = _attached_arrays.get(mem_name)
+    if shared_array is not None and shared_array.array.shape == tuple(shape) and shared_array.array.dtype == dtype:
+        _attached_arrays.move_to_end(mem_name)
+        return shared_array
+
+    _drop_unlinked_attachments()
+    mem = shared_memory.SharedMemory(name=mem_name)
+    shared_array = _read_array_from_shared_memory(shape, dtype, mem, False)
+    _add_attachment(mem_name, shared_array)
+    return shared_array
+
+
+def _attach_mapped_array(mapped_file: str, shape: Tuple[int, ...], dtype: 'npt.DTypeLike') -> SharedArray:
+    """
+    Get a SharedArray for an existing memory-mapped file, cached in the same way as shared memory segments.
+    """
+    shared_array = _attached_arrays.get(mapped_file)
+    if shared_array is not None and shared_array.array.shape == tuple(shape) and shared_array.array.dtype == dtype:
+        _attached_arrays.move_to_end(mapped_file)
+        return shared_array
+
+    _drop_unlinked_attachments()
+    array = np.memmap(mapped_file, dtype=dtype, mode='r+', shape=shape)
+    shared_array = SharedArray(array, None, free_mem_on_del=False, mapped_file=mapped_file)
+    _add_attachment(mapped_file, shared_array)
+    return shared_array
+
+
+def _add_attachment(key: str, shared_array: SharedArray) -> None:
+    _attached_arrays[key] = shared_array
+    while len(_attached_arrays) > ATTACH_CACHE_SIZE:
+        _attached_arrays.popitem(last=False)
+
+
+def _drop_unlinked_attachments() -> None:
+    """
+    Release cached mappings to segments or files that the owning process has since removed, so that the memory or
+    disk space can be returned to the OS. Segments are only visible on Linux in /dev/shm, on other platforms stale
+    mappings to segments are released by the cache size limit.
+    """
+    for key in list(_attached_arrays):
+        mapped_file = _attached_arrays[key].mapped_file
+        if mapped_file is not None:
+            removed = not os.path.exists(mapped_file)
+        elif sys.platform == 'linux':
+            removed = not os.path.exists(f'{pm.MEM_DIR_LINUX}/{key}')
+        else:
+            continue
+        if removed:
+            del _attached_arrays[key]
+
+
+def _close_segment(mem: SharedMemory) -> None:
+    try:
+        mem.close()
+    except BufferError:
+        LOG.warning(f"Could not close shared memory segment {mem.name}, its buffer is still in use")
+
+
+# Freed shared memory segments, kept open but not unlinked for re-use by _take_pooled_segment, in least recently freed
+# order. They are not closed, as on Windows a segment is destroyed when its last handle is closed. Keyed by the segment
+# name. Segments can be freed from any thread, and from inside the lock if the garbage collector runs.
+_segment_pool: OrderedDict[str, SharedMemory] = OrderedDict()
+_segment_pool_lock = threading.RLock()
+_pool_closed = False
+
+
+def _release_to_pool(mem: SharedMemory) -> bool:
+    """
+    Keep a freed segment for re-use, unlinking the oldest pooled segments if the pool goes over SEGMENT_POOL_BYTES.
+
+    Pooled segments stay registered in the memory budget, without an owner, as the memory is still held. The budget
+    frees them through _free_pooled_segments when it is under pressure.
+
+    Only the SharedArray that owns the segment releases it, once no views of its array are alive, as they would share
+    memory with the next array given the segment.
+
+    :return: False if the segment is too large to pool, and should be unlinked by the caller
+    """
+    if _segment_pool is None or _pool_closed or mem.size > SEGMENT_POOL_BYTES:
+        return False
+
+    with _segment_pool_lock:
+        _segment_pool[mem.name] = mem
+        memory_budget.register(mem.name, mem.size)
+        pooled_bytes = sum(pooled.size for pooled in _segment_pool.values())
+        while pooled_bytes > SEGMENT_POOL_BYTES:
+            _, oldest = _segment_pool.popitem(last=False)
+            pooled_bytes -= oldest.size
+            _unlink_segment(oldest)
+    return True
+
+
+def _free_pooled_segments(shortfall: int) -> None:
+    """
+    Unlink pooled segments, oldest first, until at least shortfall bytes have been freed
+    """
+    freed = 0
+    with _segment_pool_lock:
+        while _segment_pool and freed < shortfall:
+            _, oldest = _segment_pool.popitem(last=False)
+            freed += oldest.size
+            _unlink_segment(oldest)
+    if freed:
+        LOG.info(f"Freed {freed} bytes of recycled shared memory segments")
+
+
+def clear_segment_pool() -> None:
+    """
+    Unlink all the segments kept for re-use
+    """
+    with _segment_pool_lock:
+        while _segment_pool:
+            _, oldest = _segment_pool.popitem(last=False)
+            _unlink_segment(oldest)
+
+
+def _clear_segment_pool_at_exit() -> None:
+    """
+    Pooled segments are only freed by the process that pooled them, so unlink them before it exits, and stop arrays
+    freed while the interpreter shuts down from being pooled
+    """
+    global _pool_closed
+    _pool_closed = True
+    clear_segment_pool()
+
+
+atexit.register(_clear_segment_pool_at_exit)
+
+
+def _unlink_segment(mem: SharedMemory) -> None:
+    memory_budget.unregister(mem.name)
+    _close_segment(mem)
+    try:
+        mem.unlink()
+    except FileNotFoundError:
+        pass
+
+
+memory_budget.add_pressure_listener(_free_pooled_segments)
@@ -0,0 +1,113 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+"""
+Filtering of a whole volume with a 3D kernel, in parallel.
+
+The volume is split into slabs along its first axis, and each worker filters one slab in place. A 3D kernel reaches
+into the neighbouring slabs, so each slab is filtered together with halo planes from either side of it, and only its
+own planes are written back. Before any slab is changed, the planes either side of each boundary between slabs are
+copied into a small shared array, so workers always read their halos as they were before filtering. The memory used on
+top of the volume is the halo planes, and one slab per worker, instead of a second copy of the volume.
+"""
+import math
+from logging import getLogger
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from mantidimaging.core.parallel import manager as pm
+from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
+from mantidimaging.core.utility.progress_reporting import Progress
+
+LOG = getLogger(__name__)
+
+DIM_2D = "2D"
+DIM_3D = "3D"
+DIMENSIONS = [DIM_2D, DIM_3D]
+
+# Upper limit on the size of each slab, which bounds the memory each worker uses while it filters
+SLAB_BYTES = 64 * 1024 * 1024
+
+
+def filter_volume(func: Callable[[np.ndarray], np.ndarray],
+                  volume: pu.SharedArray,
+                  halo: int,
+                  wrap: bool = False,
+                  progress: Optional[Progress] = None,
+                  backend: pu.ExecutionBackend = pu.ExecutionBackend.THREAD,
+                  slab_bytes: int = SLAB_BYTES) -> None:
+    """
+    Apply a 3D filter to a volume in place. The result is the same as func(volume.array).
+
+    :param func: Filters a block of planes and returns the result, with the same shape. It must be a function of the
+                 module level to be run with the PROCESS backend.
+    :param volume: The volume to filter
+    :param halo: The number of planes either side of a plane that the filter reads, i.e. the radius of the kernel
+                 along the first axis
+    :param wrap: Whether the filter extends the volume periodically, like the wrap mode of scipy.ndimage. If so the
+                 first and last slabs take their outer halos from the other end of the volume.
+    :param progress: Progress reporting object, updated once for each slab
+    :param backend: The ExecutionBackend used to filter the slabs in parallel
+    :param slab_bytes: Approximate upper limit on the size of each slab
+    """
+    data = volume.array
+    # A larger halo than the kernel needs only costs a little memory, and means every boundary has planes either side
+    halo = max(1, halo)
+    bounds = _slab_bounds(data.shape[0], int(np.prod(data.shape[1:])) * data.itemsize, halo, slab_bytes)
+    progress = Progress.ensure_instance(progress, num_steps=len(bounds) - 1, task_name="Volume filter")
+    if len(bounds) <= 2:
+        LOG.info("Filtering the volume in one slab")
+        with progress:
+            data[:] = func(data)
+            progress.update(msg="Volume filter")
+        return
+
+    LOG.info(f"Filtering the volume in {len(bounds) - 1} slabs with {halo} halo planes")
+    boundaries = bounds[1:-1]
+    halos = pu.create_array((len(boundaries) + wrap, 2 * halo) + data.shape[1:], data.dtype)
+    for i, boundary in enumerate(boundaries):
+        halos.array[i] = data[boundary - halo:boundary + halo]
+    if wrap:
+        # The boundary between the end of the volume and its start
+        halos.array[-1, :halo] = data[-halo:]
+        halos.array[-1, halo:] = data[:halo]
+
+    params: Dict[str, Any] = {"func": func, "bounds": bounds, "halo": halo, "wrap": wrap}
+    ps.run_compute_func(_filter_slab, len(bounds) - 1, [volume, halos], params, progress, backend)
+
+
+def _slab_bounds(num_planes: int, plane_bytes: int, halo: int, slab_bytes: int) -> List[int]:
+    """
+    Split the planes into slabs, enough for each worker to have several. Each slab is at least as thick as the halo,
+    so that the halos of a slab only come from its direct neighbours, and most are twice as thick, so that no more
+    than half of the planes a worker filters are halo.
+
+    :return: The first plane of each slab, followed by the number of planes
+    """
+    slab_planes = math.ceil(num_planes / (pm.threads * pu.SLABS_PER_CORE))
+    slab_planes = max(2 * halo, min(slab_planes, slab_bytes // max(1, plane_bytes)))
+    bounds = list(range(0, num_planes, slab_planes))
+    if len(bounds) > 1 and num_planes - bounds[-1] < halo:
+        # Merge a short last slab into the one before
+        bounds.pop()
+    return bounds + [num_planes]
+
+
+def _filter_slab(index: int, arrays: List[np.ndarray], params: Dict[str, Any]):
+    data, halos = arrays
+    bounds, halo, wrap = params["bounds"], params["halo"], params["wrap"]
+    start, stop = bounds[index], bounds[index + 1]
+    parts = [data[start:stop]]
+    has_lower = index > 0 or wrap
+    if has_lower:
+        # For the first slab this is the last entry, the wrapped boundary
+        parts.insert(0, halos[index - 1, :halo])
+    if index < len(bounds) - 2:
+        parts.append(halos[index, halo:])
+    elif wrap:
+        parts.append(halos[-1, halo:])
+    result = params["func"](np.concatenate(parts))
+    lower = halo if has_lower else 0
+    data[start:stop] = result[lower:lower + stop - start]
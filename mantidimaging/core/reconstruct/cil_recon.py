@@ -21,7 +21,7 @@ from mantidimaging.core.reconstruct.base_recon import BaseRecon
 from mantidimaging.core.utility.optional_imports import safe_import
 from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.core.utility.size_calculator import full_size_KB
-from mantidimaging.core.utility.memory_usage import system_free_memory
+from mantidimaging.core.parallel.memory_budget import memory_budget
 
 if TYPE_CHECKING:
     from mantidimaging.core.utility.data_containers import ProjectionAngles, ReconstructionParameters, ScalarCoR
@@ -246,9 +246,8 @@ class CILRecon(BaseRecon):
         recon_volume_shape = pixel_num_h, pixel_num_h, pixel_num_v
         recon_volume_size = full_size_KB(recon_volume_shape, images.dtype)
         estimated_mem_required = 5 * projection_size + 13 * recon_volume_size
-        free_mem = system_free_memory().kb()
 
-        if (estimated_mem_required > free_mem):
+        if not memory_budget.enough_memory(int(estimated_mem_required * 1024), shared=False):
             estimate_gb = estimated_mem_required / 1024 / 1024
             raise RuntimeError(
                 "The machine does not have enough physical memory available to allocate space for this data."
@@ -0,0 +1,77 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+"""
+Binning of images and stacks by integer factors, by averaging or summing blocks of pixels. This is exact and much
+faster than resizing with interpolation. Pixels left over at the ends of each axis are dropped.
+"""
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+BIN_MEAN = "mean"
+BIN_SUM = "sum"
+BIN_METHODS = [BIN_MEAN, BIN_SUM]
+
+# How far the inverse of a fractional rebin factor can be from an integer and still be binned in blocks, to allow for
+# factors like 0.2 that are not exact in floating point
+FACTOR_TOLERANCE = 1e-6
+
+
+def bin_blocks(data: np.ndarray,
+               factors: Sequence[int],
+               method: str = BIN_MEAN,
+               out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Bin an array in blocks.
+
+    :param data: The array, of any number of dimensions
+    :param factors: The size of the blocks along each axis
+    :param method: BIN_MEAN to average each block, or BIN_SUM to add it up
+    :param out: Array to write the result into. If not given the result is in a new array, of floating point type for
+                the mean.
+    :return: The binned array
+    """
+    if len(factors) != data.ndim:
+        raise ValueError(f"Need a factor for each of the {data.ndim} axes, got {factors}")
+    if method not in BIN_METHODS:
+        raise ValueError(f"Unknown binning method: {method}. Should be one of {BIN_METHODS}")
+
+    binned_shape = tuple(size // factor for size, factor in zip(data.shape, factors))
+    # Split each axis into (number of blocks, block size), and reduce over the block sizes
+    blocks_shape = tuple(dim for size, factor in zip(binned_shape, factors) for dim in (size, factor))
+    trimmed = data[tuple(slice(0, size * factor) for size, factor in zip(binned_shape, factors))]
+    block_axes = tuple(range(1, 2 * data.ndim, 2))
+    blocks = trimmed.reshape(blocks_shape)
+
+    result = blocks.sum(axis=block_axes) if method == BIN_SUM else blocks.mean(axis=block_axes)
+    if out is None:
+        return result
+    out[...] = result
+    return out
+
+
+def integer_factor(fraction: float) -> Optional[int]:
+    """
+    The integer binning factor that a fraction of the size is the same as, e.g. 2 for 0.5.
+
+    :return: The factor, or None if the fraction is not the inverse of an integer greater than 1
+    """
+    if fraction <= 0:
+        return None
+    factor = round(1 / fraction)
+    if factor < 2 or abs(1 / fraction - factor) > FACTOR_TOLERANCE * factor:
+        return None
+    return factor
+
+
+def integer_factors_for_shape(shape: Tuple[int, int], binned_shape: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """
+    The integer binning factors that give a shape exactly, without dropping any pixels.
+
+    :return: The factors, or None if the sizes are not divided exactly by integers, or nothing is binned
+    """
+    if any(binned <= 0 or size % binned != 0 for size, binned in zip(shape, binned_shape)):
+        return None
+    factors = (shape[0] // binned_shape[0], shape[1] // binned_shape[1])
+    return factors if max(factors) > 1 else None
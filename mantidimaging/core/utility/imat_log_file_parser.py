@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import csv
 import re
+from datetime import datetime
 from enum import Enum, auto
 from itertools import zip_longest
 from typing import Dict, List, Optional, TYPE_CHECKING
@@ -15,6 +16,9 @@ from mantidimaging.core.utility.data_containers import Counts, ProjectionAngles
 if TYPE_CHECKING:
     from pathlib import Path
 
+# The format of the time stamps in IMAT log files, e.g. Sun Feb 10 00:22:04 2019
+TIMESTAMP_FORMAT = "%a %b %d %H:%M:%S %Y"
+
 
 def _get_projection_number(s: str) -> int:
     return int(re.sub(r"\D", "", s.split(":")[1]))
@@ -140,6 +144,20 @@ class IMATLogFile:
         angles[:] = self._data[IMATLogColumn.PROJECTION_ANGLE]
         return ProjectionAngles(numpy.deg2rad(angles))
 
+    def timestamps(self) -> Optional[numpy.ndarray]:
+        """
+        The time of each projection, in seconds after the first. None if any of the time stamps can not be read.
+        """
+        try:
+            times = [
+                datetime.strptime(stamp.strip(), TIMESTAMP_FORMAT) for stamp in self._data[IMATLogColumn.TIMESTAMP]
+            ]
+        except ValueError:
+            return None
+        if not times:
+            return None
+        return numpy.array([(time - times[0]).total_seconds() for time in times])
+
     def counts(self) -> Counts:
         counts = numpy.zeros(len(self._data[IMATLogColumn.COUNTS_BEFORE]))
         for i, [before,
@@ -0,0 +1,155 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+"""
+Median filtering of images on the CPU, giving the same result as scipy.ndimage.median_filter.
+
+Two algorithms are used:
+
+- scipy selects the median from the values of each window, so the cost grows with the area of the kernel.
+- A sliding histogram, the scikit-image rank filter, keeps a histogram of the window as it moves along each row, so the
+  cost grows with the number of distinct values in the image, and only with the width of the kernel. The values are
+  replaced by their index in the sorted distinct values, so any data type with few enough distinct values can use it,
+  e.g. counts, masks and binned images.
+
+The algorithm is picked from the size of the kernel, the data type, and the number of distinct values in the image.
+NaNs are ordered as negative infinity, so they never become the median of a window that has other values.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+import scipy.ndimage as scipy_ndimage
+from skimage.filters import rank
+
+SCIPY = "scipy"
+HISTOGRAM = "histogram"
+ALGORITHMS = [SCIPY, HISTOGRAM]
+
+# scikit-image warns about the performance of rank filters with more than 10 bit values
+HISTOGRAM_MAX_LEVELS = 1024
+# scipy is fast enough for smaller kernels that it is not worth finding the distinct values of the image
+HISTOGRAM_MIN_SIZE = 5
+# Approximate cost of one histogram level, relative to the cost of one kernel element in scipy
+HISTOGRAM_LEVEL_COST = 0.08
+# The distinct values of float images are first counted on every n-th row and column, so that images with too many
+# values for the histogram are not sorted
+LEVELS_SAMPLE_STEP = 4
+
+# Padding modes of numpy that extend an image like the scipy.ndimage modes
+_PAD_MODES = {'reflect': 'symmetric', 'mirror': 'reflect', 'nearest': 'edge', 'wrap': 'wrap', 'constant': 'constant'}
+
+
+def median_filter(data: np.ndarray, size: int, mode: str = "reflect", algorithm: Optional[str] = None) -> np.ndarray:
+    """
+    Median filter an image with a square kernel, or a volume with a cubic kernel. NaNs are ordered as negative
+    infinity, so the result is -inf where the median of a window is a NaN.
+
+    :param data: The image or volume. Volumes are always filtered by scipy.
+    :param size: Width of the kernel
+    :param mode: How the image is extended at the edges, one of the modes of scipy.ndimage.median_filter. Constant
+                 mode extends the image with zeros.
+    :param algorithm: SCIPY or HISTOGRAM. By default the faster one is picked.
+    :return: The filtered image, in a new array
+    """
+    if algorithm not in [None] + ALGORITHMS:
+        raise ValueError(f"Unknown median algorithm: {algorithm}. Should be one of {ALGORITHMS}")
+    if mode not in _PAD_MODES:
+        raise ValueError(f"Unknown mode: {mode}. Should be one of {list(_PAD_MODES)}")
+
+    try_histogram = algorithm == HISTOGRAM or (algorithm is None and size >= HISTOGRAM_MIN_SIZE)
+    if try_histogram and _histogram_supported(data, size):
+        max_levels = HISTOGRAM_MAX_LEVELS if algorithm == HISTOGRAM else _histogram_max_levels(size)
+        coded = _level_codes(data, max_levels, mode == 'constant')
+        if coded is not None:
+            return _histogram_median(*coded, size, mode)
+    if algorithm == HISTOGRAM:
+        raise ValueError(f"The histogram median can not filter {data.dtype} data of shape {data.shape} with a kernel "
+                         f"of size {size}")
+
+    if data.dtype.kind == 'f' and np.isnan(data.min()):
+        data = np.where(np.isnan(data), -np.inf, data)
+    return scipy_ndimage.median_filter(data, size=size, mode=mode)
+
+
+def _histogram_supported(data: np.ndarray, size: int) -> bool:
+    # Even kernels are not centred on the pixel the same way in scipy and scikit-image
+    return data.ndim == 2 and data.dtype.kind in "biuf" and size % 2 == 1 and size <= min(data.shape)
+
+
+def _histogram_max_levels(size: int) -> int:
+    """
+    The number of distinct values below which the histogram is expected to be faster than scipy
+    """
+    return min(HISTOGRAM_MAX_LEVELS, int(size * size / HISTOGRAM_LEVEL_COST))
+
+
+def _level_codes(data: np.ndarray, max_levels: int, needs_zero: bool) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Find the distinct values of an image, and the index of each pixel in them.
+
+    :param data: The image
+    :param max_levels: Give up if there are more distinct values than this
+    :param needs_zero: Include zero in the values, for extending the image with zeros
+    :return: The sorted distinct values, and the image of indices. None if there are too many values.
+    """
+    if data.dtype.kind in "biu":
+        lowest, highest = int(data.min()), int(data.max())
+        if needs_zero:
+            lowest, highest = min(lowest, 0), max(highest, 0)
+        if highest - lowest >= max_levels:
+            return None
+        levels = np.arange(lowest, highest + 1).astype(data.dtype)
+        codes = data.astype(np.int64)
+        codes -= lowest
+    else:
+        if len(np.unique(data[::LEVELS_SAMPLE_STEP, ::LEVELS_SAMPLE_STEP])) > max_levels:
+            return None
+        levels, codes = np.unique(data, return_inverse=True)
+        codes = codes.reshape(data.shape)
+        if len(levels) > max_levels:
+            return None
+        levels, codes = _order_nans_first(levels, codes)
+        if needs_zero:
+            levels, codes = _insert_level(levels, codes, 0)
+        if len(levels) > max_levels:
+            return None
+    return levels, codes.astype(np.uint8 if len(levels) <= 256 else np.uint16)
+
+
+def _order_nans_first(levels: np.ndarray, codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    np.unique sorts NaNs after all other values. Give them the index of negative infinity instead.
+    """
+    num_valid = np.count_nonzero(~np.isnan(levels))
+    if num_valid == len(levels):
+        return levels, codes
+    valid_levels = levels[:num_valid]
+    if num_valid > 0 and valid_levels[0] == -np.inf:
+        lookup = np.arange(len(levels))
+    else:
+        valid_levels = np.concatenate(([-np.inf], valid_levels)).astype(levels.dtype)
+        lookup = np.arange(1, len(levels) + 1)
+    lookup[num_valid:] = 0
+    return valid_levels, lookup[codes]
+
+
+def _insert_level(levels: np.ndarray, codes: np.ndarray, value: float) -> Tuple[np.ndarray, np.ndarray]:
+    index = int(np.searchsorted(levels, value))
+    if index < len(levels) and levels[index] == value:
+        return levels, codes
+    codes[codes >= index] += 1
+    return np.insert(levels, index, value), codes
+
+
+def _histogram_median(levels: np.ndarray, codes: np.ndarray, size: int, mode: str) -> np.ndarray:
+    """
+    Median filter the image of indices with a sliding histogram, and look up the values of the medians. The image is
+    padded like scipy extends it, so every window is full.
+    """
+    radius = size // 2
+    if mode == 'constant':
+        padded = np.pad(codes, radius, mode='constant', constant_values=np.searchsorted(levels, 0))
+    else:
+        padded = np.pad(codes, radius, mode=_PAD_MODES[mode])  # type: ignore[call-overload]
+    medians = rank.median(padded, footprint=np.ones((size, size), dtype=bool))
+    return levels[medians[radius:radius + codes.shape[0], radius:radius + codes.shape[1]]]
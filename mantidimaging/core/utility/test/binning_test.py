@@ -0,0 +1,55 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+from parameterized import parameterized
+
+from mantidimaging.core.utility.binning import BIN_SUM, bin_blocks, integer_factor, integer_factors_for_shape
+
+
+class BinningTest(unittest.TestCase):
+    def test_mean_2d(self):
+        data = np.arange(16, dtype=np.float32).reshape(4, 4)
+        npt.assert_array_equal([[2.5, 4.5], [10.5, 12.5]], bin_blocks(data, (2, 2)))
+
+    def test_sum_2d(self):
+        data = np.arange(16, dtype=np.uint16).reshape(4, 4)
+        npt.assert_array_equal([[10, 18], [42, 50]], bin_blocks(data, (2, 2), BIN_SUM))
+
+    def test_3d_trims_left_over_pixels(self):
+        data = np.random.default_rng(3).random((5, 7, 9))
+
+        result = bin_blocks(data, (2, 3, 4))
+
+        self.assertEqual((2, 2, 2), result.shape)
+        npt.assert_allclose(data[:2, :3, :4].mean(), result[0, 0, 0])
+        npt.assert_allclose(data[2:4, 3:6, 4:8].mean(), result[1, 1, 1])
+
+    def test_writes_into_out(self):
+        data = np.arange(16, dtype=np.float32).reshape(4, 4)
+        out = np.zeros((2, 2), dtype=np.float32)
+
+        self.assertIs(out, bin_blocks(data, (2, 2), out=out))
+        npt.assert_array_equal([[2.5, 4.5], [10.5, 12.5]], out)
+
+    @parameterized.expand([("wrong_number_of_factors", (2, ), "mean"), ("unknown_method", (2, 2), "median")])
+    def test_invalid_arguments_raise(self, _, factors, method):
+        with self.assertRaises(ValueError):
+            bin_blocks(np.zeros((4, 4)), factors, method)
+
+    @parameterized.expand([(0.5, 2), (0.25, 4), (0.2, 5), (1 / 3, 3), (0.3, None), (1.0, None), (2.0, None), (0, None)])
+    def test_integer_factor(self, fraction, expected):
+        self.assertEqual(expected, integer_factor(fraction))
+
+    @parameterized.expand([((10, 10), (5, 2), (2, 5)), ((10, 10), (10, 5), (1, 2)), ((10, 10), (3, 5), None),
+                           ((10, 10), (10, 10), None), ((10, 10), (20, 5), None)])
+    def test_integer_factors_for_shape(self, shape, binned_shape, expected):
+        self.assertEqual(expected, integer_factors_for_shape(shape, binned_shape))
+
+
+if __name__ == "__main__":
+    unittest.main()
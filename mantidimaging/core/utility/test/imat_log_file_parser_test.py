@@ -5,6 +5,7 @@ from __future__ import annotations
 import numpy as np
 import pytest
 
+from mantidimaging.core.data.test.fake_logfile import generate_csv_logfile
 from mantidimaging.core.utility.imat_log_file_parser import CSVLogParser, IMATLogFile, TextLogParser, \
     _get_projection_number
 
@@ -93,6 +94,21 @@ def test_source_file(test_input):
     assert logfile.source_file == "/tmp/fake"
 
 
+@pytest.mark.parametrize('test_input', [TXT_LOG_FILE, CSV_LOG_FILE])
+def test_timestamps_unreadable(test_input):
+    logfile = IMATLogFile(test_input, "/tmp/fake")
+    assert logfile.timestamps() is None
+
+
+def test_timestamps():
+    logfile = generate_csv_logfile()
+    timestamps = logfile.timestamps()
+    assert len(timestamps) == 10
+    assert timestamps[0] == 0
+    assert timestamps[1] == 33
+    assert timestamps[9] == 298
+
+
 def test_get_projection_number():
     assert _get_projection_number("Projection:  99  angle: 31.2048") == 99
     assert _get_projection_number("Radiography:  19") == 19
@@ -0,0 +1,104 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+import numpy as np
+import numpy.testing as npt
+import scipy.ndimage as scipy_ndimage
+from parameterized import parameterized
+
+from mantidimaging.core.utility import median
+from mantidimaging.core.utility.median import HISTOGRAM, SCIPY, median_filter
+
+MODES = ['reflect', 'constant', 'nearest', 'mirror', 'wrap']
+
+
+def _scipy_median(data: np.ndarray, size: int, mode: str) -> np.ndarray:
+    if data.dtype.kind == 'f':
+        data = np.where(np.isnan(data), -np.inf, data)
+    return scipy_ndimage.median_filter(data, size=size, mode=mode)
+
+
+def _image(kind: str) -> np.ndarray:
+    rng = np.random.default_rng(42)
+    if kind == "counts":
+        return rng.poisson(20, (31, 26)).astype(np.float32)
+    if kind == "uint16":
+        return rng.integers(100, 400, (31, 26)).astype(np.uint16)
+    if kind == "int8":
+        return rng.integers(-100, 100, (31, 26)).astype(np.int8)
+    if kind == "bool":
+        return rng.random((31, 26)) < 0.3
+    data = (rng.integers(-4, 4, (31, 26)) * 0.5).astype(np.float64)
+    data[rng.random(data.shape) < 0.05] = -np.inf
+    data[rng.random(data.shape) < 0.3] = np.nan
+    # A block of NaNs larger than the kernel
+    data[3:10, 3:10] = np.nan
+    return data
+
+
+class MedianTest(unittest.TestCase):
+    @parameterized.expand([(kind, mode, size) for kind in ["counts", "uint16", "int8", "bool", "nans"] for mode in MODES
+                           for size in [3, 7]])
+    def test_histogram_matches_scipy(self, kind, mode, size):
+        data = _image(kind)
+
+        result = median_filter(data, size, mode, algorithm=HISTOGRAM)
+
+        expected = _scipy_median(data, size, mode)
+        self.assertEqual(expected.dtype, result.dtype)
+        npt.assert_array_equal(expected, result)
+
+    @parameterized.expand([("nans", ), ("counts", )])
+    def test_scipy_matches_scipy(self, kind):
+        data = _image(kind)
+        npt.assert_array_equal(_scipy_median(data, 5, 'reflect'), median_filter(data, 5, algorithm=SCIPY))
+
+    def test_does_not_change_input(self):
+        data = _image("nans")
+        original = data.copy()
+
+        median_filter(data, 5, algorithm=HISTOGRAM)
+        median_filter(data, 5, algorithm=SCIPY)
+
+        npt.assert_array_equal(original, data)
+
+    @parameterized.expand([
+        ("large_kernel_few_values", "counts", 9, True),
+        ("small_kernel", "counts", 3, False),
+        ("even_kernel", "counts", 8, False),
+        ("many_values", "random", 9, False),
+    ])
+    @mock.patch("mantidimaging.core.utility.median.scipy_ndimage.median_filter")
+    @mock.patch("mantidimaging.core.utility.median._histogram_median")
+    def test_algorithm_picked(self, _, kind, size, use_histogram, histogram_median, scipy_median):
+        data = np.random.default_rng(1).random((40, 40)) if kind == "random" else _image(kind)
+
+        median_filter(data, size)
+
+        self.assertEqual(use_histogram, histogram_median.called)
+        self.assertEqual(not use_histogram, scipy_median.called)
+
+    def test_histogram_levels_limited_by_kernel_size(self):
+        self.assertLess(median._histogram_max_levels(5), median._histogram_max_levels(7))
+        self.assertEqual(median.HISTOGRAM_MAX_LEVELS, median._histogram_max_levels(51))
+
+    def test_histogram_unavailable_raises(self):
+        data = np.random.default_rng(1).random((40, 40))
+        with self.assertRaises(ValueError):
+            median_filter(data, 5, algorithm=HISTOGRAM)
+
+    def test_unknown_algorithm_raises(self):
+        with self.assertRaises(ValueError):
+            median_filter(_image("counts"), 5, algorithm="sort")
+
+    def test_unknown_mode_raises(self):
+        with self.assertRaises(ValueError):
+            median_filter(_image("counts"), 5, mode="extend")
+
+
+if __name__ == "__main__":
+    unittest.main()
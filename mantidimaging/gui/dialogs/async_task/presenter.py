@@ -58,6 +58,13 @@ class AsyncTaskDialogPresenter(QObject, ProgressHandler):
         self.model.do_execute_async()
         self.view.show_delayed(1000)
 
+    def cancel_task(self):
+        """
+        Asks the task to stop at its next progress update
+        """
+        if self.progress is not None:
+            self.progress.cancel()
+
     @property
     def task_is_running(self):
         return self.model.task_is_running
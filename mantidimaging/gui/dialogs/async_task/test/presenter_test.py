@@ -9,6 +9,7 @@ from unittest import mock
 
 from mantidimaging.gui.dialogs.async_task import (AsyncTaskDialogPresenter, AsyncTaskDialogView)
 from mantidimaging.gui.dialogs.async_task.presenter import Notification
+from mantidimaging.core.utility.progress_reporting import Progress
 
 
 class AsyncTaskDialogPresenterTest(unittest.TestCase):
@@ -30,3 +31,13 @@ class AsyncTaskDialogPresenterTest(unittest.TestCase):
 
         p.model.task.wait()
         self.assertFalse(p.task_is_running)
+
+    def test_cancel_task(self):
+        v = mock.create_autospec(AsyncTaskDialogView)
+        p = AsyncTaskDialogPresenter(v)
+        progress = Progress()
+        progress.add_progress_handler(p)
+
+        p.cancel_task()
+
+        self.assertTrue(progress.should_cancel)
@@ -23,6 +23,9 @@ class AsyncTaskDialogView(BaseDialogView):
         self.progressBar.setMinimum(0)
         self.progressBar.setMaximum(1000)
 
+        self.cancelButton.hide()
+        self.cancelButton.clicked.connect(self.cancel)
+
         self.show_timer = QTimer(self)
         self.hide()
 
@@ -52,6 +55,11 @@ class AsyncTaskDialogView(BaseDialogView):
         self.presenter.model = None
         self._presenter = None
 
+    def cancel(self):
+        self.cancelButton.setEnabled(False)
+        self.infoText.setText("Cancelling...")
+        self.presenter.cancel_task()
+
     def set_progress(self, progress: float, message: str):
         # Set status message
         if message:
@@ -75,7 +83,8 @@ def start_async_task_view(parent: QMainWindow,
                           on_complete: Callable,
                           kwargs: Optional[Dict] = None,
                           tracker: Optional[Set[Any]] = None,
-                          busy: Optional[bool] = False):
+                          busy: Optional[bool] = False,
+                          cancelable: bool = False):
     atd = AsyncTaskDialogView(parent)
     if not kwargs:
         kwargs = {'progress': Progress()}
@@ -87,6 +96,9 @@ def start_async_task_view(parent: QMainWindow,
         atd.progressBar.setMinimum(0)
         atd.progressBar.setMaximum(0)
 
+    if cancelable:
+        atd.cancelButton.show()
+
     atd.presenter.set_task(task)
     atd.presenter.set_on_complete(on_complete)
     atd.presenter.set_parameters(**kwargs)
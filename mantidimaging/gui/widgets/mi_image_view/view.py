@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from math import degrees
 from time import sleep
-from typing import Callable, Optional, Tuple, TYPE_CHECKING
+from typing import Callable, Optional, Tuple, TYPE_CHECKING, Union
 
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication, QHBoxLayout, QLabel, QPushButton, QSizePolicy
@@ -21,6 +21,7 @@ from mantidimaging.gui.widgets.bad_data_overlay.bad_data_overlay import BadDataO
 if TYPE_CHECKING:
     from pyqtgraph import HistogramLUTItem
     import numpy as np
+    from mantidimaging.core.data.snapshot import SnapshotView
     from mantidimaging.core.utility.data_containers import ProjectionAngles
 
 
@@ -146,7 +147,7 @@ class MIImageView(ImageView, BadDataOverlay, AutoColorMenu):
         self._angles = angles
         self._update_message(self._last_mouse_hover_location)
 
-    def setImage(self, image: np.ndarray, *args, **kwargs):
+    def setImage(self, image: Union[np.ndarray, SnapshotView], *args, **kwargs):
         dimensions_changed = self.image_data is None or self.image_data.shape != image.shape
         if image.ndim == 3:
             # For a 3 dimensional image, we need to specify which axes we are providing and their indices in the
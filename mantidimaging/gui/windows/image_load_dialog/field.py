@@ -8,6 +8,7 @@ from typing import Optional, List, Union, Tuple
 
 from PyQt5.QtWidgets import QTreeWidgetItem, QWidget, QSpinBox, QTreeWidget, QHBoxLayout, QLabel, QCheckBox, QPushButton
 
+from mantidimaging.core.parallel.memory_budget import memory_budget
 from mantidimaging.core.utility import size_calculator
 from mantidimaging.core.utility.data_containers import Indices, FILE_TYPES
 
@@ -176,18 +177,21 @@ class Field:
             else:
                 self._increment_spinbox.setValue(1)
 
-    def _update_expected_mem_usage(self, shape: Tuple[int, int]) -> Tuple[int, float]:
+    def _update_expected_mem_usage(self, shape: Tuple[int, int]) -> Tuple[int, float, bool]:
+        """
+        :return: The number of images, their size in MB once loaded, and whether they fit in the memory budget
+        """
         num_images = size_calculator.number_of_images_from_indices(self._start.value(), self._stop.value(),
                                                                    self._increment.value())
 
-        single_mem = size_calculator.full_size_MB(shape, dtype=np.float32)
-
-        exp_mem = round(single_mem * num_images, 2)
-        return num_images, exp_mem
+        exp_bytes = size_calculator.full_size_bytes((num_images, ) + tuple(shape), dtype=np.float32)
+        exp_mem = round(exp_bytes / 1024**2, 2)
+        return num_images, exp_mem, memory_budget.fits(exp_bytes)
 
     def update_shape(self, shape: Union[int, Tuple[int, int]]) -> None:
         if isinstance(shape, int):
             self._shape = f"{str(shape)} images"
         else:
-            num_images, exp_mem = self._update_expected_mem_usage(shape)
-            self._shape = f"{num_images} images x {shape[0]} x {shape[1]}, {exp_mem}MB"
+            num_images, exp_mem, fits = self._update_expected_mem_usage(shape)
+            warning = "" if fits else ", more than the free memory"
+            self._shape = f"{num_images} images x {shape[0]} x {shape[1]}, {exp_mem}MB{warning}"
@@ -8,7 +8,9 @@ from typing import TYPE_CHECKING, Optional
 
 from mantidimaging.core.io.filenames import FilenameGroup
 from mantidimaging.core.io.loader import load_log
-from mantidimaging.core.io.loader.loader import LoadingParameters, ImageParameters, read_image_dimensions
+from mantidimaging.core.io.loader.img_loader import COMBINE_METHODS
+from mantidimaging.core.io.loader.loader import LoadingParameters, ImageParameters
+from mantidimaging.core.io.loader.probe import probe_image
 from mantidimaging.core.utility.data_containers import FILE_TYPES, log_for_file_type
 from mantidimaging.gui.windows.image_load_dialog.field import Field
 
@@ -60,9 +62,11 @@ class LoadPresenter:
         self.update_field_with_filegroup(FILE_TYPES.SAMPLE, sample)
 
         sample_field.widget.setExpanded(True)
-        sample_shape = read_image_dimensions(Path(selected_file))
-        self.view.sample.update_indices(len(sample.all_indexes))
-        self.view.sample.update_shape(sample_shape)
+        # Only the header of the file is read, so this stays quick for large files on network storage
+        sample_info = probe_image(Path(selected_file))
+        # The images of a multi-page file are its pages
+        self.view.sample.update_indices(len(sample.all_indexes) * sample_info.pages)
+        self.view.sample.update_shape(sample_info.shape)
         self.view.enable_preview_all_buttons()
         self.view.ok_button.setEnabled(True)
 
@@ -123,6 +127,8 @@ class LoadPresenter:
         loading_param.pixel_size = self.view.pixelSize.value()
         loading_param.dtype = self.view.pixel_bit_depth.currentText()
         loading_param.sinograms = self.view.images_are_sinograms.isChecked()
+        combine = self.view.flat_dark_combine.currentText()
+        loading_param.flat_dark_combine = combine if combine in COMBINE_METHODS else None
         return loading_param
 
     def _update_field_action(self, field: Field, file_name) -> None:
@@ -6,7 +6,10 @@ import unittest
 from pathlib import Path
 from unittest import mock
 
+import numpy as np
+
 from mantidimaging.core.io.filenames import FilenameGroup
+from mantidimaging.core.io.loader.probe import ImageInfo
 from mantidimaging.core.utility.imat_log_file_parser import IMATLogFile
 from mantidimaging.gui.windows.image_load_dialog.field import Field
 from mantidimaging.gui.windows.image_load_dialog.presenter import LoadPresenter
@@ -75,11 +78,11 @@ class ImageLoadDialogPresenterTest(unittest.TestCase):
         self.fields["Dark Before"].set_images.assert_called_once_with(file_list)
 
     @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.FilenameGroup")
-    @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.read_image_dimensions")
+    @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.probe_image")
     @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.LoadPresenter.update_field_with_filegroup")
-    def test_do_update_sample_no_related(self, mock_update_field, mock_read_image_dimensions, mock_filename_group):
+    def test_do_update_sample_no_related(self, mock_update_field, mock_probe_image, mock_filename_group):
         selected_file = "/a/b/img_000.tif"
-        mock_read_image_dimensions.return_value = [10, 11]
+        mock_probe_image.return_value = ImageInfo((10, 11), np.dtype(np.uint16))
         mock_sample_fg = mock.create_autospec(FilenameGroup)
         mock_filename_group.from_file.return_value = mock_sample_fg
         mock_sample_fg.all_indexes = [0, 1, 2, 3]
@@ -89,16 +92,30 @@ class ImageLoadDialogPresenterTest(unittest.TestCase):
 
         mock_update_field.assert_called_once_with(FILE_TYPES.SAMPLE, mock_sample_fg)
         self.fields["Sample"].update_indices.assert_called_once_with(4)
-        self.fields["Sample"].update_shape.assert_called_once_with([10, 11])
+        self.fields["Sample"].update_shape.assert_called_once_with((10, 11))
         self.v.ok_button.setEnabled.assert_called_once_with(True)
 
     @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.FilenameGroup")
-    @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.read_image_dimensions")
+    @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.probe_image")
     @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.LoadPresenter.update_field_with_filegroup")
-    def test_do_update_sample_related_flat_before(self, mock_update_field, mock_read_image_dimensions,
-                                                  mock_filename_group):
+    def test_do_update_sample_multi_page_file(self, mock_update_field, mock_probe_image, mock_filename_group):
+        mock_probe_image.return_value = ImageInfo((10, 11), np.dtype(np.uint16), pages=50)
+        mock_sample_fg = mock.create_autospec(FilenameGroup)
+        mock_filename_group.from_file.return_value = mock_sample_fg
+        mock_sample_fg.all_indexes = [0]
+        mock_sample_fg.find_related.return_value = None
+
+        self.p.do_update_sample("/a/b/volume.tif")
+
+        self.fields["Sample"].update_indices.assert_called_once_with(50)
+        self.fields["Sample"].update_shape.assert_called_once_with((10, 11))
+
+    @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.FilenameGroup")
+    @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.probe_image")
+    @mock.patch("mantidimaging.gui.windows.image_load_dialog.presenter.LoadPresenter.update_field_with_filegroup")
+    def test_do_update_sample_related_flat_before(self, mock_update_field, mock_probe_image, mock_filename_group):
         selected_file = "/a/b/img_000.tif"
-        mock_read_image_dimensions.return_value = [10, 11]
+        mock_probe_image.return_value = ImageInfo((10, 11), np.dtype(np.uint16))
         mock_sample_fg = mock.create_autospec(FilenameGroup)
         mock_fb_fg = mock.create_autospec(FilenameGroup)
         mock_filename_group.from_file.return_value = mock_sample_fg
@@ -232,6 +249,7 @@ class ImageLoadDialogPresenterTest(unittest.TestCase):
         self.v.pixelSize.value.return_value = pixel_size
         self.v.pixel_bit_depth.currentText.return_value = dtype
         self.v.images_are_sinograms.isChecked.return_value = sinograms
+        self.v.flat_dark_combine.currentText.return_value = "Median"
 
         lp = self.p.get_parameters()
 
@@ -261,8 +279,19 @@ class ImageLoadDialogPresenterTest(unittest.TestCase):
         self.assertEqual(lp.name, sample_path.name)
         self.assertEqual(lp.dtype, dtype)
         self.assertEqual(lp.sinograms, sinograms)
+        self.assertEqual(lp.flat_dark_combine, "Median")
         self.assertEqual(lp.pixel_size, pixel_size)
 
         self.assertNotIn(FILE_TYPES.SAMPLE_LOG, lp.image_stacks.keys())
         self.assertNotIn(FILE_TYPES.FLAT_BEFORE_LOG, lp.image_stacks.keys())
         self.assertNotIn(FILE_TYPES.FLAT_AFTER_LOG, lp.image_stacks.keys())
+
+    def test_get_parameters_keeps_all_flat_and_dark_images(self):
+        type(self.fields["Sample"]).path = mock.PropertyMock(return_value=Path("/sample/tomo/tomo_0001.tiff"))
+        for field in self.fields.values():
+            field.use.isChecked.return_value = False
+        self.v.flat_dark_combine.currentText.return_value = "Keep all images"
+
+        lp = self.p.get_parameters()
+
+        self.assertIsNone(lp.flat_dark_combine)
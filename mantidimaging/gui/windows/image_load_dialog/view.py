@@ -7,6 +7,7 @@ from typing import Optional, Dict
 from PyQt5.QtWidgets import QComboBox, QCheckBox, QTreeWidget, QTreeWidgetItem, QPushButton, QSizePolicy, \
     QHeaderView, QSpinBox, QFileDialog, QDialogButtonBox, QWidget
 
+from mantidimaging.core.io.loader.img_loader import COMBINE_METHODS
 from mantidimaging.core.io.loader.loader import DEFAULT_PIXEL_SIZE, DEFAULT_IS_SINOGRAM, DEFAULT_PIXEL_DEPTH, \
     LoadingParameters
 from mantidimaging.core.utility.data_containers import FILE_TYPES
@@ -14,11 +15,14 @@ from mantidimaging.gui.windows.image_load_dialog.field import Field
 from .presenter import LoadPresenter
 from ...mvp_base import BaseDialogView
 
+FLAT_DARK_KEEP_ALL = "Keep all images"
+
 
 class ImageLoadDialog(BaseDialogView):
     tree: QTreeWidget
     pixel_bit_depth: QComboBox
     images_are_sinograms: QCheckBox
+    flat_dark_combine: QComboBox
 
     pixelSize: QSpinBox
 
@@ -58,6 +62,8 @@ class ImageLoadDialog(BaseDialogView):
         self.images_are_sinograms.setChecked(DEFAULT_IS_SINOGRAM)
         self.pixelSize.setValue(DEFAULT_PIXEL_SIZE)
         self.pixel_bit_depth.setCurrentText(DEFAULT_PIXEL_DEPTH)
+        # Flat and dark stacks are loaded in full unless a combine method is chosen
+        self.flat_dark_combine.addItems([FLAT_DARK_KEEP_ALL] + COMBINE_METHODS)
 
     def create_file_input(self, position: int, file_info: FILE_TYPES) -> Field:
         section: QTreeWidgetItem = self.tree.topLevelItem(position)
@@ -8,7 +8,7 @@ from typing import Dict, Optional, List, Union, NoReturn, TYPE_CHECKING
 
 from mantidimaging.core.data import ImageStack
 from mantidimaging.core.data.dataset import StrictDataset, MixedDataset
-from mantidimaging.core.io import loader, saver
+from mantidimaging.core.io import loader, saver, session
 from mantidimaging.core.io.filenames import FilenameGroup
 from mantidimaging.core.io.loader.loader import LoadingParameters
 from mantidimaging.core.utility.data_containers import ProjectionAngles, FILE_TYPES
@@ -36,8 +36,14 @@ class MainWindowModel(object):
         return None
 
     def do_load_dataset(self, parameters: LoadingParameters, progress: Progress) -> StrictDataset:
-        def load(im_param):
-            return loader.load_stack_from_image_params(im_param, progress, dtype=parameters.dtype)
+        def load(im_param, combine=None):
+            return loader.load_stack_from_image_params(im_param,
+                                                       progress,
+                                                       dtype=parameters.dtype,
+                                                       workers=parameters.load_workers,
+                                                       roi=parameters.roi,
+                                                       binning=parameters.binning,
+                                                       combine=combine)
 
         sample = load(parameters.image_stacks[FILE_TYPES.SAMPLE])
         ds = StrictDataset(sample)
@@ -52,7 +58,10 @@ class MainWindowModel(object):
                 FILE_TYPES.PROJ_180,
         ]:
             if im_param := parameters.image_stacks.get(file_type):
-                image_stack = load(im_param)
+                if file_type == FILE_TYPES.PROJ_180:
+                    image_stack = load(im_param)
+                else:
+                    image_stack = load(im_param, parameters.flat_dark_combine)
                 ds.set_stack(file_type, image_stack)
 
         self.datasets[ds.id] = ds
@@ -80,13 +89,31 @@ class MainWindowModel(object):
         images.filenames = filenames
         return True
 
-    def do_nexus_saving(self, dataset_id: uuid.UUID, path: str, sample_name: str) -> Optional[bool]:
+    def do_nexus_saving(self,
+                        dataset_id: uuid.UUID,
+                        path: str,
+                        sample_name: str,
+                        compress: bool = False,
+                        progress: Optional[Progress] = None) -> Optional[bool]:
         if dataset_id in self.datasets and isinstance(self.datasets[dataset_id], StrictDataset):
-            saver.nexus_save(self.datasets[dataset_id], path, sample_name)  # type: ignore
+            options = saver.NexusSaveOptions(compression="gzip" if compress else None)
+            saver.nexus_save(self.datasets[dataset_id], path, sample_name, options, progress)  # type: ignore
             return True
         else:
             raise RuntimeError(f"Failed to get StrictDataset with ID {dataset_id}")
 
+    def do_session_saving(self, path: str, compress: bool = False, progress: Optional[Progress] = None) -> bool:
+        session.save_session(list(self.datasets.values()), path, compress, progress)
+        return True
+
+    def do_session_loading(self,
+                           path: str,
+                           progress: Optional[Progress] = None) -> List[Union[MixedDataset, StrictDataset]]:
+        datasets = session.load_session(path, progress)
+        for dataset in datasets:
+            self.add_dataset_to_model(dataset)
+        return datasets
+
     def get_existing_180_id(self, dataset_id: uuid.UUID) -> Optional[uuid.UUID]:
         """
         Gets the ID of the 180 projection object in a Dataset.
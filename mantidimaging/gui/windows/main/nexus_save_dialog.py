@@ -50,6 +50,9 @@ class NexusSaveDialog(BaseDialogView):
     def sample_name(self) -> str:
         return str(self.sampleNameLineEdit.text())
 
+    def compress(self) -> bool:
+        return self.compressCheckBox.isChecked()
+
     def enable_save(self):
         self.buttonBox.button(QDialogButtonBox.StandardButton.Save).setEnabled(self.save_path().strip() != ""
                                                                                and self.sample_name().strip() != "")
@@ -21,6 +21,7 @@ from mantidimaging.gui.mvp_base import BasePresenter
 from mantidimaging.gui.windows.stack_visualiser.view import StackVisualiserView
 from .model import MainWindowModel
 from mantidimaging.gui.windows.main.image_save_dialog import ImageSaveDialog
+from mantidimaging.gui.windows.nexus_load_dialog.presenter import load_nexus_dataset
 
 if TYPE_CHECKING:
     from mantidimaging.gui.windows.main import MainWindowView  # pragma: no cover
@@ -136,22 +137,52 @@ class MainWindowPresenter(BasePresenter):
 
     def load_nexus_file(self) -> None:
         assert self.view.nexus_load_dialog is not None
-        dataset, _ = self.view.nexus_load_dialog.presenter.get_dataset()
-        self.model.add_dataset_to_model(dataset)
-        self._add_strict_dataset_to_view(dataset)
-        self.view.model_changed.emit()
+        par = self.view.nexus_load_dialog.presenter.get_parameters()
+
+        start_async_task_view(self.view, load_nexus_dataset, self._on_nexus_load_done, {'parameters': par})
+
+    def _on_nexus_load_done(self, task: 'TaskWorkerThread') -> None:
+        if task.was_successful():
+            dataset, _ = task.result
+            self.model.add_dataset_to_model(dataset)
+            self._add_strict_dataset_to_view(dataset)
+            self.view.model_changed.emit()
+            task.result = None
+        else:
+            self._handle_task_error(self.LOAD_ERROR_STRING, task)
 
     def save_nexus_file(self):
         assert self.view.nexus_save_dialog is not None
         dataset_id = self.view.nexus_save_dialog.selected_dataset
-        start_async_task_view(self.view,
-                              self.model.do_nexus_saving,
-                              self._on_save_done, {
-                                  'dataset_id': dataset_id,
-                                  'path': self.view.nexus_save_dialog.save_path(),
-                                  'sample_name': self.view.nexus_save_dialog.sample_name()
-                              },
-                              busy=True)
+        start_async_task_view(
+            self.view, self.model.do_nexus_saving, self._on_save_done, {
+                'dataset_id': dataset_id,
+                'path': self.view.nexus_save_dialog.save_path(),
+                'sample_name': self.view.nexus_save_dialog.sample_name(),
+                'compress': self.view.nexus_save_dialog.compress()
+            })
+
+    def save_session(self, file_path: str, compress: bool) -> None:
+        start_async_task_view(self.view, self.model.do_session_saving, self._on_save_done, {
+            'path': file_path,
+            'compress': compress
+        })
+
+    def load_session(self, file_path: str) -> None:
+        start_async_task_view(self.view, self.model.do_session_loading, self._on_session_load_done, {'path': file_path})
+
+    def _on_session_load_done(self, task: 'TaskWorkerThread') -> None:
+        if task.was_successful():
+            for dataset in task.result:
+                if isinstance(dataset, StrictDataset):
+                    self._add_strict_dataset_to_view(dataset)
+                else:
+                    self.create_mixed_dataset_tree_view_items(dataset)
+                    self.create_mixed_dataset_stack_windows(dataset)
+            self.view.model_changed.emit()
+            task.result = None
+        else:
+            self._handle_task_error(self.LOAD_ERROR_STRING, task)
 
     def load_image_stack(self, file_path: str) -> None:
         start_async_task_view(self.view, self.model.load_images_into_mixed_dataset, self._on_stack_load_done,
@@ -12,7 +12,9 @@ from mantidimaging.core.data import ImageStack
 from mantidimaging.core.data.dataset import StrictDataset, MixedDataset
 from mantidimaging.core.data.reconlist import ReconList
 from mantidimaging.core.io.loader.loader import LoadingParameters, ImageParameters
+from mantidimaging.core.io.saver import NexusSaveOptions
 from mantidimaging.core.utility.data_containers import ProjectionAngles, FILE_TYPES, Indices
+from mantidimaging.core.utility.sensible_roi import SensibleROI
 from mantidimaging.gui.windows.main import MainWindowModel
 from mantidimaging.gui.windows.main.model import _matching_dataset_attribute
 from mantidimaging.test_helpers.unit_test_helper import generate_images
@@ -50,7 +52,13 @@ class MainWindowModelTest(unittest.TestCase):
 
         self.model.do_load_dataset(lp, progress_mock)
 
-        load_mock.assert_called_once_with(sample_mock, progress_mock, dtype=lp.dtype)
+        load_mock.assert_called_once_with(sample_mock,
+                                          progress_mock,
+                                          dtype=lp.dtype,
+                                          workers=lp.load_workers,
+                                          roi=None,
+                                          binning=1,
+                                          combine=None)
         load_log_mock.assert_not_called()
 
     @mock.patch('mantidimaging.core.io.loader.loader.load')
@@ -71,7 +79,30 @@ class MainWindowModelTest(unittest.TestCase):
                                           progress=progress_mock,
                                           dtype=lp.dtype,
                                           indices=None,
-                                          log_file=log_file_mock)
+                                          log_file=log_file_mock,
+                                          workers=lp.load_workers,
+                                          roi=None,
+                                          binning=1)
+
+    @mock.patch('mantidimaging.core.io.loader.loader.load')
+    def test_do_load_stack_with_roi_and_binning(self, load_mock: mock.Mock):
+        lp = LoadingParameters()
+        mock_filename_group = mock.Mock()
+        lp.image_stacks[FILE_TYPES.SAMPLE] = ImageParameters(mock_filename_group)
+        lp.roi = SensibleROI(10, 20, 110, 220)
+        lp.binning = 2
+        progress_mock = mock.Mock()
+
+        self.model.do_load_dataset(lp, progress_mock)
+
+        load_mock.assert_called_once_with(filename_group=mock_filename_group,
+                                          progress=progress_mock,
+                                          dtype=lp.dtype,
+                                          indices=None,
+                                          log_file=None,
+                                          workers=lp.load_workers,
+                                          roi=lp.roi,
+                                          binning=2)
 
     @mock.patch('mantidimaging.core.io.loader.loader.load')
     def test_do_load_stack_sample_indicies(self, load_mock: mock.Mock):
@@ -92,7 +123,10 @@ class MainWindowModelTest(unittest.TestCase):
                                           progress=progress_mock,
                                           dtype=lp.dtype,
                                           indices=indices,
-                                          log_file=None)
+                                          log_file=None,
+                                          workers=lp.load_workers,
+                                          roi=None,
+                                          binning=1)
 
     @mock.patch('mantidimaging.gui.windows.main.model.loader.load_stack_from_image_params')
     @mock.patch('mantidimaging.gui.windows.main.model.StrictDataset')
@@ -123,9 +157,27 @@ class MainWindowModelTest(unittest.TestCase):
         self.model.do_load_dataset(lp, progress_mock)
 
         load_mock.assert_has_calls([
-            mock.call(sample_mock, progress_mock, dtype=lp.dtype),
-            mock.call(flat_before_mock, progress_mock, dtype=lp.dtype),
-            mock.call(flat_after_mock, progress_mock, dtype=lp.dtype)
+            mock.call(sample_mock,
+                      progress_mock,
+                      dtype=lp.dtype,
+                      workers=lp.load_workers,
+                      roi=None,
+                      binning=1,
+                      combine=None),
+            mock.call(flat_before_mock,
+                      progress_mock,
+                      dtype=lp.dtype,
+                      workers=lp.load_workers,
+                      roi=None,
+                      binning=1,
+                      combine=None),
+            mock.call(flat_after_mock,
+                      progress_mock,
+                      dtype=lp.dtype,
+                      workers=lp.load_workers,
+                      roi=None,
+                      binning=1,
+                      combine=None)
         ])
 
         dataset_mock.assert_called_with(sample_images_mock)
@@ -135,6 +187,45 @@ class MainWindowModelTest(unittest.TestCase):
             mock.call(FILE_TYPES.FLAT_AFTER, flata_images_mock),
         ])
 
+    @mock.patch('mantidimaging.gui.windows.main.model.loader.load_stack_from_image_params')
+    @mock.patch('mantidimaging.gui.windows.main.model.StrictDataset')
+    def test_do_load_stack_combines_flats_and_darks(self, dataset_mock: mock.Mock, load_mock: mock.Mock):
+        lp = LoadingParameters()
+        sample_mock = ImageParameters(mock.Mock())
+        lp.image_stacks[FILE_TYPES.SAMPLE] = sample_mock
+        flat_before_mock = ImageParameters(mock.Mock())
+        lp.image_stacks[FILE_TYPES.FLAT_BEFORE] = flat_before_mock
+        proj_180deg_mock = ImageParameters(mock.Mock())
+        lp.image_stacks[FILE_TYPES.PROJ_180] = proj_180deg_mock
+        lp.flat_dark_combine = "Median"
+        progress_mock = mock.Mock()
+
+        self.model.do_load_dataset(lp, progress_mock)
+
+        load_mock.assert_has_calls([
+            mock.call(sample_mock,
+                      progress_mock,
+                      dtype=lp.dtype,
+                      workers=lp.load_workers,
+                      roi=None,
+                      binning=1,
+                      combine=None),
+            mock.call(flat_before_mock,
+                      progress_mock,
+                      dtype=lp.dtype,
+                      workers=lp.load_workers,
+                      roi=None,
+                      binning=1,
+                      combine="Median"),
+            mock.call(proj_180deg_mock,
+                      progress_mock,
+                      dtype=lp.dtype,
+                      workers=lp.load_workers,
+                      roi=None,
+                      binning=1,
+                      combine=None),
+        ])
+
     @mock.patch('mantidimaging.gui.windows.main.model.loader.load_stack_from_image_params')
     @mock.patch('mantidimaging.gui.windows.main.model.StrictDataset')
     def test_do_load_stack_sample_and_dark_and_180deg(self, dataset_mock: mock.Mock, load_mock: mock.Mock):
@@ -167,10 +258,34 @@ class MainWindowModelTest(unittest.TestCase):
         self.model.do_load_dataset(lp, progress_mock)
 
         load_mock.assert_has_calls([
-            mock.call(sample_mock, progress_mock, dtype=lp.dtype),
-            mock.call(dark_before_mock, progress_mock, dtype=lp.dtype),
-            mock.call(dark_after_mock, progress_mock, dtype=lp.dtype),
-            mock.call(proj_180deg_mock, progress_mock, dtype=lp.dtype),
+            mock.call(sample_mock,
+                      progress_mock,
+                      dtype=lp.dtype,
+                      workers=lp.load_workers,
+                      roi=None,
+                      binning=1,
+                      combine=None),
+            mock.call(dark_before_mock,
+                      progress_mock,
+                      dtype=lp.dtype,
+                      workers=lp.load_workers,
+                      roi=None,
+                      binning=1,
+                      combine=None),
+            mock.call(dark_after_mock,
+                      progress_mock,
+                      dtype=lp.dtype,
+                      workers=lp.load_workers,
+                      roi=None,
+                      binning=1,
+                      combine=None),
+            mock.call(proj_180deg_mock,
+                      progress_mock,
+                      dtype=lp.dtype,
+                      workers=lp.load_workers,
+                      roi=None,
+                      binning=1,
+                      combine=None),
         ])
 
         dataset_mock.assert_called_with(sample_images_mock)
@@ -524,7 +639,37 @@ class MainWindowModelTest(unittest.TestCase):
         sample_name = "sample-name"
 
         self.model.do_nexus_saving(sd.id, path, sample_name)
-        nexus_save.assert_called_once_with(sd, path, sample_name)
+        nexus_save.assert_called_once_with(sd, path, sample_name, NexusSaveOptions(), None)
+
+    @mock.patch("mantidimaging.gui.windows.main.model.saver.nexus_save")
+    def test_do_nexus_save_compressed(self, nexus_save):
+        sd = StrictDataset(generate_images())
+        self.model.add_dataset_to_model(sd)
+        progress = mock.Mock()
+
+        self.model.do_nexus_saving(sd.id, "path", "sample-name", compress=True, progress=progress)
+        nexus_save.assert_called_once_with(sd, "path", "sample-name", NexusSaveOptions(compression="gzip"), progress)
+
+    @mock.patch("mantidimaging.gui.windows.main.model.session.save_session")
+    def test_do_session_saving(self, save_session):
+        sd = StrictDataset(generate_images())
+        md = MixedDataset([generate_images()])
+        self.model.add_dataset_to_model(sd)
+        self.model.add_dataset_to_model(md)
+        progress = mock.Mock()
+
+        self.assertTrue(self.model.do_session_saving("path", compress=True, progress=progress))
+        save_session.assert_called_once_with([sd, md], "path", True, progress)
+
+    @mock.patch("mantidimaging.gui.windows.main.model.session.load_session")
+    def test_do_session_loading_adds_datasets(self, load_session):
+        datasets = [StrictDataset(generate_images()), MixedDataset([generate_images()])]
+        load_session.return_value = datasets
+        progress = mock.Mock()
+
+        self.assertEqual(datasets, self.model.do_session_loading("path", progress))
+        load_session.assert_called_once_with("path", progress)
+        self.assertEqual(datasets, list(self.model.datasets.values()))
 
     def test_is_dataset_strict_returns_true(self):
         strict_ds = StrictDataset(generate_images())
@@ -34,6 +34,11 @@ class NexusSaveDialogTest(unittest.TestCase):
         self.nexus_save_dialog.sampleNameLineEdit.text = mock.Mock(return_value=sample_name)
         self.assertEqual(sample_name, self.nexus_save_dialog.sample_name())
 
+    def test_compress(self):
+        self.assertFalse(self.nexus_save_dialog.compress())
+        self.nexus_save_dialog.compressCheckBox.setChecked(True)
+        self.assertTrue(self.nexus_save_dialog.compress())
+
     def test_save_disabled_when_no_save_path(self):
         self.nexus_save_dialog.savePath.text = mock.Mock(return_value="")
         self.nexus_save_dialog.sampleNameLineEdit.text = mock.Mock(return_value="sample-name")
@@ -19,6 +19,7 @@ from mantidimaging.gui.windows.image_load_dialog import ImageLoadDialog
 from mantidimaging.gui.windows.main import MainWindowView, MainWindowPresenter
 from mantidimaging.gui.windows.main.presenter import Notification, RECON_TEXT
 from mantidimaging.test_helpers.unit_test_helper import generate_images
+from mantidimaging.gui.windows.nexus_load_dialog.presenter import load_nexus_dataset
 
 
 def generate_images_with_filenames(n_images: int) -> List[ImageStack]:
@@ -124,6 +125,48 @@ class MainWindowPresenterTest(unittest.TestCase):
         start_async_mock.assert_called_once_with(self.view, self.presenter.model.load_images_into_mixed_dataset,
                                                  self.presenter._on_stack_load_done, {'file_path': file_path})
 
+    @mock.patch("mantidimaging.gui.windows.main.presenter.start_async_task_view")
+    def test_save_session(self, start_async_mock: mock.Mock):
+        self.presenter.save_session("a/session.mis", True)
+
+        start_async_mock.assert_called_once_with(self.view, self.presenter.model.do_session_saving,
+                                                 self.presenter._on_save_done, {
+                                                     'path': "a/session.mis",
+                                                     'compress': True
+                                                 })
+
+    @mock.patch("mantidimaging.gui.windows.main.presenter.start_async_task_view")
+    def test_load_session(self, start_async_mock: mock.Mock):
+        self.presenter.load_session("a/session.mis")
+
+        start_async_mock.assert_called_once_with(self.view, self.presenter.model.do_session_loading,
+                                                 self.presenter._on_session_load_done, {'path': "a/session.mis"})
+
+    def test_on_session_load_done_adds_datasets_to_view(self):
+        strict_ds = StrictDataset(generate_images())
+        mixed_ds = MixedDataset([generate_images()])
+        task = mock.Mock()
+        task.result = [strict_ds, mixed_ds]
+        task.was_successful.return_value = True
+        self.presenter._add_strict_dataset_to_view = mock.Mock()
+        self.presenter.create_mixed_dataset_tree_view_items = mock.Mock()
+        self.presenter.create_mixed_dataset_stack_windows = mock.Mock()
+
+        self.presenter._on_session_load_done(task)
+
+        self.presenter._add_strict_dataset_to_view.assert_called_once_with(strict_ds)
+        self.presenter.create_mixed_dataset_tree_view_items.assert_called_once_with(mixed_ds)
+        self.presenter.create_mixed_dataset_stack_windows.assert_called_once_with(mixed_ds)
+        self.view.model_changed.emit.assert_called_once()
+
+    def test_failed_session_load_shows_error(self):
+        task = TaskWorkerThread()
+        task.error = 'something'
+
+        self.presenter._on_session_load_done(task)
+
+        self.view.show_error_dialog.assert_called_once_with(self.presenter.LOAD_ERROR_STRING.format(task.error))
+
     def test_add_stack(self):
         images = generate_images()
         dock_mock = mock.Mock()
@@ -240,12 +283,30 @@ class MainWindowPresenterTest(unittest.TestCase):
 
     @mock.patch("mantidimaging.gui.windows.main.presenter.MainWindowPresenter.add_alternative_180_if_required")
     def test_nexus_load_success_calls_show_information(self, _):
-        self.view.nexus_load_dialog = mock.Mock()
         data_title = "data tile"
-        self.view.nexus_load_dialog.presenter.get_dataset.return_value = self.dataset, data_title
+        task = mock.Mock()
+        task.was_successful.return_value = True
+        task.result = self.dataset, data_title
         self.presenter.create_strict_dataset_stack_windows = mock.Mock()
-        self.presenter.load_nexus_file()
+        self.presenter._on_nexus_load_done(task)
         self.presenter.create_strict_dataset_stack_windows.assert_called_once_with(self.dataset)
+        self.model.add_dataset_to_model.assert_called_once_with(self.dataset)
+
+    @mock.patch("mantidimaging.gui.windows.main.presenter.start_async_task_view")
+    def test_nexus_load_runs_async(self, start_async_mock: mock.Mock):
+        self.view.nexus_load_dialog = mock.Mock()
+        self.presenter.load_nexus_file()
+        start_async_mock.assert_called_once_with(
+            self.view, load_nexus_dataset, self.presenter._on_nexus_load_done,
+            {'parameters': self.view.nexus_load_dialog.presenter.get_parameters.return_value})
+
+    def test_nexus_load_failure_shows_error(self):
+        task = mock.Mock()
+        task.was_successful.return_value = False
+        task.error = ValueError("Bad file")
+        self.presenter._on_nexus_load_done(task)
+        self.view.show_error_dialog.assert_called_once()
+        self.model.add_dataset_to_model.assert_not_called()
 
     def test_get_stack_widget_by_name_success(self):
         stack_window = mock.Mock()
@@ -754,16 +815,16 @@ class MainWindowPresenterTest(unittest.TestCase):
         nexus_save_dialog_mock.save_path.return_value = save_path = "nexus/save/path"
         nexus_save_dialog_mock.sample_name.return_value = sample_name = "sample-name"
         nexus_save_dialog_mock.selected_dataset = dataset_id = "dataset-id"
+        nexus_save_dialog_mock.compress.return_value = True
 
         self.presenter.notify(Notification.NEXUS_SAVE)
-        start_async_mock.assert_called_once_with(self.presenter.view,
-                                                 self.model.do_nexus_saving,
+        start_async_mock.assert_called_once_with(self.presenter.view, self.model.do_nexus_saving,
                                                  self.presenter._on_save_done, {
                                                      'dataset_id': dataset_id,
                                                      'path': save_path,
-                                                     'sample_name': sample_name
-                                                 },
-                                                 busy=True)
+                                                     'sample_name': sample_name,
+                                                     'compress': True
+                                                 })
 
     def test_get_dataset(self):
         test_ds = StrictDataset(generate_images())
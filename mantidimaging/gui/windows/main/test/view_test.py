@@ -8,6 +8,7 @@ from uuid import uuid4
 
 from unittest import mock
 import numpy as np
+from parameterized import parameterized
 from PyQt5.QtWidgets import QDialog
 
 from mantidimaging.core.data.dataset import StrictDataset, MixedDataset
@@ -217,6 +218,7 @@ class MainWindowViewTest(unittest.TestCase):
         self.view.actionSampleLoadLog.setEnabled(original_state)
         self.view.actionLoad180deg.setEnabled(original_state)
         self.view.actionLoadProjectionAngles.setEnabled(original_state)
+        self.view.actionSaveSession.setEnabled(original_state)
         self.view.menuWorkflow.setEnabled(original_state)
         self.view.menuImage.setEnabled(original_state)
 
@@ -226,6 +228,7 @@ class MainWindowViewTest(unittest.TestCase):
         self.assertEqual(has_stacks, self.view.actionSampleLoadLog.isEnabled())
         self.assertEqual(has_strict_datasets, self.view.actionLoad180deg.isEnabled())
         self.assertEqual(has_stacks, self.view.actionLoadProjectionAngles.isEnabled())
+        self.assertEqual(has_stacks, self.view.actionSaveSession.isEnabled())
         self.assertEqual(has_stacks, self.view.menuWorkflow.isEnabled())
         self.assertEqual(has_stacks, self.view.menuImage.isEnabled())
 
@@ -309,6 +312,41 @@ class MainWindowViewTest(unittest.TestCase):
         self.presenter.load_image_stack.assert_called_once_with(selected_file)
         self.view._get_file_name.assert_called_once_with("Image", "Image File (*.tif *.tiff)")
 
+    def test_open_session(self):
+        self.view._get_file_name = mock.MagicMock(return_value="session.mis")
+
+        self.view.open_session()
+
+        self.presenter.load_session.assert_called_once_with("session.mis")
+        self.view._get_file_name.assert_called_once_with("Session", "Session (*.mis)")
+
+    def test_open_session_cancelled(self):
+        self.view._get_file_name = mock.MagicMock(return_value="")
+
+        self.view.open_session()
+
+        self.presenter.load_session.assert_not_called()
+
+    @parameterized.expand([
+        ("uncompressed", "Session (*.mis)", False),
+        ("compressed", "Compressed session (*.mis)", True),
+    ])
+    @mock.patch("mantidimaging.gui.windows.main.view.QFileDialog.getSaveFileName")
+    def test_save_session(self, _, selected_filter, compress, get_save_file_name):
+        get_save_file_name.return_value = ("a/session", selected_filter)
+
+        self.view.save_session()
+
+        self.presenter.save_session.assert_called_once_with("a/session.mis", compress=compress)
+
+    @mock.patch("mantidimaging.gui.windows.main.view.QFileDialog.getSaveFileName")
+    def test_save_session_cancelled(self, get_save_file_name):
+        get_save_file_name.return_value = ("", "")
+
+        self.view.save_session()
+
+        self.presenter.save_session.assert_not_called()
+
     def test_show_nexus_load_dialog_calls_show(self):
         self.view._get_file_name = mock.MagicMock()
         with mock.patch("mantidimaging.gui.windows.main.view.NexusLoadDialog") as nexus_load_dialog:
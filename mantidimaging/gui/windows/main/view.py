@@ -17,6 +17,7 @@ from PyQt5.QtWidgets import QAction, QDialog, QLabel, QMessageBox, QMenu, QFileD
 
 from mantidimaging.core.data import ImageStack
 from mantidimaging.core.data.dataset import StrictDataset
+from mantidimaging.core.io.session import SESSION_EXT
 from mantidimaging.core.io.utility import find_first_file_that_is_possibly_a_sample
 from mantidimaging.core.utility import finder
 from mantidimaging.core.utility.command_line_arguments import CommandLineArguments
@@ -166,11 +167,13 @@ class MainWindowView(BaseMainWindowView):
         self.actionLoadDataset.triggered.connect(self.show_image_load_dialog)
         self.actionLoadImages.triggered.connect(self.load_image_stack)
         self.actionLoadNeXusFile.triggered.connect(self.show_nexus_load_dialog)
+        self.actionOpenSession.triggered.connect(self.open_session)
         self.actionSampleLoadLog.triggered.connect(self.load_sample_log_dialog)
         self.actionLoad180deg.triggered.connect(self.load_180_deg_dialog)
         self.actionLoadProjectionAngles.triggered.connect(self.load_projection_angles)
         self.actionSaveImages.triggered.connect(self.show_image_save_dialog)
         self.actionSaveNeXusFile.triggered.connect(self.show_nexus_save_dialog)
+        self.actionSaveSession.triggered.connect(self.save_session)
         self.actionExit.triggered.connect(self.close)
 
         self.menuImage.aboutToShow.connect(self.populate_image_menu)
@@ -207,6 +210,7 @@ class MainWindowView(BaseMainWindowView):
 
         self.actionSaveImages.setEnabled(has_datasets)
         self.actionSaveNeXusFile.setEnabled(has_strict_datasets)
+        self.actionSaveSession.setEnabled(has_datasets)
         self.actionSampleLoadLog.setEnabled(has_datasets)
         self.actionLoad180deg.setEnabled(has_strict_datasets)
         self.actionLoadProjectionAngles.setEnabled(has_datasets)
@@ -265,6 +269,31 @@ class MainWindowView(BaseMainWindowView):
 
         self.presenter.load_image_stack(selected_file)
 
+    SESSION_FILTER = f"Session (*{SESSION_EXT})"
+    COMPRESSED_SESSION_FILTER = f"Compressed session (*{SESSION_EXT})"
+
+    def open_session(self):
+        selected_file = self._get_file_name("Session", self.SESSION_FILTER)
+
+        # Cancel/Close was clicked
+        if selected_file == "":
+            return
+
+        self.presenter.load_session(selected_file)
+
+    def save_session(self):
+        # Uncompressed sessions are memory mapped when they are reopened, compressed ones are smaller
+        selected_file, selected_filter = QFileDialog.getSaveFileName(
+            self, "Save session", "", f"{self.SESSION_FILTER};;{self.COMPRESSED_SESSION_FILTER}")
+
+        # Cancel/Close was clicked
+        if selected_file == "":
+            return
+
+        if os.path.splitext(selected_file)[1] != SESSION_EXT:
+            selected_file += SESSION_EXT
+        self.presenter.save_session(selected_file, compress=selected_filter == self.COMPRESSED_SESSION_FILTER)
+
     def load_sample_log_dialog(self):
         stack_selector = DatasetSelectorDialog(main_window=self,
                                                title="Stack Selector",
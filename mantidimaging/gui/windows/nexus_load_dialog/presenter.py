@@ -1,11 +1,11 @@
 # Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
-import enum
 import traceback
+from dataclasses import dataclass, field
 from enum import auto, Enum
 from logging import getLogger
-from typing import TYPE_CHECKING, Optional, Union, Tuple, List
+from typing import TYPE_CHECKING, Dict, Optional, Union, Tuple, List
 
 import h5py
 import numpy as np
@@ -13,11 +13,13 @@ from mantidimaging.core.data.reconlist import ReconList
 
 from mantidimaging.core.data import ImageStack
 from mantidimaging.core.data.dataset import StrictDataset
+from mantidimaging.core.io.loader.nexus_loader import (ImageKeys, ReconEntry, find_recon_entries, image_key_indices,
+                                                       read_images, read_recon)
 from mantidimaging.core.io.utility import NEXUS_PROCESSED_DATA_PATH
-from mantidimaging.core.parallel import utility as pu
 from mantidimaging.core.utility.data_containers import ProjectionAngles
 
 if TYPE_CHECKING:
+    from mantidimaging.core.utility.progress_reporting import Progress
     from mantidimaging.gui.windows.nexus_load_dialog.view import NexusLoadDialog  # pragma: no cover
 
 logger = getLogger(__name__)
@@ -27,12 +29,6 @@ class Notification(Enum):
     NEXUS_FILE_SELECTED = auto()
 
 
-class ImageKeys(enum.Enum):
-    Projections = 0
-    FlatField = 1
-    DarkField = 2
-
-
 IMAGE_TITLE_MAP = {ImageKeys.Projections: "Projections", ImageKeys.FlatField: "Flat", ImageKeys.DarkField: "Dark"}
 BEFORE_TITLE_MAP = {True: "Before", False: "After"}
 
@@ -40,8 +36,6 @@ TOMO_ENTRY = "tomo_entry"
 DATA_PATH = "instrument/detector/data"
 IMAGE_KEY_PATH = "instrument/detector/image_key"
 ROTATION_ANGLE_PATH = "sample/rotation_angle"
-DEFINITION = "definition"
-NXTOMOPROC = "NXtomoproc"
 
 
 def _missing_data_message(data_string: str) -> str:
@@ -53,25 +47,52 @@ def _missing_data_message(data_string: str) -> str:
     return f"The NeXus file does not contain the {data_string} data."
 
 
+@dataclass
+class NexusImageParameters:
+    """
+    Dataclass to hold the indices and projection angles of an image stack that is to be read from the NeXus file.
+    """
+    indices: np.ndarray
+    projection_angles: Optional[np.ndarray] = None
+
+
+@dataclass
+class NexusLoadParameters:
+    """
+    Dataclass to hold the choices made in the NexusLoadDialog. Used to transfer information from the dialog to the
+    loading code, so the widgets are not read from the loading thread.
+    """
+    file_path: str
+    data_path: str
+    title: str
+    pixel_size: int
+    dtype: str
+    # Keyed by the names used in the dialog, e.g. "Projections" or "Flat Before". Unchecked stacks are left out.
+    image_stacks: Dict[str, NexusImageParameters] = field(default_factory=dict)
+    recon_entries: List[ReconEntry] = field(default_factory=list)
+
+
 class NexusLoadPresenter:
     view: 'NexusLoadDialog'
 
     def __init__(self, view: 'NexusLoadDialog'):
         self.view = view
         self.nexus_file = None
+        self.file_path = ""
         self.tomo_entry = None
         self.data = None
+        self.data_path = ""
         self.tomo_path = ""
         self.image_key_dataset = None
         self.rotation_angles = None
         self.title = ""
-        self.recon_data: List[np.array] = []
+        self.recon_entries: List[ReconEntry] = []
 
-        self.sample_array = None
-        self.dark_before_array = None
-        self.flat_before_array = None
-        self.flat_after_array = None
-        self.dark_after_array = None
+        self.sample_indices: Optional[np.ndarray] = None
+        self.dark_before_indices: Optional[np.ndarray] = None
+        self.flat_before_indices: Optional[np.ndarray] = None
+        self.flat_after_indices: Optional[np.ndarray] = None
+        self.dark_after_indices: Optional[np.ndarray] = None
 
     def notify(self, n: Notification):
         try:
@@ -85,6 +106,7 @@ class NexusLoadPresenter:
         Try to open the NeXus file and display its contents on the view.
         """
         file_path = self.view.filePathLineEdit.text()
+        self.file_path = file_path
         try:
             with h5py.File(file_path, "r") as self.nexus_file:
                 self.tomo_entry = self._look_for_nxtomo_entry()
@@ -94,6 +116,7 @@ class NexusLoadPresenter:
                 self.data = self._look_for_image_data_and_update_view()
                 if self.data is None:
                     return
+                self.data_path = self.data.name
 
                 self.image_key_dataset = self._look_for_tomo_data_and_update_view(IMAGE_KEY_PATH, 0)
                 if self.image_key_dataset is None:
@@ -213,14 +236,13 @@ class NexusLoadPresenter:
 
     def _look_for_recon_entries(self):
         """
-        Tries to find recon entries in the NeXus file then stores the data in a list.
+        Tries to find recon entries in the NeXus file and adds them to the view so the user can choose which to load.
+        The recon data is only read when the dataset is created.
         """
         assert self.nexus_file is not None
-        for key in self.nexus_file.keys():
-            if DEFINITION in self.nexus_file[key].keys():
-                if np.array(self.nexus_file[key][DEFINITION]).tobytes().decode("utf-8") == NXTOMOPROC:
-                    nexus_recon = self.nexus_file[key]
-                    self.recon_data.append(np.array(nexus_recon["data"]["data"]))
+        self.recon_entries = find_recon_entries(self.nexus_file)
+        for entry in self.recon_entries:
+            self.view.add_recon_found(entry.name, entry.path, entry.shape)
 
     def _look_for_tomo_data(self, entry_path: str) -> Optional[Union[h5py.Group, h5py.Dataset]]:
         """
@@ -236,48 +258,43 @@ class NexusLoadPresenter:
 
     def _get_data_from_image_key(self):
         """
-        Looks for the projection and dark/flat before/after images and update the information on the view.
+        Looks for the projection and dark/flat before/after images and update the information on the view. Only the
+        indices of the images are found here, the images are read when the dataset is created.
         """
-        self.sample_array = self._get_images(ImageKeys.Projections)
-        self.view.set_images_found(0, self.sample_array.size != 0, self.sample_array.shape)
-        if self.sample_array.size == 0:
+        self.sample_indices = self._get_image_indices(ImageKeys.Projections)
+        self.view.set_images_found(0, self.sample_indices.size != 0, self._images_shape(self.sample_indices))
+        if self.sample_indices.size == 0:
             self._missing_data_error("projection images")
             self.view.disable_ok_button()
             return
-        self.view.set_projections_increment(self.sample_array.shape[0])
+        self.view.set_projections_increment(self.sample_indices.size)
 
-        self.flat_before_array = self._get_images(ImageKeys.FlatField, True)
-        self.view.set_images_found(1, self.flat_before_array.size != 0, self.flat_before_array.shape)
+        self.flat_before_indices = self._get_image_indices(ImageKeys.FlatField, True)
+        self.view.set_images_found(1, self.flat_before_indices.size != 0, self._images_shape(self.flat_before_indices))
 
-        self.flat_after_array = self._get_images(ImageKeys.FlatField, False)
-        self.view.set_images_found(2, self.flat_after_array.size != 0, self.flat_after_array.shape)
+        self.flat_after_indices = self._get_image_indices(ImageKeys.FlatField, False)
+        self.view.set_images_found(2, self.flat_after_indices.size != 0, self._images_shape(self.flat_after_indices))
 
-        self.dark_before_array = self._get_images(ImageKeys.DarkField, True)
-        self.view.set_images_found(3, self.dark_before_array.size != 0, self.dark_before_array.shape)
+        self.dark_before_indices = self._get_image_indices(ImageKeys.DarkField, True)
+        self.view.set_images_found(3, self.dark_before_indices.size != 0, self._images_shape(self.dark_before_indices))
 
-        self.dark_after_array = self._get_images(ImageKeys.DarkField, False)
-        self.view.set_images_found(4, self.dark_after_array.size != 0, self.dark_after_array.shape)
+        self.dark_after_indices = self._get_image_indices(ImageKeys.DarkField, False)
+        self.view.set_images_found(4, self.dark_after_indices.size != 0, self._images_shape(self.dark_after_indices))
 
-    def _get_images(self, image_key_number: ImageKeys, before: Optional[bool] = None) -> np.ndarray:
+    def _get_image_indices(self, image_key_number: ImageKeys, before: Optional[bool] = None) -> np.ndarray:
         """
-        Retrieve images from the data based on an image key number.
+        Find the indices of the images in the data with an image key number.
         :param image_key_number: The image key number.
         :param before: True if the function should return before images, False if the function should return after
                        images. Ignored when getting projection images.
-        :return: The set of images that correspond with a given image key.
+        :return: The indices of the images that correspond with a given image key.
         """
         assert self.image_key_dataset is not None
+        return image_key_indices(self.image_key_dataset, image_key_number, before)
+
+    def _images_shape(self, indices: np.ndarray) -> Tuple[int, ...]:
         assert self.data is not None
-        if image_key_number is ImageKeys.Projections:
-            indices = self.image_key_dataset[...] == image_key_number.value
-        else:
-            if before:
-                indices = self.image_key_dataset[:self.image_key_dataset.size // 2] == image_key_number.value
-            else:
-                indices = self.image_key_dataset[:] == image_key_number.value
-                indices[:self.image_key_dataset.size // 2] = False
-        # Shouldn't have to use numpy.where but h5py doesn't allow indexing with bool arrays currently
-        return self.data[np.where(indices)]
+        return (indices.size, ) + self.data.shape[1:]
 
     def _find_data_title(self) -> str:
         """
@@ -291,87 +308,92 @@ class NexusLoadPresenter:
             logger.info("A valid title couldn't be found. Using 'NeXus Data' instead.")
             return "NeXus Data"
 
-    def get_dataset(self) -> Tuple[StrictDataset, str]:
+    def get_parameters(self) -> NexusLoadParameters:
         """
-        Create a LoadingDataset and title using the arrays that have been retrieved from the NeXus file.
-        :return: A tuple containing the Dataset and the data title string.
+        Collect the choices made in the view. This reads the widgets, so it must be called from the GUI thread before
+        the NeXus file is read on a worker thread.
+        :return: The NexusLoadParameters for load_nexus_dataset.
         """
-        sample_images = self._create_sample_images()
-        sample_images.name = self.title
+        assert self.sample_indices is not None
+        parameters = NexusLoadParameters(file_path=self.file_path,
+                                         data_path=self.data_path,
+                                         title=self.title,
+                                         pixel_size=int(self.view.pixelSizeSpinBox.value()),
+                                         dtype=self.view.pixelDepthComboBox.currentText())
+
+        # Only the selected projections are read from the file
+        selected = slice(self.view.start_widget.value(), self.view.stop_widget.value(), self.view.step_widget.value())
+        projection_angles = self._read_rotation_angles(ImageKeys.Projections.value)
+        parameters.image_stacks["Projections"] = NexusImageParameters(
+            self.sample_indices[selected], projection_angles[selected] if projection_angles is not None else None)
+
+        for name, indices, image_key in [("Flat Before", self.flat_before_indices, ImageKeys.FlatField),
+                                         ("Flat After", self.flat_after_indices, ImageKeys.FlatField),
+                                         ("Dark Before", self.dark_before_indices, ImageKeys.DarkField),
+                                         ("Dark After", self.dark_after_indices, ImageKeys.DarkField)]:
+            if indices is None or indices.size == 0 or not self.view.checkboxes[name].isChecked():
+                continue
+            parameters.image_stacks[name] = NexusImageParameters(
+                indices, self._read_rotation_angles(image_key.value, "Before" in name))
+
+        parameters.recon_entries = [
+            entry for entry in self.recon_entries if self.view.recon_checkboxes[entry.path].isChecked()
+        ]
+        return parameters
+
+
+def load_nexus_dataset(parameters: NexusLoadParameters,
+                       progress: Optional[Progress] = None) -> Tuple[StrictDataset, str]:
+    """
+    Create a StrictDataset and title by reading the chosen images from the NeXus file. This only reads the file, so it
+    can run on a worker thread.
+    :param parameters: The choices made in the NexusLoadDialog.
+    :param progress: The progress reporting instance.
+    :return: A tuple containing the Dataset and the data title string.
+    """
+    with h5py.File(parameters.file_path, "r") as nexus_file:
+        data = nexus_file[parameters.data_path]
+        stacks = {
+            name: _read_image_stack(data, name, image_parameters, parameters, progress)
+            for name, image_parameters in parameters.image_stacks.items()
+        }
+        sample_images = stacks["Projections"]
+        sample_images.name = parameters.title
+        sample_images.pixel_size = parameters.pixel_size
         ds = StrictDataset(sample=sample_images,
-                           flat_before=self._create_images_if_required(self.flat_before_array, "Flat Before",
-                                                                       ImageKeys.FlatField.value),
-                           flat_after=self._create_images_if_required(self.flat_after_array, "Flat After",
-                                                                      ImageKeys.FlatField.value),
-                           dark_before=self._create_images_if_required(self.dark_before_array, "Dark Before",
-                                                                       ImageKeys.DarkField.value),
-                           dark_after=self._create_images_if_required(self.dark_after_array, "Dark After",
-                                                                      ImageKeys.DarkField.value),
-                           name=self.title)
-
-        if self.recon_data:
-            recon_list = self._create_recon_list()
-            ds.recons = recon_list
-
-        return ds, self.title
-
-    def _create_sample_images(self):
-        """
-        Creates the sample ImageStack object.
-        :return: An ImageStack object containing projections. If given, projection angles, pixel size, and 180deg are
-            also set.
-        """
-        assert self.sample_array is not None
+                           flat_before=stacks.get("Flat Before"),
+                           flat_after=stacks.get("Flat After"),
+                           dark_before=stacks.get("Dark Before"),
+                           dark_after=stacks.get("Dark After"),
+                           name=parameters.title)
 
-        # Create sample array and ImageStack object
-        self.sample_array = self.sample_array[self.view.start_widget.value():self.view.stop_widget.value():self.view.
-                                              step_widget.value()]
-        sample_images = self._create_images(self.sample_array, "Projections")
+        recon_list = ReconList()
+        for entry in parameters.recon_entries:
+            recon = ImageStack(read_recon(nexus_file, entry, progress))
+            recon.name = entry.name
+            recon_list.append(recon)
+        if recon_list:
+            ds.recons = recon_list
 
-        # Set attributes
-        sample_images.pixel_size = int(self.view.pixelSizeSpinBox.value())
-        projection_angles = self._read_rotation_angles(ImageKeys.Projections.value)
-        if projection_angles is not None:
-            sample_images.set_projection_angles(
-                ProjectionAngles(projection_angles[self.view.start_widget.value():self.view.stop_widget.value():self.
-                                                   view.step_widget.value()]))
-        return sample_images
+    return ds, parameters.title
 
-    def _create_images(self, data_array: np.ndarray, name: str) -> ImageStack:
-        """
-        Use a data array to create an ImageStack object.
-        :param data_array: The images array obtained from the NeXus file.
-        :param name: The name of the image dataset.
-        :return: An ImageStack object.
-        """
-        data = pu.create_array(data_array.shape, self.view.pixelDepthComboBox.currentText())
-        data.array[:] = data_array
-        return ImageStack(data, [f"{name} {self.title}"])
 
-    def _create_images_if_required(self, data_array: np.ndarray, name: str, image_key: int) -> Optional[ImageStack]:
-        """
-        Create the ImageStack objects if the corresponding data was found in the NeXus file, and the user checked the
-        "Use?" checkbox.
-        :param data_array: The images data array.
-        :param name: The name of the images.
-        :param image_key: The image key index for the image type.
-        :return: An ImageStack object or None.
-        """
-        if data_array.size == 0 or not self.view.checkboxes[name].isChecked():
-            return None
-        image_stack = self._create_images(data_array, name)
-        if image_stack is not None:
-            projection_angles = self._read_rotation_angles(image_key, "Before" in name)
-            if projection_angles is not None:
-                image_stack.set_projection_angles(ProjectionAngles(projection_angles))
-        return image_stack
-
-    def _create_recon_list(self) -> ReconList:
-        """
-        Uses the array of recon data extracted from the NeXus file to create a ReconList object.
-        :return: The ReconList object containing recons from the NeXus file.
-        """
-        recon_list = ReconList()
-        for recon_array in self.recon_data:
-            recon_list.append(ImageStack(recon_array))
-        return recon_list
+def _read_image_stack(data: h5py.Dataset,
+                      name: str,
+                      image_parameters: NexusImageParameters,
+                      parameters: NexusLoadParameters,
+                      progress: Optional[Progress] = None) -> ImageStack:
+    """
+    Read images from the NeXus file into an ImageStack object.
+    :param data: The images dataset in the NeXus file.
+    :param name: The name of the image dataset.
+    :param image_parameters: The indices and projection angles of the images.
+    :param parameters: The choices made in the NexusLoadDialog.
+    :param progress: The progress reporting instance.
+    :return: An ImageStack object.
+    """
+    images = read_images(data, image_parameters.indices, parameters.dtype, progress)
+    image_stack = ImageStack(images, [f"{name} {parameters.title}"])
+    if image_parameters.projection_angles is not None:
+        image_stack.set_projection_angles(ProjectionAngles(image_parameters.projection_angles))
+    return image_stack
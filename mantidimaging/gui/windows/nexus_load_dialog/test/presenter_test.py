@@ -13,7 +13,7 @@ from mantidimaging.test_helpers.unit_test_helper import generate_images
 
 from mantidimaging.core.data.dataset import StrictDataset
 from mantidimaging.gui.windows.nexus_load_dialog.presenter import _missing_data_message, TOMO_ENTRY, DATA_PATH, \
-    IMAGE_KEY_PATH, NexusLoadPresenter, ROTATION_ANGLE_PATH
+    IMAGE_KEY_PATH, NexusLoadPresenter, ROTATION_ANGLE_PATH, load_nexus_dataset
 from mantidimaging.gui.windows.nexus_load_dialog.presenter import logger as nexus_logger
 from mantidimaging.gui.windows.nexus_load_dialog.view import NexusLoadDialog
 
@@ -70,12 +70,16 @@ class NexusLoaderTest(unittest.TestCase):
 
         self.nexus_load_patcher = mock.patch("mantidimaging.gui.windows.nexus_load_dialog.presenter.h5py.File")
         self.nexus_load_mock = self.nexus_load_patcher.start()
-        self.nexus_load_mock.return_value = self.nexus
+        # The file is opened again to read the images, so it must stay open when the presenter finishes with it
+        self.nexus_load_mock.return_value.__enter__.return_value = self.nexus
 
     def tearDown(self) -> None:
         self.nexus.close()
         self.nexus_load_patcher.stop()
 
+    def get_dataset(self, progress=None):
+        return load_nexus_dataset(self.nexus_loader.get_parameters(), progress)
+
     def replace_values_in_image_key(self, name: str, new_value: int):
         """
         Changes values in the image key.
@@ -146,6 +150,39 @@ class NexusLoaderTest(unittest.TestCase):
         self.view.set_images_found(3, True, self.dark_before.shape)
         self.view.set_images_found(4, True, self.dark_after.shape)
 
+    def test_scan_finds_image_indices(self):
+        self.nexus_loader.scan_nexus_file()
+        np.testing.assert_array_equal(self.nexus_loader.sample_indices, [4, 5])
+        np.testing.assert_array_equal(self.nexus_loader.flat_before_indices, [0, 1])
+        np.testing.assert_array_equal(self.nexus_loader.dark_after_indices, [6, 7])
+
+    @mock.patch("mantidimaging.gui.windows.nexus_load_dialog.presenter.read_images")
+    def test_get_dataset_reads_selected_projections(self, read_images_mock: mock.Mock):
+        read_images_mock.side_effect = lambda data, indices, dtype, progress: np.zeros((len(indices), 10, 10))
+        self.view.step_widget.value.return_value = 2
+        progress = mock.Mock()
+        self.nexus_loader.scan_nexus_file()
+        self.get_dataset(progress)
+
+        data, indices, dtype, passed_progress = read_images_mock.call_args_list[0][0]
+        self.assertEqual(data.name, f"/{self.full_tomo_path}/{DATA_PATH}")
+        np.testing.assert_array_equal(indices, [4])
+        self.assertEqual(dtype, self.expected_pixel_depth)
+        self.assertIs(passed_progress, progress)
+
+    def test_dataset_is_read_without_the_view(self):
+        self.view.checkboxes["Flat After"].isChecked.return_value = False
+        self.nexus_loader.scan_nexus_file()
+        parameters = self.nexus_loader.get_parameters()
+        self.view.reset_mock()
+
+        dataset, _ = load_nexus_dataset(parameters)
+
+        self.assertEqual(self.view.mock_calls, [])
+        self.assertNotIn("Flat After", parameters.image_stacks)
+        self.assertIsNone(dataset.flat_after)
+        np.testing.assert_array_almost_equal(dataset.sample.data, self.sample)
+
     def test_open_nexus_file_in_read_mode(self):
         self.view.filePathLineEdit.text.return_value = expected_file_path = "some_file_path"
         del self.nexus[self.full_tomo_path]  # Prevent it from doing the full operation
@@ -154,14 +191,14 @@ class NexusLoaderTest(unittest.TestCase):
 
     def test_complete_file_returns_expected_dataset_and_title(self):
         self.nexus_loader.scan_nexus_file()
-        dataset, title = self.nexus_loader.get_dataset()
+        dataset, title = self.get_dataset()
         self.assertIsInstance(dataset, StrictDataset)
         self.assertEqual(title, self.title)
         self.assertEqual(dataset.sample.pixel_size, self.expected_pixel_size)
 
     def test_dataset_arrays_match_image_key(self):
         self.nexus_loader.scan_nexus_file()
-        dataset = self.nexus_loader.get_dataset()[0]
+        dataset = self.get_dataset()[0]
         np.testing.assert_array_almost_equal(dataset.flat_before.data, self.flat_before)
         np.testing.assert_array_almost_equal(dataset.dark_before.data, self.dark_before)
         np.testing.assert_array_almost_equal(dataset.sample.data, self.sample)
@@ -171,28 +208,28 @@ class NexusLoaderTest(unittest.TestCase):
     def test_no_flat_before_data(self):
         self.replace_values_in_image_key("Flat Before", 5)
         self.nexus_loader.scan_nexus_file()
-        dataset = self.nexus_loader.get_dataset()[0]
+        dataset = self.get_dataset()[0]
         self.assertIsNone(dataset.flat_before)
         self.view.set_images_found.assert_any_call(1, False, (0, 10, 10))
 
     def test_no_dark_before_data(self):
         self.replace_values_in_image_key("Dark Before", 5)
         self.nexus_loader.scan_nexus_file()
-        dataset = self.nexus_loader.get_dataset()[0]
+        dataset = self.get_dataset()[0]
         self.assertIsNone(dataset.dark_before)
         self.view.set_images_found.assert_any_call(3, False, (0, 10, 10))
 
     def test_no_flat_after_data(self):
         self.replace_values_in_image_key("Flat After", 5)
         self.nexus_loader.scan_nexus_file()
-        dataset = self.nexus_loader.get_dataset()[0]
+        dataset = self.get_dataset()[0]
         self.assertIsNone(dataset.flat_after)
         self.view.set_images_found.assert_any_call(2, False, (0, 10, 10))
 
     def test_no_dark_after_data(self):
         self.replace_values_in_image_key("Dark After", 5)
         self.nexus_loader.scan_nexus_file()
-        dataset = self.nexus_loader.get_dataset()[0]
+        dataset = self.get_dataset()[0]
         self.assertIsNone(dataset.dark_after)
         self.view.set_images_found.assert_any_call(4, False, (0, 10, 10))
 
@@ -209,25 +246,25 @@ class NexusLoaderTest(unittest.TestCase):
     def test_use_flat_before_data_is_false(self):
         self.view.checkboxes["Flat Before"].isChecked.return_value = False
         self.nexus_loader.scan_nexus_file()
-        dataset = self.nexus_loader.get_dataset()[0]
+        dataset = self.get_dataset()[0]
         self.assertIsNone(dataset.flat_before)
 
     def test_use_dark_before_data_is_false(self):
         self.view.checkboxes["Dark Before"].isChecked.return_value = False
         self.nexus_loader.scan_nexus_file()
-        dataset = self.nexus_loader.get_dataset()[0]
+        dataset = self.get_dataset()[0]
         self.assertIsNone(dataset.dark_before)
 
     def test_use_flat_after_data_is_false(self):
         self.view.checkboxes["Flat After"].isChecked.return_value = False
         self.nexus_loader.scan_nexus_file()
-        dataset = self.nexus_loader.get_dataset()[0]
+        dataset = self.get_dataset()[0]
         self.assertIsNone(dataset.flat_after)
 
     def test_use_dark_after_data_is_false(self):
         self.view.checkboxes["Dark After"].isChecked.return_value = False
         self.nexus_loader.scan_nexus_file()
-        dataset = self.nexus_loader.get_dataset()[0]
+        dataset = self.get_dataset()[0]
         self.assertIsNone(dataset.dark_after)
 
     def test_dataset_has_expected_pixel_depth(self):
@@ -236,7 +273,7 @@ class NexusLoaderTest(unittest.TestCase):
         for depth in depths:
             self.view.pixelDepthComboBox.currentText.return_value = depth
             with self.subTest(depth=depth):
-                dataset = self.nexus_loader.get_dataset()[0]
+                dataset = self.get_dataset()[0]
                 self.assertEqual(dataset.sample.dtype, np.dtype(depth))
                 self.assertEqual(dataset.flat_before.dtype, np.dtype(depth))
                 self.assertEqual(dataset.dark_before.dtype, np.dtype(depth))
@@ -248,11 +285,11 @@ class NexusLoaderTest(unittest.TestCase):
         with self.assertLogs(nexus_logger, level="INFO") as log_mock:
             self.nexus_loader.scan_nexus_file()
         self.assertIn("A valid title couldn't be found. Using 'NeXus Data' instead.", log_mock.output[0])
-        assert self.nexus_loader.get_dataset()[1] == "NeXus Data"
+        assert self.get_dataset()[1] == "NeXus Data"
 
     def test_image_names(self):
         self.nexus_loader.scan_nexus_file()
-        dataset = self.nexus_loader.get_dataset()[0]
+        dataset = self.get_dataset()[0]
         assert dataset.sample.filenames[0] == "Projections " + self.title
         assert dataset.flat_before.filenames[0] == "Flat Before " + self.title
         assert dataset.dark_before.filenames[0] == "Dark Before " + self.title
@@ -270,7 +307,7 @@ class NexusLoaderTest(unittest.TestCase):
     def test_step_load(self):
         self.view.step_widget.value.return_value = 2
         self.nexus_loader.scan_nexus_file()
-        dataset = self.nexus_loader.get_dataset()[0]
+        dataset = self.get_dataset()[0]
         self.assertEqual(dataset.sample.data.shape[0], 1)
 
     def test_load_invalid_nexus_file(self):
@@ -314,7 +351,7 @@ class NexusLoaderTest(unittest.TestCase):
         angle_dataset.attrs.create("units", "radians")
 
         self.nexus_loader.scan_nexus_file()
-        ds, _ = self.nexus_loader.get_dataset()
+        ds, _ = self.get_dataset()
 
         assert np.array_equal(ds.flat_before.projection_angles().value, [0, 1])
         assert np.array_equal(ds.dark_before.projection_angles().value, [2, 3])
@@ -328,7 +365,7 @@ class NexusLoaderTest(unittest.TestCase):
         angle_dataset.attrs.create("units", "radians")
 
         self.nexus_loader.scan_nexus_file()
-        ds, _ = self.nexus_loader.get_dataset()
+        ds, _ = self.get_dataset()
 
         self.assertIsNone(ds.flat_before._projection_angles)
         self.assertIsNone(ds.dark_before._projection_angles)
@@ -345,7 +382,7 @@ class NexusLoaderTest(unittest.TestCase):
         angle_dataset.attrs.create("units", "radians")
 
         self.nexus_loader.scan_nexus_file()
-        ds, _ = self.nexus_loader.get_dataset()
+        ds, _ = self.get_dataset()
 
         self.assertIsNone(ds.flat_before._projection_angles)
         self.assertIsNone(ds.dark_before._projection_angles)
@@ -353,27 +390,49 @@ class NexusLoaderTest(unittest.TestCase):
         self.assertIsNone(ds.dark_after._projection_angles)
         self.assertIsNone(ds.flat_after._projection_angles)
 
-    def test_recon_entry_found_in_file(self):
+    def add_recon_entry(self, name: str):
         recon = generate_images()
-        recon.name = "Recon"
-
-        recon_entry = self.nexus.create_group(recon.name)
+        recon_entry = self.nexus.create_group(name)
         recon_entry.attrs["NX_class"] = np.string_("NXentry")
-        recon_entry.create_dataset("title", data=np.string_(recon.name))
+        recon_entry.create_dataset("title", data=np.string_(name))
         recon_entry.create_dataset("definition", data=np.string_("NXtomoproc"))
         data = recon_entry.create_group("data")
         data.attrs["NX_class"] = np.string_("NXdata")
         data.create_dataset("data", shape=recon.data.shape, dtype="float16")
         data["data"][:] = recon.data
+        return recon
+
+    def test_recon_entry_found_in_file(self):
+        recon = self.add_recon_entry("Recon")
 
         self.nexus_loader._look_for_recon_entries()
-        self.assertEqual(len(self.nexus_loader.recon_data), 1)
+        self.assertEqual(len(self.nexus_loader.recon_entries), 1)
+        self.view.add_recon_found.assert_called_once_with("Recon", "/Recon/data/data", recon.data.shape)
+
+    def test_recon_data_not_read_when_scanning(self):
+        self.add_recon_entry("Recon")
+
+        with mock.patch("mantidimaging.gui.windows.nexus_load_dialog.presenter.read_recon") as read_recon_mock:
+            self.nexus_loader.scan_nexus_file()
+        read_recon_mock.assert_not_called()
 
     def test_get_dataset_creates_recon_list(self):
-        self.nexus_loader.recon_data = [generate_images(), generate_images()]
+        recons = [self.add_recon_entry("Recon 1"), self.add_recon_entry("Recon 2")]
         self.nexus_loader.scan_nexus_file()
-        ds, _ = self.nexus_loader.get_dataset()
+        self.view.recon_checkboxes = {entry.path: mock.Mock() for entry in self.nexus_loader.recon_entries}
+        ds, _ = self.get_dataset()
         self.assertEqual(len(ds.recons), 2)
+        self.assertEqual(ds.recons[0].name, "Recon 1")
+        np.testing.assert_array_almost_equal(ds.recons[1].data, recons[1].data, decimal=2)
+
+    def test_get_dataset_only_reads_chosen_recons(self):
+        self.add_recon_entry("Recon 1")
+        self.add_recon_entry("Recon 2")
+        self.nexus_loader.scan_nexus_file()
+        self.view.recon_checkboxes = {entry.path: mock.Mock() for entry in self.nexus_loader.recon_entries}
+        self.view.recon_checkboxes["/Recon 1/data/data"].isChecked.return_value = False
+        ds, _ = self.get_dataset()
+        self.assertEqual([recon.name for recon in ds.recons], ["Recon 2"])
 
     def test_look_for_image_data_and_update_view_with_nonprocessed_file(self):
         self.nexus_loader.tomo_entry = self.tomo_entry
@@ -1,7 +1,7 @@
 # Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
 # SPDX - License - Identifier: GPL-3.0-or-later
 from __future__ import annotations
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 
 from PyQt5.QtCore import Qt, QEventLoop
 from PyQt5.QtWidgets import QPushButton, QFileDialog, QLineEdit, QTreeWidget, QTreeWidgetItem, \
@@ -22,6 +22,8 @@ SHAPE_COLUMN = 3
 CHECKBOX_COLUMN = 4
 TEXT_COLUMNS = [FOUND_COLUMN, PATH_COLUMN, SHAPE_COLUMN]
 
+RECON_SECTION_TITLE = "Reconstructions"
+
 
 class NexusLoadDialog(BaseDialogView):
     tree: QTreeWidget
@@ -34,6 +36,8 @@ class NexusLoadDialog(BaseDialogView):
     previewPushButton: QStackedWidget
     allPushButton: QStackedWidget
     presenter: NexusLoadPresenter
+    recon_checkboxes: Dict[str, QCheckBox]
+    recon_section: Optional[QTreeWidgetItem]
 
     def __init__(self, parent):
         super().__init__(parent, "gui/ui/nexus_load_dialog.ui")
@@ -42,6 +46,8 @@ class NexusLoadDialog(BaseDialogView):
         self.presenter = NexusLoadPresenter(self)
         self.tree.expandItem(self.tree.topLevelItem(1))
         self.checkboxes = dict()
+        self.recon_checkboxes = {}
+        self.recon_section = None
 
         self.tree.header().setSectionResizeMode(QHeaderView.ResizeToContents)
         self.tree.header().setSectionResizeMode(2, QHeaderView.Stretch)
@@ -92,6 +98,7 @@ class NexusLoadDialog(BaseDialogView):
             self.stackedWidget.setCurrentIndex(1)
             QApplication.instance().processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 1)
             self.checkboxes.clear()
+            self.recon_checkboxes.clear()
             self.clear_widgets()
             self.buttonBox.button(QDialogButtonBox.Ok).setEnabled(True)
             self.filePathLineEdit.setText(selected_file)
@@ -114,6 +121,10 @@ class NexusLoadDialog(BaseDialogView):
                 child.setText(column, "")
             self.tree.removeItemWidget(child, CHECKBOX_COLUMN)
 
+        if self.recon_section is not None:
+            self.tree.takeTopLevelItem(self.tree.indexOfTopLevelItem(self.recon_section))
+            self.recon_section = None
+
     def set_data_found(self, position: int, found: bool, path: str, shape: Tuple[int, ...]):
         """
         Indicate on the QTreeWidget if the image key and data fields have been found or not.
@@ -157,6 +168,27 @@ class NexusLoadDialog(BaseDialogView):
         self.tree.setItemWidget(child, CHECKBOX_COLUMN, checkbox)
         self.checkboxes[child.text(0)] = checkbox
 
+    def add_recon_found(self, name: str, path: str, shape: Tuple[int, ...]):
+        """
+        Add a reconstruction that was found in the NeXus file to the QTreeWidget, with a "Use?" checkbox to choose
+        whether it is loaded.
+        :param name: The name of the reconstruction entry.
+        :param path: The path of the reconstruction data in the NeXus file.
+        :param shape: The shape of the reconstruction data.
+        """
+        if self.recon_section is None:
+            self.recon_section = QTreeWidgetItem(self.tree, [RECON_SECTION_TITLE])
+            self.recon_section.setExpanded(True)
+
+        child = QTreeWidgetItem(self.recon_section, [name])
+        self.set_found_status(child, True)
+        child.setText(PATH_COLUMN, path)
+        child.setText(SHAPE_COLUMN, str(shape))
+        checkbox = QCheckBox()
+        checkbox.setChecked(True)
+        self.tree.setItemWidget(child, CHECKBOX_COLUMN, checkbox)
+        self.recon_checkboxes[path] = checkbox
+
     def set_projections_increment(self, n_proj: int):
         """
         Set the properties of the indices spin boxes.
@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 from functools import partial
-from typing import Callable, TYPE_CHECKING, List, Any, Dict
+from typing import Callable, TYPE_CHECKING, List, Any, Dict, Optional, Tuple
+from uuid import UUID
 
+from mantidimaging.core.operation_history.pipeline import run_stages
 from mantidimaging.core.operations.base_filter import BaseFilter, FilterGroup
 from mantidimaging.core.operations.loader import load_filter_packages
+from mantidimaging.core.parallel.memory_budget import memory_budget
+from mantidimaging.core.parallel.utility import ExecutionBackend
 from mantidimaging.gui.dialogs.async_task import start_async_task_view
 from mantidimaging.gui.mvp_base import BaseMainWindowView
 
@@ -14,6 +18,7 @@ if TYPE_CHECKING:
     from PyQt5.QtWidgets import QFormLayout  # noqa: F401  # pragma: no cover
     from mantidimaging.gui.windows.operations import FiltersWindowPresenter  # pragma: no cover
     from mantidimaging.core.data import ImageStack
+    from mantidimaging.core.data.snapshot import StackSnapshot
 
 
 def ensure_tuple(val):
@@ -108,17 +113,30 @@ class FiltersWindowModel(object):
         self.selected_filter = self.filters[filter_idx]
         self.filter_widget_kwargs = filter_widget_kwargs
 
-    def apply_to_stacks(self, stacks: List['ImageStack'], progress=None):
+    def apply_to_stacks(self,
+                        stacks: List['ImageStack'],
+                        progress=None,
+                        snapshots: Optional[Dict[UUID, 'StackSnapshot']] = None):
         """
         Applies the selected filter to a given image stack.
 
         It gets the image reference out of the StackVisualiserView and forwards
         it to the function that actually processes the images.
+
+        :param snapshots: Snapshots to save the original data of each stack in, by stack ID
         """
         for stack in stacks:
-            self.apply_to_images(stack, progress=progress)
-
-    def apply_to_images(self, images, progress=None):
+            snapshot = snapshots.get(stack.id) if snapshots is not None else None
+            self.apply_to_images(stack, progress=progress, snapshot=snapshot)
+
+    def apply_to_images(self,
+                        images,
+                        progress=None,
+                        snapshot: Optional['StackSnapshot'] = None,
+                        preview_of: Optional[Tuple['ImageStack', int]] = None):
+        """
+        :param preview_of: The stack and index that images was sliced from, if images is a preview
+        """
         input_kwarg_widgets = self.filter_widget_kwargs.copy()
 
         # Validate required kwargs are supplied so pre-processing does not happen unnecessarily
@@ -128,7 +146,19 @@ class FiltersWindowModel(object):
         # Run filter
         exec_func: partial = self.selected_filter.execute_wrapper(**input_kwarg_widgets)
         exec_func.keywords["progress"] = progress
-        exec_func(images)
+        if preview_of is not None:
+            exec_func.keywords.update(self.selected_filter.preview_kwargs(*preview_of, **exec_func.keywords))
+        with memory_budget.track_operation(self.selected_filter.filter_name):
+            if snapshot is None:
+                exec_func(images)
+            elif exec_func.args or self.selected_filter.parallel_backend is ExecutionBackend.PROCESS:
+                # The slabs are not in shared memory, so filters that use the process pool run on the whole stack
+                snapshot.save_all()
+                exec_func(images)
+            else:
+                # Run slab by slab, so that only the slices that the filter changes are saved in the snapshot
+                kwargs = {key: value for key, value in exec_func.keywords.items() if key != "progress"}
+                run_stages(images, [(self.selected_filter, kwargs)], progress, snapshot=snapshot)
         # store the executed filter in history if it executed successfully
         images.record_operation(
             self.selected_filter.__name__,  # type: ignore
@@ -136,7 +166,10 @@ class FiltersWindowModel(object):
             *exec_func.args,
             **exec_func.keywords)
 
-    def do_apply_filter(self, stacks: List['ImageStack'], post_filter: Callable[[Any], None]):
+    def do_apply_filter(self,
+                        stacks: List['ImageStack'],
+                        post_filter: Callable[[Any], None],
+                        snapshots: Optional[Dict[UUID, 'StackSnapshot']] = None):
         """
         Applies the selected filter to the selected stack.
         """
@@ -145,7 +178,7 @@ class FiltersWindowModel(object):
 
         # Get auto parameters
         # Generate sub-stack and run filter
-        apply_func = partial(self.apply_to_stacks, stacks)
+        apply_func = partial(self.apply_to_stacks, stacks, snapshots=snapshots)
         start_async_task_view(self.presenter.view, apply_func, post_filter)
 
     def do_apply_filter_sync(self, stacks: List['ImageStack'], post_filter: Callable[[Any], None]):
@@ -15,10 +15,10 @@ import numpy as np
 from PyQt5.QtWidgets import QApplication, QLineEdit
 
 from mantidimaging.core.data import ImageStack
+from mantidimaging.core.data.snapshot import StackSnapshot
 from mantidimaging.core.operation_history.const import OPERATION_HISTORY, OPERATION_DISPLAY_NAME
 from mantidimaging.gui.mvp_base import BasePresenter
 from mantidimaging.gui.utility import BlockQtSignals
-from mantidimaging.gui.utility.common import operation_in_progress
 from mantidimaging.gui.windows.stack_choice.presenter import StackChoicePresenter
 from mantidimaging.gui.widgets.dataset_selector import DatasetSelectorWidgetView
 
@@ -103,7 +103,7 @@ class FiltersWindowPresenter(BasePresenter):
         self.model = FiltersWindowModel(self)
         self._main_window = main_window
 
-        self.original_images_stack: dict[UUID, ImageStack] = {}
+        self.snapshots: dict[UUID, StackSnapshot] = {}
         self.applying_to_all = False
         self.filter_is_running = False
 
@@ -222,8 +222,7 @@ class FiltersWindowPresenter(BasePresenter):
                 return
 
         if self.view.safeApply.isChecked():
-            with operation_in_progress("Safe Apply: Copying Data", "-------------------------------------", self.view):
-                self.original_images_stack = {self.stack.id: self.stack.copy()}
+            self.snapshots = {self.stack.id: StackSnapshot(self.stack)}
 
         # if is a 180degree stack and a user says no, cancel apply filter.
         if self.is_a_proj180deg(self.stack) and not self.view.ask_confirmation(APPLY_TO_180_MSG):
@@ -239,18 +238,15 @@ class FiltersWindowPresenter(BasePresenter):
             return
         stacks = self.main_window.get_all_stacks()
         if self.view.safeApply.isChecked():
-            with operation_in_progress("Safe Apply: Copying Data", "-------------------------------------", self.view):
-                self.original_images_stack = {}
-                for stack in stacks:
-                    self.original_images_stack[stack.id] = stack.copy()
+            self.snapshots = {stack.id: StackSnapshot(stack) for stack in stacks}
 
         if len(stacks) > 0:
             self.applying_to_all = True
         self._do_apply_filter(stacks)
 
     def _wait_for_stack_choice(self, new_stack: ImageStack, stack_uuid: UUID):
-        stack_choice = StackChoicePresenter(self.original_images_stack[stack_uuid], new_stack, self)
-        del self.original_images_stack[stack_uuid]
+        stack_choice = StackChoicePresenter(self.snapshots[stack_uuid], new_stack, self)
+        del self.snapshots[stack_uuid]
         if self.model.show_negative_overlay():
             stack_choice.enable_nonpositive_check()
         stack_choice.show()
@@ -320,7 +316,8 @@ class FiltersWindowPresenter(BasePresenter):
         self.prev_apply_all_state = self.view.applyToAllButton.isEnabled()
         # Disable the apply buttons
         self._set_apply_buttons_enabled(False, False)
-        self.model.do_apply_filter(apply_to, partial(self._post_filter, apply_to))
+        snapshots = self.snapshots if self.view.safeApply.isChecked() else None
+        self.model.do_apply_filter(apply_to, partial(self._post_filter, apply_to), snapshots)
 
     def _do_apply_filter_sync(self, apply_to):
         self.model.do_apply_filter_sync(apply_to, partial(self._post_filter, apply_to))
@@ -358,7 +355,7 @@ class FiltersWindowPresenter(BasePresenter):
 
         try:
             if self.model.filter_widget_kwargs:
-                self.model.apply_to_images(subset)
+                self.model.apply_to_images(subset, preview_of=(self.stack, self.model.preview_image_idx))
         except Exception as e:
             msg = f"Error applying filter for preview: {e}"
             self.show_error(msg, traceback.format_exc())
@@ -12,6 +12,7 @@ from mantidimaging.core.operations.loader import load_filter_packages
 
 import mantidimaging.test_helpers.unit_test_helper as th
 from mantidimaging.core.operation_history import const
+from mantidimaging.core.parallel.utility import ExecutionBackend
 from mantidimaging.gui.windows.operations import FiltersWindowModel
 from mantidimaging.gui.windows.stack_visualiser import SVParameters
 from mantidimaging.core.data import ImageStack
@@ -130,9 +131,10 @@ class FiltersWindowModelTest(unittest.TestCase):
 
         self.model.apply_to_stacks(mock_stacks, mock_progress)
 
-        apply_to_images_mock.assert_has_calls(
-            [mock.call(mock_stacks[0], progress=mock_progress),
-             mock.call(mock_stacks[1], progress=mock_progress)])
+        apply_to_images_mock.assert_has_calls([
+            mock.call(mock_stacks[0], progress=mock_progress, snapshot=None),
+            mock.call(mock_stacks[1], progress=mock_progress, snapshot=None)
+        ])
 
     def test_apply_filter_to_images(self):
         """
@@ -155,6 +157,46 @@ class FiltersWindowModelTest(unittest.TestCase):
         selected_filter_mock.validate_execute_kwargs.assert_called_once()
         callback_mock.assert_called_once_with(images, progress=progress_mock)
 
+    def test_apply_filter_to_preview(self):
+        stack = th.generate_images()
+        preview = stack.slice_as_image_stack(2)
+        selected_filter_mock = mock.Mock()
+        selected_filter_mock.__name__ = "Test filter"
+        selected_filter_mock.preview_kwargs.side_effect = lambda images, index, **kwargs: dict(kwargs, index=index)
+        callback_mock = mock.Mock()
+        selected_filter_mock.execute_wrapper.return_value = partial(callback_mock)
+        self.model.selected_filter = selected_filter_mock
+
+        self.model.apply_to_images(preview, preview_of=(stack, 2))
+
+        self.assertIs(selected_filter_mock.preview_kwargs.call_args.args[0], stack)
+        callback_mock.assert_called_once_with(preview, progress=None, index=2)
+
+    def _apply_with_snapshot(self, backend: ExecutionBackend):
+        images = th.generate_images()
+        selected_filter_mock = mock.Mock()
+        selected_filter_mock.__name__ = "Test filter"
+        selected_filter_mock.parallel_backend = backend
+        selected_filter_mock.execute_wrapper.return_value = partial(mock.Mock())
+        self.model.selected_filter = selected_filter_mock
+        snapshot = mock.Mock()
+
+        with mock.patch("mantidimaging.gui.windows.operations.model.run_stages") as run_stages_mock:
+            self.model.apply_to_images(images, snapshot=snapshot)
+        return snapshot, run_stages_mock
+
+    def test_apply_with_snapshot_keeps_process_pool(self):
+        snapshot, run_stages_mock = self._apply_with_snapshot(ExecutionBackend.PROCESS)
+
+        snapshot.save_all.assert_called_once()
+        run_stages_mock.assert_not_called()
+
+    def test_apply_with_snapshot_runs_thread_filters_in_slabs(self):
+        snapshot, run_stages_mock = self._apply_with_snapshot(ExecutionBackend.THREAD)
+
+        snapshot.save_all.assert_not_called()
+        run_stages_mock.assert_called_once()
+
     def test_get_filter_module_name(self):
         self.model.filters = mock.MagicMock()
 
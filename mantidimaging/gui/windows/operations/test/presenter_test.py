@@ -74,11 +74,11 @@ class FiltersWindowPresenterTest(unittest.TestCase):
 
         expected_apply_to = [stack]
         assert_called_once_with(apply_filter_mock, expected_apply_to,
-                                partial(self.presenter._post_filter, expected_apply_to))
+                                partial(self.presenter._post_filter, expected_apply_to), None)
 
-    @mock.patch("mantidimaging.gui.windows.operations.presenter.operation_in_progress")
     @mock.patch('mantidimaging.gui.windows.operations.presenter.FiltersWindowModel.do_apply_filter')
-    def test_apply_filter_to_all(self, apply_filter_mock: mock.Mock, _):
+    def test_apply_filter_to_all(self, apply_filter_mock: mock.Mock):
+        self.presenter.view.safeApply.isChecked.return_value = False
         self.view.ask_confirmation.return_value = False
         self.presenter.do_apply_filter_to_all()
 
@@ -93,7 +93,7 @@ class FiltersWindowPresenterTest(unittest.TestCase):
 
         self.presenter.do_apply_filter_to_all()
 
-        assert_called_once_with(apply_filter_mock, mock_stacks, partial(self.presenter._post_filter, mock_stacks))
+        assert_called_once_with(apply_filter_mock, mock_stacks, partial(self.presenter._post_filter, mock_stacks), None)
 
     @mock.patch.multiple('mantidimaging.gui.windows.operations.presenter.FiltersWindowPresenter',
                          do_update_previews=DEFAULT,
@@ -327,13 +327,13 @@ class FiltersWindowPresenterTest(unittest.TestCase):
         self.presenter._do_apply_filter = mock.MagicMock()  # type: ignore
         task = mock.MagicMock()
         task.error = None
-        self.presenter.original_images_stack = {stack.id: mock.Mock() for stack in self.mock_stacks}
+        self.presenter.snapshots = {stack.id: mock.Mock() for stack in self.mock_stacks}
 
         self.presenter._post_filter(self.mock_stacks, task)
 
         self.assertEqual(2, stack_choice_presenter.call_count)
         self.assertEqual(2, stack_choice_presenter.return_value.show.call_count)
-        self.assertDictEqual(self.presenter.original_images_stack, {})
+        self.assertDictEqual(self.presenter.snapshots, {})
 
     @mock.patch('mantidimaging.gui.windows.operations.presenter.StackChoicePresenter')
     def test_unchecked_safe_apply_does_not_start_stack_choice_presenter(self, stack_choice_presenter):
@@ -347,27 +347,34 @@ class FiltersWindowPresenterTest(unittest.TestCase):
 
         stack_choice_presenter.assert_not_called()
 
-    @mock.patch("mantidimaging.gui.windows.operations.presenter.operation_in_progress")
-    def test_original_stack_assigned_when_safe_apply_checked(self, _):
+    @mock.patch("mantidimaging.gui.windows.operations.presenter.StackSnapshot")
+    def test_snapshot_taken_when_safe_apply_checked(self, stack_snapshot: Mock):
         stack = mock.MagicMock()
         stack.id = "123"
         self.presenter.stack = stack
-        stack_copy = "THIS IS USEFUL STACK DATA"
-        stack.copy.return_value = stack_copy
-        self.presenter._do_apply_filter = mock.MagicMock()
 
-        self.presenter.do_apply_filter()
+        with mock.patch.object(self.presenter, "_do_apply_filter"):
+            self.presenter.do_apply_filter()
+
+        stack_snapshot.assert_called_once_with(stack)
+        stack.copy.assert_not_called()
+        self.assertDictEqual({stack.id: stack_snapshot.return_value}, self.presenter.snapshots)
+
+    @mock.patch('mantidimaging.gui.windows.operations.presenter.FiltersWindowModel.do_apply_filter')
+    def test_snapshots_passed_to_model_when_safe_apply_checked(self, apply_filter_mock: mock.Mock):
+        self.presenter.view.safeApply.isChecked.return_value = True
+        self.presenter.snapshots = {self.mock_stacks[0].id: mock.Mock()}
+
+        self.presenter._do_apply_filter(self.mock_stacks)
 
-        stack.copy.assert_called_once()
-        self.assertDictEqual({stack.id: stack_copy}, self.presenter.original_images_stack)
+        self.assertIs(self.presenter.snapshots, apply_filter_mock.call_args[0][2])
 
     def test_set_filter_by_name(self):
         NAME = "ROI Normalisation"
         self.presenter.set_filter_by_name(NAME)
         self.view.filterSelector.setCurrentText.assert_called_with(NAME)
 
-    @mock.patch("mantidimaging.gui.windows.operations.presenter.operation_in_progress")
-    def test_warning_when_flat_fielding_is_run_twice(self, _):
+    def test_warning_when_flat_fielding_is_run_twice(self):
         """
         Test that a warning is displayed if the user is trying to run flat-fielding again.
         """
@@ -378,8 +385,7 @@ class FiltersWindowPresenterTest(unittest.TestCase):
         self.presenter.do_apply_filter()
         self.view.ask_confirmation.assert_called_once_with(REPEAT_FLAT_FIELDING_MSG)
 
-    @mock.patch("mantidimaging.gui.windows.operations.presenter.operation_in_progress")
-    def test_no_warning_when_flat_fielding_isnt_run(self, _):
+    def test_no_warning_when_flat_fielding_isnt_run(self):
         """
         Test no warning is created if the user isn't running flat fielding.
         """
@@ -389,8 +395,7 @@ class FiltersWindowPresenterTest(unittest.TestCase):
         self.presenter.do_apply_filter()
         self.view.ask_confirmation.assert_not_called()
 
-    @mock.patch("mantidimaging.gui.windows.operations.presenter.operation_in_progress")
-    def test_no_warning_when_flat_fielding_is_first_operation(self, _):
+    def test_no_warning_when_flat_fielding_is_first_operation(self):
         """
         Test that no warning is created when flat fielding is the first operation the user runs, and no operation
         history exists.
@@ -401,8 +406,7 @@ class FiltersWindowPresenterTest(unittest.TestCase):
         self.presenter.do_apply_filter()
         self.view.ask_confirmation.assert_not_called()
 
-    @mock.patch("mantidimaging.gui.windows.operations.presenter.operation_in_progress")
-    def test_no_warning_when_flat_fielding_is_run_for_first_time(self, _):
+    def test_no_warning_when_flat_fielding_is_run_for_first_time(self):
         """
         Test that no warning is created if an operation history exists but flat fielding isn't in it.
         """
@@ -413,8 +417,7 @@ class FiltersWindowPresenterTest(unittest.TestCase):
         self.presenter.do_apply_filter()
         self.view.ask_confirmation.assert_not_called()
 
-    @mock.patch("mantidimaging.gui.windows.operations.presenter.operation_in_progress")
-    def test_no_operation_run_when_user_cancels_flat_fielding(self, _):
+    def test_no_operation_run_when_user_cancels_flat_fielding(self):
         """
         Test that pressing "Cancel" when the flat-fielding warning is displayed means that no operation is run.
         """
@@ -426,15 +429,13 @@ class FiltersWindowPresenterTest(unittest.TestCase):
         self.presenter.do_apply_filter()
         self.presenter._do_apply_filter.assert_not_called()
 
-    @mock.patch("mantidimaging.gui.windows.operations.presenter.operation_in_progress")
-    def test_buttons_disabled_while_filter_is_running(self, _):
+    def test_buttons_disabled_while_filter_is_running(self):
         self.presenter.model.do_apply_filter = mock.MagicMock()
         self.presenter._do_apply_filter(None)
         self.presenter.view.applyButton.setEnabled.assert_called_once_with(False)
         self.presenter.view.applyToAllButton.setEnabled.assert_called_once_with(False)
 
-    @mock.patch("mantidimaging.gui.windows.operations.presenter.operation_in_progress")
-    def test_running_operation_records_previous_button_states(self, _):
+    def test_running_operation_records_previous_button_states(self):
         self.presenter.view.applyButton.isEnabled.return_value = prev_apply_single_state = True
         self.presenter.view.applyToAllButton.isEnabled.return_value = prev_apply_all_state = False
         self.presenter.model.do_apply_filter = mock.MagicMock()
@@ -11,7 +11,7 @@ from mantidimaging.gui.windows.stack_choice.view import StackChoiceView
 
 class StackComparePresenter(StackChoicePresenterMixin):
     def __init__(self, stack_one: ImageStack, stack_two: ImageStack, parent):
-        self.view = StackChoiceView(stack_one, stack_two, self, parent)
+        self.view = StackChoiceView(stack_one.data, stack_two.data, self, parent)
         self.view.originalDataButton.hide()
         self.view.newDataButton.hide()
 
@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 import traceback
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from mantidimaging.core.data.imagestack import ImageStack
+from mantidimaging.core.data.snapshot import StackSnapshot
 from mantidimaging.gui.windows.stack_choice.presenter_base import StackChoicePresenterMixin
 from mantidimaging.gui.windows.stack_choice.view import Notification, StackChoiceView
 
@@ -14,13 +15,12 @@ if TYPE_CHECKING:
 
 
 class StackChoicePresenter(StackChoicePresenterMixin):
-    def __init__(self, original_stack: ImageStack, new_stack: ImageStack,
-                 operations_presenter: 'FiltersWindowPresenter'):
-
+    def __init__(self, snapshot: StackSnapshot, new_stack: ImageStack, operations_presenter: 'FiltersWindowPresenter'):
         self.operations_presenter = operations_presenter
-        self.original_stack = original_stack
+        self.snapshot: Optional[StackSnapshot] = snapshot
 
-        self.view = StackChoiceView(self.original_stack, new_stack, self, parent=operations_presenter.view)
+        # The original data is read a slice at a time from the snapshot, and only put back into the stack if chosen
+        self.view = StackChoiceView(snapshot.original_view(), new_stack.data, self, parent=operations_presenter.view)
         self.new_stack = new_stack
         self.done = False
         self.use_new_data = False
@@ -41,8 +41,8 @@ class StackChoicePresenter(StackChoicePresenterMixin):
             self.show_error(e, traceback.format_exc())
 
     def do_reapply_original_data(self):
-        self.new_stack.shared_array = self.original_stack.shared_array
-        self.new_stack.metadata = self.original_stack.metadata
+        assert self.snapshot is not None
+        self.snapshot.restore()
         self.view.choice_made = True
         self.close_view()
 
@@ -52,7 +52,7 @@ class StackChoicePresenter(StackChoicePresenterMixin):
 
     def close_view(self):
         self.view.close()
-        self.original_stack = None
+        self.snapshot = None
         self.done = True
 
     def enable_nonpositive_check(self):
@@ -5,7 +5,6 @@ from __future__ import annotations
 import unittest
 from unittest import mock
 from unittest.mock import DEFAULT, MagicMock, Mock, patch
-from uuid import uuid4
 
 import numpy as np
 
@@ -13,25 +12,27 @@ import mantidimaging.test_helpers.unit_test_helper as th
 from mantidimaging.gui.windows.stack_choice.presenter import StackChoicePresenter
 from mantidimaging.gui.windows.stack_choice.view import Notification
 from mantidimaging.core.data.imagestack import ImageStack
+from mantidimaging.core.data.snapshot import StackSnapshot
 
 
 class StackChoicePresenterTest(unittest.TestCase):
     @mock.patch("mantidimaging.gui.windows.stack_choice.presenter.StackChoiceView")
     def setUp(self, _):
-        self.original_stack = th.generate_images()
         self.new_stack = th.generate_images()
+        self.snapshot = StackSnapshot(self.new_stack)
         self.op_p = mock.MagicMock()
-        self.uuid = uuid4()
-        self.p = StackChoicePresenter(original_stack=self.original_stack,
-                                      new_stack=self.new_stack,
-                                      operations_presenter=self.op_p)
+        self.p = StackChoicePresenter(snapshot=self.snapshot, new_stack=self.new_stack, operations_presenter=self.op_p)
         self.v = self.p.view
 
     @mock.patch("mantidimaging.gui.windows.stack_choice.presenter.StackChoiceView")
-    def test_presenter_doesnt_raise_lists_for_original_stack(self, _):
-        single_stack_uuid = uuid4()
-        original_stack = [(th.generate_images(), single_stack_uuid), (th.generate_images(), uuid4())]
-        StackChoicePresenter(original_stack, mock.MagicMock(), mock.MagicMock())
+    def test_original_stack_comes_from_snapshot(self, view: Mock):
+        snapshot = mock.MagicMock()
+        new_stack = mock.MagicMock()
+        StackChoicePresenter(snapshot, new_stack, mock.MagicMock())
+
+        snapshot.original_view.assert_called_once_with()
+        self.assertIs(snapshot.original_view.return_value, view.call_args[0][0])
+        self.assertIs(new_stack.data, view.call_args[0][1])
 
     def test_show_calls_show_in_the_view(self):
         self.p.show()
@@ -62,22 +63,21 @@ class StackChoicePresenterTest(unittest.TestCase):
 
     def test_do_reapply_original_data(self):
         self.p.close_view = mock.MagicMock()
-        img1 = ImageStack(np.zeros((3, 3, 3)) + 1)
-        img1.metadata = {"name": 1}
-        img2 = ImageStack(np.zeros((3, 3, 3)) + 2)
-        img2.metadata = {"name": 2}
-        self.p.original_stack = img1
-        self.p.new_stack = img2
+        new_stack = ImageStack(np.zeros((3, 3, 3)) + 1)
+        new_stack.metadata = {"name": 1}
+        self.p.snapshot = StackSnapshot(new_stack)
+        self.p.snapshot.save_changed(0, np.zeros((3, 3, 3)) + 2)
+        new_stack.data[:] = 2
+        new_stack.metadata = {"name": 2}
 
         self.p.do_reapply_original_data()
 
-        self.assertEqual(self.p.new_stack.data[0, 0, 0], 1)
-        self.assertEqual(self.p.new_stack.metadata["name"], 1)
+        self.assertEqual(new_stack.data[0, 0, 0], 1)
+        self.assertEqual(new_stack.metadata["name"], 1)
         self.assertTrue(self.v.choice_made)
         self.p.close_view.assert_called_once()
 
     def test_do_clean_up_original_data(self):
-        self.p.original_stack = mock.MagicMock()
         self.p.close_view = mock.MagicMock()
 
         self.p.do_clean_up_original_data()
@@ -95,6 +95,11 @@ class StackChoicePresenterTest(unittest.TestCase):
 
         self.assertTrue(self.p.done)
 
+    def test_close_view_releases_snapshot(self):
+        self.p.close_view()
+
+        self.assertIsNone(self.p.snapshot)
+
     def test_do_toggle_lock_histograms(self):
         self.v.lockHistograms.isChecked.return_value = True
         self.p.notify(Notification.TOGGLE_LOCK_HISTOGRAMS)
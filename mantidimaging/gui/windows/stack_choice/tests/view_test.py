@@ -21,7 +21,7 @@ class StackChoiceViewTest(unittest.TestCase):
         self.original_stack = th.generate_images()
         self.new_stack = th.generate_images()
         self.p = mock.MagicMock()
-        self.v = StackChoiceView(self.original_stack, self.new_stack, self.p, None)
+        self.v = StackChoiceView(self.original_stack.data, self.new_stack.data, self.p, None)
 
     def tearDown(self):
         sip.delete(self.v)
@@ -10,7 +10,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QCheckBox, QMainWindow, QMessageBox, QPushButton, QSizePolicy
 from pyqtgraph import ViewBox
 
-from mantidimaging.core.data.imagestack import ImageStack
+from mantidimaging.core.data.snapshot import SnapshotView
 from mantidimaging.gui.mvp_base import BaseMainWindowView
 from mantidimaging.gui.widgets.mi_image_view.view import MIImageView
 
@@ -30,7 +30,7 @@ class StackChoiceView(BaseMainWindowView):
     newDataButton: QPushButton
     lockHistograms: QCheckBox
 
-    def __init__(self, original_stack: ImageStack, new_stack: ImageStack,
+    def __init__(self, original_data: Union[np.ndarray, SnapshotView], new_data: np.ndarray,
                  presenter: Union['StackComparePresenter', 'StackChoicePresenter'], parent: Optional[QMainWindow]):
         super().__init__(parent, "gui/ui/stack_choice_window.ui")
 
@@ -48,8 +48,8 @@ class StackChoiceView(BaseMainWindowView):
         self.new_stack.name = "New Stack"
         self.new_stack.enable_nan_check(True)
 
-        self._setup_stack_for_view(self.original_stack, original_stack.data)
-        self._setup_stack_for_view(self.new_stack, new_stack.data)
+        self._setup_stack_for_view(self.original_stack, original_data)
+        self._setup_stack_for_view(self.new_stack, new_data)
 
         self.topVerticalOriginal.addWidget(self.original_stack)
         self.topVerticalNew.addWidget(self.new_stack)
@@ -112,7 +112,7 @@ class StackChoiceView(BaseMainWindowView):
             self.original_stack.roiClicked()
             self.new_stack.roiClicked()
 
-    def _setup_stack_for_view(self, stack: MIImageView, data: np.ndarray):
+    def _setup_stack_for_view(self, stack: MIImageView, data: Union[np.ndarray, SnapshotView]):
         stack.setContentsMargins(4, 4, 4, 4)
         stack.setImage(data)
         stack.ui.menuBtn.hide()
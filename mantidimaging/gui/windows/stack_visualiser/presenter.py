@@ -11,6 +11,7 @@ from typing import TYPE_CHECKING
 from mantidimaging.core.data import ImageStack
 from mantidimaging.core.operation_history import const
 from mantidimaging.core.utility.sensible_roi import SensibleROI
+from mantidimaging.gui.dialogs.async_task import start_async_task_view
 from mantidimaging.gui.mvp_base import BasePresenter
 from .model import SVModel
 from ...utility.common import operation_in_progress
@@ -18,6 +19,7 @@ from mantidimaging.core.data.dataset import MixedDataset
 
 if TYPE_CHECKING:
     from .view import StackVisualiserView  # pragma: no cover
+    from mantidimaging.gui.dialogs.async_task import TaskWorkerThread
 
 
 class SVNotification(IntEnum):
@@ -102,12 +104,28 @@ class StackVisualiserPresenter(BasePresenter):
         self.refresh_image()
 
     def create_swapped_axis_stack(self):
-        with operation_in_progress("Creating sinograms, copying data, this may take a while",
-                                   "The data is being copied, this may take a while.", self.view):
-            new_stack = self.images.copy(flip_axes=True)
-            new_stack.name = self.images.name + "_sino"
-            new_stack.record_operation(const.OPERATION_NAME_AXES_SWAP, display_name="Axes Swapped")
-            self.add_sinograms_to_model_and_update_view(new_stack)
+        start_async_task_view(self.view,
+                              self.images.copy,
+                              self._on_swapped_axis_stack_done, {'flip_axes': True},
+                              cancelable=True)
+
+    def _on_swapped_axis_stack_done(self, task: 'TaskWorkerThread'):
+        if not task.was_successful():
+            progress = task.kwargs.get('progress')
+            if progress is not None and progress.should_cancel:
+                # Cancelling stops the copy with an error, but there is nothing to report
+                return
+            # The error was raised in the task's thread, so its traceback is taken from the error itself
+            error = task.error
+            details = ""
+            if isinstance(error, BaseException):
+                details = "".join(traceback.format_exception(type(error), error, error.__traceback__))
+            self.show_error(f"Failed to create sinograms: {error}", details)
+            return
+        new_stack = task.result
+        new_stack.name = self.images.name + "_sino"
+        new_stack.record_operation(const.OPERATION_NAME_AXES_SWAP, display_name="Axes Swapped")
+        self.add_sinograms_to_model_and_update_view(new_stack)
 
     def dupe_stack(self):
         with operation_in_progress("Copying data, this may take a while",
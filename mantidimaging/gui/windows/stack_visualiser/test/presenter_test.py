@@ -11,6 +11,7 @@ from mantidimaging.gui.windows.stack_visualiser.presenter import SVParameters
 
 import mantidimaging.test_helpers.unit_test_helper as th
 from mantidimaging.core.data import ImageStack
+from mantidimaging.core.utility.progress_reporting import Progress
 from mantidimaging.gui.windows.stack_visualiser import StackVisualiserPresenter, StackVisualiserView, SVNotification, \
     SVImageMode
 
@@ -107,6 +108,57 @@ class StackVisualiserPresenterTest(unittest.TestCase):
         self.view._main_window.presenter.add_sinograms_to_dataset_and_update_view.assert_called_once_with(
             sinograms, self.presenter.images.id)
 
+    @patch("mantidimaging.gui.windows.stack_visualiser.presenter.start_async_task_view")
+    def test_create_swapped_axis_stack_runs_async(self, mock_start_async_task_view):
+        self.presenter.notify(SVNotification.SWAP_AXES)
+        mock_start_async_task_view.assert_called_once_with(self.view,
+                                                           self.presenter.images.copy,
+                                                           self.presenter._on_swapped_axis_stack_done,
+                                                           {'flip_axes': True},
+                                                           cancelable=True)
+
+    def test_swapped_axis_stack_added_when_done(self):
+        task = mock.Mock()
+        task.result = self.presenter.images.copy(flip_axes=True)
+        self.presenter.images.name = "stack"
+
+        self.presenter._on_swapped_axis_stack_done(task)
+
+        self.assertEqual("stack_sino", task.result.name)
+        self.view._main_window.presenter.add_sinograms_to_dataset_and_update_view.assert_called_once_with(
+            task.result, self.presenter.images.id)
+
+    @patch("mantidimaging.gui.windows.stack_visualiser.presenter.StackVisualiserPresenter.show_error")
+    def test_swapped_axis_stack_failed(self, mock_show_error):
+        task = mock.Mock()
+        task.was_successful.return_value = False
+        task.kwargs = {'progress': Progress()}
+        try:
+            raise MemoryError("Not enough memory")
+        except MemoryError as e:
+            task.error = e
+
+        self.presenter._on_swapped_axis_stack_done(task)
+
+        mock_show_error.assert_called_once_with("Failed to create sinograms: Not enough memory", mock.ANY)
+        details = mock_show_error.call_args.args[1]
+        self.assertIn("test_swapped_axis_stack_failed", details)
+        self.assertIn("MemoryError: Not enough memory", details)
+        self.view._main_window.presenter.add_sinograms_to_dataset_and_update_view.assert_not_called()
+
+    @patch("mantidimaging.gui.windows.stack_visualiser.presenter.StackVisualiserPresenter.show_error")
+    def test_swapped_axis_stack_cancelled(self, mock_show_error):
+        task = mock.Mock()
+        task.was_successful.return_value = False
+        task.kwargs = {'progress': Progress()}
+        task.kwargs['progress'].cancel()
+        task.error = RuntimeError("Task has been cancelled")
+
+        self.presenter._on_swapped_axis_stack_done(task)
+
+        mock_show_error.assert_not_called()
+        self.view._main_window.presenter.add_sinograms_to_dataset_and_update_view.assert_not_called()
+
 
 if __name__ == '__main__':
     unittest.main()
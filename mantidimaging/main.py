@@ -8,6 +8,7 @@ import logging
 import sys
 import warnings
 import mantidimaging.core.parallel.manager as pm
+import mantidimaging.core.parallel.utility as pu
 
 from mantidimaging import helper as h
 from mantidimaging.core.utility.command_line_arguments import CommandLineArguments
@@ -63,9 +64,11 @@ def main():
     except BaseException as e:
         if sys.platform == 'linux':
             pm.clear_memory_from_current_process_linux()
+        pm.clear_mapped_files_from_current_process()
         raise e
     finally:
         pm.end_pool()
+        pu.clear_segment_pool()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,106 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+"""
+Time the discovery of a dataset in a synthetic directory tree, like the load dialog does when a sample is selected.
+
+The sample directory holds the projections, and flat, dark and 180 directories sit next to it. Finding the files with
+the directory index is compared with matching every entry of each directory and globbing for the log files, which is
+what FilenameGroup did before.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from mantidimaging.core.io.filenames import FilenameGroup, clear_directory_indexes
+from mantidimaging.core.utility.data_containers import FILE_TYPES
+
+STACKS = ["Flat_Before", "Flat_After", "Dark_Before", "Dark_After"]
+
+
+def create_tree(root: Path, num_files: int, num_other: int) -> Path:
+    tomo = root / "Tomo"
+    tomo.mkdir()
+    for i in range(num_files):
+        (tomo / f"IMAT_Tomo_{i:06d}.tif").touch()
+    for i in range(num_other):
+        (tomo / f"IMAT_Tomo_spectra_{i:06d}.txt").touch()
+    (root / "Tomo_log.txt").touch()
+    for stack in STACKS:
+        (root / stack).mkdir()
+        for i in range(20):
+            (root / stack / f"IMAT_{stack}_{i:06d}.tif").touch()
+    (root / "180deg").mkdir()
+    (root / "180deg" / "IMAT_180deg.tif").touch()
+    return tomo / "IMAT_Tomo_000000.tif"
+
+
+def related_groups(sample: Path) -> List[FilenameGroup]:
+    fg = FilenameGroup.from_file(sample)
+    groups = [fg]
+    for file_type in FILE_TYPES:
+        if file_type.mode in ["images", "180"]:
+            if (related := fg.find_related(file_type)) is not None:
+                groups.append(related)
+    return groups
+
+
+def scan_every_entry(sample: Path) -> None:
+    for fg in related_groups(sample):
+        all_indexes = []
+        for filename in fg.directory.iterdir():
+            if fg.pattern.match(filename.name):
+                all_indexes.append(fg.pattern.get_index(filename.name))
+            fg.pattern.match_metadata(filename.name)
+        fg.all_indexes = sorted(all_indexes)
+        min(fg.directory.parent.glob(fg.directory.name + "*.txt"), key=lambda p: len(str(p)), default=None)
+
+
+def discover_dataset(sample: Path) -> None:
+    for fg in related_groups(sample):
+        fg.find_all_files()
+        fg.find_log_file()
+
+
+def best_time(func: Callable[[], None], repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time finding the files of a dataset in a large directory")
+    parser.add_argument("--files", type=int, default=100_000, help="number of projections in the sample directory")
+    parser.add_argument("--other", type=int, default=0, help="number of unrelated files in the sample directory")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sample = create_tree(Path(tmpdir), args.files, args.other)
+        # Let the directory times settle, so cached indexes can be reused
+        time.sleep(2.5)
+
+        def old():
+            clear_directory_indexes()
+            scan_every_entry(sample)
+
+        def cold():
+            clear_directory_indexes()
+            discover_dataset(sample)
+
+        timings = {
+            "Matching every entry": old,
+            "Directory index, cold cache": cold,
+            "Directory index, warm cache": lambda: discover_dataset(sample),
+        }
+        for name, func in timings.items():
+            print(f"{name:<30}{best_time(func, args.repeats):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
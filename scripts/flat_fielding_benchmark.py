@@ -0,0 +1,112 @@
+# Copyright (C) 2023 ISIS Rutherford Appleton Laboratory UKRI
+# SPDX - License - Identifier: GPL-3.0-or-later
+from __future__ import annotations
+"""
+Time the flat-field correction of a synthetic stack, comparing the single pass blocked kernel that the Flat-fielding
+operation uses with the ways of doing it timed in the docstring of flat_fielding._execute.
+
+The default shape is the 500x2048x2048 stack from that benchmark, which needs 8GB of memory. Use --shape for a smaller
+stack.
+"""
+import argparse
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+from mantidimaging.core.data import ImageStack
+from mantidimaging.core.operations.flat_fielding import flat_fielding
+from mantidimaging.core.parallel import shared as ps
+from mantidimaging.core.parallel import utility as pu
+
+
+def _subtract(data, dark=None):
+    np.subtract(data, dark, out=data)
+
+
+def _divide(data, norm_divide):
+    np.true_divide(data, norm_divide, out=data)
+
+
+def _subtract_divide(data, dark, norm_divide):
+    np.true_divide(np.subtract(data, dark, out=data), norm_divide, out=data)
+
+
+def _inplace_with_2d(func, data, i):
+    func(data[0].array[i], data[1].array, data[2].array)
+
+
+def sequential_subtract_parallel_divide(images: ImageStack, dark: np.ndarray, norm_divide: np.ndarray) -> None:
+    """#1 in the docstring"""
+    np.subtract(images.data, dark, out=images.data)
+    ps.execute(ps.create_partial(_divide, ps.inplace_second_2d),
+               [images.shared_array, pu.SharedArray(norm_divide, None)],
+               images.data.shape[0],
+               backend=pu.ExecutionBackend.THREAD)
+
+
+def separate_parallel_passes(images: ImageStack, dark: np.ndarray, norm_divide: np.ndarray) -> None:
+    """#2 in the docstring, what the operation did before the single pass kernel"""
+    ps.execute(ps.create_partial(_subtract, ps.inplace_second_2d),
+               [images.shared_array, pu.SharedArray(dark, None)],
+               images.data.shape[0],
+               backend=pu.ExecutionBackend.THREAD)
+    ps.execute(ps.create_partial(_divide, ps.inplace_second_2d),
+               [images.shared_array, pu.SharedArray(norm_divide, None)],
+               images.data.shape[0],
+               backend=pu.ExecutionBackend.THREAD)
+
+
+def whole_image_single_pass(images: ImageStack, dark: np.ndarray, norm_divide: np.ndarray) -> None:
+    """#3 in the docstring, subtracting and dividing each whole image in turn"""
+    ps.execute(ps.create_partial(_subtract_divide, _inplace_with_2d),
+               [images.shared_array, pu.SharedArray(dark, None),
+                pu.SharedArray(norm_divide, None)],
+               images.data.shape[0],
+               backend=pu.ExecutionBackend.THREAD)
+
+
+def blocked_single_pass(images: ImageStack, flat: np.ndarray, dark: np.ndarray, minus_log: bool) -> None:
+    flat_fielding._execute(images, flat, dark, minus_log)
+
+
+def best_time(func: Callable[[ImageStack], None], source: np.ndarray, repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        images = ImageStack(pu.copy_into_shared_memory(source))
+        start = time.perf_counter()
+        func(images)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the flat-field correction of a stack")
+    parser.add_argument("--shape", type=int, nargs=3, default=[500, 2048, 2048], help="shape of the stack")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    source = rng.uniform(100, 1000, args.shape).astype(np.float32)
+    flat = rng.uniform(1000, 2000, args.shape[1:]).astype(np.float32)
+    dark = rng.uniform(0, 100, args.shape[1:]).astype(np.float32)
+    norm_divide = flat - dark
+
+    timings: Dict[str, Callable[[ImageStack], None]] = {
+        "#1 Sequential subtract, parallel divide":
+        lambda images: sequential_subtract_parallel_divide(images, dark, norm_divide),
+        "#2 Separate parallel passes":
+        lambda images: separate_parallel_passes(images, dark, norm_divide),
+        "#3 Subtract then divide each image":
+        lambda images: whole_image_single_pass(images, dark, norm_divide),
+        "Blocked single pass":
+        lambda images: blocked_single_pass(images, flat, dark, False),
+        "Blocked single pass, minus log":
+        lambda images: blocked_single_pass(images, flat, dark, True),
+    }
+    for name, func in timings.items():
+        print(f"{name:<45}{best_time(func, source, args.repeats):.3f}s")
+
+
+if __name__ == "__main__":
+    main()